@@ -1,5 +1,9 @@
+from typing import Any, Dict
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from orca_shared.database import shared_db
+from sqlalchemy import Engine
 
 from src.adapters.api.graphql_app import get_graphql_app
 from src.adapters.graphql.adapters import AdaptersStorage
@@ -7,17 +11,22 @@ from src.adapters.graphql.graphql_settings import GraphQLSettings
 from src.adapters.webserver.uvicorn_settings import UvicornSettings
 
 
-def create_fastapi_app(uvicorn_settings: UvicornSettings, adapters_storage: AdaptersStorage) \
-        -> FastAPI:
+def create_fastapi_app(
+    uvicorn_settings: UvicornSettings,
+    adapters_storage: AdaptersStorage,
+    engines: Dict[str, Engine],
+) -> FastAPI:
     """
     Creates a Fast API app based on arguments, including GraphQL setup.
 
     Args:
         uvicorn_settings: Contains settings required by application components.
         adapters_storage: Adapters required by application functionality.
+        engines: The database engines used by the adapters, by name.
+            Their connection pools are reported by the metrics route.
 
     Returns:
-        A Fast API app with graphql routes and a health check.
+        A Fast API app with graphql routes, a health check, and pool metrics.
     """
     app = FastAPI()
 
@@ -47,4 +56,33 @@ def create_fastapi_app(uvicorn_settings: UvicornSettings, adapters_storage: Adap
         # .     see if external items are up?
         return {"Healthy": True}
 
+    # Create metrics
+    @app.get("/metrics")
+    def get_metrics():
+        """
+        Connection pool metrics for each database engine.
+        """
+        return {name: get_pool_metrics(engine) for name, engine in engines.items()}
+
     return app
+
+
+def get_pool_metrics(engine: Engine) -> Dict[str, Any]:
+    """
+    Reports the state of an engine's connection pool.
+
+    Args:
+        engine: The engine to report on.
+
+    Returns:
+        The pool's size, connections checked in and out, and overflow,
+        along with its checkout count and latency from shared_db.
+    """
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        **shared_db.get_pool_checkout_stats(engine),
+    }
@@ -4,6 +4,7 @@ import dataclasses
 import strawberry
 from pydantic import BaseModel
 
+from src.adapters.storage.async_rdbms import AsyncStorageAdapterRDBMS
 from src.adapters.storage.internal_reconciliation_rdbms import (
     InternalReconciliationStorageAdapterRDBMS,
 )
@@ -24,6 +25,7 @@ class AdaptersStorage(BaseModel):
     word_generation: WordGenerationInterface
     storage: StorageAdapterRDBMS
     storage_internal_reconciliation: InternalReconciliationStorageAdapterRDBMS
+    async_storage: AsyncStorageAdapterRDBMS
     logger_provider: LoggerProviderInterface
 
     # Overriding constructor to give us type/name hints for Pydantic class.
@@ -31,11 +33,13 @@ class AdaptersStorage(BaseModel):
                  word_generation: WordGenerationInterface,
                  storage: StorageAdapterRDBMS,
                  storage_internal_reconciliation: InternalReconciliationStorageAdapterRDBMS,
+                 async_storage: AsyncStorageAdapterRDBMS,
                  logger_provider: LoggerProviderInterface):
         # This call to __init__ will NOT automatically update when performing renames.
         super().__init__(
             word_generation=word_generation,
             storage=storage,
             storage_internal_reconciliation=storage_internal_reconciliation,
+            async_storage=async_storage,
             logger_provider=logger_provider
         )
@@ -15,8 +15,8 @@ from src.entities.common import PageParameters
 from src.entities.files import FileLocation
 from src.entities.internal_reconcile_report import InternalReconcileReportCursor
 from src.use_cases.adapter_interfaces.storage import (
+    AsyncStorageInternalReconcileReportInterface,
     InternalReconcileGenerationStorageInterface,
-    StorageInternalReconcileReportInterface,
 )
 from src.use_cases.helpers.edge_cursor import EdgeCursor
 from src.use_cases.internal_reconcile_generation import InternalReconcileGeneration
@@ -100,28 +100,28 @@ def perform_orca_reconcile(
         return InternalServerErrorGraphqlType(ex)
 
 
-def get_phantom_page(
+async def get_phantom_page(
     job_id: int,
     page_parameters: PageParameters,
-    storage_irr: StorageInternalReconcileReportInterface,
+    storage_irr: AsyncStorageInternalReconcileReportInterface,
     logger: logging.Logger,
 ) -> GetPhantomPageStrawberryResponse:
     try:
-        return InternalReconcileReport(storage_irr) \
+        return await InternalReconcileReport(storage_irr) \
             .get_phantom_page(job_id, page_parameters, logger)
     except Exception as ex:
         logger.error(ex)
         return InternalServerErrorGraphqlType(ex)
 
 
-def get_mismatch_page(
+async def get_mismatch_page(
     job_id: int,
     page_parameters: PageParameters,
-    storage_irr: StorageInternalReconcileReportInterface,
+    storage_irr: AsyncStorageInternalReconcileReportInterface,
     logger: logging.Logger,
 ) -> GetMismatchPageStrawberryResponse:
     try:
-        return InternalReconcileReport(storage_irr) \
+        return await InternalReconcileReport(storage_irr) \
             .get_mismatch_page(job_id, page_parameters, logger)
     except Exception as ex:
         logger.error(ex)
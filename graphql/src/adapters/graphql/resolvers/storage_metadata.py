@@ -4,15 +4,15 @@ from src.adapters.graphql.dataTypes.common import InternalServerErrorGraphqlType
 from src.adapters.graphql.dataTypes.storage_metadata import (
     GetStorageSchemaVersionStrawberryResponse,
 )
-from src.use_cases.adapter_interfaces.storage import StorageMetadataInterface
+from src.use_cases.adapter_interfaces.storage import AsyncStorageMetadataInterface
 from src.use_cases.storage_metadata import StorageMetadata
 
 
-def get_storage_migration_version(
-    storage_metadata: StorageMetadataInterface,
+async def get_storage_migration_version(
+    storage_metadata: AsyncStorageMetadataInterface,
     logger: logging.Logger
 ) -> GetStorageSchemaVersionStrawberryResponse:
     try:
-        return StorageMetadata(storage_metadata).get_schema_version(logger)
+        return await StorageMetadata(storage_metadata).get_schema_version(logger)
     except Exception as ex:
         return InternalServerErrorGraphqlType(ex)
@@ -55,11 +55,11 @@ class Queries:
 
     @field(
         description="""Gets all phantom reports for the given filter.""")
-    def get_storage_schema_version(
+    async def get_storage_schema_version(
         self,
     ) -> GetStorageSchemaVersionStrawberryResponse:
-        return get_storage_migration_version(
-            Queries.adapters_storage.storage,
+        return await get_storage_migration_version(
+            Queries.adapters_storage.async_storage,
             Queries.adapters_storage.logger_provider.get_logger(
                 uuid.uuid4().__str__()
             )
@@ -68,7 +68,7 @@ class Queries:
     @field(
         description="""Gets a page of phantom reports for the given filter."""
     )
-    def get_phantom_page(
+    async def get_phantom_page(
         self,
         job_id: Annotated[
             int8,
@@ -83,10 +83,10 @@ class Queries:
             )
         ]
     ) -> GetPhantomPageStrawberryResponse:
-        return get_phantom_page(
+        return await get_phantom_page(
             job_id,
             page_parameters,
-            Queries.adapters_storage.storage_internal_reconciliation,
+            Queries.adapters_storage.async_storage,
             Queries.adapters_storage.logger_provider.get_logger(
                 uuid.uuid4().__str__()
             )
@@ -95,7 +95,7 @@ class Queries:
     @field(
         description="""Gets a page of mismatch reports for the given filter."""
     )
-    def get_mismatch_page(
+    async def get_mismatch_page(
         self,
         job_id: Annotated[
             int8,
@@ -110,10 +110,10 @@ class Queries:
             )
         ]
     ) -> GetMismatchPageStrawberryResponse:
-        return get_mismatch_page(
+        return await get_mismatch_page(
             job_id,
             page_parameters,
-            Queries.adapters_storage.storage_internal_reconciliation,
+            Queries.adapters_storage.async_storage,
             Queries.adapters_storage.logger_provider.get_logger(
                 uuid.uuid4().__str__()
             )
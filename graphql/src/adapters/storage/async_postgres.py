@@ -0,0 +1,35 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.adapters.storage.async_rdbms import AsyncStorageAdapterRDBMS
+from src.adapters.storage.internal_reconciliation_postgres import (
+    InternalReconciliationStorageAdapterPostgres,
+)
+from src.adapters.storage.postgres import StorageAdapterPostgres
+from src.entities.common import DirectionEnum
+
+
+class AsyncStorageAdapterPostgres(AsyncStorageAdapterRDBMS):
+    """
+    Runs the same Postgres SQL as the synchronous adapters, through an async engine.
+    """
+
+    def __init__(
+        self,
+        user_engine: AsyncEngine,
+    ):
+        super(AsyncStorageAdapterPostgres, self).__init__(
+            user_engine,
+        )
+
+    @staticmethod
+    def get_schema_version_sql() -> text:  # pragma: no cover
+        return StorageAdapterPostgres.get_schema_version_sql()
+
+    @staticmethod
+    def get_phantom_page_sql(direction: DirectionEnum) -> text:  # pragma: no cover
+        return InternalReconciliationStorageAdapterPostgres.get_phantom_page_sql(direction)
+
+    @staticmethod
+    def get_mismatch_page_sql(direction: DirectionEnum) -> text:  # pragma: no cover
+        return InternalReconciliationStorageAdapterPostgres.get_mismatch_page_sql(direction)
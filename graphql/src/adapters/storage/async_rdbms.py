@@ -0,0 +1,180 @@
+import logging
+from abc import abstractmethod
+from typing import List
+
+from orca_shared.database import shared_db
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.adapters.storage.internal_reconciliation_rdbms import (
+    InternalReconciliationStorageAdapterRDBMS,
+)
+from src.entities.common import DirectionEnum
+from src.entities.internal_reconcile_report import Mismatch, Phantom
+from src.use_cases.adapter_interfaces.storage import (
+    AsyncStorageInternalReconcileReportInterface,
+    AsyncStorageMetadataInterface,
+)
+
+
+class AsyncStorageAdapterRDBMS(
+    AsyncStorageMetadataInterface,
+    AsyncStorageInternalReconcileReportInterface,
+):
+    def __init__(
+        self,
+        user_engine: AsyncEngine,
+    ):
+        """
+        Args:
+            user_engine: Async engine for the application database as the application user,
+                from shared_db.get_async_engine, so that authentication errors clear
+                the cached secrets and checkouts are reported by the metrics route.
+                While a query waits on the database, the event loop serves other requests.
+        """
+        self.user_engine = user_engine
+
+    @shared_db.retry_operational_error_async()
+    async def get_schema_version(
+        self,
+        logger: logging.Logger,
+    ) -> int:
+        """
+        Queries the database version table and returns the latest version.
+
+        Args:
+            logger: The logger to use.
+
+        Returns:
+            Version number of the currently installed ORCA schema.
+        """
+        try:
+            async with self.user_engine.connect() as connection:
+                # If table exists get the latest version from the table
+                logger.info("Getting current schema version from table.")
+                results = await connection.execute(self.get_schema_version_sql())
+                row = results.fetchone()
+                schema_version = row[0]
+
+                return schema_version
+        except ProgrammingError as ex:
+            if ex.code == "f405":  # UndefinedTable
+                return 1
+            raise
+
+    @shared_db.retry_operational_error_async()
+    async def get_phantom_page(
+        self,
+        job_id: int,
+        cursor_collection_id: str,
+        cursor_granule_id: str,
+        cursor_key_path: str,
+        direction: DirectionEnum,
+        limit: int,
+        logger: logging.Logger
+    ) -> List[Phantom]:
+        """
+        Returns a page of phantoms,
+        ordered by collection_id, granule_id, then key_path.
+
+        Args:
+            job_id: The job to return reports for.
+            cursor_collection_id: Points to start/end of the page (non-inclusive).
+            cursor_granule_id: Points to start/end of the page (non-inclusive).
+            cursor_key_path: Points to start/end of the page (non-inclusive).
+            direction: If `next`, cursor is the start of the page. Otherwise, end.
+            limit: Limits the number of rows returned.
+            logger: The logger to use.
+
+        Returns:
+            A list of phantoms.
+        """
+        async with self.user_engine.connect() as connection:
+            logger.info(f"Retrieving phantoms for job '{job_id}'.")
+            results = await connection.execute(
+                self.get_phantom_page_sql(direction),
+                [{
+                    "job_id": job_id,
+                    "cursor_collection_id": cursor_collection_id,
+                    "cursor_granule_id": cursor_granule_id,
+                    "cursor_key_path": cursor_key_path,
+                    "limit": limit,
+                }],
+            )
+
+            phantoms = [
+                InternalReconciliationStorageAdapterRDBMS.phantom_from_row(result)
+                for result in results.mappings()
+            ]
+            if direction == DirectionEnum.previous:
+                # due to how previous pages are retrieved, order must be reversed to be consistent.
+                phantoms.reverse()
+            return phantoms
+
+    @shared_db.retry_operational_error_async()
+    async def get_mismatch_page(
+        self,
+        job_id: int,
+        cursor_collection_id: str,
+        cursor_granule_id: str,
+        cursor_key_path: str,
+        direction: DirectionEnum,
+        limit: int,
+        logger: logging.Logger
+    ) -> List[Mismatch]:
+        """
+        Returns a page of mismatches,
+        ordered by collection_id, granule_id, then key_path.
+
+        Args:
+            job_id: The job to return mismatches for.
+            cursor_collection_id: Points to start/end of the page (non-inclusive).
+            cursor_granule_id: Points to start/end of the page (non-inclusive).
+            cursor_key_path: Points to start/end of the page (non-inclusive).
+            direction: If `next`, cursor is the start of the page. Otherwise, end.
+            limit: Limits the number of rows returned.
+            logger: The logger to use.
+
+        Returns:
+            A list of mismatches.
+        """
+        async with self.user_engine.connect() as connection:
+            logger.info(f"Retrieving mismatches for job '{job_id}'.")
+            results = await connection.execute(
+                self.get_mismatch_page_sql(direction),
+                [{
+                    "job_id": job_id,
+                    "cursor_collection_id": cursor_collection_id,
+                    "cursor_granule_id": cursor_granule_id,
+                    "cursor_key_path": cursor_key_path,
+                    "limit": limit,
+                }],
+            )
+
+            mismatches = [
+                InternalReconciliationStorageAdapterRDBMS.mismatch_from_row(result)
+                for result in results.mappings()
+            ]
+            if direction == DirectionEnum.previous:
+                # due to how previous pages are retrieved, order must be reversed to be consistent.
+                mismatches.reverse()
+            return mismatches
+
+    @staticmethod
+    @abstractmethod
+    def get_schema_version_sql() -> text:  # pragma: no cover
+        # abstract to allow other sql formats
+        raise NotImplementedError()
+
+    @staticmethod
+    @abstractmethod
+    def get_phantom_page_sql(direction: DirectionEnum) -> text:  # pragma: no cover
+        # abstract to allow other sql formats
+        raise NotImplementedError()
+
+    @staticmethod
+    @abstractmethod
+    def get_mismatch_page_sql(direction: DirectionEnum) -> text:  # pragma: no cover
+        # abstract to allow other sql formats
+        raise NotImplementedError()
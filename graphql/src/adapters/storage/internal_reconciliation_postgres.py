@@ -1,4 +1,4 @@
-from sqlalchemy import text
+from sqlalchemy import Engine, text
 
 from src.adapters.storage.internal_reconciliation_rdbms import (
     InternalReconciliationStorageAdapterRDBMS,
@@ -10,12 +10,12 @@ class InternalReconciliationStorageAdapterPostgres(InternalReconciliationStorage
 
     def __init__(
         self,
-        user_connection_uri: str,
-        admin_connection_uri: str,
+        user_engine: Engine,
+        admin_engine: Engine,
     ):
         super(InternalReconciliationStorageAdapterPostgres, self).__init__(
-            user_connection_uri,
-            admin_connection_uri,
+            user_engine,
+            admin_engine,
         )
 
     @staticmethod
@@ -47,6 +47,8 @@ class InternalReconciliationStorageAdapterPostgres(InternalReconciliationStorage
     def create_temporary_table_sql(temporary_s3_column_list: str) -> text:  # pragma: no cover
         """
         Creates a temporary table to store inventory data.
+        The table is dropped when the transaction ends, so the pooled connection
+        can create it again for the next report.
         Args:
             temporary_s3_column_list: The list of columns that need to be created to store
             csv data.
@@ -56,7 +58,7 @@ class InternalReconciliationStorageAdapterPostgres(InternalReconciliationStorage
             f"""
                 CREATE TEMPORARY TABLE s3_import(
                     {temporary_s3_column_list}
-                )
+                ) ON COMMIT DROP
                 """
         )
 
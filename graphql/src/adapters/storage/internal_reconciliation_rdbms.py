@@ -1,12 +1,12 @@
 import logging
 from abc import abstractmethod
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, List, Mapping, Optional
 
 import orca_shared
 from orca_shared.database import shared_db
 from orca_shared.reconciliation import OrcaStatus, get_partition_name_from_bucket_name
-from sqlalchemy import create_engine, text
+from sqlalchemy import Engine, text
 
 from src.adapters.storage.internal_reconciliation_s3 import AWSS3FileLocation
 from src.entities.common import DirectionEnum
@@ -27,11 +27,17 @@ class InternalReconciliationStorageAdapterRDBMS(
 ):
     def __init__(
         self,
-        user_connection_uri: str,
-        admin_connection_uri: str,
+        user_engine: Engine,
+        admin_engine: Engine,
     ):
-        self.user_connection_uri = user_connection_uri
-        self.admin_connection_uri = admin_connection_uri
+        """
+        Args:
+            user_engine: Engine for the application database as the application user.
+            admin_engine: Engine for the application database as the admin user.
+            Engines are shared with other adapters, so connections are pooled across requests.
+        """
+        self.user_engine = user_engine
+        self.admin_engine = admin_engine
 
     @shared_db.retry_operational_error()
     def create_job(
@@ -51,7 +57,7 @@ class InternalReconciliationStorageAdapterRDBMS(
         Returns: A cursor with the auto-incremented job_id from the database.
         """
         logger.debug("Creating status for job.")
-        with create_engine(self.user_connection_uri, future=True).begin() as connection:
+        with self.user_engine.begin() as connection:
             # Within this transaction import the csv and update the job status
             now = datetime.now(timezone.utc)
             rows = connection.execute(
@@ -121,7 +127,7 @@ class InternalReconciliationStorageAdapterRDBMS(
         """
         logger.debug(f"Truncating old s3 data blocking report {report_source}.")
         partition_name = get_partition_name_from_bucket_name(report_source)
-        with create_engine(self.admin_connection_uri, future=True).begin() as connection:
+        with self.admin_engine.begin() as connection:
             connection.execute(
                 self.truncate_s3_partition_sql(partition_name),
                 [{}],
@@ -147,7 +153,7 @@ class InternalReconciliationStorageAdapterRDBMS(
             int(report_cursor.job_id),
             status,
             error_message,
-            create_engine(self.user_connection_uri, future=True)
+            self.user_engine
         )
 
     @shared_db.retry_operational_error()
@@ -174,7 +180,7 @@ class InternalReconciliationStorageAdapterRDBMS(
         temporary_s3_column_list = self.generate_temporary_s3_column_list(
             columns_in_csv
         )
-        with create_engine(self.admin_connection_uri, future=True).begin() as connection:
+        with self.admin_engine.begin() as connection:
             connection.execute(
                 self.create_temporary_table_sql(temporary_s3_column_list),
                 [{}],
@@ -255,7 +261,7 @@ class InternalReconciliationStorageAdapterRDBMS(
             logger: The logger to use.
         """
         logger.debug(f"Generating reports for job id {report_cursor.job_id}.")
-        with create_engine(self.user_connection_uri, future=True).begin() as connection:
+        with self.user_engine.begin() as connection:
             logger.debug(f"Generating phantom reports for job id {report_cursor.job_id}.")
             connection.execute(
                 # populate reconcile_phantom_report with files in orca.files
@@ -305,7 +311,7 @@ class InternalReconciliationStorageAdapterRDBMS(
         Returns:
             A list of phantoms.
         """
-        with create_engine(self.user_connection_uri, future=True).begin() as connection:
+        with self.user_engine.begin() as connection:
             logger.info(f"Retrieving phantoms for job '{job_id}'.")
             results = connection.execute(
                 self.get_phantom_page_sql(direction),
@@ -318,21 +324,7 @@ class InternalReconciliationStorageAdapterRDBMS(
                 }]
             )
 
-            phantoms = []
-            for result in results.mappings():
-                phantoms.append(
-                    Phantom(
-                        job_id=result["job_id"],
-                        collection_id=result["collection_id"],
-                        granule_id=result["granule_id"],
-                        filename=result["filename"],
-                        key_path=result["key_path"],
-                        orca_etag=result["orca_etag"],
-                        orca_granule_last_update=result["orca_last_update"],
-                        orca_size_in_bytes=result["orca_size_in_bytes"],
-                        orca_storage_class=result["orca_storage_class"],
-                    )
-                )
+            phantoms = [self.phantom_from_row(result) for result in results.mappings()]
             if direction == DirectionEnum.previous:
                 # due to how previous pages are retrieved, order must be reversed to be consistent.
                 phantoms.reverse()
@@ -365,7 +357,7 @@ class InternalReconciliationStorageAdapterRDBMS(
         Returns:
             A list of mismatches.
         """
-        with create_engine(self.user_connection_uri, future=True).begin() as connection:
+        with self.user_engine.begin() as connection:
             logger.info(f"Retrieving mismatches for job '{job_id}'.")
             results = connection.execute(
                 self.get_mismatch_page_sql(direction),
@@ -378,33 +370,65 @@ class InternalReconciliationStorageAdapterRDBMS(
                 }]
             )
 
-            mismatches = []
-            for result in results.mappings():
-                mismatches.append(
-                    Mismatch(
-                        job_id=result["job_id"],
-                        collection_id=result["collection_id"],
-                        granule_id=result["granule_id"],
-                        filename=result["filename"],
-                        key_path=result["key_path"],
-                        cumulus_archive_location=result["cumulus_archive_location"],
-                        orca_etag=result["orca_etag"],
-                        s3_etag=result["s3_etag"],
-                        orca_granule_last_update=result["orca_last_update"],
-                        s3_file_last_update=result["s3_last_update"],
-                        orca_size_in_bytes=result["orca_size_in_bytes"],
-                        s3_size_in_bytes=result["s3_size_in_bytes"],
-                        orca_storage_class=result["orca_storage_class"],
-                        s3_storage_class=result["s3_storage_class"],
-                        discrepancy_type=result["discrepancy_type"],
-                        comment=result["comment"]
-                    )
-                )
+            mismatches = [self.mismatch_from_row(result) for result in results.mappings()]
             if direction == DirectionEnum.previous:
                 # due to how previous pages are retrieved, order must be reversed to be consistent.
                 mismatches.reverse()
             return mismatches
 
+    @staticmethod
+    def phantom_from_row(result: Mapping[str, Any]) -> Phantom:
+        """
+        Builds a phantom from a row of get_phantom_page_sql.
+
+        Args:
+            result: The row, by column name.
+
+        Returns:
+            The phantom.
+        """
+        return Phantom(
+            job_id=result["job_id"],
+            collection_id=result["collection_id"],
+            granule_id=result["granule_id"],
+            filename=result["filename"],
+            key_path=result["key_path"],
+            orca_etag=result["orca_etag"],
+            orca_granule_last_update=result["orca_last_update"],
+            orca_size_in_bytes=result["orca_size_in_bytes"],
+            orca_storage_class=result["orca_storage_class"],
+        )
+
+    @staticmethod
+    def mismatch_from_row(result: Mapping[str, Any]) -> Mismatch:
+        """
+        Builds a mismatch from a row of get_mismatch_page_sql.
+
+        Args:
+            result: The row, by column name.
+
+        Returns:
+            The mismatch.
+        """
+        return Mismatch(
+            job_id=result["job_id"],
+            collection_id=result["collection_id"],
+            granule_id=result["granule_id"],
+            filename=result["filename"],
+            key_path=result["key_path"],
+            cumulus_archive_location=result["cumulus_archive_location"],
+            orca_etag=result["orca_etag"],
+            s3_etag=result["s3_etag"],
+            orca_granule_last_update=result["orca_last_update"],
+            s3_file_last_update=result["s3_last_update"],
+            orca_size_in_bytes=result["orca_size_in_bytes"],
+            s3_size_in_bytes=result["s3_size_in_bytes"],
+            orca_storage_class=result["orca_storage_class"],
+            s3_storage_class=result["s3_storage_class"],
+            discrepancy_type=result["discrepancy_type"],
+            comment=result["comment"]
+        )
+
     @staticmethod
     @abstractmethod
     def create_job_sql() -> text:  # pragma: no cover
@@ -1,4 +1,4 @@
-from sqlalchemy import URL, text
+from sqlalchemy import Engine, text
 
 from src.adapters.storage.rdbms import StorageAdapterRDBMS
 
@@ -7,10 +7,10 @@ class StorageAdapterPostgres(StorageAdapterRDBMS):
 
     def __init__(
         self,
-        user_connection_uri: URL,
+        user_engine: Engine,
     ):
         super(StorageAdapterPostgres, self).__init__(
-            user_connection_uri,
+            user_engine,
             )
 
     @staticmethod
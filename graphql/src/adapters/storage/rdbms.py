@@ -2,7 +2,7 @@ import logging
 from abc import abstractmethod
 
 from orca_shared.database import shared_db
-from sqlalchemy import URL, create_engine, text
+from sqlalchemy import Engine, text
 from sqlalchemy.exc import ProgrammingError
 
 from src.use_cases.adapter_interfaces.storage import StorageMetadataInterface
@@ -13,9 +13,14 @@ class StorageAdapterRDBMS(
 ):
     def __init__(
         self,
-        user_connection_uri: URL,
+        user_engine: Engine,
     ):
-        self.user_connection_uri = user_connection_uri
+        """
+        Args:
+            user_engine: Engine for the application database as the application user.
+                Shared with other adapters, so its connections are pooled across requests.
+        """
+        self.user_engine = user_engine
 
     @shared_db.retry_operational_error()
     def get_schema_version(
@@ -33,7 +38,7 @@ class StorageAdapterRDBMS(
             Version number of the currently installed ORCA schema.
         """
         try:
-            with create_engine(self.user_connection_uri, future=True).begin() as connection:
+            with self.user_engine.begin() as connection:
                 # If table exists get the latest version from the table
                 logger.info("Getting current schema version from table.")
                 results = connection.execute(self.get_schema_version_sql())
@@ -1,12 +1,15 @@
 import json
 
+from orca_shared.database import shared_db
 from orca_shared.database.entities import PostgresConnectionInfo
 from orca_shared.database.use_cases import create_postgres_connection_uri
 from orca_shared.database.use_cases.validation import validate_config
+from sqlalchemy import make_url
 
 from src.adapters.api.fastapi import create_fastapi_app
 from src.adapters.graphql.adapters import AdaptersStorage
 from src.adapters.logger_provider.json import JsonLoggerProvider
+from src.adapters.storage.async_postgres import AsyncStorageAdapterPostgres
 from src.adapters.storage.internal_reconciliation_postgres import (
     InternalReconciliationStorageAdapterPostgres,
 )
@@ -14,9 +17,19 @@ from src.adapters.storage.postgres import StorageAdapterPostgres
 from src.adapters.webserver.uvicorn_settings import UvicornSettings
 from src.adapters.word_generation.word_generation import UUIDWordGeneration
 
+# Mutations are resolved on a thread pool, and queries on the event loop,
+# so each user engine keeps a few connections.
+# The admin engine is only used while generating internal reconciliation reports.
+USER_DB_POOL_SIZE = 5
+USER_DB_MAX_OVERFLOW = 10
+# Driver used by the async engine that serves report queries.
+ASYNC_USER_DB_DRIVER = "postgresql+asyncpg"
+
+
 def get_application(uvicorn_settings: UvicornSettings):
     """
     Sets up an application for use with uvicorn.
+    Database engines are created once here and shared by all storage adapters.
 
     Args:
         uvicorn_settings: Contains settings required by application components.
@@ -50,14 +63,35 @@ def get_application(uvicorn_settings: UvicornSettings):
         db_connect_info, logger, db_connect_info.user_database_name,
     )
 
+    user_engine = shared_db.get_engine(
+        user_connection_uri,
+        pool_size=USER_DB_POOL_SIZE,
+        max_overflow=USER_DB_MAX_OVERFLOW,
+    )
+    admin_engine = shared_db.get_engine(admin_connection_uri)
+    async_user_engine = shared_db.get_async_engine(
+        make_url(user_connection_uri).set(drivername=ASYNC_USER_DB_DRIVER),
+        pool_size=USER_DB_POOL_SIZE,
+        max_overflow=USER_DB_MAX_OVERFLOW,
+    )
+
     adapters_storage = AdaptersStorage(
         UUIDWordGeneration(),
-        StorageAdapterPostgres(user_connection_uri),
+        StorageAdapterPostgres(user_engine),
         InternalReconciliationStorageAdapterPostgres(
-            user_connection_uri,
-            admin_connection_uri,
+            user_engine,
+            admin_engine,
         ),
+        AsyncStorageAdapterPostgres(async_user_engine),
         initialized_logger_provider
     )
 
-    return create_fastapi_app(uvicorn_settings, adapters_storage)
+    return create_fastapi_app(
+        uvicorn_settings,
+        adapters_storage,
+        {
+            "user": user_engine,
+            "user_async": async_user_engine.sync_engine,
+            "admin": admin_engine,
+        },
+    )
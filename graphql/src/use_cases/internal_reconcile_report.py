@@ -4,7 +4,7 @@ import logging
 from src.entities.common import Page, PageParameters
 from src.entities.internal_reconcile_report import Mismatch, Phantom
 from src.use_cases.adapter_interfaces.storage import (
-    StorageInternalReconcileReportInterface,
+    AsyncStorageInternalReconcileReportInterface,
 )
 from src.use_cases.helpers.edge_cursor import EdgeCursor
 
@@ -12,11 +12,11 @@ from src.use_cases.helpers.edge_cursor import EdgeCursor
 class InternalReconcileReport:
     def __init__(
         self,
-        storage: StorageInternalReconcileReportInterface
+        storage: AsyncStorageInternalReconcileReportInterface
     ):
         self.storage = storage
 
-    def get_phantom_page(
+    async def get_phantom_page(
         self,
         job_id: int,
         page_parameters: PageParameters,
@@ -39,7 +39,7 @@ class InternalReconcileReport:
         else:
             cursor = EdgeCursor.decode_cursor(page_parameters.cursor, Phantom.Cursor)
 
-        phantoms = self.storage.get_phantom_page(
+        phantoms = await self.storage.get_phantom_page(
             job_id,
             cursor.collection_id,
             cursor.granule_id,
@@ -62,7 +62,7 @@ class InternalReconcileReport:
                     start_cursor=start_cursor,
                     end_cursor=end_cursor)
 
-    def get_mismatch_page(
+    async def get_mismatch_page(
         self,
         job_id: int,
         page_parameters: PageParameters,
@@ -85,7 +85,7 @@ class InternalReconcileReport:
         else:
             cursor = EdgeCursor.decode_cursor(page_parameters.cursor, Mismatch.Cursor)
 
-        mismatches = self.storage.get_mismatch_page(
+        mismatches = await self.storage.get_mismatch_page(
             job_id,
             cursor.collection_id,
             cursor.granule_id,
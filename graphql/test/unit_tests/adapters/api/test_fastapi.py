@@ -3,7 +3,7 @@ from unittest.mock import MagicMock, Mock, patch
 
 from starlette.middleware.cors import CORSMiddleware
 
-from src.adapters.api.fastapi import create_fastapi_app
+from src.adapters.api.fastapi import create_fastapi_app, get_pool_metrics
 
 
 class TestFastapi(unittest.TestCase):
@@ -19,8 +19,9 @@ class TestFastapi(unittest.TestCase):
     ):
         mock_uvicorn_settings = Mock()
         mock_adapters_storage = Mock()
+        mock_engines = {"user": Mock()}
 
-        create_fastapi_app(mock_uvicorn_settings, mock_adapters_storage)
+        create_fastapi_app(mock_uvicorn_settings, mock_adapters_storage, mock_engines)
 
         mock_fast_api.assert_called_once_with()
         mock_app: MagicMock = mock_fast_api.return_value
@@ -38,3 +39,40 @@ class TestFastapi(unittest.TestCase):
             router=mock_get_graphql_app.return_value,
             prefix="/graphql"
         )
+        mock_app.get.assert_any_call("/healthz")
+        mock_app.get.assert_any_call("/metrics")
+
+    @patch("src.adapters.api.fastapi.shared_db.get_pool_checkout_stats")
+    def test_get_pool_metrics_happy_path(
+        self,
+        mock_get_pool_checkout_stats: MagicMock,
+    ):
+        """
+        Reports the pool state along with its checkout stats.
+        """
+        mock_engine = Mock()
+        mock_engine.pool.size.return_value = 5
+        mock_engine.pool.checkedin.return_value = 3
+        mock_engine.pool.checkedout.return_value = 2
+        mock_engine.pool.overflow.return_value = -3
+        mock_get_pool_checkout_stats.return_value = {
+            "checkouts": 7,
+            "total_secs": 0.5,
+            "max_secs": 0.25,
+        }
+
+        result = get_pool_metrics(mock_engine)
+
+        mock_get_pool_checkout_stats.assert_called_once_with(mock_engine)
+        self.assertEqual(
+            {
+                "size": 5,
+                "checked_in": 3,
+                "checked_out": 2,
+                "overflow": -3,
+                "checkouts": 7,
+                "total_secs": 0.5,
+                "max_secs": 0.25,
+            },
+            result,
+        )
@@ -1,5 +1,6 @@
+import asyncio
 import unittest
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 from src.adapters.graphql.resolvers import internal_reconcile_report
 from src.entities.internal_reconcile_report import InternalReconcileReportCursor
@@ -282,13 +283,15 @@ class TestInternalReconcileReport(unittest.TestCase):
         mock_page_parameters = Mock()
         mock_storage_irr = Mock()
         mock_logger = Mock()
+        mock_use_case.return_value.get_phantom_page = AsyncMock()
 
-        result = \
+        result = asyncio.run(
             internal_reconcile_report.get_phantom_page(mock_job_id, mock_page_parameters,
                                                        mock_storage_irr, mock_logger)
+        )
 
         mock_use_case.assert_called_once_with(mock_storage_irr)
-        mock_use_case.return_value.get_phantom_page.assert_called_once_with(
+        mock_use_case.return_value.get_phantom_page.assert_awaited_once_with(
             mock_job_id, mock_page_parameters, mock_logger)
         self.assertEqual(mock_use_case.return_value.get_phantom_page.return_value, result)
 
@@ -311,9 +314,10 @@ class TestInternalReconcileReport(unittest.TestCase):
 
         mock_use_case.side_effect = mock_exception
 
-        result = \
+        result = asyncio.run(
             internal_reconcile_report.get_phantom_page(mock_job_id, mock_page_parameters,
                                                        mock_storage_irr, mock_logger)
+        )
 
         mock_use_case.assert_called_once_with(mock_storage_irr)
         mock_use_case.return_value.get_phantom_page.assert_not_called()
@@ -332,13 +336,15 @@ class TestInternalReconcileReport(unittest.TestCase):
         mock_page_parameters = Mock()
         mock_storage_irr = Mock()
         mock_logger = Mock()
+        mock_use_case.return_value.get_mismatch_page = AsyncMock()
 
-        result = \
+        result = asyncio.run(
             internal_reconcile_report.get_mismatch_page(mock_job_id, mock_page_parameters,
                                                         mock_storage_irr, mock_logger)
+        )
 
         mock_use_case.assert_called_once_with(mock_storage_irr)
-        mock_use_case.return_value.get_mismatch_page.assert_called_once_with(
+        mock_use_case.return_value.get_mismatch_page.assert_awaited_once_with(
             mock_job_id, mock_page_parameters, mock_logger)
         self.assertEqual(mock_use_case.return_value.get_mismatch_page.return_value, result)
 
@@ -361,9 +367,10 @@ class TestInternalReconcileReport(unittest.TestCase):
 
         mock_use_case.side_effect = mock_exception
 
-        result = \
+        result = asyncio.run(
             internal_reconcile_report.get_mismatch_page(mock_job_id, mock_page_parameters,
                                                         mock_storage_irr, mock_logger)
+        )
 
         mock_use_case.assert_called_once_with(mock_storage_irr)
         mock_use_case.return_value.get_mismatch_page.assert_not_called()
@@ -1,12 +1,13 @@
+import asyncio
 import unittest
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 from src.adapters.graphql.schemas.queries import Queries
 
 
 class TestQueries(unittest.TestCase):
 
-    @patch("src.adapters.graphql.schemas.queries.get_phantom_page")
+    @patch("src.adapters.graphql.schemas.queries.get_phantom_page", new_callable=AsyncMock)
     def test_get_phantom_page_happy_path(
         self,
         mock_get_phantom_page: MagicMock,
@@ -23,16 +24,16 @@ class TestQueries(unittest.TestCase):
         Queries.adapters_storage = mock_adapters_storage
         queries = Queries(adapters_storage=mock_adapters_storage)
 
-        result = queries.get_phantom_page(mock_job_id, mock_page_parameters)
+        result = asyncio.run(queries.get_phantom_page(mock_job_id, mock_page_parameters))
 
-        mock_get_phantom_page.assert_called_once_with(
+        mock_get_phantom_page.assert_awaited_once_with(
             mock_job_id, mock_page_parameters,
-            mock_adapters_storage.storage_internal_reconciliation,
+            mock_adapters_storage.async_storage,
             mock_adapters_storage.logger_provider.get_logger.return_value
         )
         self.assertEqual(mock_get_phantom_page.return_value, result)
 
-    @patch("src.adapters.graphql.schemas.queries.get_mismatch_page")
+    @patch("src.adapters.graphql.schemas.queries.get_mismatch_page", new_callable=AsyncMock)
     def test_get_mismatch_page_happy_path(
         self,
         mock_get_mismatch_page: MagicMock,
@@ -49,11 +50,36 @@ class TestQueries(unittest.TestCase):
         Queries.adapters_storage = mock_adapters_storage
         queries = Queries(adapters_storage=mock_adapters_storage)
 
-        result = queries.get_mismatch_page(mock_job_id, mock_page_parameters)
+        result = asyncio.run(queries.get_mismatch_page(mock_job_id, mock_page_parameters))
 
-        mock_get_mismatch_page.assert_called_once_with(
+        mock_get_mismatch_page.assert_awaited_once_with(
             mock_job_id, mock_page_parameters,
-            mock_adapters_storage.storage_internal_reconciliation,
+            mock_adapters_storage.async_storage,
             mock_adapters_storage.logger_provider.get_logger.return_value
         )
         self.assertEqual(mock_get_mismatch_page.return_value, result)
+
+    @patch(
+        "src.adapters.graphql.schemas.queries.get_storage_migration_version",
+        new_callable=AsyncMock,
+    )
+    def test_get_storage_schema_version_happy_path(
+        self,
+        mock_get_storage_migration_version: MagicMock,
+    ):
+        """
+        The async storage adapter should be used.
+        """
+        mock_adapters_storage = MagicMock()
+
+        # graphql limitations make construction interesting.
+        Queries.adapters_storage = mock_adapters_storage
+        queries = Queries(adapters_storage=mock_adapters_storage)
+
+        result = asyncio.run(queries.get_storage_schema_version())
+
+        mock_get_storage_migration_version.assert_awaited_once_with(
+            mock_adapters_storage.async_storage,
+            mock_adapters_storage.logger_provider.get_logger.return_value
+        )
+        self.assertEqual(mock_get_storage_migration_version.return_value, result)
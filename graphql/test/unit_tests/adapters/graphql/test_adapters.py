@@ -2,6 +2,7 @@ import unittest
 from unittest.mock import Mock
 
 from src.adapters.graphql.adapters import AdaptersStorage
+from src.adapters.storage.async_rdbms import AsyncStorageAdapterRDBMS
 from src.adapters.storage.internal_reconciliation_rdbms import (
     InternalReconciliationStorageAdapterRDBMS,
 )
@@ -21,12 +22,14 @@ class TestAdapters(unittest.TestCase):
         mock_word_generation = Mock(spec=WordGenerationInterface)
         mock_storage = Mock(spec=StorageAdapterRDBMS)
         mock_storage_internal_reconciliation = Mock(spec=InternalReconciliationStorageAdapterRDBMS)
+        mock_async_storage = Mock(spec=AsyncStorageAdapterRDBMS)
         mock_logger_provider = Mock(spec=LoggerProviderInterface)
 
         result = AdaptersStorage(
             mock_word_generation,
             mock_storage,
             mock_storage_internal_reconciliation,
+            mock_async_storage,
             mock_logger_provider
         )
 
@@ -35,4 +38,5 @@ class TestAdapters(unittest.TestCase):
         self.assertEqual(
             mock_storage_internal_reconciliation, result.storage_internal_reconciliation
         )
+        self.assertEqual(mock_async_storage, result.async_storage)
         self.assertEqual(mock_logger_provider, result.logger_provider)
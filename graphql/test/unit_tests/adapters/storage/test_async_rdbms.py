@@ -0,0 +1,248 @@
+import asyncio
+import random
+import unittest
+import uuid
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+from sqlalchemy.exc import ProgrammingError
+
+from src.adapters.storage.async_rdbms import AsyncStorageAdapterRDBMS
+from src.entities.common import DirectionEnum
+from src.entities.internal_reconcile_report import Mismatch, Phantom
+
+
+class TestAsyncStorageAdapterRDBMS(unittest.TestCase):
+    @staticmethod
+    def get_mock_user_engine(mock_connection: Mock) -> Mock:
+        mock_connect = Mock()
+        mock_connect.__aenter__ = AsyncMock(return_value=mock_connection)
+        mock_connect.__aexit__ = AsyncMock(return_value=False)
+        mock_user_engine = Mock()
+        mock_user_engine.connect = Mock(return_value=mock_connect)
+        return mock_user_engine
+
+    @patch("src.adapters.storage.async_rdbms."
+           "AsyncStorageAdapterRDBMS.get_schema_version_sql")
+    def test_get_schema_version_happy_path(
+        self,
+        mock_get_schema_version_sql: MagicMock,
+    ):
+        """
+        The latest version should be read from the table.
+        """
+        mock_version = random.randint(0, 100)  # nosec
+        mock_execute_result = Mock()
+        mock_execute_result.fetchone = Mock(return_value=(mock_version,))
+        mock_connection = Mock()
+        mock_connection.execute = AsyncMock(return_value=mock_execute_result)
+        mock_user_engine = self.get_mock_user_engine(mock_connection)
+
+        adapter = AsyncStorageAdapterRDBMS(mock_user_engine)
+
+        result = asyncio.run(adapter.get_schema_version(Mock()))
+
+        self.assertEqual(mock_version, result)
+        mock_connection.execute.assert_awaited_once_with(
+            mock_get_schema_version_sql.return_value
+        )
+        mock_user_engine.connect.return_value.__aexit__.assert_awaited_once_with(
+            None, None, None
+        )
+
+    @patch("src.adapters.storage.async_rdbms."
+           "AsyncStorageAdapterRDBMS.get_schema_version_sql")
+    def test_get_schema_version_missing_table_returns_1(
+        self,
+        mock_get_schema_version_sql: MagicMock,
+    ):
+        """
+        Before the version table is created, the schema is version 1.
+        """
+        mock_connection = Mock()
+        mock_connection.execute = AsyncMock(
+            side_effect=ProgrammingError("select", {}, Exception())
+        )
+        mock_user_engine = self.get_mock_user_engine(mock_connection)
+
+        adapter = AsyncStorageAdapterRDBMS(mock_user_engine)
+
+        result = asyncio.run(adapter.get_schema_version(Mock()))
+
+        self.assertEqual(1, result)
+        mock_connection.execute.assert_awaited_once_with(
+            mock_get_schema_version_sql.return_value
+        )
+
+    @patch("src.adapters.storage.async_rdbms."
+           "AsyncStorageAdapterRDBMS.get_phantom_page_sql")
+    def test_get_phantom_page_next_page(
+        self,
+        mock_get_phantom_page_sql: MagicMock,
+    ):
+        """
+        Happy path for getting the next or previous page of results.
+        """
+        for direction in [DirectionEnum.next, DirectionEnum.previous]:
+            with self.subTest(direction=direction):
+                mock_job_id = Mock()
+                mock_cursor_collection_id = Mock()
+                mock_cursor_granule_id = Mock()
+                mock_cursor_key_path = Mock()
+                mock_limit = Mock()
+                mock_logger = Mock()
+
+                phantoms = []
+                rows = []
+                for i in range(0, 3):
+                    phantom = Phantom(
+                        job_id=random.randint(0, 10000),  # nosec
+                        collection_id=uuid.uuid4().__str__(),
+                        granule_id=uuid.uuid4().__str__(),
+                        filename=uuid.uuid4().__str__(),
+                        key_path=uuid.uuid4().__str__(),
+                        orca_etag=uuid.uuid4().__str__(),
+                        orca_granule_last_update=random.randint(0, 10000),  # nosec
+                        orca_size_in_bytes=random.randint(0, 10000),  # nosec
+                        orca_storage_class=uuid.uuid4().__str__(),
+                    )
+                    phantoms.append(phantom)
+                    rows.append(
+                        {
+                            "job_id": phantom.job_id,
+                            "collection_id": phantom.collection_id,
+                            "granule_id": phantom.granule_id,
+                            "filename": phantom.filename,
+                            "key_path": phantom.key_path,
+                            "orca_etag": phantom.orca_etag,
+                            "orca_last_update": phantom.orca_granule_last_update,
+                            "orca_size_in_bytes": phantom.orca_size_in_bytes,
+                            "orca_storage_class": phantom.orca_storage_class,
+                        }
+                    )
+                if direction == DirectionEnum.previous:
+                    rows.reverse()
+                mock_execute_result = Mock()
+                mock_execute_result.mappings = Mock(return_value=rows)
+                mock_connection = Mock()
+                mock_connection.execute = AsyncMock(return_value=mock_execute_result)
+                mock_user_engine = self.get_mock_user_engine(mock_connection)
+
+                adapter = AsyncStorageAdapterRDBMS(mock_user_engine)
+
+                result = asyncio.run(adapter.get_phantom_page(
+                    mock_job_id, mock_cursor_collection_id, mock_cursor_granule_id,
+                    mock_cursor_key_path,
+                    direction, mock_limit, mock_logger
+                ))
+                self.assertEqual(phantoms, result)
+
+                mock_connection.execute.assert_awaited_once_with(
+                    mock_get_phantom_page_sql.return_value,
+                    [{
+                        "job_id": mock_job_id,
+                        "cursor_collection_id": mock_cursor_collection_id,
+                        "cursor_granule_id": mock_cursor_granule_id,
+                        "cursor_key_path": mock_cursor_key_path,
+                        "limit": mock_limit,
+                    }],
+                )
+                mock_execute_result.mappings.assert_called_once_with()
+                mock_user_engine.connect.return_value.__aexit__.assert_awaited_once_with(
+                    None, None, None
+                )
+                mock_get_phantom_page_sql.assert_called_once_with(direction)
+            mock_get_phantom_page_sql.reset_mock()
+
+    @patch("src.adapters.storage.async_rdbms."
+           "AsyncStorageAdapterRDBMS.get_mismatch_page_sql")
+    def test_get_mismatch_page_next_page(
+        self,
+        mock_get_mismatch_page_sql: MagicMock,
+    ):
+        """
+        Happy path for getting the next or previous page of results.
+        """
+        for direction in [DirectionEnum.next, DirectionEnum.previous]:
+            with self.subTest(direction=direction):
+                mock_job_id = Mock()
+                mock_cursor_collection_id = Mock()
+                mock_cursor_granule_id = Mock()
+                mock_cursor_key_path = Mock()
+                mock_limit = Mock()
+                mock_logger = Mock()
+
+                mismatches = []
+                rows = []
+                for i in range(0, 3):
+                    mismatch = Mismatch(
+                        job_id=random.randint(0, 10000),  # nosec
+                        collection_id=uuid.uuid4().__str__(),
+                        granule_id=uuid.uuid4().__str__(),
+                        filename=uuid.uuid4().__str__(),
+                        key_path=uuid.uuid4().__str__(),
+                        cumulus_archive_location=uuid.uuid4().__str__(),
+                        orca_etag=uuid.uuid4().__str__(),
+                        s3_etag=uuid.uuid4().__str__(),
+                        orca_granule_last_update=random.randint(0, 10000),  # nosec
+                        s3_file_last_update=random.randint(0, 10000),  # nosec
+                        orca_size_in_bytes=random.randint(0, 10000),  # nosec
+                        s3_size_in_bytes=random.randint(0, 10000),  # nosec
+                        orca_storage_class=uuid.uuid4().__str__(),
+                        s3_storage_class=uuid.uuid4().__str__(),
+                        discrepancy_type=uuid.uuid4().__str__(),
+                        comment=uuid.uuid4().__str__(),
+                    )
+                    mismatches.append(mismatch)
+                    rows.append(
+                        {
+                            "job_id": mismatch.job_id,
+                            "collection_id": mismatch.collection_id,
+                            "granule_id": mismatch.granule_id,
+                            "filename": mismatch.filename,
+                            "key_path": mismatch.key_path,
+                            "cumulus_archive_location": mismatch.cumulus_archive_location,
+                            "orca_etag": mismatch.orca_etag,
+                            "s3_etag": mismatch.s3_etag,
+                            "orca_last_update": mismatch.orca_granule_last_update,
+                            "s3_last_update": mismatch.s3_file_last_update,
+                            "orca_size_in_bytes": mismatch.orca_size_in_bytes,
+                            "s3_size_in_bytes": mismatch.s3_size_in_bytes,
+                            "orca_storage_class": mismatch.orca_storage_class,
+                            "s3_storage_class": mismatch.s3_storage_class,
+                            "discrepancy_type": mismatch.discrepancy_type,
+                            "comment": mismatch.comment,
+                        }
+                    )
+                if direction == DirectionEnum.previous:
+                    rows.reverse()
+                mock_execute_result = Mock()
+                mock_execute_result.mappings = Mock(return_value=rows)
+                mock_connection = Mock()
+                mock_connection.execute = AsyncMock(return_value=mock_execute_result)
+                mock_user_engine = self.get_mock_user_engine(mock_connection)
+
+                adapter = AsyncStorageAdapterRDBMS(mock_user_engine)
+
+                result = asyncio.run(adapter.get_mismatch_page(
+                    mock_job_id, mock_cursor_collection_id, mock_cursor_granule_id,
+                    mock_cursor_key_path,
+                    direction, mock_limit, mock_logger
+                ))
+                self.assertEqual(mismatches, result)
+
+                mock_connection.execute.assert_awaited_once_with(
+                    mock_get_mismatch_page_sql.return_value,
+                    [{
+                        "job_id": mock_job_id,
+                        "cursor_collection_id": mock_cursor_collection_id,
+                        "cursor_granule_id": mock_cursor_granule_id,
+                        "cursor_key_path": mock_cursor_key_path,
+                        "limit": mock_limit,
+                    }],
+                )
+                mock_execute_result.mappings.assert_called_once_with()
+                mock_user_engine.connect.return_value.__aexit__.assert_awaited_once_with(
+                    None, None, None
+                )
+                mock_get_mismatch_page_sql.assert_called_once_with(direction)
+            mock_get_mismatch_page_sql.reset_mock()
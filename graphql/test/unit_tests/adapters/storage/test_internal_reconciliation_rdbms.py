@@ -5,6 +5,9 @@ from unittest.mock import MagicMock, Mock, call, patch
 
 from orca_shared.reconciliation import OrcaStatus
 
+from src.adapters.storage.internal_reconciliation_postgres import (
+    InternalReconciliationStorageAdapterPostgres,
+)
 from src.adapters.storage.internal_reconciliation_rdbms import (
     InternalReconciliationStorageAdapterRDBMS,
 )
@@ -20,10 +23,8 @@ from src.entities.internal_reconcile_report import (
 class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
     @patch("src.adapters.storage.internal_reconciliation_rdbms."
            "InternalReconciliationStorageAdapterRDBMS.create_job_sql")
-    @patch("src.adapters.storage.internal_reconciliation_rdbms.create_engine")
     def test_create_job_happy_path(
         self,
-        mock_create_engine: MagicMock,
         mock_create_job_sql: MagicMock,
     ):
         """
@@ -31,8 +32,8 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
         """
         mock_logger = Mock()
 
-        mock_user_connection_uri = Mock()
-        mock_admin_connection_uri = Mock()
+        mock_user_engine = Mock()
+        mock_admin_engine = Mock()
 
         mock_orca_archive_location = Mock()
         mock_inventory_creation_time = Mock()
@@ -47,13 +48,11 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
         mock_enter = Mock()
         mock_enter.__enter__ = Mock(return_value=mock_connection)
         mock_enter.__exit__ = mock_exit
-        mock_engine = Mock()
-        mock_engine.begin = Mock(return_value=mock_enter)
-        mock_create_engine.return_value = mock_engine
+        mock_user_engine.begin = Mock(return_value=mock_enter)
 
         adapter = InternalReconciliationStorageAdapterRDBMS(
-            mock_user_connection_uri,
-            mock_admin_connection_uri,
+            mock_user_engine,
+            mock_admin_engine,
         )
 
         result = adapter.create_job(
@@ -61,9 +60,6 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
         )
         self.assertEqual(mock_job_id, result.job_id)
 
-        mock_create_engine.assert_called_once_with(
-            mock_user_connection_uri, future=True)
-
         mock_enter.__enter__.assert_called_once_with()
         mock_execute.assert_called_once_with(
             mock_create_job_sql.return_value,
@@ -95,12 +91,12 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
         """
         Performs calls in sequence.
         """
-        mock_user_connection_uri = Mock()
-        mock_admin_connection_uri = Mock()
+        mock_user_engine = Mock()
+        mock_admin_engine = Mock()
 
         adapter = InternalReconciliationStorageAdapterRDBMS(
-            mock_user_connection_uri,
-            mock_admin_connection_uri,
+            mock_user_engine,
+            mock_admin_engine,
         )
 
         mock_report_source = Mock()
@@ -132,10 +128,8 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
            "InternalReconciliationStorageAdapterRDBMS.truncate_s3_partition_sql")
     @patch("src.adapters.storage.internal_reconciliation_rdbms."
            "get_partition_name_from_bucket_name")
-    @patch("src.adapters.storage.internal_reconciliation_rdbms.create_engine")
     def test_truncate_s3_partition_happy_path(
         self,
-        mock_create_engine: MagicMock,
         mock_get_partition_name_from_bucket_name: MagicMock,
         mock_truncate_s3_partition_sql: MagicMock,
     ):
@@ -144,8 +138,8 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
         """
         mock_logger = Mock()
 
-        mock_user_connection_uri = Mock()
-        mock_admin_connection_uri = Mock()
+        mock_user_engine = Mock()
+        mock_admin_engine = Mock()
 
         mock_orca_archive_location = Mock()
         mock_execute = Mock()
@@ -155,22 +149,17 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
         mock_enter = Mock()
         mock_enter.__enter__ = Mock(return_value=mock_connection)
         mock_enter.__exit__ = mock_exit
-        mock_engine = Mock()
-        mock_engine.begin = Mock(return_value=mock_enter)
-        mock_create_engine.return_value = mock_engine
+        mock_admin_engine.begin = Mock(return_value=mock_enter)
 
         adapter = InternalReconciliationStorageAdapterRDBMS(
-            mock_user_connection_uri,
-            mock_admin_connection_uri,
+            mock_user_engine,
+            mock_admin_engine,
         )
 
         adapter.truncate_s3_partition(
             mock_orca_archive_location, mock_logger
         )
 
-        mock_create_engine.assert_called_once_with(
-            mock_admin_connection_uri, future=True)
-
         mock_get_partition_name_from_bucket_name \
             .assert_called_once_with(mock_orca_archive_location)
         mock_enter.__enter__.assert_called_once_with()
@@ -187,18 +176,16 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
 
     @patch("src.adapters.storage.internal_reconciliation_rdbms."
            "orca_shared.reconciliation.update_job")
-    @patch("src.adapters.storage.internal_reconciliation_rdbms.create_engine")
     def test_update_job_happy_path(
         self,
-        mock_create_engine: MagicMock,
         mock_update_job: MagicMock,
     ):
-        mock_user_connection_uri = Mock()
-        mock_admin_connection_uri = Mock()
+        mock_user_engine = Mock()
+        mock_admin_engine = Mock()
 
         adapter = InternalReconciliationStorageAdapterRDBMS(
-            mock_user_connection_uri,
-            mock_admin_connection_uri,
+            mock_user_engine,
+            mock_admin_engine,
         )
 
         job_id = random.randint(0, 9999999999)  # nosec
@@ -212,14 +199,11 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
             mock_error_message,
         )
 
-        mock_create_engine.assert_called_once_with(
-            mock_user_connection_uri, future=True)
-
         mock_update_job.assert_called_once_with(
             job_id,
             mock_status,
             mock_error_message,
-            mock_create_engine.return_value,
+            mock_user_engine,
         )
 
     @patch("src.adapters.storage.internal_reconciliation_rdbms."
@@ -230,10 +214,8 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
            "InternalReconciliationStorageAdapterRDBMS.create_temporary_table_sql")
     @patch("src.adapters.storage.internal_reconciliation_rdbms."
            "InternalReconciliationStorageAdapterRDBMS.generate_temporary_s3_column_list")
-    @patch("src.adapters.storage.internal_reconciliation_rdbms.create_engine")
     def test_update_job_with_s3_inventory_happy_path(
         self,
-        mock_create_engine: MagicMock,
         mock_generate_temporary_s3_column_list: MagicMock,
         mock_create_temporary_table_sql: MagicMock,
         mock_trigger_csv_load_from_s3_sql: MagicMock,
@@ -245,8 +227,8 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
         """
         mock_logger = Mock()
 
-        mock_user_connection_uri = Mock()
-        mock_admin_connection_uri = Mock()
+        mock_user_engine = Mock()
+        mock_admin_engine = Mock()
 
         mock_report_bucket_name = uuid.uuid4().__str__()
         mock_report_bucket_region = Mock()
@@ -270,13 +252,11 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
         mock_enter = Mock()
         mock_enter.__enter__ = Mock(return_value=mock_connection)
         mock_enter.__exit__ = mock_exit
-        mock_engine = Mock()
-        mock_engine.begin = Mock(return_value=mock_enter)
-        mock_create_engine.return_value = mock_engine
+        mock_admin_engine.begin = Mock(return_value=mock_enter)
 
         adapter = InternalReconciliationStorageAdapterRDBMS(
-            mock_user_connection_uri,
-            mock_admin_connection_uri,
+            mock_user_engine,
+            mock_admin_engine,
         )
 
         adapter.update_job_with_s3_inventory(
@@ -287,9 +267,6 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
             mock_logger,
         )
 
-        mock_create_engine.assert_called_once_with(
-            mock_admin_connection_uri, future=True)
-
         mock_generate_temporary_s3_column_list.assert_called_once_with(
             mock_columns_in_csv
         )
@@ -332,6 +309,60 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
         self.assertEqual(len(csv_file_locations) + 2, mock_execute.call_count)
         mock_exit.assert_called_once_with(None, None, None)
 
+    def test_update_job_with_s3_inventory_twice_on_same_engine(self):
+        """
+        The admin engine is pooled, so both reports can run on the same connection.
+        The temporary table must not outlive the first report's transaction.
+        """
+        # Mimics a single pooled postgres connection, on which temporary tables
+        # last until dropped or until the connection closes.
+        temporary_tables = set()
+        drop_on_commit = set()
+
+        def execute(statement, parameters):
+            sql = str(statement)
+            if "CREATE TEMPORARY TABLE s3_import" in sql:
+                if "s3_import" in temporary_tables:
+                    raise Exception('relation "s3_import" already exists')
+                temporary_tables.add("s3_import")
+                if "ON COMMIT DROP" in sql:
+                    drop_on_commit.add("s3_import")
+
+        def end_transaction(*args):
+            temporary_tables.difference_update(drop_on_commit)
+            drop_on_commit.clear()
+            return False
+
+        mock_connection = Mock()
+        mock_connection.execute = Mock(side_effect=execute)
+        mock_transaction = Mock()
+        mock_transaction.__enter__ = Mock(return_value=mock_connection)
+        mock_transaction.__exit__ = Mock(side_effect=end_transaction)
+        mock_admin_engine = Mock()
+        mock_admin_engine.begin = Mock(return_value=mock_transaction)
+
+        adapter = InternalReconciliationStorageAdapterPostgres(
+            Mock(),
+            mock_admin_engine,
+        )
+
+        for _ in range(2):
+            adapter.update_job_with_s3_inventory(
+                InternalReconcileReportCursor(random.randint(0, 999999999999)),  # nosec
+                ["Bucket", "Key", "IsLatest"],
+                [
+                    AWSS3FileLocation(
+                        bucket_name=uuid.uuid4().__str__(),
+                        key=uuid.uuid4().__str__() + ".csv.gz",
+                    )
+                ],
+                uuid.uuid4().__str__(),
+                Mock(),
+            )
+
+        self.assertEqual(2, mock_admin_engine.begin.call_count)
+        self.assertEqual(set(), temporary_tables)
+
     def test_generate_temporary_s3_column_list_happy_path(self):
         """
         Should properly translate columns to orca DB format.
@@ -354,10 +385,8 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
            "InternalReconciliationStorageAdapterRDBMS.generate_orphan_reports_sql")
     @patch("src.adapters.storage.internal_reconciliation_rdbms."
            "InternalReconciliationStorageAdapterRDBMS.generate_phantom_reports_sql")
-    @patch("src.adapters.storage.internal_reconciliation_rdbms.create_engine")
     def test_perform_orca_reconcile_happy_path(
         self,
-        mock_create_engine: MagicMock,
         mock_generate_phantom_reports_sql: MagicMock,
         mock_generate_orphan_reports_sql: MagicMock,
         mock_generate_mismatch_reports_sql: MagicMock,
@@ -367,8 +396,8 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
         """
         mock_logger = Mock()
 
-        mock_user_connection_uri = Mock()
-        mock_admin_connection_uri = Mock()
+        mock_user_engine = Mock()
+        mock_admin_engine = Mock()
 
         mock_job_id = random.randint(0, 99999999)  # nosec
         mock_orca_archive_location = Mock()
@@ -379,13 +408,11 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
         mock_enter = Mock()
         mock_enter.__enter__ = Mock(return_value=mock_connection)
         mock_enter.__exit__ = mock_exit
-        mock_engine = Mock()
-        mock_engine.begin = Mock(return_value=mock_enter)
-        mock_create_engine.return_value = mock_engine
+        mock_user_engine.begin = Mock(return_value=mock_enter)
 
         adapter = InternalReconciliationStorageAdapterRDBMS(
-            mock_user_connection_uri,
-            mock_admin_connection_uri,
+            mock_user_engine,
+            mock_admin_engine,
         )
         adapter.perform_orca_reconcile(
             mock_orca_archive_location,
@@ -437,10 +464,8 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
 
     @patch("src.adapters.storage.internal_reconciliation_rdbms."
            "InternalReconciliationStorageAdapterRDBMS.get_phantom_page_sql")
-    @patch("src.adapters.storage.internal_reconciliation_rdbms.create_engine")
     def test_get_phantom_page_next_page(
         self,
-        mock_create_engine: MagicMock,
         mock_get_phantom_page_sql: MagicMock,
     ):
         """
@@ -448,8 +473,8 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
         """
         for direction in [DirectionEnum.next, DirectionEnum.previous]:
             with self.subTest(direction=direction):
-                mock_user_connection_uri = Mock()
-                mock_admin_connection_uri = Mock()
+                mock_user_engine = Mock()
+                mock_admin_engine = Mock()
 
                 mock_job_id = Mock()
                 mock_cursor_collection_id = Mock()
@@ -497,13 +522,11 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
                 mock_enter = Mock()
                 mock_enter.__enter__ = Mock(return_value=mock_connection)
                 mock_enter.__exit__ = mock_exit
-                mock_engine = Mock()
-                mock_engine.begin = Mock(return_value=mock_enter)
-                mock_create_engine.return_value = mock_engine
+                mock_user_engine.begin = Mock(return_value=mock_enter)
 
                 adapter = InternalReconciliationStorageAdapterRDBMS(
-                    mock_user_connection_uri,
-                    mock_admin_connection_uri,
+                    mock_user_engine,
+                    mock_admin_engine,
                 )
 
                 result = adapter.get_phantom_page(
@@ -513,8 +536,6 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
                 )
                 self.assertEqual(phantoms, result)
 
-                mock_create_engine.assert_called_once_with(
-                    mock_user_connection_uri, future=True)
                 mock_enter.__enter__.assert_called_once_with()
                 mock_execute.assert_called_once_with(
                     mock_get_phantom_page_sql.return_value,
@@ -529,15 +550,12 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
                 mock_execute_result.mappings.assert_called_once_with()
                 mock_exit.assert_called_once_with(None, None, None)
                 mock_get_phantom_page_sql.assert_called_once_with(direction)
-            mock_create_engine.reset_mock()
             mock_get_phantom_page_sql.reset_mock()
 
     @patch("src.adapters.storage.internal_reconciliation_rdbms."
            "InternalReconciliationStorageAdapterRDBMS.get_mismatch_page_sql")
-    @patch("src.adapters.storage.internal_reconciliation_rdbms.create_engine")
     def test_get_mismatch_page_next_page(
         self,
-        mock_create_engine: MagicMock,
         mock_get_mismatch_page_sql: MagicMock,
     ):
         """
@@ -545,8 +563,8 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
         """
         for direction in [DirectionEnum.next, DirectionEnum.previous]:
             with self.subTest(direction=direction):
-                mock_user_connection_uri = Mock()
-                mock_admin_connection_uri = Mock()
+                mock_user_engine = Mock()
+                mock_admin_engine = Mock()
 
                 mock_job_id = Mock()
                 mock_cursor_collection_id = Mock()
@@ -608,13 +626,11 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
                 mock_enter = Mock()
                 mock_enter.__enter__ = Mock(return_value=mock_connection)
                 mock_enter.__exit__ = mock_exit
-                mock_engine = Mock()
-                mock_engine.begin = Mock(return_value=mock_enter)
-                mock_create_engine.return_value = mock_engine
+                mock_user_engine.begin = Mock(return_value=mock_enter)
 
                 adapter = InternalReconciliationStorageAdapterRDBMS(
-                    mock_user_connection_uri,
-                    mock_admin_connection_uri,
+                    mock_user_engine,
+                    mock_admin_engine,
                 )
 
                 result = adapter.get_mismatch_page(
@@ -624,8 +640,6 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
                 )
                 self.assertEqual(mismatches, result)
 
-                mock_create_engine.assert_called_once_with(
-                    mock_user_connection_uri, future=True)
                 mock_enter.__enter__.assert_called_once_with()
                 mock_execute.assert_called_once_with(
                     mock_get_mismatch_page_sql.return_value,
@@ -640,5 +654,4 @@ class TestInternalReconciliationStorageAdapterRDBMS(unittest.TestCase):
                 mock_execute_result.mappings.assert_called_once_with()
                 mock_exit.assert_called_once_with(None, None, None)
                 mock_get_mismatch_page_sql.assert_called_once_with(direction)
-            mock_create_engine.reset_mock()
             mock_get_mismatch_page_sql.reset_mock()
@@ -3,16 +3,24 @@ import unittest
 import uuid
 from unittest.mock import MagicMock, Mock, patch
 
-from src.adapters.webserver.application import get_application
+from src.adapters.webserver.application import (
+    ASYNC_USER_DB_DRIVER,
+    USER_DB_MAX_OVERFLOW,
+    USER_DB_POOL_SIZE,
+    get_application,
+)
 
 
 class TestApplication(unittest.TestCase):
 
     @patch("src.adapters.webserver.application.create_fastapi_app")
     @patch("src.adapters.webserver.application.AdaptersStorage")
+    @patch("src.adapters.webserver.application.AsyncStorageAdapterPostgres")
+    @patch("src.adapters.webserver.application.make_url")
     @patch("src.adapters.webserver.application.InternalReconciliationStorageAdapterPostgres")
     @patch("src.adapters.webserver.application.StorageAdapterPostgres")
     @patch("src.adapters.webserver.application.UUIDWordGeneration")
+    @patch("src.adapters.webserver.application.shared_db")
     @patch("src.adapters.webserver.application.create_postgres_connection_uri")
     @patch("src.adapters.webserver.application.PostgresConnectionInfo")
     @patch("src.adapters.webserver.application.validate_config")
@@ -23,9 +31,12 @@ class TestApplication(unittest.TestCase):
         mock_validate_config: MagicMock,
         mock_postgres_connection_info: MagicMock,
         mock_create_postgres_connection_uri: MagicMock,
+        mock_shared_db: MagicMock,
         mock_uuid_word_generation: MagicMock,
         mock_storage_adapter_postgres: MagicMock,
         mock_internal_reconciliation_storage_adapter_postgres: MagicMock,
+        mock_make_url: MagicMock,
+        mock_async_storage_adapter_postgres: MagicMock,
         mock_adapters_storage: MagicMock,
         mock_create_fastapi_app: MagicMock,
     ):
@@ -53,6 +64,10 @@ class TestApplication(unittest.TestCase):
             "port": mock_port,
         })
 
+        mock_user_engine = Mock()
+        mock_admin_engine = Mock()
+        mock_shared_db.get_engine.side_effect = [mock_user_engine, mock_admin_engine]
+
         result = get_application(mock_uvicorn_settings)
 
         mock_basic_logger_provider.assert_called_once_with()
@@ -82,20 +97,49 @@ class TestApplication(unittest.TestCase):
             mock_logger,
             mock_postgres_connection_info.return_value.user_database_name,
         )
-        mock_uuid_word_generation.assert_called_once_with()
-        mock_storage_adapter_postgres.assert_called_once_with(
-            mock_create_postgres_connection_uri.create_user_uri.return_value)
-        mock_internal_reconciliation_storage_adapter_postgres.assert_called_once_with(
+        self.assertEqual(2, mock_shared_db.get_engine.call_count)
+        mock_shared_db.get_engine.assert_any_call(
             mock_create_postgres_connection_uri.create_user_uri.return_value,
+            pool_size=USER_DB_POOL_SIZE,
+            max_overflow=USER_DB_MAX_OVERFLOW,
+        )
+        mock_shared_db.get_engine.assert_any_call(
             mock_create_postgres_connection_uri.create_admin_uri.return_value,
         )
+        mock_make_url.assert_called_once_with(
+            mock_create_postgres_connection_uri.create_user_uri.return_value
+        )
+        mock_make_url.return_value.set.assert_called_once_with(
+            drivername=ASYNC_USER_DB_DRIVER
+        )
+        mock_shared_db.get_async_engine.assert_called_once_with(
+            mock_make_url.return_value.set.return_value,
+            pool_size=USER_DB_POOL_SIZE,
+            max_overflow=USER_DB_MAX_OVERFLOW,
+        )
+        mock_async_user_engine = mock_shared_db.get_async_engine.return_value
+        mock_uuid_word_generation.assert_called_once_with()
+        mock_storage_adapter_postgres.assert_called_once_with(mock_user_engine)
+        mock_internal_reconciliation_storage_adapter_postgres.assert_called_once_with(
+            mock_user_engine,
+            mock_admin_engine,
+        )
+        mock_async_storage_adapter_postgres.assert_called_once_with(mock_async_user_engine)
         mock_adapters_storage.assert_called_once_with(
             mock_uuid_word_generation.return_value,
             mock_storage_adapter_postgres.return_value,
             mock_internal_reconciliation_storage_adapter_postgres.return_value,
+            mock_async_storage_adapter_postgres.return_value,
             mock_basic_logger_provider.return_value,
         )
         mock_create_fastapi_app.assert_called_once_with(
-            mock_uvicorn_settings, mock_adapters_storage.return_value)
+            mock_uvicorn_settings,
+            mock_adapters_storage.return_value,
+            {
+                "user": mock_user_engine,
+                "user_async": mock_async_user_engine.sync_engine,
+                "admin": mock_admin_engine,
+            },
+        )
 
         self.assertEqual(mock_create_fastapi_app.return_value, result)
@@ -1,5 +1,6 @@
+import asyncio
 import unittest
-from unittest.mock import MagicMock, Mock, call, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, call, patch
 
 from src.entities.internal_reconcile_report import Mismatch, Phantom
 from src.use_cases.internal_reconcile_report import InternalReconcileReport
@@ -29,18 +30,20 @@ class MyTestCase(unittest.TestCase):
         phantom0 = Mock()
         phantom1 = Mock()
         phantoms = [phantom0, phantom1]
-        mock_storage_get_phantom_page = Mock(return_value=phantoms)
+        mock_storage_get_phantom_page = AsyncMock(return_value=phantoms)
         mock_storage = Mock()
         mock_storage.get_phantom_page = mock_storage_get_phantom_page
         mock_job_id = Mock()
         mock_page_parameters = Mock()
         mock_logger = Mock()
 
-        result = InternalReconcileReport(mock_storage)\
+        result = asyncio.run(
+            InternalReconcileReport(mock_storage)
             .get_phantom_page(mock_job_id, mock_page_parameters, mock_logger)
+        )
 
         mock_decode_cursor.assert_called_once_with(mock_page_parameters.cursor, Phantom.Cursor)
-        mock_storage_get_phantom_page.assert_called_once_with(
+        mock_storage_get_phantom_page.assert_awaited_once_with(
             mock_job_id,
             mock_decode_cursor.return_value.collection_id,
             mock_decode_cursor.return_value.granule_id,
@@ -88,18 +91,20 @@ class MyTestCase(unittest.TestCase):
         mismatch0 = Mock()
         mismatch1 = Mock()
         mismatches = [mismatch0, mismatch1]
-        mock_storage_get_mismatch_page = Mock(return_value=mismatches)
+        mock_storage_get_mismatch_page = AsyncMock(return_value=mismatches)
         mock_storage = Mock()
         mock_storage.get_mismatch_page = mock_storage_get_mismatch_page
         mock_job_id = Mock()
         mock_page_parameters = Mock()
         mock_logger = Mock()
 
-        result = InternalReconcileReport(mock_storage)\
+        result = asyncio.run(
+            InternalReconcileReport(mock_storage)
             .get_mismatch_page(mock_job_id, mock_page_parameters, mock_logger)
+        )
 
         mock_decode_cursor.assert_called_once_with(mock_page_parameters.cursor, Mismatch.Cursor)
-        mock_storage_get_mismatch_page.assert_called_once_with(
+        mock_storage_get_mismatch_page.assert_awaited_once_with(
             mock_job_id,
             mock_decode_cursor.return_value.collection_id,
             mock_decode_cursor.return_value.granule_id,
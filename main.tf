@@ -83,5 +83,6 @@ module "orca" {
   deploy_rds_cluster_role_association                   = var.deploy_rds_cluster_role_association
   max_pool_connections                                  = var.max_pool_connections
   max_concurrency                                       = var.max_concurrency
+  max_files_in_flight                                   = var.max_files_in_flight
   deploy_rds_dedicated_instance_role_association        = var.deploy_rds_dedicated_instance_role_association
 }
@@ -68,6 +68,7 @@ data "aws_iam_policy_document" "restore_object_role_policy_document" {
     actions = [
       "s3:GetBucket",
       "s3:ListBucket",
+      "s3:ListBucketMultipartUploads",
       "s3:ListBucketVersions",
       "s3:PutBucket"
     ]
@@ -130,7 +131,8 @@ data "aws_iam_policy_document" "restore_object_role_policy_document" {
   statement {
     actions = [
       "s3:GetObject",  # Get the manifest
-      "s3:PutObject"  # Copy the gzip to add missing metadata
+      "s3:PutObject",  # Copy the gzip to add missing metadata
+      "s3:AbortMultipartUpload"  # Discard failed catalog exports
     ]
     resources = ["arn:aws:s3:::${var.orca_reports_bucket_name}/*"]
   }
@@ -63,6 +63,7 @@ resource "aws_lambda_function" "copy_to_archive" {
       LOG_LEVEL                      = var.log_level
       DEFAULT_MAX_POOL_CONNECTIONS   = var.max_pool_connections
       DEFAULT_MAX_CONCURRENCY        = var.max_concurrency
+      DEFAULT_MAX_FILES_IN_FLIGHT    = var.max_files_in_flight
     }
   }
   depends_on = [
@@ -593,6 +594,7 @@ resource "aws_lambda_function" "copy_from_archive" {
       LOG_LEVEL                      = var.log_level
       DEFAULT_MAX_POOL_CONNECTIONS   = var.max_pool_connections
       DEFAULT_MAX_CONCURRENCY        = var.max_concurrency
+      LAMBDA_TIMEOUT_SECS            = var.orca_recovery_lambda_timeout
     }
   }
   depends_on = [
@@ -603,8 +605,9 @@ resource "aws_lambda_function" "copy_from_archive" {
 # Additional resources needed by copy_from_archive
 # ------------------------------------------------------------------------------
 resource "aws_lambda_event_source_mapping" "copy_from_archive_event_source_mapping" {
-  event_source_arn = var.orca_sqs_staged_recovery_queue_arn
-  function_name    = aws_lambda_function.copy_from_archive.arn
+  event_source_arn        = var.orca_sqs_staged_recovery_queue_arn
+  function_name           = aws_lambda_function.copy_from_archive.arn
+  function_response_types = ["ReportBatchItemFailures"]
 }
 
 # Permissions to allow SQS trigger to invoke lambda
@@ -872,6 +875,50 @@ resource "aws_lambda_function" "orca_catalog_reporting" {
 }
 
 
+# orca_catalog_export - Exports catalog data to the reports bucket
+# ==============================================================================
+# log group for the orca_catalog_export function
+resource "aws_cloudwatch_log_group" "orca_catalog_export_log_group" {
+  name = "/aws/lambda/${var.prefix}_orca_catalog_export"
+  retention_in_days = var.lambda_log_retention_in_days
+
+  tags = var.tags
+}
+
+resource "aws_lambda_function" "orca_catalog_export" {
+  ## REQUIRED
+  function_name = "${var.prefix}_orca_catalog_export"
+  role          = var.restore_object_role_arn
+
+  ## OPTIONAL
+  description      = "Exports catalog data to the reports bucket as gzipped ndjson."
+  filename         = "${path.module}/../../tasks/orca_catalog_reporting/orca_catalog_reporting.zip"
+  handler          = "orca_catalog_export.handler"
+  memory_size      = var.orca_reconciliation_lambda_memory_size
+  runtime          = var.lambda_runtime
+  source_code_hash = filebase64sha256("${path.module}/../../tasks/orca_catalog_reporting/orca_catalog_reporting.zip")
+  tags             = var.tags
+  timeout          = var.orca_reconciliation_lambda_timeout
+
+  vpc_config {
+    subnet_ids         = var.lambda_subnet_ids
+    security_group_ids = [module.lambda_security_group.vpc_postgres_ingress_all_egress_id]
+  }
+
+  environment {
+    variables = {
+      DB_CONNECT_INFO_SECRET_ARN = var.db_connect_info_secret_arn
+      EXPORT_BUCKET_NAME         = var.orca_reports_bucket_name
+      POWERTOOLS_SERVICE_NAME    = "orca.reconciliation"
+      LOG_LEVEL                  = var.log_level
+    }
+  }
+  depends_on = [
+    aws_cloudwatch_log_group.orca_catalog_export_log_group
+  ]
+}
+
+
 # post_to_catalog - Posts provider/collection/granule/file info from SQS queue to database.
 # ===========================================================================================
 # log group for the post_to_catalog function
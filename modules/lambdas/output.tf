@@ -19,6 +19,11 @@ output "orca_catalog_reporting_arn" {
   value       = aws_lambda_function.orca_catalog_reporting.arn
 }
 
+output "orca_catalog_export_arn" {
+  description = "AWS ARN for the orca_catalog_export lambda."
+  value       = aws_lambda_function.orca_catalog_export.arn
+}
+
 # Reconciliation Lambdas
 # ------------------------------------------------------------------------------
 output "get_current_archive_list_arn" {
@@ -58,6 +58,11 @@ variable "orca_default_bucket" {
   description = "Default archive bucket to use if no overrides exist."
 }
 
+variable "orca_reports_bucket_name" {
+  type        = string
+  description = "The name of the bucket to store s3 inventory reports and catalog exports."
+}
+
 variable "orca_sqs_archive_recovery_queue_arn" {
   type        = string
   description = "The ARN of the archive-recovery-queue SQS"
@@ -216,7 +221,7 @@ variable "orca_recovery_retry_limit" {
 
 variable "orca_recovery_retry_interval" {
   type        = number
-  description = "Number of seconds to wait between recovery failure retries."
+  description = "Number of seconds to wait between recovery failure retries. request_from_archive and copy_from_archive back off exponentially with jitter from this value."
 }
 
 
@@ -240,3 +245,8 @@ variable "max_concurrency" {
   type        = number
   description = "The maximum number of concurrent S3 API transfer operations. Defaults to 10."
 }
+
+variable "max_files_in_flight" {
+  type        = number
+  description = "The maximum number of files copy_to_archive copies at the same time. Each file uses up to max_concurrency connections, so the S3 connection pool is raised to max_files_in_flight * max_concurrency if max_pool_connections is smaller. Defaults to 10."
+}
@@ -25,6 +25,7 @@ module "orca_lambdas" {
   ## REQUIRED
   db_connect_info_secret_arn          = module.orca_secretsmanager.secretsmanager_arn
   orca_default_bucket                 = var.orca_default_bucket
+  orca_reports_bucket_name            = var.orca_reports_bucket_name
   orca_sqs_archive_recovery_queue_arn = module.orca_sqs.orca_sqs_archive_recovery_queue_arn
   orca_sqs_archive_recovery_queue_id  = module.orca_sqs.orca_sqs_archive_recovery_queue_id
   orca_sqs_internal_report_queue_id   = module.orca_sqs.orca_sqs_internal_report_queue_id
@@ -60,6 +61,7 @@ module "orca_lambdas" {
   gql_tasks_role_arn                            = module.orca_graphql_0.gql_tasks_role_arn
   max_pool_connections                          = var.max_pool_connections
   max_concurrency                               = var.max_concurrency
+  max_files_in_flight                           = var.max_files_in_flight
 }
 
 ## orca_lambdas_secondary - lambdas module that is dependent on resources that presently are created after most lambdas
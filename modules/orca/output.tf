@@ -12,6 +12,11 @@ output "orca_lambda_orca_catalog_reporting_arn" {
   value       = module.orca_lambdas.orca_catalog_reporting_arn
 }
 
+output "orca_lambda_orca_catalog_export_arn" {
+  description = "AWS ARN of the ORCA orca_catalog_export lambda."
+  value       = module.orca_lambdas.orca_catalog_export_arn
+}
+
 
 # Recovery Lambdas
 # ------------------------------------------------------------------------------
@@ -222,7 +222,7 @@ variable "orca_recovery_retry_limit" {
 
 variable "orca_recovery_retry_interval" {
   type        = number
-  description = "Number of seconds to wait between recovery failure retries."
+  description = "Number of seconds to wait between recovery failure retries. request_from_archive and copy_from_archive back off exponentially with jitter from this value."
 }
 
 
@@ -300,6 +300,11 @@ variable "max_concurrency" {
   description = "The maximum number of concurrent S3 API transfer operations. Defaults to 10."
 }
 
+variable "max_files_in_flight" {
+  type        = number
+  description = "The maximum number of files copy_to_archive copies at the same time. Each file uses up to max_concurrency connections, so the S3 connection pool is raised to max_files_in_flight * max_concurrency if max_pool_connections is smaller. Defaults to 10."
+}
+
 variable "deploy_rds_dedicated_instance_role_association" {
   type        = bool
   description = "Deploys IAM role for RDS dedicated instance."
@@ -25,6 +25,12 @@ output "orca_lambda_orca_catalog_reporting_arn" {
 }
 
 
+output "orca_lambda_orca_catalog_export_arn" {
+  description = "AWS ARN of the ORCA orca_catalog_export lambda."
+  value       = module.orca.orca_lambda_orca_catalog_export_arn
+}
+
+
 output "orca_lambda_request_from_archive_arn" {
   description = "AWS ARN of the ORCA request_from_archive lambda."
   value       = module.orca.orca_lambda_request_from_archive_arn
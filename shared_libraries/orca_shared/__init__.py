@@ -12,10 +12,13 @@ def lazy_load(module_name, element):
 
 
 __title__ = "orca_shared"
-__version__ = "1.6.0"
+__version__ = "1.7.0"
 
 
 # Libraries
 shared_database = lazy_load(".database", "shared_database")
 shared_recovery = lazy_load(".recovery", "shared_recovery")
 shared_reconciliation = lazy_load(".reconciliation", "shared_reconciliation")
+shared_files = lazy_load(".files", "shared_files")
+shared_retry = lazy_load(".retry", "shared_retry")
+shared_transfer = lazy_load(".transfer", "shared_transfer")
@@ -1,7 +1,13 @@
 # flake8: noqa
 from .shared_db import (
     LOGGER,
+    clear_configuration_cache,
+    dispose_engines,
     get_admin_connection,
+    get_async_engine,
     get_configuration,
+    get_configuration_cache_stats,
+    get_engine,
+    get_pool_checkout_stats,
     get_user_connection,
 )
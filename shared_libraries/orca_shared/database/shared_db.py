@@ -4,19 +4,23 @@ Name: shared_db.py
 Description: Shared library for database objects needed by the various libraries.
 """
 
+import asyncio
 import functools
 import json
 import os
 import random
+import threading
 import time
-from typing import Any, Callable, Dict, TypeVar
+from typing import Any, Awaitable, Callable, Dict, Tuple, TypeVar, Union
 
 import boto3
 from aws_lambda_powertools import Logger
-from sqlalchemy import create_engine
-from sqlalchemy.engine import URL
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, ExceptionContext, make_url
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.future import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 # Set AWS powertools logger
 LOGGER = Logger()
@@ -26,11 +30,82 @@ BACKOFF_FACTOR = 2  # Value of the factor used to backoff
 INITIAL_BACKOFF_IN_SECONDS = 1  # Number of seconds to sleep the first time through.
 RT = TypeVar("RT")  # return type
 
+# Pool settings for engines. A Lambda handles one invocation at a time,
+# so it rarely needs more than one connection.
+DEFAULT_POOL_SIZE = 1
+DEFAULT_MAX_OVERFLOW = 4
+# Connections sit idle while a Lambda is frozen between invocations,
+# so replace them before the database or network drops them.
+DEFAULT_POOL_RECYCLE_SECS = 300
+DEFAULT_POOL_PRE_PING = True
 
-def get_configuration(db_connect_info_secret_arn: str) -> Dict[str, str]:
+# Decoded secrets are reused for this long before Secrets Manager is asked again.
+DEFAULT_SECRET_CACHE_TTL_SECS = 300
+
+# Secrets Manager clients by region, and decoded secrets by ARN,
+# as (time fetched, VersionId, secret), kept between warm invocations.
+_SECRETSMANAGER_CLIENTS: Dict[str, Any] = {}
+_SECRET_CACHE: Dict[str, Tuple[float, str, Dict[str, str]]] = {}
+_SECRET_CACHE_STATS = {"hits": 0, "misses": 0}
+_SECRET_CACHE_LOCK = threading.Lock()
+
+# Engines are kept for the life of the process, so warm invocations reuse their pools.
+_ENGINES: Dict[Tuple[str, int, int, int, bool], Engine] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+class _CheckoutTimedPool:
+    """
+    Mixin for a QueuePool that records how long each connection checkout takes,
+    including the pre-ping and any new connection.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.checkout_stats = {"checkouts": 0, "total_secs": 0.0, "max_secs": 0.0}
+        self._checkout_stats_lock = threading.Lock()
+
+    def connect(self) -> Any:
+        start_time = time.monotonic()
+        connection = super().connect()
+        elapsed_secs = time.monotonic() - start_time
+        with self._checkout_stats_lock:
+            self.checkout_stats["checkouts"] += 1
+            self.checkout_stats["total_secs"] += elapsed_secs
+            self.checkout_stats["max_secs"] = max(
+                self.checkout_stats["max_secs"], elapsed_secs
+            )
+        LOGGER.debug(
+            f"Checked out a database connection in {elapsed_secs:.3f} seconds. "
+            f"{self.status()}"
+        )
+        return connection
+
+
+class _CheckoutTimedQueuePool(_CheckoutTimedPool, QueuePool):
+    """
+    A QueuePool that records how long each connection checkout takes.
+    """
+
+
+class _CheckoutTimedAsyncAdaptedQueuePool(_CheckoutTimedPool, AsyncAdaptedQueuePool):
+    """
+    An AsyncAdaptedQueuePool, as used by async engines,
+    that records how long each connection checkout takes.
+    """
+
+
+def get_configuration(
+    db_connect_info_secret_arn: str,
+    cache_ttl_secs: float = DEFAULT_SECRET_CACHE_TTL_SECS,
+    force_refresh: bool = False,
+) -> Dict[str, str]:
     """
     Create a dictionary of configuration values based on environment variables
     and secret information items needed to create ORCA database connections.
+    The decoded secret is cached for cache_ttl_secs, and until a database
+    authentication failure clears the cache.
+    If the secret's version changed since it was cached, cached engines are disposed.
 
     ```
     Environment Variables:
@@ -39,6 +114,8 @@ def get_configuration(db_connect_info_secret_arn: str) -> Dict[str, str]:
 
     Args:
         db_connect_info_secret_arn (str): The secret ARN of the secret in AWS secretsmanager.
+        cache_ttl_secs (float): How long to reuse a cached secret.
+        force_refresh (bool): If True, the secret is retrieved even if it is cached.
 
     Returns:
         Configuration (Dict): Dictionary with all of the configuration information.
@@ -57,18 +134,31 @@ def get_configuration(db_connect_info_secret_arn: str) -> Dict[str, str]:
         LOGGER.critical(message)
         raise Exception(message)
 
+    with _SECRET_CACHE_LOCK:
+        cached_secret = _SECRET_CACHE.get(db_connect_info_secret_arn, None)
+        if (
+            cached_secret is not None
+            and not force_refresh
+            and time.monotonic() - cached_secret[0] < cache_ttl_secs
+        ):
+            _SECRET_CACHE_STATS["hits"] += 1
+            LOGGER.debug(f"Secret cache stats: {get_configuration_cache_stats()}")
+            return dict(cached_secret[2])
+        _SECRET_CACHE_STATS["misses"] += 1
+
     try:
-        LOGGER.debug("Creating secretsmanager resource.")
-        secretsmanager = boto3.client("secretsmanager", region_name=aws_region)
+        with _SECRET_CACHE_LOCK:
+            secretsmanager = _SECRETSMANAGER_CLIENTS.get(aws_region, None)
+            if secretsmanager is None:
+                LOGGER.debug("Creating secretsmanager resource.")
+                secretsmanager = boto3.client("secretsmanager", region_name=aws_region)
+                _SECRETSMANAGER_CLIENTS[aws_region] = secretsmanager
 
         LOGGER.debug(
             "Retrieving db login info for both user and admin as a dictionary."
         )
-        config = json.loads(
-            secretsmanager.get_secret_value(SecretId=db_connect_info_secret_arn)[
-                "SecretString"
-            ]
-        )
+        secret = secretsmanager.get_secret_value(SecretId=db_connect_info_secret_arn)
+        config = json.loads(secret["SecretString"])
         LOGGER.debug(
             "Successfully retrieved db login info for both user and admin as a dictionary."
         )
@@ -76,13 +166,73 @@ def get_configuration(db_connect_info_secret_arn: str) -> Dict[str, str]:
         LOGGER.critical("Failed to retrieve secret.", exc_info=True)
         raise Exception("Failed to retrieve secret manager value.")
 
+    version_id = secret.get("VersionId", None)
+    with _SECRET_CACHE_LOCK:
+        _SECRET_CACHE[db_connect_info_secret_arn] = (
+            time.monotonic(),
+            version_id,
+            config,
+        )
+        LOGGER.debug(f"Secret cache stats: {get_configuration_cache_stats()}")
+    if cached_secret is not None and cached_secret[1] != version_id:
+        # Engines for the old credentials would otherwise sit idle for the life of the process.
+        LOGGER.info(
+            f"Secret version changed from {cached_secret[1]} to {version_id}. "
+            "Disposing cached engines."
+        )
+        dispose_engines()
+
     # return the config dict
-    return config
+    return dict(config)
+
+
+def get_configuration_cache_stats() -> Dict[str, float]:
+    """
+    Reports how often get_configuration was answered from its cache.
+
+    Returns:
+        Dict: 'hits', 'misses', and 'hit_ratio' of hits to all lookups.
+    """
+    lookups = _SECRET_CACHE_STATS["hits"] + _SECRET_CACHE_STATS["misses"]
+    return {
+        "hits": _SECRET_CACHE_STATS["hits"],
+        "misses": _SECRET_CACHE_STATS["misses"],
+        "hit_ratio": _SECRET_CACHE_STATS["hits"] / lookups if lookups > 0 else 0.0,
+    }
+
+
+def clear_configuration_cache() -> None:
+    """
+    Forgets all cached secrets, so the next get_configuration retrieves them again.
+    """
+    with _SECRET_CACHE_LOCK:
+        _SECRET_CACHE.clear()
+
+
+def _clear_configuration_cache_on_authentication_error(
+    context: ExceptionContext,
+) -> None:
+    """
+    Engine 'handle_error' listener. If the database rejected the credentials,
+    the cached secrets may be stale, so they are cleared.
+
+    Args:
+        context (ExceptionContext): Information about the error.
+    """
+    original_exception = context.original_exception
+    if getattr(original_exception, "pgcode", None) in (
+        "28000",  # invalid_authorization_specification
+        "28P01",  # invalid_password
+    ) or "authentication failed" in str(original_exception):
+        LOGGER.warning(
+            "Database authentication failed. Cached secrets will be retrieved again."
+        )
+        clear_configuration_cache()
 
 
 def _create_connection(**kwargs: Any) -> Engine:
     """
-    Base function for creating a connection engine that can connect to a database.
+    Base function for getting a connection engine that can connect to a database.
 
     Args:
         host (str): Database host to connect to
@@ -90,22 +240,162 @@ def _create_connection(**kwargs: Any) -> Engine:
         database (str): Database name to connect to
         username (str): Database user to connect as
         password (str): Database password for the user
+        pool_size, max_overflow, pool_recycle_secs, pool_pre_ping: Optional.
+            See get_engine.
 
     Returns
         Engine (sqlalchemy.future.Engine): engine object for creating database connections.
     """
+    pool_kwargs = {
+        key: kwargs.pop(key)
+        for key in ["pool_size", "max_overflow", "pool_recycle_secs", "pool_pre_ping"]
+        if key in kwargs
+    }
     LOGGER.debug("Creating URL object to connect to the database.")
     connection_url = URL.create(drivername="postgresql", **kwargs)
-    return create_engine(connection_url, future=True)
+    return get_engine(connection_url, **pool_kwargs)
+
 
+def get_engine(
+    connection_url: Union[str, URL],
+    pool_size: int = DEFAULT_POOL_SIZE,
+    max_overflow: int = DEFAULT_MAX_OVERFLOW,
+    pool_recycle_secs: int = DEFAULT_POOL_RECYCLE_SECS,
+    pool_pre_ping: bool = DEFAULT_POOL_PRE_PING,
+) -> Engine:
+    """
+    Gets a connection engine for a database URL.
+    Engines are cached by connection URL and pool settings for the life of the process.
+
+    Args:
+        connection_url (str or URL): The URL of the database to connect to.
+        pool_size (int): Number of connections to keep open in the pool.
+        max_overflow (int): Number of connections to allow beyond pool_size.
+        pool_recycle_secs (int): Connections older than this are replaced on checkout.
+        pool_pre_ping (bool): If True, connections are tested before each checkout.
 
-def get_admin_connection(config: Dict[str, str], database: str = None) -> Engine:
+    Returns
+        Engine (sqlalchemy.future.Engine): engine object for creating database connections.
+    """
+    connection_url = make_url(connection_url)
+    engine_key = (
+        connection_url.render_as_string(hide_password=False),
+        pool_size,
+        max_overflow,
+        pool_recycle_secs,
+        pool_pre_ping,
+    )
+    with _ENGINES_LOCK:
+        engine = _ENGINES.get(engine_key, None)
+        if engine is None:
+            LOGGER.debug("Creating engine for the database.")
+            engine = create_engine(
+                connection_url,
+                future=True,
+                poolclass=_CheckoutTimedQueuePool,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_recycle=pool_recycle_secs,
+                pool_pre_ping=pool_pre_ping,
+            )
+            event.listen(
+                engine,
+                "handle_error",
+                _clear_configuration_cache_on_authentication_error,
+            )
+            _ENGINES[engine_key] = engine
+        else:
+            LOGGER.debug("Reusing engine for the database.")
+    return engine
+
+
+def get_async_engine(
+    connection_url: Union[str, URL],
+    pool_size: int = DEFAULT_POOL_SIZE,
+    max_overflow: int = DEFAULT_MAX_OVERFLOW,
+    pool_recycle_secs: int = DEFAULT_POOL_RECYCLE_SECS,
+    pool_pre_ping: bool = DEFAULT_POOL_PRE_PING,
+) -> AsyncEngine:
     """
-    Creates a connection engine to a database as a superuser.
+    Creates an async connection engine for a database URL with an async driver,
+    such as 'postgresql+asyncpg'. Like get_engine, it clears cached secrets
+    when the database rejects the credentials, and records checkout latency
+    for get_pool_checkout_stats(engine.sync_engine).
+    Async engines are not cached, as their connections belong to the event loop
+    that opened them. Create one per event loop and keep it for its life.
+
+    Args:
+        connection_url (str or URL): The URL of the database to connect to.
+        pool_size, max_overflow, pool_recycle_secs, pool_pre_ping: See get_engine.
+
+    Returns
+        AsyncEngine (sqlalchemy.ext.asyncio.AsyncEngine): engine object for creating
+            database connections.
+    """
+    LOGGER.debug("Creating async engine for the database.")
+    engine = create_async_engine(
+        connection_url,
+        poolclass=_CheckoutTimedAsyncAdaptedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=pool_recycle_secs,
+        pool_pre_ping=pool_pre_ping,
+    )
+    # Events are not supported on async engines, so listen on the engine they wrap.
+    event.listen(
+        engine.sync_engine,
+        "handle_error",
+        _clear_configuration_cache_on_authentication_error,
+    )
+    return engine
+
+
+def get_pool_checkout_stats(engine: Engine) -> Dict[str, float]:
+    """
+    Reports how long connection checkouts from an engine's pool have taken.
+
+    Args:
+        engine (sqlalchemy.future.Engine): An engine from get_user_connection
+            or get_admin_connection, or the sync_engine of one from get_async_engine.
+
+    Returns
+        Dict: 'checkouts', and the 'total_secs' and 'max_secs' they took,
+            since the engine was created or last disposed.
+    """
+    return dict(getattr(engine.pool, "checkout_stats", {}))
+
+
+def dispose_engines(close: bool = True) -> None:
+    """
+    Disposes the connection pools of all cached engines.
+
+    Args:
+        close (bool): If True, connections are closed and the cache is cleared.
+            If False, the connections are dropped without being closed,
+            as a forked child must not close connections it shares with its parent.
+    """
+    with _ENGINES_LOCK:
+        for engine in _ENGINES.values():
+            engine.dispose(close=close)
+        if close:
+            _ENGINES.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: dispose_engines(close=False))
+
+
+def get_admin_connection(
+    config: Dict[str, str], database: str = None, **pool_kwargs: Any
+) -> Engine:
+    """
+    Gets a connection engine to a database as a superuser.
+    Engines are reused for the life of the process.
 
     Args:
         config (Dict): Configuration containing connection information.
         database (str): Database for the admin user to connect to. Defaults to admin_database.
+        pool_kwargs: Optional pool settings. See get_engine.
 
     Returns
         Engine (sqlalchemy.future.Engine): engine object for creating database connections.
@@ -124,18 +414,20 @@ def get_admin_connection(config: Dict[str, str], database: str = None) -> Engine
         database=admin_database,
         username=config["admin_username"],
         password=config["admin_password"],
+        **pool_kwargs,
     )
 
     return connection
 
 
-def get_user_connection(config: Dict[str, str]) -> Engine:
+def get_user_connection(config: Dict[str, str], **pool_kwargs: Any) -> Engine:
     """
-    Creates a connection engine to the application database as the application
-    database user.
+    Gets a connection engine to the application database as the application
+    database user. Engines are reused for the life of the process.
 
     Args:
         config (Dict): Configuration containing connection information.
+        pool_kwargs: Optional pool settings. See get_engine.
 
     Returns
         Engine (sqlalchemy.future.Engine): engine object for creating database connections.
@@ -148,6 +440,7 @@ def get_user_connection(config: Dict[str, str]) -> Engine:
         database=config["user_database"],
         username=config["user_username"],
         password=config["user_password"],
+        **pool_kwargs,
     )
 
     return connection
@@ -213,3 +506,52 @@ def retry_operational_error(
 
     # Return our decorator
     return decorator_retry_operational_error
+
+
+# Retry decorator for coroutine functions
+def retry_operational_error_async(
+    max_retries: int = MAX_RETRIES,
+    backoff_in_seconds: int = INITIAL_BACKOFF_IN_SECONDS,
+    backoff_factor: int = BACKOFF_FACTOR,
+) -> Callable[[Callable[..., Awaitable[RT]]], Callable[..., Awaitable[RT]]]:
+    """
+    Version of retry_operational_error for coroutine functions.
+    Backoff uses asyncio.sleep, so other tasks keep running while waiting.
+    Args:
+        max_retries (int): number of times to retry in case of failure.
+        backoff_in_seconds (int): Number of seconds to sleep the first time through.
+        backoff_factor (int): Value of the factor used for backoff.
+    """
+
+    def decorator_retry_operational_error_async(
+        func: Callable[..., Awaitable[RT]]
+    ) -> Callable[..., Awaitable[RT]]:
+        @functools.wraps(func)
+        async def wrapper_retry_operational_error_async(*args, **kwargs) -> RT:
+            total_retries = 0
+            while True:
+                try:
+                    return await func(*args, **kwargs)
+                except OperationalError:
+                    if total_retries == max_retries:
+                        LOGGER.error(
+                            f"Encountered Errors {total_retries} times. Reached max retry limit.",
+                        )
+                        raise
+                    backoff_time = (
+                        backoff_in_seconds * backoff_factor**total_retries
+                        + random.uniform(0, 1)  # nosec
+                    )
+                    LOGGER.error(
+                        f"Encountered OperationalError on attempt {total_retries}. "
+                        f"Sleeping {backoff_time} seconds.",
+                    )
+                    await asyncio.sleep(backoff_time)
+                    total_retries += 1
+                except Exception as ex:
+                    LOGGER.error(f"Encountered a non-retriable error: {ex}")
+                    raise ex
+
+        return wrapper_retry_operational_error_async
+
+    return decorator_retry_operational_error_async
@@ -0,0 +1,2 @@
+# flake8: noqa
+from .shared_files import FileExclusionMatcher, get_file_exclusion_matcher
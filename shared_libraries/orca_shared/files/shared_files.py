@@ -0,0 +1,134 @@
+"""
+Name: shared_files.py
+Description: Shared library that combines common functions and classes needed for
+             selecting which granule files ORCA operates on.
+"""
+
+# Standard libraries
+import functools
+import re
+from typing import Callable, Iterable, List, Optional, Tuple, TypeVar
+
+# Third party libraries
+from aws_lambda_powertools import Logger
+
+# Set AWS powertools
+LOGGER = Logger()
+
+FileType = TypeVar("FileType")
+
+
+class FileExclusionMatcher:
+    """
+    Matches file keys against a collection's excludedFileExtensions.
+    All extensions are compiled once into a single regular expression,
+    so each file is checked in one pass regardless of the number of extensions.
+    Extensions keep their existing meaning of a regular expression matched against
+    the end of the file key.
+    """
+
+    def __init__(self, excluded_file_extensions: Optional[Iterable[str]]):
+        """
+        Args:
+            excluded_file_extensions: List of extensions to exclude. None is treated as empty.
+        """
+        if excluded_file_extensions is None:
+            excluded_file_extensions = []
+        self.excluded_file_extensions = list(excluded_file_extensions)
+        if len(self.excluded_file_extensions) == 0:
+            self._combined_pattern = None
+        else:
+            self._combined_pattern = re.compile(
+                "^.*(?:"
+                + "|".join(
+                    f"(?:{file_type})" for file_type in self.excluded_file_extensions
+                )
+                + ")$"
+            )
+        # Only used to report which extension excluded a file.
+        self._patterns = [
+            (file_type, re.compile(f"^.*{file_type}$"))
+            for file_type in self.excluded_file_extensions
+        ]
+
+    def should_exclude(self, file_key: str) -> bool:
+        """
+        Tests whether file is included in {excludedFileExtensions}.
+        Args:
+            file_key: The key or name of the file.
+        Returns:
+            True if file should be excluded, False otherwise.
+        """
+        if self._combined_pattern is None:
+            return False
+        return self._combined_pattern.search(file_key) is not None
+
+    def get_matching_extension(self, file_key: str) -> Optional[str]:
+        """
+        Finds the first configured extension that excludes the file.
+        Args:
+            file_key: The key or name of the file.
+        Returns:
+            The matching extension, or None if the file should not be excluded.
+        """
+        if not self.should_exclude(file_key):
+            return None
+        return next(
+            file_type
+            for file_type, pattern in self._patterns
+            if pattern.search(file_key) is not None
+        )
+
+    def filter(
+        self,
+        files: Iterable[FileType],
+        get_file_key: Callable[[FileType], str] = lambda file: file,
+    ) -> List[FileType]:
+        """
+        Removes excluded files, preserving the order of the remaining files.
+        Each excluded file is logged along with the extension that excluded it.
+        Args:
+            files: The files to filter.
+            get_file_key: Returns the key or name to match for a file.
+                Defaults to treating each file as its key.
+        Returns:
+            The files that should not be excluded.
+        """
+        if self._combined_pattern is None:
+            return list(files)
+
+        included_files = []
+        for file in files:
+            file_key = get_file_key(file)
+            if self.should_exclude(file_key):
+                LOGGER.info(
+                    f"Excluding {file_key} because it matches the excluded file type "
+                    f"{self.get_matching_extension(file_key)}."
+                )
+            else:
+                included_files.append(file)
+        return included_files
+
+
+@functools.lru_cache(maxsize=32)
+def _get_cached_file_exclusion_matcher(
+    excluded_file_extensions: Tuple[str, ...]
+) -> FileExclusionMatcher:
+    return FileExclusionMatcher(excluded_file_extensions)
+
+
+def get_file_exclusion_matcher(
+    excluded_file_extensions: Optional[Iterable[str]],
+) -> FileExclusionMatcher:
+    """
+    Gets a FileExclusionMatcher for the given extensions.
+    Matchers are cached per configuration, so warm invocations
+    with the same collection config do not recompile.
+    Args:
+        excluded_file_extensions: List of extensions to exclude. None is treated as empty.
+    Returns:
+        A matcher for the extensions.
+    """
+    if excluded_file_extensions is None:
+        excluded_file_extensions = []
+    return _get_cached_file_exclusion_matcher(tuple(excluded_file_extensions))
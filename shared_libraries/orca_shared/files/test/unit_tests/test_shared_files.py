@@ -0,0 +1,104 @@
+"""
+Name: test_shared_files.py
+Description: Unit tests for shared_files.py shared library.
+"""
+
+import unittest
+import uuid
+from unittest.mock import MagicMock, patch
+
+from orca_shared.files import shared_files
+
+
+class TestSharedFilesLibraries(unittest.TestCase):
+    """
+    Unit tests for the shared_files library used by ORCA Lambdas.
+    """
+
+    def test_should_exclude_matches_any_extension(self):
+        """
+        Files ending in any configured extension should be excluded.
+        """
+        matcher = shared_files.FileExclusionMatcher([".xml", ".cmr", ".cmr.json"])
+
+        self.assertTrue(matcher.should_exclude("s3://test-bucket/exclude.xml"))
+        self.assertTrue(matcher.should_exclude("prefix/exclude.cmr.json"))
+        self.assertTrue(matcher.should_exclude("exclude.cmr"))
+        self.assertFalse(matcher.should_exclude("s3://test-bucket/include.cmr.txt"))
+        self.assertFalse(matcher.should_exclude("include.xml.hdf"))
+
+    def test_should_exclude_keeps_regex_semantics(self):
+        """
+        Extensions are regular expressions, as with the previous per-extension search.
+        """
+        matcher = shared_files.FileExclusionMatcher([".h5|.nc", r"\.tx?t"])
+
+        self.assertTrue(matcher.should_exclude("file.nc"))
+        self.assertTrue(matcher.should_exclude("file.h5"))
+        self.assertTrue(matcher.should_exclude("file.tt"))
+        self.assertTrue(matcher.should_exclude("file_h5"))
+        self.assertFalse(matcher.should_exclude("file.txtx"))
+
+    def test_should_exclude_empty_or_none(self):
+        """
+        No extensions should exclude nothing.
+        """
+        for excluded_file_extensions in [None, []]:
+            matcher = shared_files.FileExclusionMatcher(excluded_file_extensions)
+            self.assertFalse(matcher.should_exclude(uuid.uuid4().__str__()))
+            self.assertIsNone(matcher.get_matching_extension(uuid.uuid4().__str__()))
+
+    def test_get_matching_extension_returns_first_match(self):
+        """
+        The first configured extension that matches should be reported.
+        """
+        matcher = shared_files.FileExclusionMatcher([".met", ".xml", "cmr.xml"])
+
+        self.assertEqual(".xml", matcher.get_matching_extension("file.cmr.xml"))
+        self.assertIsNone(matcher.get_matching_extension("file.hdf"))
+
+    @patch("orca_shared.files.shared_files.LOGGER.info")
+    def test_filter_preserves_order(self, mock_info: MagicMock):
+        """
+        filter should remove excluded files, keep the order of the rest,
+        and log each exclusion.
+        """
+        files = [
+            {"key": "a.hdf"},
+            {"key": "b.xml"},
+            {"key": "c.hdf.met"},
+            {"key": "d.jpg"},
+        ]
+        matcher = shared_files.FileExclusionMatcher([".xml", ".met"])
+
+        result = matcher.filter(files, lambda file: file["key"])
+
+        self.assertEqual([{"key": "a.hdf"}, {"key": "d.jpg"}], result)
+        mock_info.assert_any_call(
+            "Excluding b.xml because it matches the excluded file type .xml."
+        )
+        self.assertEqual(2, mock_info.call_count)
+
+    def test_filter_defaults_to_file_as_key(self):
+        """
+        Without get_file_key, each file should be treated as its own key.
+        """
+        matcher = shared_files.FileExclusionMatcher([".xml"])
+
+        self.assertEqual(["a.hdf"], matcher.filter(["a.hdf", "b.xml"]))
+
+    def test_get_file_exclusion_matcher_caches(self):
+        """
+        The same configuration should reuse the same matcher.
+        """
+        extensions = [uuid.uuid4().__str__()]
+
+        first_matcher = shared_files.get_file_exclusion_matcher(extensions)
+        second_matcher = shared_files.get_file_exclusion_matcher(list(extensions))
+
+        self.assertIs(first_matcher, second_matcher)
+        self.assertEqual(extensions, first_matcher.excluded_file_extensions)
+        self.assertIs(
+            shared_files.get_file_exclusion_matcher(None),
+            shared_files.get_file_exclusion_matcher([]),
+        )
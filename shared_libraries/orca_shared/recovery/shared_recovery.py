@@ -19,6 +19,10 @@ from aws_lambda_powertools import Logger
 # Set AWS powertools
 LOGGER = Logger()
 
+# SQS limits for a single send_message_batch request.
+MAX_BATCH_ENTRIES = 10
+MAX_BATCH_SIZE_IN_BYTES = 262144
+
 
 class RequestMethod(Enum):
     """
@@ -121,6 +125,45 @@ def create_status_for_job(
     post_entry_to_fifo_queue(new_data, RequestMethod.NEW_JOB, db_queue_url)
 
 
+def create_status_for_jobs(
+    job_id: str,
+    archive_destination: str,
+    granules: List[Dict[str, Any]],
+    db_queue_url: str,
+) -> List[int]:
+    """
+    Creates status information for a new job for several granules at once,
+    and posts it to the queue in batches.
+    Args:
+        job_id: The unique identifier used for tracking requests.
+        archive_destination: The S3 bucket destination of where the data is archived.
+        granules: A List of Dicts with the following keys:
+            'collectionId' (str): The id of the collection containing the granule.
+            'granuleId' (str): The id of the granule being restored.
+            'files' (list(dict)): See create_status_for_job for details.
+        db_queue_url: The SQS queue URL defined by AWS.
+    Returns:
+        The indices of the granules whose status could not be posted.
+    """
+    request_time = datetime.now(timezone.utc).isoformat()
+    new_data_list = []
+    for granule in granules:
+        new_data = {
+            JOB_ID_KEY: job_id,
+            COLLECTION_ID_KEY: granule[COLLECTION_ID_KEY],
+            GRANULE_ID_KEY: granule[GRANULE_ID_KEY],
+            REQUEST_TIME_KEY: request_time,
+            ARCHIVE_DESTINATION_KEY: archive_destination,
+            FILES_KEY: granule[FILES_KEY],
+        }
+        LOGGER.debug(f"Sending the following data to queue: {new_data}")
+        new_data_list.append(new_data)
+
+    return post_entries_to_fifo_queue(
+        new_data_list, RequestMethod.NEW_JOB, db_queue_url
+    )
+
+
 def update_status_for_file(
     job_id: str,
     collection_id: str,
@@ -227,6 +270,108 @@ def post_entry_to_fifo_queue(
         )
 
 
+def post_entries_to_fifo_queue(
+    new_data_list: List[Dict[str, Any]],
+    request_method: RequestMethod,
+    db_queue_url: str,
+) -> List[int]:
+    """
+    Posts messages to SQS FIFO queue using as few send_message_batch calls as possible.
+    Messages keep their relative order, and share the MessageGroupId used by
+    post_entry_to_fifo_queue.
+    Args:
+        new_data_list: A list of dictionaries representing the column/value pairs
+            to write to the DB table.
+        request_method: The action for the database lambda to take when posting to the SQS queue.
+        db_queue_url: The SQS queue URL defined by AWS.
+    Returns:
+        The indices in new_data_list of the messages that were not accepted by SQS,
+        or whose MD5 did not match. Callers may retry these entries.
+    """
+    if len(new_data_list) == 0:
+        return []
+
+    LOGGER.debug(f"Creating SQS resource for {db_queue_url}")
+    mysqs_resource = boto3.resource("sqs", region_name=get_aws_region())
+    mysqs = mysqs_resource.Queue(db_queue_url)
+
+    # Group the messages into batches that fit within SQS limits.
+    batches = []
+    batch = []
+    batch_size = 0
+    for index, new_data in enumerate(new_data_list):
+        body = json.dumps(new_data)
+        body_size = len(body.encode("utf8"))
+        if len(batch) > 0 and (
+            len(batch) >= MAX_BATCH_ENTRIES
+            or batch_size + body_size > MAX_BATCH_SIZE_IN_BYTES
+        ):
+            batches.append(batch)
+            batch = []
+            batch_size = 0
+        batch.append((index, body))
+        batch_size += body_size
+    batches.append(batch)
+
+    failed_indices = []
+    for batch in batches:
+        entries = []
+        md5_bodies = {}
+        for index, body in batch:
+            # Create hash for De-duplication ID max size is 128 characters
+            # sha256 will be 64 characters long sha512 is 128 characters
+            deduplication_id = (
+                request_method.value + hashlib.sha256(body.encode("utf8")).hexdigest()
+            )
+            md5_bodies[str(index)] = hashlib.md5(  # nosec
+                body.encode("utf8")
+            ).hexdigest()
+            entries.append(
+                {
+                    "Id": str(index),
+                    "MessageDeduplicationId": deduplication_id,
+                    "MessageGroupId": "request_files",
+                    "MessageAttributes": {
+                        "RequestMethod": {
+                            "DataType": "String",
+                            "StringValue": request_method.value,
+                        }
+                    },
+                    "MessageBody": body,
+                }
+            )
+
+        LOGGER.debug(f"Sending {len(entries)} messages to the QUEUE")
+        try:
+            response = mysqs.send_messages(Entries=entries)
+        except Exception as ex:
+            LOGGER.error(f"Failed to send {len(entries)} messages to Queue: {ex}")
+            failed_indices.extend(index for index, _ in batch)
+            continue
+        LOGGER.debug(f"SQS Message Response: {json.dumps(response)}")
+
+        accepted_ids = set()
+        for successful in response.get("Successful", []):
+            sqs_md5 = successful.get("MD5OfMessageBody")
+            if md5_bodies[successful["Id"]] != sqs_md5:
+                LOGGER.error(
+                    f"Calculated MD5 of {md5_bodies[successful['Id']]} "
+                    f"does not match SQS MD5 of {sqs_md5}"
+                )
+                continue
+            accepted_ids.add(successful["Id"])
+        for failed in response.get("Failed", []):
+            LOGGER.error(
+                f"Failed to send message {failed['Id']} to Queue. "
+                f"Code '{failed.get('Code')}': {failed.get('Message')}"
+            )
+        failed_indices.extend(
+            index for index, _ in batch if str(index) not in accepted_ids
+        )
+
+    return failed_indices
+
+
 def post_entry_to_standard_queue(
     new_data: Dict[str, Any],
     recovery_queue_url: str,
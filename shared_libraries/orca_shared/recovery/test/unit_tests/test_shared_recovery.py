@@ -9,7 +9,7 @@ import unittest
 import uuid
 from datetime import datetime, timezone
 from unittest import mock
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import boto3
 from moto import mock_sqs
@@ -175,6 +175,157 @@ class TestSharedRecoveryLibraries(unittest.TestCase):
         )
         self.assertEqual(timezone.utc, new_request_time.tzinfo)
 
+    @patch.dict(
+        os.environ,
+        {"AWS_REGION": "us-west-2"},
+        clear=True,
+    )
+    def test_create_status_for_jobs_no_errors(self):
+        """
+        *Happy Path*
+        Tests that one NEW_JOB message per granule is sent to the queue, in order.
+        """
+        archive_destination = "s3://archive-bucket"
+        granules = [
+            {
+                shared_recovery.COLLECTION_ID_KEY: uuid.uuid4().__str__(),
+                shared_recovery.GRANULE_ID_KEY: uuid.uuid4().__str__(),
+                shared_recovery.FILES_KEY: [
+                    {uuid.uuid4().__str__(): uuid.uuid4().__str__()}
+                ],
+            }
+            for _ in range(12)
+        ]
+
+        failed_indices = shared_recovery.create_status_for_jobs(
+            self.job_id,
+            archive_destination,
+            granules,
+            self.fifo_queue_url,
+        )
+
+        self.assertEqual([], failed_indices)
+        queue_output_bodies = []
+        while True:
+            queue_contents = self.fifo_queue.receive_messages(
+                MaxNumberOfMessages=10, MessageAttributeNames=["All"]
+            )
+            if len(queue_contents) == 0:
+                break
+            for queue_content in queue_contents:
+                self.assertEqual(
+                    shared_recovery.RequestMethod.NEW_JOB.value,
+                    queue_content.message_attributes["RequestMethod"]["StringValue"],
+                )
+                queue_output_bodies.append(json.loads(queue_content.body))
+                queue_content.delete()
+        self.assertEqual(
+            [
+                {
+                    shared_recovery.JOB_ID_KEY: self.job_id,
+                    shared_recovery.COLLECTION_ID_KEY: granule[
+                        shared_recovery.COLLECTION_ID_KEY
+                    ],
+                    shared_recovery.FILES_KEY: granule[shared_recovery.FILES_KEY],
+                    shared_recovery.GRANULE_ID_KEY: granule[
+                        shared_recovery.GRANULE_ID_KEY
+                    ],
+                    shared_recovery.REQUEST_TIME_KEY: mock.ANY,
+                    shared_recovery.ARCHIVE_DESTINATION_KEY: archive_destination,
+                }
+                for granule in granules
+            ],
+            queue_output_bodies,
+        )
+
+    @patch.dict(
+        os.environ,
+        {"AWS_REGION": "us-west-2"},
+        clear=True,
+    )
+    @patch("boto3.resource")
+    def test_post_entries_to_fifo_queue_returns_failed_indices(
+        self, mock_resource: MagicMock
+    ):
+        """
+        Entries rejected by SQS, with a mismatched MD5, or in a batch that raised,
+        should be returned so the caller can retry them.
+        """
+        new_data_list = [{"name": f"test{index}"} for index in range(21)]
+        mock_queue = mock_resource.return_value.Queue.return_value
+
+        def send_messages_side_effect(Entries):
+            ids = [entry["Id"] for entry in Entries]
+            if "20" in ids:
+                raise Exception("Service unavailable")
+            successful = []
+            for entry in Entries:
+                md5 = shared_recovery.hashlib.md5(  # nosec
+                    entry["MessageBody"].encode("utf8")
+                ).hexdigest()
+                if entry["Id"] == "3":
+                    continue
+                if entry["Id"] == "12":
+                    md5 = "bad"
+                successful.append({"Id": entry["Id"], "MD5OfMessageBody": md5})
+            return {
+                "Successful": successful,
+                "Failed": (
+                    [{"Id": "3", "Code": "InternalError", "Message": "?"}]
+                    if "3" in ids
+                    else []
+                ),
+            }
+
+        mock_queue.send_messages.side_effect = send_messages_side_effect
+
+        failed_indices = shared_recovery.post_entries_to_fifo_queue(
+            new_data_list,
+            shared_recovery.RequestMethod.NEW_JOB,
+            self.fifo_queue_url,
+        )
+
+        self.assertEqual([3, 12, 20], failed_indices)
+        self.assertEqual(3, mock_queue.send_messages.call_count)
+        for call_args in mock_queue.send_messages.call_args_list:
+            self.assertLessEqual(
+                len(call_args.kwargs["Entries"]), shared_recovery.MAX_BATCH_ENTRIES
+            )
+
+    @patch.dict(
+        os.environ,
+        {"AWS_REGION": "us-west-2"},
+        clear=True,
+    )
+    @patch("boto3.resource")
+    def test_post_entries_to_fifo_queue_splits_on_size(self, mock_resource: MagicMock):
+        """
+        Batches should not exceed the SQS batch size limit.
+        """
+        large_value = "a" * (shared_recovery.MAX_BATCH_SIZE_IN_BYTES // 2)
+        new_data_list = [{"name": large_value} for _ in range(3)]
+        mock_queue = mock_resource.return_value.Queue.return_value
+        mock_queue.send_messages.side_effect = lambda Entries: {
+            "Successful": [
+                {
+                    "Id": entry["Id"],
+                    "MD5OfMessageBody": shared_recovery.hashlib.md5(  # nosec
+                        entry["MessageBody"].encode("utf8")
+                    ).hexdigest(),
+                }
+                for entry in Entries
+            ]
+        }
+
+        failed_indices = shared_recovery.post_entries_to_fifo_queue(
+            new_data_list,
+            shared_recovery.RequestMethod.NEW_JOB,
+            self.fifo_queue_url,
+        )
+
+        self.assertEqual([], failed_indices)
+        self.assertEqual(3, mock_queue.send_messages.call_count)
+
     def test_update_status_for_file_no_errors(self):
         """
         *Happy Path*
@@ -0,0 +1,2 @@
+# flake8: noqa
+from .shared_retry import RetryEngine, get_full_jitter_delay
@@ -0,0 +1,189 @@
+"""
+Name: shared_retry.py
+Description: Shared library that retries failed items with per-item exponential backoff,
+             full jitter, and a time budget based on the Lambda's remaining time.
+"""
+
+# Standard libraries
+import random
+import time
+from concurrent.futures import Executor
+from typing import Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+# Third party libraries
+from aws_lambda_powertools import Logger
+
+# Set AWS powertools
+LOGGER = Logger()
+
+DEFAULT_MAX_DELAY_SECS = 120
+DEFAULT_TIME_BUDGET_MARGIN_SECS = 10
+
+ItemType = TypeVar("ItemType")
+
+
+def get_full_jitter_delay(
+    retry: int,
+    base_delay_secs: float,
+    max_delay_secs: float = DEFAULT_MAX_DELAY_SECS,
+) -> float:
+    """
+    Returns a delay chosen uniformly between 0 and the capped exponential backoff.
+    See https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/
+    Args:
+        retry: The number of the upcoming retry, starting at 1.
+        base_delay_secs: The backoff ceiling for the first retry.
+        max_delay_secs: The largest backoff ceiling used for any retry.
+    Returns:
+        The number of seconds to wait before the retry.
+    """
+    ceiling = min(max_delay_secs, base_delay_secs * 2 ** (retry - 1))
+    if ceiling <= 0:
+        return 0
+    return random.uniform(0, ceiling)  # nosec
+
+
+class RetryEngine(Generic[ItemType]):
+    """
+    Runs an operation over a list of items, retrying only the items that failed.
+    Each failed item waits its own full-jitter exponential backoff before its next attempt.
+    Retries stop when an item has been retried max_retries times, or when waiting
+    for the next retry would leave less than time_budget_margin_secs of Lambda time.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_retries: int,
+        base_delay_secs: float,
+        max_delay_secs: float = DEFAULT_MAX_DELAY_SECS,
+        get_remaining_time_in_millis: Optional[Callable[[], int]] = None,
+        time_budget_margin_secs: float = DEFAULT_TIME_BUDGET_MARGIN_SECS,
+    ):
+        """
+        Args:
+            name: Identifies the engine in log messages.
+            max_retries: The number of times a failed item may be retried.
+            base_delay_secs: The backoff ceiling for the first retry.
+            max_delay_secs: The largest backoff ceiling used for any retry.
+            get_remaining_time_in_millis: Usually LambdaContext.get_remaining_time_in_millis.
+                If None, retries are only limited by max_retries.
+            time_budget_margin_secs: Lambda time to leave unused after the last retry wait,
+                so the caller can report the final results.
+        """
+        self.name = name
+        self.max_retries = max_retries
+        self.base_delay_secs = base_delay_secs
+        self.max_delay_secs = max_delay_secs
+        self.get_remaining_time_in_millis = get_remaining_time_in_millis
+        self.time_budget_margin_secs = time_budget_margin_secs
+        self.counters = {
+            "attempts": 0,
+            "retries": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "out_of_time": 0,
+        }
+
+    def run(
+        self,
+        items: List[ItemType],
+        operation: Callable[[ItemType, int], bool],
+        executor: Optional[Executor] = None,
+    ) -> List[ItemType]:
+        """
+        Calls operation(item, attempt) for each item until it returns True.
+        Exceptions raised by operation are not caught.
+        Args:
+            items: The items to process.
+            operation: Returns True if the item succeeded. attempt starts at 1.
+            executor: If given, the ready items of each pass are run concurrently on it.
+        Returns:
+            The items that never succeeded, in their original order.
+        """
+
+        def attempt_items(ready: List[Tuple[ItemType, int]]) -> List[bool]:
+            if executor is None:
+                return [operation(item, attempt) for item, attempt in ready]
+            futures = [
+                executor.submit(operation, item, attempt) for item, attempt in ready
+            ]
+            return [future.result() for future in futures]
+
+        return self._run(items, attempt_items)
+
+    def run_batch(
+        self,
+        items: List[ItemType],
+        operation: Callable[[List[ItemType]], List[bool]],
+    ) -> List[ItemType]:
+        """
+        Calls operation once per pass with every item that is ready to be tried.
+        Useful for APIs that accept several items per request, such as SQS batches.
+        Exceptions raised by operation are not caught.
+        Args:
+            items: The items to process.
+            operation: Returns one bool per given item, True if that item succeeded.
+        Returns:
+            The items that never succeeded, in their original order.
+        """
+        return self._run(items, lambda ready: operation([item for item, _ in ready]))
+
+    def _run(
+        self,
+        items: List[ItemType],
+        attempt_items: Callable[[List[Tuple[ItemType, int]]], List[bool]],
+    ) -> List[ItemType]:
+        # Each entry is (ready_at, original index, item, attempt).
+        pending = [(0.0, index, item, 1) for index, item in enumerate(items)]
+        failed: Dict[int, ItemType] = {}
+        now = time.monotonic()
+        while len(pending) > 0:
+            ready = [entry for entry in pending if entry[0] <= now]
+            if len(ready) == 0:
+                wait_secs = min(entry[0] for entry in pending) - now
+                if not self._has_time_for(wait_secs):
+                    LOGGER.warning(
+                        f"{self.name}: Not enough time left to retry {len(pending)} "
+                        f"item(s) in {wait_secs:.2f} seconds."
+                    )
+                    self.counters["out_of_time"] += len(pending)
+                    for _, index, item, _ in pending:
+                        failed[index] = item
+                    break
+                time.sleep(wait_secs)
+                now = max(time.monotonic(), now + wait_secs)
+                continue
+
+            pending = [entry for entry in pending if entry[0] > now]
+            self.counters["attempts"] += len(ready)
+            results = attempt_items([(item, attempt) for _, _, item, attempt in ready])
+            now = time.monotonic()
+            for (_, index, item, attempt), succeeded in zip(ready, results):
+                if succeeded:
+                    self.counters["succeeded"] += 1
+                elif attempt > self.max_retries:
+                    self.counters["failed"] += 1
+                    failed[index] = item
+                else:
+                    delay_secs = get_full_jitter_delay(
+                        attempt, self.base_delay_secs, self.max_delay_secs
+                    )
+                    LOGGER.warning(
+                        f"{self.name}: Attempt {attempt} failed. "
+                        f"Retrying in {delay_secs:.2f} seconds."
+                    )
+                    self.counters["retries"] += 1
+                    pending.append((now + delay_secs, index, item, attempt + 1))
+
+        LOGGER.info(f"{self.name}: Retry counters {self.counters}")
+        return [failed[index] for index in sorted(failed)]
+
+    def _has_time_for(self, wait_secs: float) -> bool:
+        """
+        Returns True if waiting wait_secs still leaves the margin of Lambda time.
+        """
+        if self.get_remaining_time_in_millis is None:
+            return True
+        remaining_secs = self.get_remaining_time_in_millis() / 1000
+        return remaining_secs - wait_secs >= self.time_budget_margin_secs
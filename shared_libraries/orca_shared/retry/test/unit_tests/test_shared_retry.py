@@ -0,0 +1,138 @@
+"""
+Name: test_shared_retry.py
+Description: Unit tests for shared_retry.py shared library.
+"""
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, Mock, call, patch
+
+from orca_shared.retry import shared_retry
+
+
+class TestSharedRetryLibraries(unittest.TestCase):
+    """
+    Unit tests for the shared_retry library.
+    """
+
+    @patch("orca_shared.retry.shared_retry.random.uniform")
+    def test_get_full_jitter_delay_caps_exponential_ceiling(
+        self, mock_uniform: MagicMock
+    ):
+        """
+        The jitter ceiling should double each retry up to max_delay_secs.
+        """
+        for retry, expected_ceiling in [(1, 3), (2, 6), (3, 12), (4, 20), (9, 20)]:
+            with self.subTest(retry=retry):
+                result = shared_retry.get_full_jitter_delay(retry, 3, 20)
+
+                mock_uniform.assert_called_with(0, expected_ceiling)
+                self.assertEqual(mock_uniform.return_value, result)
+
+    def test_get_full_jitter_delay_zero_base_is_zero(self):
+        self.assertEqual(0, shared_retry.get_full_jitter_delay(5, 0))
+
+    @patch("time.sleep")
+    @patch("orca_shared.retry.shared_retry.get_full_jitter_delay")
+    def test_run_only_retries_failed_items(
+        self, mock_get_full_jitter_delay: MagicMock, mock_sleep: MagicMock
+    ):
+        """
+        Items that succeed are not retried, and each retry waits the jittered delay.
+        """
+        mock_get_full_jitter_delay.side_effect = [5, 7]
+        outcomes = {"a": [True], "b": [False, False, True], "c": [True]}
+        operation = Mock(side_effect=lambda item, attempt: outcomes[item][attempt - 1])
+        engine = shared_retry.RetryEngine("test", 3, 2)
+
+        result = engine.run(["a", "b", "c"], operation)
+
+        self.assertEqual([], result)
+        operation.assert_has_calls(
+            [call("a", 1), call("b", 1), call("c", 1), call("b", 2), call("b", 3)]
+        )
+        self.assertEqual(5, operation.call_count)
+        mock_get_full_jitter_delay.assert_has_calls(
+            [call(1, 2, shared_retry.DEFAULT_MAX_DELAY_SECS), call(2, 2, 120)]
+        )
+        self.assertEqual(2, mock_sleep.call_count)
+        self.assertAlmostEqual(5, mock_sleep.call_args_list[0].args[0], delta=1)
+        self.assertAlmostEqual(7, mock_sleep.call_args_list[1].args[0], delta=1)
+        self.assertEqual(
+            {
+                "attempts": 5,
+                "retries": 2,
+                "succeeded": 3,
+                "failed": 0,
+                "out_of_time": 0,
+            },
+            engine.counters,
+        )
+
+    @patch("time.sleep")
+    def test_run_returns_items_past_max_retries_in_order(self, mock_sleep: MagicMock):
+        engine = shared_retry.RetryEngine("test", 2, 0)
+        operation = Mock(side_effect=lambda item, attempt: item == "b")
+
+        result = engine.run(["c", "b", "a"], operation)
+
+        self.assertEqual(["c", "a"], result)
+        self.assertEqual(7, operation.call_count)
+        mock_sleep.assert_not_called()
+        self.assertEqual(2, engine.counters["failed"])
+        self.assertEqual(4, engine.counters["retries"])
+
+    @patch("time.sleep")
+    @patch("orca_shared.retry.shared_retry.get_full_jitter_delay")
+    def test_run_stops_when_time_budget_exhausted(
+        self, mock_get_full_jitter_delay: MagicMock, mock_sleep: MagicMock
+    ):
+        """
+        A retry that would leave less than the margin of Lambda time is not attempted.
+        """
+        mock_get_full_jitter_delay.return_value = 30
+        get_remaining_time_in_millis = Mock(return_value=35000)
+        engine = shared_retry.RetryEngine(
+            "test",
+            5,
+            20,
+            get_remaining_time_in_millis=get_remaining_time_in_millis,
+            time_budget_margin_secs=10,
+        )
+        operation = Mock(return_value=False)
+
+        result = engine.run(["a"], operation)
+
+        self.assertEqual(["a"], result)
+        operation.assert_called_once_with("a", 1)
+        mock_sleep.assert_not_called()
+        self.assertEqual(1, engine.counters["out_of_time"])
+
+    @patch("time.sleep")
+    def test_run_uses_executor(self, mock_sleep: MagicMock):
+        operation = Mock(side_effect=lambda item, attempt: attempt == 2)
+        engine = shared_retry.RetryEngine("test", 1, 0)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            result = engine.run(list(range(8)), operation, executor=executor)
+
+        self.assertEqual([], result)
+        self.assertEqual(16, operation.call_count)
+
+    @patch("time.sleep")
+    def test_run_batch_passes_ready_items_together(self, mock_sleep: MagicMock):
+        """
+        Only the items that failed in a batch are sent in the next batch.
+        """
+        batches = []
+
+        def operation(items):
+            batches.append(list(items))
+            return [item != "b" or len(batches) > 1 for item in items]
+
+        engine = shared_retry.RetryEngine("test", 2, 0)
+
+        result = engine.run_batch(["a", "b", "c"], operation)
+
+        self.assertEqual([], result)
+        self.assertEqual([["a", "b", "c"], ["b"]], batches)
@@ -0,0 +1,7 @@
+# flake8: noqa
+from .shared_transfer import (
+    TransferPlan,
+    get_part_ranges,
+    log_transfer_throughput,
+    plan_transfer,
+)
@@ -0,0 +1,150 @@
+"""
+Name: shared_transfer.py
+Description: Shared library that plans how S3 objects are copied based on their size,
+             choosing between a single copy and a multipart copy, the chunk size,
+             and the number of parts copied at once.
+"""
+
+# Standard libraries
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+# Third party libraries
+from aws_lambda_powertools import Logger
+from boto3.s3.transfer import MB, TransferConfig
+
+# Set AWS powertools
+LOGGER = Logger()
+
+# Limits set by S3 on multipart copies.
+MIN_PART_SIZE_BYTES = 5 * MB
+MAX_PART_SIZE_BYTES = 5 * 1024 * MB
+MAX_PART_COUNT = 10000
+
+# Objects under this size are always copied in one request.
+# Matches the default multipart_threshold of boto3's TransferConfig.
+MIN_MULTIPART_SIZE_BYTES = 8 * MB
+MIN_AUTO_CHUNKSIZE_BYTES = 8 * MB
+# Enough parts per worker that one slow part does not leave the others idle.
+PARTS_PER_WORKER = 4
+
+
+@dataclass(frozen=True)
+class TransferPlan:
+    """
+    How to copy a single object.
+    Attributes:
+        size_in_bytes: The size of the object being copied.
+        multipart: False if the object should be copied with a single copy_object.
+        chunksize_bytes: The size of each part of a multipart copy.
+        part_count: The number of parts the object is copied in.
+        max_concurrency: The number of parts to copy at once.
+        chunksize_overridden: True if chunksize_bytes came from a collection override.
+    """
+
+    size_in_bytes: int
+    multipart: bool
+    chunksize_bytes: int
+    part_count: int
+    max_concurrency: int
+    chunksize_overridden: bool
+
+    def get_transfer_config(self) -> TransferConfig:
+        """
+        Returns:
+            A TransferConfig that makes a managed copy follow this plan.
+        """
+        return TransferConfig(
+            multipart_threshold=(
+                self.chunksize_bytes if self.multipart else self.size_in_bytes + 1
+            ),
+            multipart_chunksize=self.chunksize_bytes,
+            max_concurrency=self.max_concurrency,
+        )
+
+
+def plan_transfer(
+    size_in_bytes: int,
+    max_concurrency: int,
+    max_chunksize_mb: int,
+    chunksize_override_mb: Optional[int] = None,
+) -> TransferPlan:
+    """
+    Chooses how to copy an object of the given size.
+    Without an override, the chunk size is picked so each of the max_concurrency
+    workers gets several parts, between MIN_AUTO_CHUNKSIZE_BYTES and max_chunksize_mb.
+    Either way, the chunk size is raised if needed to stay within S3's part limits.
+    Objects that fit in a single chunk are copied in one request.
+    Args:
+        size_in_bytes: The size of the object, usually from head_object.
+        max_concurrency: The most parts that may be copied at once.
+        max_chunksize_mb: The largest chunk size to pick automatically.
+        chunksize_override_mb: The collection's chunk size. If given, it is used as is.
+    Returns:
+        The plan for the copy.
+    """
+    max_concurrency = max(1, max_concurrency)
+    if chunksize_override_mb is not None:
+        chunksize_bytes = chunksize_override_mb * MB
+    else:
+        chunksize_bytes = math.ceil(
+            size_in_bytes / (max_concurrency * PARTS_PER_WORKER)
+        )
+        chunksize_bytes = min(
+            max(chunksize_bytes, MIN_AUTO_CHUNKSIZE_BYTES),
+            max(max_chunksize_mb * MB, MIN_AUTO_CHUNKSIZE_BYTES),
+        )
+    chunksize_bytes = max(
+        chunksize_bytes,
+        math.ceil(size_in_bytes / MAX_PART_COUNT),
+        MIN_PART_SIZE_BYTES,
+    )
+    # Whole megabytes keep the plan readable in logs.
+    chunksize_bytes = min(math.ceil(chunksize_bytes / MB) * MB, MAX_PART_SIZE_BYTES)
+
+    multipart = (
+        size_in_bytes >= MIN_MULTIPART_SIZE_BYTES and size_in_bytes > chunksize_bytes
+    )
+    part_count = math.ceil(size_in_bytes / chunksize_bytes) if multipart else 1
+    return TransferPlan(
+        size_in_bytes=size_in_bytes,
+        multipart=multipart,
+        chunksize_bytes=chunksize_bytes,
+        part_count=part_count,
+        max_concurrency=min(max_concurrency, part_count),
+        chunksize_overridden=chunksize_override_mb is not None,
+    )
+
+
+def get_part_ranges(plan: TransferPlan) -> List[Tuple[int, int, int]]:
+    """
+    Splits a multipart plan into the byte ranges of its parts.
+    The ranges only depend on the plan, so a copy can be resumed part by part.
+    Args:
+        plan: The plan for the copy.
+    Returns:
+        A tuple of part number, first byte and last byte for each part, in order.
+        The last byte is inclusive, as in a CopySourceRange.
+    """
+    part_ranges = []
+    for index in range(plan.part_count):
+        first_byte = index * plan.chunksize_bytes
+        last_byte = min(first_byte + plan.chunksize_bytes, plan.size_in_bytes) - 1
+        part_ranges.append((index + 1, first_byte, last_byte))
+    return part_ranges
+
+
+def log_transfer_throughput(key: str, plan: TransferPlan, elapsed_secs: float) -> None:
+    """
+    Logs how long a copy took and its throughput.
+    Args:
+        key: The key of the copied object.
+        plan: The plan the copy followed.
+        elapsed_secs: How long the copy took.
+    """
+    throughput_mb_per_sec = plan.size_in_bytes / MB / max(elapsed_secs, 0.001)
+    LOGGER.info(
+        f"Copied '{key}' ({plan.size_in_bytes} bytes in {plan.part_count} part(s)) "
+        f"in {elapsed_secs:.2f} seconds at {throughput_mb_per_sec:.2f} MB/s."
+    )
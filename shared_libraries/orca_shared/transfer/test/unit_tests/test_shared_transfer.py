@@ -0,0 +1,119 @@
+"""
+Name: test_shared_transfer.py
+Description: Unit tests for shared_transfer.py shared library.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from boto3.s3.transfer import MB
+
+from orca_shared.transfer import shared_transfer
+
+
+class TestSharedTransferLibraries(unittest.TestCase):
+    """
+    Unit tests for the shared_transfer library.
+    """
+
+    def test_plan_transfer_small_file_single_copy(self):
+        """
+        Files under the multipart minimum are copied in one request.
+        """
+        plan = shared_transfer.plan_transfer(3 * MB, 10, 250)
+
+        self.assertFalse(plan.multipart)
+        self.assertEqual(1, plan.part_count)
+        self.assertEqual(1, plan.max_concurrency)
+        self.assertFalse(plan.chunksize_overridden)
+
+    def test_plan_transfer_spreads_parts_across_workers(self):
+        """
+        Without an override, each worker should get several parts,
+        up to the maximum chunk size.
+        """
+        for size, expected_chunksize, expected_part_count in [
+            (400 * MB, 10 * MB, 40),
+            (100 * MB, 8 * MB, 13),
+            (100 * 1024 * MB, 250 * MB, 410),
+        ]:
+            with self.subTest(size=size):
+                plan = shared_transfer.plan_transfer(size, 10, 250)
+
+                self.assertTrue(plan.multipart)
+                self.assertEqual(expected_chunksize, plan.chunksize_bytes)
+                self.assertEqual(expected_part_count, plan.part_count)
+                self.assertEqual(10, plan.max_concurrency)
+
+    def test_plan_transfer_override_wins(self):
+        """
+        A collection override should be used as is, including for mid-sized files.
+        """
+        plan = shared_transfer.plan_transfer(100 * MB, 10, 250, chunksize_override_mb=5)
+
+        self.assertTrue(plan.multipart)
+        self.assertEqual(5 * MB, plan.chunksize_bytes)
+        self.assertEqual(20, plan.part_count)
+        self.assertTrue(plan.chunksize_overridden)
+
+    def test_plan_transfer_file_within_override_single_copy(self):
+        plan = shared_transfer.plan_transfer(
+            200 * MB, 10, 250, chunksize_override_mb=250
+        )
+
+        self.assertFalse(plan.multipart)
+        self.assertEqual(1, plan.part_count)
+
+    def test_plan_transfer_respects_part_count_limit(self):
+        """
+        Chunks should grow past the override when needed to stay within 10,000 parts.
+        """
+        size = 5 * 1024 * 1024 * MB
+        plan = shared_transfer.plan_transfer(size, 10, 250, chunksize_override_mb=100)
+
+        self.assertEqual(525 * MB, plan.chunksize_bytes)
+        self.assertEqual(9987, plan.part_count)
+        self.assertTrue(plan.multipart)
+
+    def test_plan_transfer_concurrency_limited_by_parts(self):
+        plan = shared_transfer.plan_transfer(20 * MB, 10, 250, chunksize_override_mb=8)
+
+        self.assertEqual(3, plan.part_count)
+        self.assertEqual(3, plan.max_concurrency)
+
+    def test_get_transfer_config_follows_plan(self):
+        multipart_plan = shared_transfer.plan_transfer(400 * MB, 10, 250)
+        single_plan = shared_transfer.plan_transfer(3 * MB, 10, 250)
+
+        multipart_config = multipart_plan.get_transfer_config()
+        single_config = single_plan.get_transfer_config()
+
+        self.assertEqual(10 * MB, multipart_config.multipart_chunksize)
+        self.assertEqual(10, multipart_config.max_concurrency)
+        self.assertLessEqual(multipart_config.multipart_threshold, 400 * MB)
+        self.assertGreater(single_config.multipart_threshold, 3 * MB)
+
+    def test_get_part_ranges_covers_object(self):
+        plan = shared_transfer.plan_transfer(20 * MB, 10, 250, chunksize_override_mb=8)
+
+        result = shared_transfer.get_part_ranges(plan)
+
+        self.assertEqual(
+            [
+                (1, 0, 8 * MB - 1),
+                (2, 8 * MB, 16 * MB - 1),
+                (3, 16 * MB, 20 * MB - 1),
+            ],
+            result,
+        )
+
+    @patch("orca_shared.transfer.shared_transfer.LOGGER")
+    def test_log_transfer_throughput(self, mock_logger: MagicMock):
+        plan = shared_transfer.plan_transfer(400 * MB, 10, 250)
+
+        shared_transfer.log_transfer_throughput("some/key", plan, 4)
+
+        mock_logger.info.assert_called_once_with(
+            f"Copied 'some/key' ({400 * MB} bytes in 40 part(s)) "
+            "in 4.00 seconds at 100.00 MB/s."
+        )
@@ -46,7 +46,14 @@ for library_name in [
 
 # Update with library specific requirements
 extras_per_library.update(
-    {"database": [_dep_boto3, _dep_sqlalchemy], "recovery": [_dep_boto3], "reconciliation": []}
+    {
+        "database": [_dep_boto3, _dep_sqlalchemy],
+        "recovery": [_dep_boto3],
+        "reconciliation": [],
+        "files": [],
+        "retry": [],
+        "transfer": [_dep_boto3],
+    }
 )
 
 
@@ -7,16 +7,15 @@ to another s3 bucket.
 import json
 import os
 import time
-from typing import Any, Dict, List, Optional, Union
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import boto3
 import fastjsonschema
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
-# noinspection PyPackageRequirements
-from boto3.s3.transfer import MB, TransferConfig
-
 # noinspection PyPackageRequirements
 from botocore.client import BaseClient
 from botocore.config import Config
@@ -24,15 +23,34 @@ from botocore.config import Config
 # noinspection PyPackageRequirements
 from botocore.exceptions import ClientError
 from orca_shared.recovery import shared_recovery
+from orca_shared.retry import shared_retry
+from orca_shared.transfer import shared_transfer
 
 OS_ENVIRON_STATUS_UPDATE_QUEUE_URL_KEY = "STATUS_UPDATE_QUEUE_URL"
 OS_ENVIRON_DEFAULT_MAX_POOL_CONNECTIONS_KEY = "DEFAULT_MAX_POOL_CONNECTIONS"
 OS_ENVIRON_DEFAULT_MAX_CONCURRENCY_KEY = "DEFAULT_MAX_CONCURRENCY"
+OS_ENVIRON_LAMBDA_TIMEOUT_SECS_KEY = "LAMBDA_TIMEOUT_SECS"
 
 # These will determine what the output looks like.
 FILE_SUCCESS_KEY = "success"
 FILE_ERROR_MESSAGE_KEY = "errorMessage"
 FILE_MESSAGE_RECEIPT = "receiptHandle"
+FILE_MESSAGE_ID_KEY = "messageId"
+FILE_REDELIVER_KEY = "redeliver"
+
+# These are tied to the Lambda partial batch response for SQS.
+OUTPUT_BATCH_ITEM_FAILURES_KEY = "batchItemFailures"
+OUTPUT_ITEM_IDENTIFIER_KEY = "itemIdentifier"
+
+# The most messages SQS will delete in a single delete_message_batch request.
+MAX_DELETE_BATCH_ENTRIES = 10
+
+# New parts are not started with less than this much Lambda time left,
+# so they are not lost to a timeout. Finished parts are resumed on redelivery.
+PART_COPY_TIME_MARGIN_SECS = 30
+# The longest a Lambda can run. Unfinished uploads older than the Lambda timeout
+# were started by invocations that have ended, so can be aborted.
+MAX_LAMBDA_TIMEOUT_SECS = 900
 
 # These are tied to the input schema.
 INPUT_JOB_ID_KEY = "jobId"
@@ -65,9 +83,10 @@ except Exception as ex:
     raise
 
 
-class CopyRequestError(Exception):
+class CopyOutOfTimeError(Exception):
     """
-    Exception to be raised if the copy request fails for any of the files.
+    Exception to be raised if a multipart copy runs out of Lambda time.
+    The copy is not failed, as the next delivery of the file resumes it.
     """
 
 
@@ -78,98 +97,181 @@ def task(
     status_update_queue_url: str,
     default_multipart_chunksize_mb: int,
     recovery_queue_url: str,
-) -> None:
+    get_remaining_time_in_millis: Optional[Callable[[], int]] = None,
+    lambda_timeout_secs: int = MAX_LAMBDA_TIMEOUT_SECS,
+) -> Dict[str, List[Dict[str, str]]]:
     """
     Task called by the handler to perform the work.
-    This task will call copy_object for each file. A copy will be tried
-    up to {retries} times if it fails, waiting {retry_sleep_secs}
-    between each attempt.
+    This task will call copy_object for each file. Files are copied concurrently.
+    Their copy requests share one executor of DEFAULT_MAX_CONCURRENCY workers,
+    so a large file can use the whole budget once the other files are done.
+    Each file's status is posted and its message deleted as soon as its copy finishes,
+    so a timeout does not redeliver files that were already copied.
+    The messages for failed copies are reported so only they are redelivered.
+    Copies that run out of time, or whose status or message deletion fails,
+    are also reported, but keep their status, as the redelivered file finishes them.
+    A failed copy will be retried up to {retries} times, with exponential backoff
+    and full jitter starting at {retry_sleep_secs}. Only the files that failed are retried.
     Args:
         records: Passed through from the handler.
         max_retries: The number of attempts to retry a failed copy.
-        retry_sleep_secs: The number of seconds
-            to sleep between retry attempts.
+        retry_sleep_secs: The backoff ceiling for the first retry.
         status_update_queue_url: The URL of the queue that posts status entries.
-        default_multipart_chunksize_mb: The multipart_chunksize to use if not set on file.
+        default_multipart_chunksize_mb: The largest chunk size to choose from a file's size
+            if the file does not set s3MultipartChunksizeMb.
         recovery_queue_url: The URL of the queue that this lambda is receiving messages from.
-    Raises:
-        CopyRequestError: Thrown if there are errors with the input records or the copy failed.
+        get_remaining_time_in_millis: Returns the Lambda's remaining time.
+            Retries are not started if they would run past it.
+        lambda_timeout_secs: The Lambda's timeout. Unfinished uploads older than this
+            are aborted, as no invocation can still be copying to them.
+    Returns:
+        A Lambda partial batch response, listing the messageId of each failed file
+        under 'batchItemFailures'.
     """
     files = get_files_from_records(records)
     default_max_pool_connections = int(
         os.environ[OS_ENVIRON_DEFAULT_MAX_POOL_CONNECTIONS_KEY]
     )
-    LOGGER.info(default_max_pool_connections)
+    default_max_concurrency = int(os.environ[OS_ENVIRON_DEFAULT_MAX_CONCURRENCY_KEY])
+    max_files_in_flight = max(1, min(len(files), default_max_concurrency))
+    LOGGER.info(
+        f"Copying {len(files)} file(s), {max_files_in_flight} at a time "
+        f"with up to {default_max_concurrency} copy requests in flight in total. "
+        f"Max pool connections: {default_max_pool_connections}."
+    )
     s3 = boto3.client(
         "s3", config=Config(max_pool_connections=default_max_pool_connections)
     )  # pylint: disable-msg=invalid-name
     aws_client_sqs = boto3.client("sqs")
 
-    for attempt in range(1, max_retries + 1):
-        for a_file in files:
-            # All files from get_files_from_records start with 'success' == False.
-            if not a_file[FILE_SUCCESS_KEY]:
-                LOGGER.debug(f"Restoring file {a_file[INPUT_SOURCE_KEY_KEY]}")
-                err_msg = copy_object(
-                    s3,
-                    a_file[INPUT_SOURCE_BUCKET_KEY],
-                    a_file[INPUT_SOURCE_KEY_KEY],
-                    a_file[INPUT_TARGET_BUCKET_KEY],
-                    a_file.get(INPUT_MULTIPART_CHUNKSIZE_MB_KEY, None)
-                    or default_multipart_chunksize_mb,
-                    a_file[INPUT_TARGET_KEY_KEY],
-                )
-
-                # Check to see that our copy for the file was a success
-                if err_msg is None:
-                    # Send updated status to database queue
-                    a_file[FILE_SUCCESS_KEY] = True
-                    shared_recovery.update_status_for_file(
-                        a_file[INPUT_JOB_ID_KEY],
-                        a_file[INPUT_COLLECTION_ID_KEY],
-                        a_file[INPUT_GRANULE_ID_KEY],
-                        a_file[INPUT_FILENAME_KEY],
-                        shared_recovery.OrcaStatus.SUCCESS,
-                        None,
-                        status_update_queue_url,
-                    )
-
-                    # Remove message from the queue we are listening to, so we
-                    # don't try to do it again if something else fails.
-                    aws_client_sqs.delete_message(
-                        QueueUrl=recovery_queue_url,
-                        ReceiptHandle=a_file[FILE_MESSAGE_RECEIPT],
-                    )
-
-                else:
-                    a_file[FILE_ERROR_MESSAGE_KEY] = err_msg
-
-        if attempt < max_retries + 1:  # Only sleep if not on the last attempt.
-            if all(
-                a_file[FILE_SUCCESS_KEY] for a_file in files
-            ):  # Check for early completion
-                break
-            LOGGER.warning(
-                f"Attempt {attempt +1} of restore failed. Retrying in {retry_sleep_secs} seconds."
+    # noinspection PyUnusedLocal
+    def copy_file(a_file: Dict[str, Any], attempt: int) -> bool:
+        LOGGER.debug(f"Restoring file {a_file[INPUT_SOURCE_KEY_KEY]}")
+        try:
+            err_msg = copy_object(
+                s3,
+                a_file[INPUT_SOURCE_BUCKET_KEY],
+                a_file[INPUT_SOURCE_KEY_KEY],
+                a_file[INPUT_TARGET_BUCKET_KEY],
+                a_file.get(INPUT_MULTIPART_CHUNKSIZE_MB_KEY, None),
+                default_multipart_chunksize_mb,
+                default_max_concurrency,
+                part_executor,
+                a_file[INPUT_TARGET_KEY_KEY],
+                get_remaining_time_in_millis,
+                lambda_timeout_secs,
             )
-            time.sleep(retry_sleep_secs)
-
-    any_error = False
-    for a_file in files:
-        if not a_file[FILE_SUCCESS_KEY]:
-            any_error = True
+        except CopyOutOfTimeError as ex:
+            # Not retried, as there is no time left. The redelivery resumes the copy.
+            LOGGER.warning(ex.__str__())
+            a_file[FILE_REDELIVER_KEY] = True
+            return True
+
+        # Check to see that our copy for the file was a success
+        if err_msg is not None:
+            a_file[FILE_ERROR_MESSAGE_KEY] = err_msg
+            return False
+
+        a_file[FILE_SUCCESS_KEY] = True
+        try:
+            # Send updated status to database queue
             shared_recovery.update_status_for_file(
                 a_file[INPUT_JOB_ID_KEY],
                 a_file[INPUT_COLLECTION_ID_KEY],
                 a_file[INPUT_GRANULE_ID_KEY],
                 a_file[INPUT_FILENAME_KEY],
-                shared_recovery.OrcaStatus.FAILED,
-                a_file.get(FILE_ERROR_MESSAGE_KEY, None),
+                shared_recovery.OrcaStatus.SUCCESS,
+                None,
                 status_update_queue_url,
             )
-    if any_error:
-        LOGGER.error(f"File copy failed. {files}")
-        raise CopyRequestError(f"File copy failed. {files}")
+            # Remove the message from the queue we are listening to, so we
+            # don't try to copy the file again.
+            delete_messages(
+                aws_client_sqs, recovery_queue_url, [a_file[FILE_MESSAGE_RECEIPT]]
+            )
+        except Exception as ex:
+            # The copy is not retried, as it succeeded. The redelivery posts the status.
+            LOGGER.error(
+                f"Could not post status or delete message for copied file "
+                f"'{a_file[INPUT_FILENAME_KEY]}': {ex}"
+            )
+            a_file[FILE_REDELIVER_KEY] = True
+        return True
+
+    # All files from get_files_from_records start with 'success' and 'redeliver' == False.
+    # Each file is only modified by the worker currently copying it.
+    # File workers only wait on their copy requests, which run in part_executor.
+    with ThreadPoolExecutor(
+        max_workers=default_max_concurrency
+    ) as part_executor, ThreadPoolExecutor(
+        max_workers=max_files_in_flight
+    ) as file_executor:
+        shared_retry.RetryEngine(
+            "copy_from_archive",
+            max_retries,
+            retry_sleep_secs,
+            get_remaining_time_in_millis=get_remaining_time_in_millis,
+        ).run(files, copy_file, executor=file_executor)
+
+    failed_files = []
+    redelivered_files = []
+    for a_file in files:
+        if a_file[FILE_REDELIVER_KEY]:
+            redelivered_files.append(a_file)
+        elif not a_file[FILE_SUCCESS_KEY]:
+            failed_files.append(a_file)
+            try:
+                shared_recovery.update_status_for_file(
+                    a_file[INPUT_JOB_ID_KEY],
+                    a_file[INPUT_COLLECTION_ID_KEY],
+                    a_file[INPUT_GRANULE_ID_KEY],
+                    a_file[INPUT_FILENAME_KEY],
+                    shared_recovery.OrcaStatus.FAILED,
+                    a_file.get(FILE_ERROR_MESSAGE_KEY, None),
+                    status_update_queue_url,
+                )
+            except Exception as ex:
+                LOGGER.error(
+                    f"Could not post status for failed file "
+                    f"'{a_file[INPUT_FILENAME_KEY]}': {ex}"
+                )
+    if len(failed_files) > 0:
+        LOGGER.error(f"File copy failed. {failed_files}")
+    if len(redelivered_files) > 0:
+        LOGGER.warning(f"File copy will finish on redelivery. {redelivered_files}")
+    return {
+        OUTPUT_BATCH_ITEM_FAILURES_KEY: [
+            {OUTPUT_ITEM_IDENTIFIER_KEY: a_file[FILE_MESSAGE_ID_KEY]}
+            for a_file in failed_files + redelivered_files
+        ]
+    }
+
+
+def delete_messages(
+    sqs_cli: BaseClient, queue_url: str, receipt_handles: List[str]
+) -> None:
+    """
+    Deletes messages from the queue, up to MAX_DELETE_BATCH_ENTRIES per request.
+    Messages that fail to delete are logged, as they will only cause a redundant copy.
+    Args:
+        sqs_cli: An instance of boto3 sqs client.
+        queue_url: The URL of the queue the messages were received from.
+        receipt_handles: The receipt handles of the messages to delete.
+    """
+    for start in range(0, len(receipt_handles), MAX_DELETE_BATCH_ENTRIES):
+        end = start + MAX_DELETE_BATCH_ENTRIES
+        response = sqs_cli.delete_message_batch(
+            QueueUrl=queue_url,
+            Entries=[
+                {"Id": str(index), "ReceiptHandle": receipt_handle}
+                for index, receipt_handle in enumerate(receipt_handles[start:end])
+            ],
+        )
+        for failure in response.get("Failed", []):
+            LOGGER.warning(
+                f"Could not delete message '{failure['Id']}' from '{queue_url}': "
+                f"{failure.get('Message')}"
+            )
 
 
 def get_files_from_records(
@@ -180,7 +282,8 @@ def get_files_from_records(
     Args:
         records: passed through from the handler.
     Returns:
-        records, parsed into Dicts, with the additional KVP 'success' = False
+        records, parsed into Dicts, with the additional KVPs 'success' = False
+        and 'redeliver' = False
     """
     files = []
     for record in records:
@@ -188,7 +291,9 @@ def get_files_from_records(
         LOGGER.debug(f"Validating {a_file}")
         _BODY_VALIDATE(a_file)
         a_file[FILE_SUCCESS_KEY] = False
+        a_file[FILE_REDELIVER_KEY] = False
         a_file[FILE_MESSAGE_RECEIPT] = record[FILE_MESSAGE_RECEIPT]
+        a_file[FILE_MESSAGE_ID_KEY] = record[FILE_MESSAGE_ID_KEY]
         files.append(a_file)
     return files
 
@@ -198,25 +303,41 @@ def copy_object(
     src_bucket_name: str,
     src_object_name: str,
     dest_bucket_name: str,
-    multipart_chunksize_mb: int,
+    multipart_chunksize_mb: Optional[int],
+    default_multipart_chunksize_mb: int,
+    default_max_concurrency: int,
+    part_executor: Executor,
     dest_object_name: str = None,
+    get_remaining_time_in_millis: Optional[Callable[[], int]] = None,
+    lambda_timeout_secs: int = MAX_LAMBDA_TIMEOUT_SECS,
 ) -> Optional[str]:
-    """Copy an Amazon S3 bucket object
+    """Copy an Amazon S3 bucket object.
+    The copy is planned from the source object's size by shared_transfer.
+    Multipart copies are resumable, see copy_parts.
+    Every copy request is pinned to the version of the source read by head_object.
     Args:
         s3_cli: An instance of boto3 s3 client.
         src_bucket_name: The source S3 bucket name.
         src_object_name: The key of the s3 object being copied.
         dest_bucket_name: The target S3 bucket name.
-        multipart_chunksize_mb: The maximum size of chunks to use when copying.
+        multipart_chunksize_mb: The collection's chunk size for multipart copies.
+            If None, the chunk size is chosen from the object size.
+        default_multipart_chunksize_mb: The largest chunk size to choose automatically.
+        default_max_concurrency: DEFAULT_MAX_CONCURRENCY. The chunk size is chosen from it,
+            so it is the same on every delivery of the file.
+        part_executor: Runs the copy requests. Shared by all files being copied,
+            so its workers are the budget of copy requests in flight.
         dest_object_name: Optional; The key of the destination object.
             If an object with the same name exists in the given bucket, the object is overwritten.
             Defaults to {src_object_name}.
+        get_remaining_time_in_millis: Returns the Lambda's remaining time.
+            New parts are not started if they could run past it.
+        lambda_timeout_secs: The Lambda's timeout. See get_resumable_upload.
     Returns:
         None if object was copied, otherwise contains error message.
+    Raises:
+        CopyOutOfTimeError: A multipart copy ran out of time. See copy_parts.
     """
-    default_max_concurrency = int(os.environ[OS_ENVIRON_DEFAULT_MAX_CONCURRENCY_KEY])
-    LOGGER.info(default_max_concurrency)
-
     if dest_object_name is None:
         dest_object_name = src_object_name
     # Construct source bucket/object parameter
@@ -224,24 +345,39 @@ def copy_object(
 
     # Copy the object
     try:
-        LOGGER.debug(
-            f"Copying {src_object_name} to {dest_bucket_name} "
-            f" with chunk size of {multipart_chunksize_mb}MB."
+        source = s3_cli.head_object(Bucket=src_bucket_name, Key=src_object_name)
+        if source.get("VersionId", None) is not None:
+            copy_source["VersionId"] = source["VersionId"]
+        plan = shared_transfer.plan_transfer(
+            source["ContentLength"],
+            default_max_concurrency,
+            default_multipart_chunksize_mb,
+            chunksize_override_mb=multipart_chunksize_mb,
         )
-        s3_cli.copy(
-            copy_source,
-            dest_bucket_name,
-            dest_object_name,
-            ExtraArgs={
-                # 'StorageClass': 'GLACIER',
-                # 'MetadataDirective': 'COPY',
-                # 'ContentType': s3_cli.head_object(Bucket=src_bucket_name,
-                #  Key=src_object_name)['ContentType'],
-            },
-            Config=TransferConfig(
-                multipart_chunksize=multipart_chunksize_mb * MB,
-                max_concurrency=default_max_concurrency,
-            ),
+        LOGGER.info(f"Copying '{src_object_name}' to '{dest_bucket_name}' with {plan}")
+        start_time = time.monotonic()
+        if plan.multipart:
+            copy_parts(
+                s3_cli,
+                copy_source,
+                source,
+                dest_bucket_name,
+                dest_object_name,
+                plan,
+                part_executor,
+                get_remaining_time_in_millis,
+                lambda_timeout_secs,
+            )
+        else:
+            part_executor.submit(
+                s3_cli.copy_object,
+                CopySource=copy_source,
+                CopySourceIfMatch=source["ETag"],
+                Bucket=dest_bucket_name,
+                Key=dest_object_name,
+            ).result()
+        shared_transfer.log_transfer_throughput(
+            src_object_name, plan, time.monotonic() - start_time
         )
         LOGGER.debug(f"Object {src_object_name} copied.")
     except ClientError as ex:
@@ -250,19 +386,236 @@ def copy_object(
     return None
 
 
+def copy_parts(
+    s3_cli: BaseClient,
+    copy_source: Dict[str, str],
+    source: Dict[str, Any],
+    dest_bucket_name: str,
+    dest_object_name: str,
+    plan: shared_transfer.TransferPlan,
+    part_executor: Executor,
+    get_remaining_time_in_millis: Optional[Callable[[], int]] = None,
+    lambda_timeout_secs: int = MAX_LAMBDA_TIMEOUT_SECS,
+) -> None:
+    """
+    Copies an object with UploadPartCopy, resuming an earlier upload of it if there is one.
+    S3 keeps the upload ID and the ETag of each finished part, so if the Lambda runs out
+    of time, the next delivery of the file only copies the parts that are left.
+    Each part is only copied if the source still has the ETag read by head_object.
+    If it does not, the upload is aborted, so its parts are not mixed with a newer source.
+    Args:
+        s3_cli: An instance of boto3 s3 client.
+        copy_source: The 'Bucket', 'Key', and 'VersionId' if versioned,
+            of the object being copied.
+        source: The head_object response for the object being copied.
+        dest_bucket_name: The target S3 bucket name.
+        dest_object_name: The key of the destination object.
+        plan: A multipart plan for the copy.
+            At most plan.max_concurrency parts are queued in part_executor at once,
+            so parts of other files are run between them.
+        part_executor: Runs the part copies. Shared by all files being copied.
+        get_remaining_time_in_millis: Returns the Lambda's remaining time.
+            New parts are not started with less than PART_COPY_TIME_MARGIN_SECS left.
+        lambda_timeout_secs: The Lambda's timeout. See get_resumable_upload.
+    Raises:
+        CopyOutOfTimeError: Some parts were not started for lack of time.
+            The upload is left for the next delivery to resume.
+        ClientError: A part failed, leaving the upload to be resumed
+            unless the source has changed.
+    """
+    upload_id, part_etags = get_resumable_upload(
+        s3_cli,
+        dest_bucket_name,
+        dest_object_name,
+        plan,
+        source["LastModified"],
+        lambda_timeout_secs,
+    )
+    if upload_id is None:
+        upload_id = s3_cli.create_multipart_upload(
+            Bucket=dest_bucket_name, Key=dest_object_name
+        )["UploadId"]
+    part_ranges = [
+        part_range
+        for part_range in shared_transfer.get_part_ranges(plan)
+        if part_range[0] not in part_etags
+    ]
+    LOGGER.info(
+        f"Copying {len(part_ranges)} of {plan.part_count} part(s) of '{dest_object_name}' "
+        f"with upload '{upload_id}'."
+    )
+
+    def copy_part(part_range: Tuple[int, int, int]) -> Optional[str]:
+        part_number, first_byte, last_byte = part_range
+        if (
+            get_remaining_time_in_millis is not None
+            and get_remaining_time_in_millis() < PART_COPY_TIME_MARGIN_SECS * 1000
+        ):
+            return None
+        return s3_cli.upload_part_copy(
+            Bucket=dest_bucket_name,
+            Key=dest_object_name,
+            CopySource=copy_source,
+            CopySourceIfMatch=source["ETag"],
+            CopySourceRange=f"bytes={first_byte}-{last_byte}",
+            PartNumber=part_number,
+            UploadId=upload_id,
+        )["CopyPartResult"]["ETag"]
+
+    # The part number of each part queued in part_executor.
+    in_flight = {}
+
+    def collect(done) -> None:
+        for future in done:
+            part_number = in_flight.pop(future)
+            etag = future.result()
+            if etag is not None:
+                part_etags[part_number] = etag
+
+    try:
+        for part_range in part_ranges:
+            if len(in_flight) >= plan.max_concurrency:
+                collect(wait(in_flight, return_when=FIRST_COMPLETED).done)
+            in_flight[part_executor.submit(copy_part, part_range)] = part_range[0]
+        collect(wait(in_flight).done)
+    except ClientError as ex:
+        if ex.response["Error"].get("Code", None) == "PreconditionFailed":
+            LOGGER.warning(
+                f"Source of '{dest_object_name}' changed during the copy. "
+                f"Aborting upload '{upload_id}'."
+            )
+            s3_cli.abort_multipart_upload(
+                Bucket=dest_bucket_name, Key=dest_object_name, UploadId=upload_id
+            )
+        raise
+    finally:
+        # Parts not yet started are left for the next delivery.
+        for future in in_flight:
+            future.cancel()
+
+    if len(part_etags) < plan.part_count:
+        raise CopyOutOfTimeError(
+            f"Ran out of time with {len(part_etags)} of {plan.part_count} part(s) "
+            f"of '{dest_object_name}' copied. Upload '{upload_id}' will resume "
+            f"when the file is redelivered."
+        )
+    s3_cli.complete_multipart_upload(
+        Bucket=dest_bucket_name,
+        Key=dest_object_name,
+        UploadId=upload_id,
+        MultipartUpload={
+            "Parts": [
+                {"ETag": part_etags[part_number], "PartNumber": part_number}
+                for part_number in sorted(part_etags)
+            ]
+        },
+    )
+
+
+def get_resumable_upload(
+    s3_cli: BaseClient,
+    dest_bucket_name: str,
+    dest_object_name: str,
+    plan: shared_transfer.TransferPlan,
+    source_last_modified: datetime,
+    lambda_timeout_secs: int = MAX_LAMBDA_TIMEOUT_SECS,
+) -> Tuple[Optional[str], Dict[int, str]]:
+    """
+    Finds the newest unfinished multipart upload of the destination object whose parts
+    match the plan, and that was initiated after the source was last modified,
+    so its parts were copied from the current source. Other unfinished uploads
+    of the object initiated more than lambda_timeout_secs ago are aborted,
+    so uploads abandoned by earlier deliveries do not keep their parts.
+    Newer uploads are left alone, as a duplicate delivery of the file
+    may still be copying to them.
+    Args:
+        s3_cli: An instance of boto3 s3 client.
+        dest_bucket_name: The target S3 bucket name.
+        dest_object_name: The key of the destination object.
+        plan: A multipart plan for the copy.
+        source_last_modified: The LastModified of the source object.
+        lambda_timeout_secs: The Lambda's timeout.
+    Returns:
+        The ID of the upload to resume and the ETags of its finished parts by part number.
+        The ID is None if there is no upload to resume.
+    """
+    expected_sizes = {
+        part_number: last_byte - first_byte + 1
+        for part_number, first_byte, last_byte in shared_transfer.get_part_ranges(plan)
+    }
+    uploads = []
+    for page in s3_cli.get_paginator("list_multipart_uploads").paginate(
+        Bucket=dest_bucket_name, Prefix=dest_object_name
+    ):
+        uploads.extend(
+            upload
+            for upload in page.get("Uploads", [])
+            if upload["Key"] == dest_object_name
+        )
+    uploads.sort(key=lambda upload: upload["Initiated"], reverse=True)
+    abandoned_before = datetime.now(timezone.utc) - timedelta(
+        seconds=lambda_timeout_secs
+    )
+
+    resumable_upload_id = None
+    part_etags = {}
+    for upload in uploads:
+        # Uploads started before the source changed hold parts of an older source.
+        if resumable_upload_id is None and upload["Initiated"] > source_last_modified:
+            parts = []
+            for page in s3_cli.get_paginator("list_parts").paginate(
+                Bucket=dest_bucket_name,
+                Key=dest_object_name,
+                UploadId=upload["UploadId"],
+            ):
+                parts.extend(page.get("Parts", []))
+            # Parts from a different plan cover different byte ranges, so cannot be reused.
+            if all(
+                expected_sizes.get(part["PartNumber"], None) == part["Size"]
+                for part in parts
+            ):
+                resumable_upload_id = upload["UploadId"]
+                part_etags = {part["PartNumber"]: part["ETag"] for part in parts}
+                LOGGER.info(
+                    f"Resuming upload '{resumable_upload_id}' of '{dest_object_name}' "
+                    f"with {len(part_etags)} of {plan.part_count} part(s) copied."
+                )
+                continue
+        if upload["Initiated"] > abandoned_before:
+            LOGGER.info(
+                f"Leaving upload '{upload['UploadId']}' of '{dest_object_name}', "
+                f"initiated at {upload['Initiated']}, as it may still be in progress."
+            )
+            continue
+        LOGGER.info(f"Aborting upload '{upload['UploadId']}' of '{dest_object_name}'.")
+        s3_cli.abort_multipart_upload(
+            Bucket=dest_bucket_name, Key=dest_object_name, UploadId=upload["UploadId"]
+        )
+    return resumable_upload_id, part_etags
+
+
 @LOGGER.inject_lambda_context
 def handler(
     event: Dict[str, Any], context: LambdaContext
-) -> None:  # pylint: disable-msg=unused-argument
+) -> Dict[str, List[Dict[str, str]]]:  # pylint: disable-msg=unused-argument
     """Lambda handler. Copies a file from its temporary s3 bucket to the s3 archive.
-    If the copy for a file in the request fails, the lambda
-    throws an exception. Environment variables can be set to override how many
-    times to retry a copy before failing, and how long to wait between retries.
+    If the copy for a file in the request fails, its message is reported in
+    'batchItemFailures' so that only the failed files are redelivered.
+    This requires ReportBatchItemFailures on the event source mapping.
+    Multipart copies that run out of time are resumed from their finished parts
+    when the file is redelivered.
+    Environment variables can be set to override how many times to retry a copy
+    before failing, and how long to wait between retries.
         Environment Vars:
             COPY_RETRIES (number, optional, default = 3): The number of
                 attempts to retry a copy that failed.
-            COPY_RETRY_SLEEP_SECS (number, optional, default = 0): The number of seconds
-                to sleep between retry attempts.
+            COPY_RETRY_SLEEP_SECS (number, optional, default = 0): The backoff ceiling,
+                in seconds, for the first retry. Retries wait a random time up to this
+                ceiling, which doubles with each retry.
+            DEFAULT_MAX_CONCURRENCY (number): The maximum number of parts copied at once,
+                shared by all files in the request.
+            LAMBDA_TIMEOUT_SECS (number, optional, default = 900): The Lambda's timeout.
+                Unfinished uploads older than this are aborted.
             DATABASE_PORT (string): the database port. The standard is 5432.
             DATABASE_NAME (string): the name of the database.
             DATABASE_USER (string): the name of the application user.
@@ -274,11 +627,10 @@ def handler(
         event:
             A dict from the SQS queue. See schemas/input.json for more information.
         context: This object provides information about the lambda invocation, function,
-            and execution env.
-    Raises:
-        CopyRequestError: An error occurred calling copy for one or more files.
-        The same dict that is returned for a successful copy will be included in the
-        message, with 'success' = False for the files for which the copy failed.
+            and execution env. Retries are not started if they would outlast it.
+    Returns:
+        A Lambda partial batch response. 'batchItemFailures' holds an 'itemIdentifier'
+        with the messageId of each file that failed to copy.
     """
     _INPUT_VALIDATE(event)
 
@@ -314,6 +666,15 @@ def handler(
         LOGGER.error("DEFAULT_MULTIPART_CHUNKSIZE_MB environment value not found.")
         raise key_error
 
+    try:
+        lambda_timeout_secs = int(os.environ[OS_ENVIRON_LAMBDA_TIMEOUT_SECS_KEY])
+    except KeyError:
+        LOGGER.warning(
+            f"Setting {OS_ENVIRON_LAMBDA_TIMEOUT_SECS_KEY} value to a default of "
+            f"{MAX_LAMBDA_TIMEOUT_SECS}"
+        )
+        lambda_timeout_secs = MAX_LAMBDA_TIMEOUT_SECS
+
     try:
         recovery_queue_url = str(os.environ["RECOVERY_QUEUE_URL"])
     except KeyError as key_error:
@@ -323,11 +684,13 @@ def handler(
     LOGGER.debug(f"event: {event}")
     records = event["Records"]
 
-    task(
+    return task(
         records,
         retries,
         retry_sleep_secs,
         status_update_queue_url,
         default_multipart_chunksize_mb,
         recovery_queue_url,
+        get_remaining_time_in_millis=context.get_remaining_time_in_millis,
+        lambda_timeout_secs=lambda_timeout_secs,
     )
@@ -7,12 +7,16 @@ import json
 import os
 import unittest
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from random import randint
-from test.unit_tests.ConfigCheck import ConfigCheck
+from threading import Barrier
 from unittest import TestCase, mock
 from unittest.mock import MagicMock, Mock, call, patch
 
 from botocore.exceptions import ClientError
+from orca_shared.retry import shared_retry
+from orca_shared.transfer import shared_transfer
 from s3transfer.constants import MB
 
 import copy_from_archive
@@ -31,6 +35,7 @@ class TestCopyFromArchive(TestCase):
             copy_from_archive.OS_ENVIRON_STATUS_UPDATE_QUEUE_URL_KEY: "something.blah",
             "DEFAULT_MULTIPART_CHUNKSIZE_MB": "42",
             "RECOVERY_QUEUE_URL": "something_else.blah",
+            copy_from_archive.OS_ENVIRON_LAMBDA_TIMEOUT_SECS_KEY: "600",
         },
         clear=True,
     )
@@ -44,11 +49,20 @@ class TestCopyFromArchive(TestCase):
         records = [Mock()]
         event = {"Records": records}
 
-        copy_from_archive.handler(event, Mock())
+        context = Mock()
+        result = copy_from_archive.handler(event, context)
 
         mock_task.assert_called_with(
-            records, 703, 108.5, "something.blah", 42, "something_else.blah"
+            records,
+            703,
+            108.5,
+            "something.blah",
+            42,
+            "something_else.blah",
+            get_remaining_time_in_millis=context.get_remaining_time_in_millis,
+            lambda_timeout_secs=600,
         )
+        self.assertEqual(mock_task.return_value, result)
 
     @patch.dict(
         os.environ,
@@ -66,14 +80,23 @@ class TestCopyFromArchive(TestCase):
     ):
         """
         If retry settings not in os.environ, uses 2 retries and 30 seconds.
+        Without a timeout, uploads are only aborted once older than the longest timeout.
         """
         records = [Mock()]
         event = {"Records": records}
 
-        copy_from_archive.handler(event, Mock())
+        context = Mock()
+        copy_from_archive.handler(event, context)
 
         mock_task.assert_called_with(
-            records, 2, 30, "something.else", 42, "someother.queue"
+            records,
+            2,
+            30,
+            "something.else",
+            42,
+            "someother.queue",
+            get_remaining_time_in_millis=context.get_remaining_time_in_millis,
+            lambda_timeout_secs=copy_from_archive.MAX_LAMBDA_TIMEOUT_SECS,
         )
 
     @patch("time.sleep")
@@ -115,6 +138,7 @@ class TestCopyFromArchive(TestCase):
         file0_target_bucket = uuid.uuid4().__str__()
         file0_target_key = uuid.uuid4().__str__()
         file0_message_receipt = uuid.uuid4().__str__()
+        file0_message_id = uuid.uuid4().__str__()
 
         file1_job_id = uuid.uuid4().__str__()
         file1_collection_id = uuid.uuid4().__str__()
@@ -126,6 +150,7 @@ class TestCopyFromArchive(TestCase):
         file1_target_key = uuid.uuid4().__str__()
         file1_multipart_chunksize_mb = randint(1, 10000)  # nosec
         file1_message_receipt = uuid.uuid4().__str__()
+        file1_message_id = uuid.uuid4().__str__()
 
         mock_records = [Mock()]
 
@@ -135,12 +160,14 @@ class TestCopyFromArchive(TestCase):
             copy_from_archive.INPUT_GRANULE_ID_KEY: file0_granule_id,
             copy_from_archive.INPUT_FILENAME_KEY: file0_input_filename,
             copy_from_archive.FILE_SUCCESS_KEY: False,
+            copy_from_archive.FILE_REDELIVER_KEY: False,
             copy_from_archive.INPUT_SOURCE_BUCKET_KEY: file0_source_bucket,
             copy_from_archive.INPUT_SOURCE_KEY_KEY: file0_source_key,
             copy_from_archive.INPUT_TARGET_BUCKET_KEY: file0_target_bucket,
             copy_from_archive.INPUT_TARGET_KEY_KEY: file0_target_key,
             copy_from_archive.INPUT_MULTIPART_CHUNKSIZE_MB_KEY: None,
             copy_from_archive.FILE_MESSAGE_RECEIPT: file0_message_receipt,
+            copy_from_archive.FILE_MESSAGE_ID_KEY: file0_message_id,
         }
         file1 = {
             copy_from_archive.INPUT_JOB_ID_KEY: file1_job_id,
@@ -148,17 +175,19 @@ class TestCopyFromArchive(TestCase):
             copy_from_archive.INPUT_GRANULE_ID_KEY: file1_granule_id,
             copy_from_archive.INPUT_FILENAME_KEY: file1_input_filename,
             copy_from_archive.FILE_SUCCESS_KEY: False,
+            copy_from_archive.FILE_REDELIVER_KEY: False,
             copy_from_archive.INPUT_SOURCE_BUCKET_KEY: file1_source_bucket,
             copy_from_archive.INPUT_SOURCE_KEY_KEY: file1_source_key,
             copy_from_archive.INPUT_TARGET_BUCKET_KEY: file1_target_bucket,
             copy_from_archive.INPUT_TARGET_KEY_KEY: file1_target_key,
             copy_from_archive.INPUT_MULTIPART_CHUNKSIZE_MB_KEY: file1_multipart_chunksize_mb,
             copy_from_archive.FILE_MESSAGE_RECEIPT: file1_message_receipt,
+            copy_from_archive.FILE_MESSAGE_ID_KEY: file1_message_id,
         }
         mock_get_files_from_records.return_value = [file0, file1]
         mock_copy_object.return_value = None
 
-        copy_from_archive.task(
+        result = copy_from_archive.task(
             mock_records,
             max_retries,
             retry_sleep_secs,
@@ -175,8 +204,13 @@ class TestCopyFromArchive(TestCase):
                     file0_source_bucket,
                     file0_source_key,
                     file0_target_bucket,
+                    None,
                     default_multipart_chunksize_mb,
+                    10,
+                    mock.ANY,
                     file0_target_key,
+                    None,
+                    copy_from_archive.MAX_LAMBDA_TIMEOUT_SECS,
                 ),
                 call(
                     mock_boto3_client.return_value,
@@ -184,11 +218,24 @@ class TestCopyFromArchive(TestCase):
                     file1_source_key,
                     file1_target_bucket,
                     file1_multipart_chunksize_mb,
+                    default_multipart_chunksize_mb,
+                    10,
+                    mock.ANY,
                     file1_target_key,
+                    None,
+                    copy_from_archive.MAX_LAMBDA_TIMEOUT_SECS,
                 ),
-            ]
+            ],
+            any_order=True,
         )
         self.assertEqual(2, mock_copy_object.call_count)
+        # Both files share one executor for their copy requests.
+        part_executors = [
+            copy_call.args[7] for copy_call in mock_copy_object.call_args_list
+        ]
+        self.assertIsInstance(part_executors[0], ThreadPoolExecutor)
+        self.assertIs(part_executors[0], part_executors[1])
+        self.assertEqual(10, part_executors[0]._max_workers)
         mock_update_status_for_file.assert_has_calls(
             [
                 call(
@@ -209,11 +256,34 @@ class TestCopyFromArchive(TestCase):
                     None,
                     db_queue_url,
                 ),
-            ]
+            ],
+            any_order=True,
         )
         self.assertEqual(2, mock_update_status_for_file.call_count)
+        # Each message is deleted as soon as its file is copied.
+        mock_boto3_client.return_value.delete_message_batch.assert_has_calls(
+            [
+                call(
+                    QueueUrl=recovery_queue_url,
+                    Entries=[{"Id": "0", "ReceiptHandle": file0_message_receipt}],
+                ),
+                call(
+                    QueueUrl=recovery_queue_url,
+                    Entries=[{"Id": "0", "ReceiptHandle": file1_message_receipt}],
+                ),
+            ],
+            any_order=True,
+        )
+        self.assertEqual(
+            2, mock_boto3_client.return_value.delete_message_batch.call_count
+        )
         mock_sleep.assert_not_called()
+        self.assertEqual(
+            {copy_from_archive.OUTPUT_BATCH_ITEM_FAILURES_KEY: []},
+            result,
+        )
 
+    @patch("orca_shared.retry.shared_retry.get_full_jitter_delay", return_value=1)
     @patch("copy_from_archive.LOGGER")
     @patch("time.sleep")
     @patch("copy_from_archive.shared_recovery.update_status_for_file")
@@ -236,10 +306,12 @@ class TestCopyFromArchive(TestCase):
         mock_update_status_for_file: MagicMock,
         mock_sleep: MagicMock,
         mock_logger: MagicMock,
+        mock_get_full_jitter_delay: MagicMock,
     ):
         """
-        If one file causes errors during copy,
-        retry up to limit then post error status and raise CopyRequestError.
+        If one file causes errors during copy, retry only that file up to limit
+        then post error status and report only its message as a batch item failure.
+        The successful file's message is deleted before the retries.
         """
         db_queue_url = uuid.uuid4().__str__()
         max_retries = 2
@@ -256,6 +328,7 @@ class TestCopyFromArchive(TestCase):
         file0_target_bucket = uuid.uuid4().__str__()
         file0_target_key = uuid.uuid4().__str__()
         file0_message_receipt = uuid.uuid4().__str__()
+        file0_message_id = uuid.uuid4().__str__()
         error_message = uuid.uuid4().__str__()
 
         file1_job_id = uuid.uuid4().__str__()
@@ -267,6 +340,7 @@ class TestCopyFromArchive(TestCase):
         file1_target_bucket = uuid.uuid4().__str__()
         file1_target_key = uuid.uuid4().__str__()
         file1_message_receipt = uuid.uuid4().__str__()
+        file1_message_id = uuid.uuid4().__str__()
 
         mock_records = [Mock()]
 
@@ -276,11 +350,13 @@ class TestCopyFromArchive(TestCase):
             copy_from_archive.INPUT_GRANULE_ID_KEY: file0_granule_id,
             copy_from_archive.INPUT_FILENAME_KEY: file0_input_filename,
             copy_from_archive.FILE_SUCCESS_KEY: False,
+            copy_from_archive.FILE_REDELIVER_KEY: False,
             copy_from_archive.INPUT_SOURCE_BUCKET_KEY: file0_source_bucket,
             copy_from_archive.INPUT_SOURCE_KEY_KEY: file0_source_key,
             copy_from_archive.INPUT_TARGET_BUCKET_KEY: file0_target_bucket,
             copy_from_archive.INPUT_TARGET_KEY_KEY: file0_target_key,
             copy_from_archive.FILE_MESSAGE_RECEIPT: file0_message_receipt,
+            copy_from_archive.FILE_MESSAGE_ID_KEY: file0_message_id,
         }
         successful_file = {
             copy_from_archive.INPUT_JOB_ID_KEY: file1_job_id,
@@ -288,89 +364,317 @@ class TestCopyFromArchive(TestCase):
             copy_from_archive.INPUT_GRANULE_ID_KEY: file1_granule_id,
             copy_from_archive.INPUT_FILENAME_KEY: file1_input_filename,
             copy_from_archive.FILE_SUCCESS_KEY: False,
+            copy_from_archive.FILE_REDELIVER_KEY: False,
             copy_from_archive.INPUT_SOURCE_BUCKET_KEY: file1_source_bucket,
             copy_from_archive.INPUT_SOURCE_KEY_KEY: file1_source_key,
             copy_from_archive.INPUT_TARGET_BUCKET_KEY: file1_target_bucket,
             copy_from_archive.INPUT_TARGET_KEY_KEY: file1_target_key,
             copy_from_archive.FILE_MESSAGE_RECEIPT: file1_message_receipt,
+            copy_from_archive.FILE_MESSAGE_ID_KEY: file1_message_id,
         }
         mock_get_files_from_records.return_value = [failed_file, successful_file]
-        mock_copy_object.side_effect = [
-            error_message,
-            None,
-            error_message,
-            error_message,
-        ]
+        # Files are copied concurrently, so fail by key rather than by call order.
+        mock_copy_object.side_effect = lambda s3_cli, src_bucket, src_key, *args: (
+            error_message if src_key == file0_source_key else None
+        )
+        mock_sleep.side_effect = lambda secs: (
+            mock_boto3_client.return_value.delete_message_batch.assert_called_once()
+        )
 
-        try:
-            copy_from_archive.task(
-                mock_records,
-                max_retries,
-                retry_sleep_secs,
-                db_queue_url,
-                multipart_chunksize_mb,
-                received_message_queue_url,
-            )
-        except copy_from_archive.CopyRequestError:
-            mock_get_files_from_records.assert_called_once_with(mock_records)
-            mock_copy_object.assert_has_calls(
-                [
-                    call(
-                        mock_boto3_client.return_value,
-                        file0_source_bucket,
-                        file0_source_key,
-                        file0_target_bucket,
-                        multipart_chunksize_mb,
-                        file0_target_key,
-                    ),
-                    call(
-                        mock_boto3_client.return_value,
-                        file1_source_bucket,
-                        file1_source_key,
-                        file1_target_bucket,
-                        multipart_chunksize_mb,
-                        file1_target_key,
-                    ),
-                    call(
-                        mock_boto3_client.return_value,
-                        file0_source_bucket,
-                        file0_source_key,
-                        file0_target_bucket,
-                        multipart_chunksize_mb,
-                        file0_target_key,
-                    ),
+        result = copy_from_archive.task(
+            mock_records,
+            max_retries,
+            retry_sleep_secs,
+            db_queue_url,
+            multipart_chunksize_mb,
+            received_message_queue_url,
+        )
+
+        mock_get_files_from_records.assert_called_once_with(mock_records)
+        mock_copy_object.assert_has_calls(
+            [
+                call(
+                    mock_boto3_client.return_value,
+                    file0_source_bucket,
+                    file0_source_key,
+                    file0_target_bucket,
+                    None,
+                    multipart_chunksize_mb,
+                    10,
+                    mock.ANY,
+                    file0_target_key,
+                    None,
+                    copy_from_archive.MAX_LAMBDA_TIMEOUT_SECS,
+                ),
+                call(
+                    mock_boto3_client.return_value,
+                    file1_source_bucket,
+                    file1_source_key,
+                    file1_target_bucket,
+                    None,
+                    multipart_chunksize_mb,
+                    10,
+                    mock.ANY,
+                    file1_target_key,
+                    None,
+                    copy_from_archive.MAX_LAMBDA_TIMEOUT_SECS,
+                ),
+                call(
+                    mock_boto3_client.return_value,
+                    file0_source_bucket,
+                    file0_source_key,
+                    file0_target_bucket,
+                    None,
+                    multipart_chunksize_mb,
+                    10,
+                    mock.ANY,
+                    file0_target_key,
+                    None,
+                    copy_from_archive.MAX_LAMBDA_TIMEOUT_SECS,
+                ),
+                call(
+                    mock_boto3_client.return_value,
+                    file0_source_bucket,
+                    file0_source_key,
+                    file0_target_bucket,
+                    None,
+                    multipart_chunksize_mb,
+                    10,
+                    mock.ANY,
+                    file0_target_key,
+                    None,
+                    copy_from_archive.MAX_LAMBDA_TIMEOUT_SECS,
+                ),
+            ],
+            any_order=True,
+        )
+        self.assertEqual(max_retries + 2, mock_copy_object.call_count)
+        mock_update_status_for_file.assert_has_calls(
+            [
+                call(
+                    file1_job_id,
+                    file1_collection_id,
+                    file1_granule_id,
+                    file1_input_filename,
+                    copy_from_archive.shared_recovery.OrcaStatus.SUCCESS,
+                    None,
+                    db_queue_url,
+                ),
+                call(
+                    file0_job_id,
+                    file0_collection_id,
+                    file0_granule_id,
+                    file0_input_filename,
+                    copy_from_archive.shared_recovery.OrcaStatus.FAILED,
+                    error_message,
+                    db_queue_url,
+                ),
+            ]
+        )
+        self.assertEqual(2, mock_update_status_for_file.call_count)
+        mock_get_full_jitter_delay.assert_has_calls(
+            [
+                call(1, retry_sleep_secs, shared_retry.DEFAULT_MAX_DELAY_SECS),
+                call(2, retry_sleep_secs, shared_retry.DEFAULT_MAX_DELAY_SECS),
+            ]
+        )
+        self.assertEqual(max_retries, mock_sleep.call_count)
+        mock_boto3_client.return_value.delete_message_batch.assert_called_once_with(
+            QueueUrl=received_message_queue_url,
+            Entries=[{"Id": "0", "ReceiptHandle": file1_message_receipt}],
+        )
+        self.assertEqual(
+            {
+                copy_from_archive.OUTPUT_BATCH_ITEM_FAILURES_KEY: [
+                    {copy_from_archive.OUTPUT_ITEM_IDENTIFIER_KEY: file0_message_id}
                 ]
+            },
+            result,
+        )
+
+    @patch("copy_from_archive.LOGGER")
+    @patch("copy_from_archive.shared_recovery.update_status_for_file")
+    @patch("copy_from_archive.copy_object")
+    @patch("copy_from_archive.get_files_from_records")
+    @patch("boto3.client")
+    @patch.dict(
+        os.environ,
+        {
+            copy_from_archive.OS_ENVIRON_DEFAULT_MAX_POOL_CONNECTIONS_KEY: "10",
+            copy_from_archive.OS_ENVIRON_DEFAULT_MAX_CONCURRENCY_KEY: "10",
+        },
+        clear=True,
+    )
+    def test_task_out_of_time_file_reported_without_status(
+        self,
+        mock_boto3_client: MagicMock,
+        mock_get_files_from_records: MagicMock,
+        mock_copy_object: MagicMock,
+        mock_update_status_for_file: MagicMock,
+        mock_logger: MagicMock,
+    ):
+        """
+        A copy that runs out of time is not retried or failed.
+        Its message is reported for redelivery, and its status is left as it was.
+        """
+        db_queue_url = "http://" + uuid.uuid4().__str__() + ".blah"
+        received_message_queue_url = "http://" + uuid.uuid4().__str__() + ".blah"
+        files = []
+        for index in range(2):
+            files.append(
+                {
+                    copy_from_archive.INPUT_JOB_ID_KEY: uuid.uuid4().__str__(),
+                    copy_from_archive.INPUT_COLLECTION_ID_KEY: uuid.uuid4().__str__(),
+                    copy_from_archive.INPUT_GRANULE_ID_KEY: uuid.uuid4().__str__(),
+                    copy_from_archive.INPUT_FILENAME_KEY: uuid.uuid4().__str__(),
+                    copy_from_archive.FILE_SUCCESS_KEY: False,
+                    copy_from_archive.FILE_REDELIVER_KEY: False,
+                    copy_from_archive.INPUT_SOURCE_BUCKET_KEY: uuid.uuid4().__str__(),
+                    copy_from_archive.INPUT_SOURCE_KEY_KEY: f"source{index}",
+                    copy_from_archive.INPUT_TARGET_BUCKET_KEY: uuid.uuid4().__str__(),
+                    copy_from_archive.INPUT_TARGET_KEY_KEY: uuid.uuid4().__str__(),
+                    copy_from_archive.FILE_MESSAGE_RECEIPT: f"receipt{index}",
+                    copy_from_archive.FILE_MESSAGE_ID_KEY: f"message{index}",
+                }
             )
-            self.assertEqual(3, mock_copy_object.call_count)
-            mock_update_status_for_file.assert_has_calls(
-                [
-                    call(
-                        file1_job_id,
-                        file1_collection_id,
-                        file1_granule_id,
-                        file1_input_filename,
-                        copy_from_archive.shared_recovery.OrcaStatus.SUCCESS,
-                        None,
-                        db_queue_url,
-                    ),
-                    call(
-                        file0_job_id,
-                        file0_collection_id,
-                        file0_granule_id,
-                        file0_input_filename,
-                        copy_from_archive.shared_recovery.OrcaStatus.FAILED,
-                        error_message,
-                        db_queue_url,
-                    ),
+        out_of_time_file, copied_file = files
+        mock_get_files_from_records.return_value = files
+
+        def copy_object(s3_cli, src_bucket, src_key, *args):
+            if src_key == "source0":
+                raise copy_from_archive.CopyOutOfTimeError()
+            return None
+
+        mock_copy_object.side_effect = copy_object
+
+        result = copy_from_archive.task(
+            [Mock()],
+            2,
+            0,
+            db_queue_url,
+            250,
+            received_message_queue_url,
+        )
+
+        self.assertEqual(2, mock_copy_object.call_count)
+        mock_update_status_for_file.assert_called_once_with(
+            copied_file[copy_from_archive.INPUT_JOB_ID_KEY],
+            copied_file[copy_from_archive.INPUT_COLLECTION_ID_KEY],
+            copied_file[copy_from_archive.INPUT_GRANULE_ID_KEY],
+            copied_file[copy_from_archive.INPUT_FILENAME_KEY],
+            copy_from_archive.shared_recovery.OrcaStatus.SUCCESS,
+            None,
+            db_queue_url,
+        )
+        mock_boto3_client.return_value.delete_message_batch.assert_called_once_with(
+            QueueUrl=received_message_queue_url,
+            Entries=[{"Id": "0", "ReceiptHandle": "receipt1"}],
+        )
+        self.assertTrue(out_of_time_file[copy_from_archive.FILE_REDELIVER_KEY])
+        self.assertEqual(
+            {
+                copy_from_archive.OUTPUT_BATCH_ITEM_FAILURES_KEY: [
+                    {copy_from_archive.OUTPUT_ITEM_IDENTIFIER_KEY: "message0"}
                 ]
+            },
+            result,
+        )
+
+    @patch("copy_from_archive.LOGGER")
+    @patch("copy_from_archive.shared_recovery.update_status_for_file")
+    @patch("copy_from_archive.copy_object")
+    @patch("copy_from_archive.get_files_from_records")
+    @patch("boto3.client")
+    @patch.dict(
+        os.environ,
+        {
+            copy_from_archive.OS_ENVIRON_DEFAULT_MAX_POOL_CONNECTIONS_KEY: "10",
+            copy_from_archive.OS_ENVIRON_DEFAULT_MAX_CONCURRENCY_KEY: "10",
+        },
+        clear=True,
+    )
+    def test_task_status_error_reports_only_its_file(
+        self,
+        mock_boto3_client: MagicMock,
+        mock_get_files_from_records: MagicMock,
+        mock_copy_object: MagicMock,
+        mock_update_status_for_file: MagicMock,
+        mock_logger: MagicMock,
+    ):
+        """
+        If the status of a copied file cannot be posted, the other files are unaffected.
+        The file's message is kept and reported for redelivery, without a FAILED status.
+        """
+        db_queue_url = "http://" + uuid.uuid4().__str__() + ".blah"
+        received_message_queue_url = "http://" + uuid.uuid4().__str__() + ".blah"
+        files = []
+        for index in range(3):
+            files.append(
+                {
+                    copy_from_archive.INPUT_JOB_ID_KEY: uuid.uuid4().__str__(),
+                    copy_from_archive.INPUT_COLLECTION_ID_KEY: uuid.uuid4().__str__(),
+                    copy_from_archive.INPUT_GRANULE_ID_KEY: uuid.uuid4().__str__(),
+                    copy_from_archive.INPUT_FILENAME_KEY: f"file{index}",
+                    copy_from_archive.FILE_SUCCESS_KEY: False,
+                    copy_from_archive.FILE_REDELIVER_KEY: False,
+                    copy_from_archive.INPUT_SOURCE_BUCKET_KEY: uuid.uuid4().__str__(),
+                    copy_from_archive.INPUT_SOURCE_KEY_KEY: uuid.uuid4().__str__(),
+                    copy_from_archive.INPUT_TARGET_BUCKET_KEY: uuid.uuid4().__str__(),
+                    copy_from_archive.INPUT_TARGET_KEY_KEY: uuid.uuid4().__str__(),
+                    copy_from_archive.FILE_MESSAGE_RECEIPT: f"receipt{index}",
+                    copy_from_archive.FILE_MESSAGE_ID_KEY: f"message{index}",
+                }
             )
-            self.assertEqual(max_retries, mock_update_status_for_file.call_count)
-            mock_sleep.assert_has_calls(
-                [call(retry_sleep_secs), call(retry_sleep_secs)]
+        mock_get_files_from_records.return_value = files
+        mock_copy_object.return_value = None
+
+        # noinspection PyUnusedLocal
+        def update_status_for_file(job_id, collection_id, granule_id, filename, *args):
+            if filename == "file1":
+                raise Exception("Mock status queue failure.")
+
+        mock_update_status_for_file.side_effect = update_status_for_file
+
+        result = copy_from_archive.task(
+            [Mock()],
+            2,
+            0,
+            db_queue_url,
+            250,
+            received_message_queue_url,
+        )
+
+        self.assertEqual(3, mock_copy_object.call_count)
+        self.assertEqual(3, mock_update_status_for_file.call_count)
+        for call_args in mock_update_status_for_file.call_args_list:
+            self.assertEqual(
+                copy_from_archive.shared_recovery.OrcaStatus.SUCCESS,
+                call_args.args[4],
             )
-            self.assertEqual(max_retries, mock_sleep.call_count)
-            return
-        self.fail("Error not raised.")
+        mock_boto3_client.return_value.delete_message_batch.assert_has_calls(
+            [
+                call(
+                    QueueUrl=received_message_queue_url,
+                    Entries=[{"Id": "0", "ReceiptHandle": "receipt0"}],
+                ),
+                call(
+                    QueueUrl=received_message_queue_url,
+                    Entries=[{"Id": "0", "ReceiptHandle": "receipt2"}],
+                ),
+            ],
+            any_order=True,
+        )
+        self.assertEqual(
+            2, mock_boto3_client.return_value.delete_message_batch.call_count
+        )
+        self.assertEqual(
+            {
+                copy_from_archive.OUTPUT_BATCH_ITEM_FAILURES_KEY: [
+                    {copy_from_archive.OUTPUT_ITEM_IDENTIFIER_KEY: "message1"}
+                ]
+            },
+            result,
+        )
 
     @patch("copy_from_archive.LOGGER")
     def test_get_files_from_records_adds_success_key(
@@ -412,103 +716,644 @@ class TestCopyFromArchive(TestCase):
             [
                 {
                     copy_from_archive.FILE_MESSAGE_RECEIPT: return_message_id_0,
+                    copy_from_archive.FILE_MESSAGE_ID_KEY: "message0",
                     "body": json.dumps(file0.copy(), indent=4),
                 },
                 {
                     copy_from_archive.FILE_MESSAGE_RECEIPT: return_message_id_1,
+                    copy_from_archive.FILE_MESSAGE_ID_KEY: "message1",
                     "body": json.dumps(file1.copy(), indent=4),
                 },
             ]
         )
 
         file0[copy_from_archive.FILE_SUCCESS_KEY] = False
+        file0[copy_from_archive.FILE_REDELIVER_KEY] = False
         file0[copy_from_archive.FILE_MESSAGE_RECEIPT] = return_message_id_0
+        file0[copy_from_archive.FILE_MESSAGE_ID_KEY] = "message0"
         file1[copy_from_archive.FILE_SUCCESS_KEY] = False
+        file1[copy_from_archive.FILE_REDELIVER_KEY] = False
         file1[copy_from_archive.FILE_MESSAGE_RECEIPT] = return_message_id_1
+        file1[copy_from_archive.FILE_MESSAGE_ID_KEY] = "message1"
 
         self.assertEqual([file0, file1], result)
 
-    @patch.dict(
-        os.environ,
-        {
-            copy_from_archive.OS_ENVIRON_DEFAULT_MAX_POOL_CONNECTIONS_KEY: "10",
-            copy_from_archive.OS_ENVIRON_DEFAULT_MAX_CONCURRENCY_KEY: "10",
-        },
-        clear=True,
-    )
-    def test_copy_object_happy_path(self):
+    @patch("copy_from_archive.LOGGER")
+    def test_delete_messages_batches_and_logs_failures(self, mock_logger: MagicMock):
+        """
+        Messages should be deleted 10 at a time, and failed deletes only logged.
+        """
+        queue_url = uuid.uuid4().__str__()
+        receipt_handles = [uuid.uuid4().__str__() for _ in range(12)]
+        mock_sqs_cli = Mock()
+        mock_sqs_cli.delete_message_batch.side_effect = [
+            {"Successful": [{"Id": str(index)} for index in range(10)]},
+            {
+                "Successful": [{"Id": "0"}],
+                "Failed": [{"Id": "1", "Message": "bad receipt"}],
+            },
+        ]
+
+        copy_from_archive.delete_messages(mock_sqs_cli, queue_url, receipt_handles)
+
+        mock_sqs_cli.delete_message_batch.assert_has_calls(
+            [
+                call(
+                    QueueUrl=queue_url,
+                    Entries=[
+                        {"Id": str(index), "ReceiptHandle": receipt_handle}
+                        for index, receipt_handle in enumerate(receipt_handles[0:10])
+                    ],
+                ),
+                call(
+                    QueueUrl=queue_url,
+                    Entries=[
+                        {"Id": "0", "ReceiptHandle": receipt_handles[10]},
+                        {"Id": "1", "ReceiptHandle": receipt_handles[11]},
+                    ],
+                ),
+            ]
+        )
+        self.assertEqual(2, mock_sqs_cli.delete_message_batch.call_count)
+        mock_logger.warning.assert_called_once_with(
+            f"Could not delete message '1' from '{queue_url}': bad receipt"
+        )
+
+    @patch("copy_from_archive.copy_parts")
+    def test_copy_object_happy_path(self, mock_copy_parts: MagicMock):
+        """
+        Files larger than the collection's chunk size should be copied in parts
+        of that chunk size.
+        """
         src_bucket_name = uuid.uuid4().__str__()
         src_object_name = uuid.uuid4().__str__()
         dest_bucket_name = uuid.uuid4().__str__()
-        multipart_chunksize_mb = randint(1, 10000)  # nosec
         dest_object_name = uuid.uuid4().__str__()
+        mock_get_remaining_time_in_millis = Mock()
+        source = {
+            "ContentLength": 100 * MB,
+            "ETag": '"source-etag"',
+            "LastModified": datetime.now(timezone.utc),
+            "VersionId": uuid.uuid4().__str__(),
+        }
 
         mock_s3_cli = Mock()
-        config_check = ConfigCheck(multipart_chunksize_mb * MB)
-        mock_s3_cli.copy = Mock(return_value=None)
-        mock_s3_cli.copy.side_effect = config_check.check_multipart_chunksize
+        mock_s3_cli.head_object.return_value = source
+        mock_copy_parts.return_value = None
+        mock_part_executor = Mock()
 
         result = copy_from_archive.copy_object(
             mock_s3_cli,
             src_bucket_name,
             src_object_name,
             dest_bucket_name,
-            multipart_chunksize_mb,
+            25,
+            250,
+            10,
+            mock_part_executor,
             dest_object_name,
+            mock_get_remaining_time_in_millis,
+            600,
         )
 
-        mock_s3_cli.copy.assert_called_once_with(
-            {"Bucket": src_bucket_name, "Key": src_object_name},
+        mock_s3_cli.head_object.assert_called_once_with(
+            Bucket=src_bucket_name, Key=src_object_name
+        )
+        mock_copy_parts.assert_called_once_with(
+            mock_s3_cli,
+            {
+                "Bucket": src_bucket_name,
+                "Key": src_object_name,
+                "VersionId": source["VersionId"],
+            },
+            source,
             dest_bucket_name,
             dest_object_name,
-            ExtraArgs={},
-            Config=mock.ANY,
+            mock.ANY,
+            mock_part_executor,
+            mock_get_remaining_time_in_millis,
+            600,
         )
+        plan = mock_copy_parts.call_args.args[5]
+        self.assertEqual(25 * MB, plan.chunksize_bytes)
+        self.assertEqual(4, plan.part_count)
+        self.assertEqual(4, plan.max_concurrency)
+        mock_s3_cli.copy_object.assert_not_called()
         self.assertIsNone(result)
-        self.assertIsNone(config_check.bad_config)
 
-    @patch.dict(
-        os.environ,
-        {
-            copy_from_archive.OS_ENVIRON_DEFAULT_MAX_POOL_CONNECTIONS_KEY: "10",
-            copy_from_archive.OS_ENVIRON_DEFAULT_MAX_CONCURRENCY_KEY: "10",
-        },
-        clear=True,
-    )
-    def test_copy_object_client_error_returned_as_string(self):
+    @patch("copy_from_archive.copy_parts")
+    def test_copy_object_chunksize_independent_of_batch(
+        self, mock_copy_parts: MagicMock
+    ):
         """
-        If copying the object fails, return error as string.
+        The chunk size is chosen from DEFAULT_MAX_CONCURRENCY, so a redelivered file
+        is split the same way however many files share its batch.
+        """
+        mock_s3_cli = Mock()
+        mock_s3_cli.head_object.return_value = {"ContentLength": 400 * MB}
+        mock_copy_parts.return_value = None
+        chunksizes = []
+
+        for max_workers in [1, 5, 10]:
+            with ThreadPoolExecutor(max_workers=max_workers) as part_executor:
+                copy_from_archive.copy_object(
+                    mock_s3_cli,
+                    uuid.uuid4().__str__(),
+                    uuid.uuid4().__str__(),
+                    uuid.uuid4().__str__(),
+                    None,
+                    250,
+                    10,
+                    part_executor,
+                )
+            chunksizes.append(mock_copy_parts.call_args.args[5].chunksize_bytes)
+
+        self.assertEqual([10 * MB] * 3, chunksizes)
+
+    def test_copy_object_small_file_single_copy(self):
+        """
+        Files that fit in a single chunk should be copied with one copy_object.
         """
         src_bucket_name = uuid.uuid4().__str__()
         src_object_name = uuid.uuid4().__str__()
         dest_bucket_name = uuid.uuid4().__str__()
-        multipart_chunksize_mb = randint(1, 10000)  # nosec
         dest_object_name = uuid.uuid4().__str__()
+
+        mock_s3_cli = Mock()
+        mock_s3_cli.head_object.return_value = {
+            "ContentLength": 2 * MB,
+            "ETag": '"source-etag"',
+        }
+
+        with ThreadPoolExecutor(max_workers=10) as part_executor:
+            result = copy_from_archive.copy_object(
+                mock_s3_cli,
+                src_bucket_name,
+                src_object_name,
+                dest_bucket_name,
+                None,
+                250,
+                10,
+                part_executor,
+                dest_object_name,
+            )
+
+        mock_s3_cli.copy_object.assert_called_once_with(
+            CopySource={"Bucket": src_bucket_name, "Key": src_object_name},
+            CopySourceIfMatch='"source-etag"',
+            Bucket=dest_bucket_name,
+            Key=dest_object_name,
+        )
+        mock_s3_cli.create_multipart_upload.assert_not_called()
+        self.assertIsNone(result)
+
+    @patch("copy_from_archive.copy_parts")
+    def test_copy_object_out_of_time_raised(self, mock_copy_parts: MagicMock):
+        """
+        A copy that runs out of time is not returned as an error, as it is resumed later.
+        """
+        mock_s3_cli = Mock()
+        mock_s3_cli.head_object.return_value = {"ContentLength": 100 * MB}
+        mock_copy_parts.side_effect = copy_from_archive.CopyOutOfTimeError()
+
+        with self.assertRaises(copy_from_archive.CopyOutOfTimeError):
+            copy_from_archive.copy_object(
+                mock_s3_cli,
+                uuid.uuid4().__str__(),
+                uuid.uuid4().__str__(),
+                uuid.uuid4().__str__(),
+                None,
+                250,
+                10,
+                Mock(),
+            )
+
+    @patch("copy_from_archive.copy_parts")
+    def test_copy_object_client_error_returned_as_string(
+        self, mock_copy_parts: MagicMock
+    ):
+        """
+        If copying the object fails, return error as string.
+        """
         expected_result = uuid.uuid4().__str__()
 
         mock_s3_cli = Mock()
+        mock_s3_cli.head_object.return_value = {"ContentLength": 100 * MB}
         error = ClientError({"Error": {}}, "operation name")
         error.__str__ = Mock()
         error.__str__.return_value = expected_result
-        mock_s3_cli.copy.side_effect = error
+        mock_copy_parts.side_effect = error
 
         result = copy_from_archive.copy_object(
             mock_s3_cli,
-            src_bucket_name,
-            src_object_name,
+            uuid.uuid4().__str__(),
+            uuid.uuid4().__str__(),
+            uuid.uuid4().__str__(),
+            randint(5, 50),  # nosec
+            250,
+            10,
+            Mock(),
+            uuid.uuid4().__str__(),
+        )
+
+        self.assertEqual(expected_result, result)
+
+    @patch("copy_from_archive.get_resumable_upload")
+    def test_copy_parts_new_upload(self, mock_get_resumable_upload: MagicMock):
+        """
+        Without an upload to resume, all parts are copied into a new upload and completed.
+        """
+        copy_source = {
+            "Bucket": uuid.uuid4().__str__(),
+            "Key": uuid.uuid4().__str__(),
+            "VersionId": uuid.uuid4().__str__(),
+        }
+        source = {"ETag": '"source-etag"', "LastModified": datetime.now(timezone.utc)}
+        dest_bucket_name = uuid.uuid4().__str__()
+        dest_object_name = uuid.uuid4().__str__()
+        upload_id = uuid.uuid4().__str__()
+        plan = shared_transfer.plan_transfer(20 * MB, 10, 250, chunksize_override_mb=8)
+
+        mock_get_resumable_upload.return_value = (None, {})
+        mock_s3_cli = Mock()
+        mock_s3_cli.create_multipart_upload.return_value = {"UploadId": upload_id}
+        mock_s3_cli.upload_part_copy.side_effect = lambda **kwargs: {
+            "CopyPartResult": {"ETag": f"etag{kwargs['PartNumber']}"}
+        }
+
+        with ThreadPoolExecutor(max_workers=10) as part_executor:
+            copy_from_archive.copy_parts(
+                mock_s3_cli,
+                copy_source,
+                source,
+                dest_bucket_name,
+                dest_object_name,
+                plan,
+                part_executor,
+            )
+
+        mock_get_resumable_upload.assert_called_once_with(
+            mock_s3_cli,
+            dest_bucket_name,
+            dest_object_name,
+            plan,
+            source["LastModified"],
+            copy_from_archive.MAX_LAMBDA_TIMEOUT_SECS,
+        )
+        mock_s3_cli.create_multipart_upload.assert_called_once_with(
+            Bucket=dest_bucket_name, Key=dest_object_name
+        )
+        mock_s3_cli.upload_part_copy.assert_has_calls(
+            [
+                call(
+                    Bucket=dest_bucket_name,
+                    Key=dest_object_name,
+                    CopySource=copy_source,
+                    CopySourceIfMatch='"source-etag"',
+                    CopySourceRange=f"bytes={first_byte}-{last_byte}",
+                    PartNumber=part_number,
+                    UploadId=upload_id,
+                )
+                for part_number, first_byte, last_byte in [
+                    (1, 0, 8 * MB - 1),
+                    (2, 8 * MB, 16 * MB - 1),
+                    (3, 16 * MB, 20 * MB - 1),
+                ]
+            ],
+            any_order=True,
+        )
+        self.assertEqual(3, mock_s3_cli.upload_part_copy.call_count)
+        mock_s3_cli.complete_multipart_upload.assert_called_once_with(
+            Bucket=dest_bucket_name,
+            Key=dest_object_name,
+            UploadId=upload_id,
+            MultipartUpload={
+                "Parts": [
+                    {"ETag": "etag1", "PartNumber": 1},
+                    {"ETag": "etag2", "PartNumber": 2},
+                    {"ETag": "etag3", "PartNumber": 3},
+                ]
+            },
+        )
+
+    @patch("copy_from_archive.get_resumable_upload")
+    def test_copy_parts_resumes_remaining_parts(
+        self, mock_get_resumable_upload: MagicMock
+    ):
+        """
+        Parts finished by an earlier delivery are not copied again.
+        """
+        upload_id = uuid.uuid4().__str__()
+        plan = shared_transfer.plan_transfer(20 * MB, 10, 250, chunksize_override_mb=8)
+
+        mock_get_resumable_upload.return_value = (upload_id, {1: "etag1", 3: "etag3"})
+        mock_s3_cli = Mock()
+        mock_s3_cli.upload_part_copy.return_value = {
+            "CopyPartResult": {"ETag": "etag2"}
+        }
+
+        with ThreadPoolExecutor(max_workers=10) as part_executor:
+            copy_from_archive.copy_parts(
+                mock_s3_cli,
+                {"Bucket": uuid.uuid4().__str__(), "Key": uuid.uuid4().__str__()},
+                {"ETag": '"source-etag"', "LastModified": datetime.now(timezone.utc)},
+                uuid.uuid4().__str__(),
+                uuid.uuid4().__str__(),
+                plan,
+                part_executor,
+            )
+
+        mock_s3_cli.create_multipart_upload.assert_not_called()
+        mock_s3_cli.upload_part_copy.assert_called_once_with(
+            Bucket=mock.ANY,
+            Key=mock.ANY,
+            CopySource=mock.ANY,
+            CopySourceIfMatch='"source-etag"',
+            CopySourceRange=f"bytes={8 * MB}-{16 * MB - 1}",
+            PartNumber=2,
+            UploadId=upload_id,
+        )
+        self.assertEqual(
+            [
+                {"ETag": "etag1", "PartNumber": 1},
+                {"ETag": "etag2", "PartNumber": 2},
+                {"ETag": "etag3", "PartNumber": 3},
+            ],
+            mock_s3_cli.complete_multipart_upload.call_args.kwargs["MultipartUpload"][
+                "Parts"
+            ],
+        )
+
+    @patch("copy_from_archive.get_resumable_upload")
+    def test_copy_parts_uses_whole_shared_budget(
+        self, mock_get_resumable_upload: MagicMock
+    ):
+        """
+        A file copied alone should have as many parts in flight
+        as the shared executor has workers.
+        """
+        plan = shared_transfer.plan_transfer(64 * MB, 4, 250, chunksize_override_mb=8)
+        # Each part waits until 4 parts are being copied at once.
+        all_in_flight = Barrier(4, timeout=5)
+
+        def upload_part_copy(**kwargs):
+            all_in_flight.wait()
+            return {"CopyPartResult": {"ETag": f"etag{kwargs['PartNumber']}"}}
+
+        mock_get_resumable_upload.return_value = (None, {})
+        mock_s3_cli = Mock()
+        mock_s3_cli.create_multipart_upload.return_value = {
+            "UploadId": uuid.uuid4().__str__()
+        }
+        mock_s3_cli.upload_part_copy.side_effect = upload_part_copy
+
+        with ThreadPoolExecutor(max_workers=4) as part_executor:
+            copy_from_archive.copy_parts(
+                mock_s3_cli,
+                {"Bucket": uuid.uuid4().__str__(), "Key": uuid.uuid4().__str__()},
+                {"ETag": '"source-etag"', "LastModified": datetime.now(timezone.utc)},
+                uuid.uuid4().__str__(),
+                uuid.uuid4().__str__(),
+                plan,
+                part_executor,
+            )
+
+        self.assertEqual(8, mock_s3_cli.upload_part_copy.call_count)
+        self.assertEqual(
+            8,
+            len(
+                mock_s3_cli.complete_multipart_upload.call_args.kwargs[
+                    "MultipartUpload"
+                ]["Parts"]
+            ),
+        )
+
+    @patch("copy_from_archive.get_resumable_upload")
+    def test_copy_parts_out_of_time_leaves_upload(
+        self, mock_get_resumable_upload: MagicMock
+    ):
+        """
+        Parts are not started without enough Lambda time,
+        and the upload is left for the next delivery to resume.
+        """
+        upload_id = uuid.uuid4().__str__()
+        plan = shared_transfer.plan_transfer(20 * MB, 10, 250, chunksize_override_mb=8)
+
+        mock_get_resumable_upload.return_value = (upload_id, {1: "etag1"})
+        mock_s3_cli = Mock()
+        mock_get_remaining_time_in_millis = Mock(return_value=1000)
+
+        with ThreadPoolExecutor(max_workers=10) as part_executor:
+            with self.assertRaises(copy_from_archive.CopyOutOfTimeError) as context:
+                copy_from_archive.copy_parts(
+                    mock_s3_cli,
+                    {"Bucket": uuid.uuid4().__str__(), "Key": uuid.uuid4().__str__()},
+                    {
+                        "ETag": '"source-etag"',
+                        "LastModified": datetime.now(timezone.utc),
+                    },
+                    uuid.uuid4().__str__(),
+                    "some/key",
+                    plan,
+                    part_executor,
+                    mock_get_remaining_time_in_millis,
+                )
+
+        mock_s3_cli.upload_part_copy.assert_not_called()
+        mock_s3_cli.complete_multipart_upload.assert_not_called()
+        mock_s3_cli.abort_multipart_upload.assert_not_called()
+        self.assertEqual(
+            "Ran out of time with 1 of 3 part(s) of 'some/key' copied. "
+            f"Upload '{upload_id}' will resume when the file is redelivered.",
+            context.exception.__str__(),
+        )
+
+    @patch("copy_from_archive.get_resumable_upload")
+    def test_copy_parts_source_changed_aborts_upload(
+        self, mock_get_resumable_upload: MagicMock
+    ):
+        """
+        If the source no longer has the ETag read by head_object,
+        the upload is aborted so its parts are not resumed.
+        """
+        dest_bucket_name = uuid.uuid4().__str__()
+        dest_object_name = uuid.uuid4().__str__()
+        upload_id = uuid.uuid4().__str__()
+        plan = shared_transfer.plan_transfer(20 * MB, 10, 250, chunksize_override_mb=8)
+        error = ClientError({"Error": {"Code": "PreconditionFailed"}}, "UploadPartCopy")
+
+        mock_get_resumable_upload.return_value = (upload_id, {1: "etag1"})
+        mock_s3_cli = Mock()
+        mock_s3_cli.upload_part_copy.side_effect = error
+
+        with ThreadPoolExecutor(max_workers=10) as part_executor:
+            with self.assertRaises(ClientError) as context:
+                copy_from_archive.copy_parts(
+                    mock_s3_cli,
+                    {"Bucket": uuid.uuid4().__str__(), "Key": uuid.uuid4().__str__()},
+                    {
+                        "ETag": '"source-etag"',
+                        "LastModified": datetime.now(timezone.utc),
+                    },
+                    dest_bucket_name,
+                    dest_object_name,
+                    plan,
+                    part_executor,
+                )
+
+        self.assertEqual(error, context.exception)
+        mock_s3_cli.abort_multipart_upload.assert_called_once_with(
+            Bucket=dest_bucket_name, Key=dest_object_name, UploadId=upload_id
+        )
+        mock_s3_cli.complete_multipart_upload.assert_not_called()
+
+    def test_get_resumable_upload_keeps_newest_matching_upload(self):
+        """
+        The newest upload whose parts match the plan is resumed.
+        Uploads with parts from another plan, and older uploads, are aborted
+        once older than the Lambda timeout.
+        """
+        dest_bucket_name = uuid.uuid4().__str__()
+        dest_object_name = uuid.uuid4().__str__()
+        plan = shared_transfer.plan_transfer(20 * MB, 10, 250, chunksize_override_mb=8)
+        now = datetime.now(timezone.utc)
+        uploads = [
+            {
+                "Key": dest_object_name,
+                "UploadId": "oldest",
+                "Initiated": now - timedelta(seconds=700),
+            },
+            {
+                "Key": dest_object_name,
+                "UploadId": "mismatched",
+                "Initiated": now - timedelta(seconds=610),
+            },
+            {
+                "Key": dest_object_name + "_other",
+                "UploadId": "other",
+                "Initiated": now - timedelta(seconds=800),
+            },
+            {
+                "Key": dest_object_name,
+                "UploadId": "recent",
+                "Initiated": now - timedelta(seconds=60),
+            },
+            {
+                "Key": dest_object_name,
+                "UploadId": "matching",
+                "Initiated": now - timedelta(seconds=650),
+            },
+        ]
+        parts = {
+            "recent": [{"PartNumber": 1, "Size": 4 * MB, "ETag": "etag1"}],
+            "mismatched": [{"PartNumber": 1, "Size": 5 * MB, "ETag": "etag1"}],
+            "matching": [
+                {"PartNumber": 2, "Size": 8 * MB, "ETag": "etag2"},
+                {"PartNumber": 3, "Size": 4 * MB, "ETag": "etag3"},
+            ],
+        }
+        mock_uploads_paginator = Mock()
+        mock_uploads_paginator.paginate.return_value = [
+            {"Uploads": uploads[:2]},
+            {"Uploads": uploads[2:]},
+        ]
+        mock_parts_paginator = Mock()
+        mock_parts_paginator.paginate.side_effect = lambda **kwargs: [
+            {"Parts": parts[kwargs["UploadId"]]}
+        ]
+        mock_s3_cli = Mock()
+        mock_s3_cli.get_paginator.side_effect = lambda name: {
+            "list_multipart_uploads": mock_uploads_paginator,
+            "list_parts": mock_parts_paginator,
+        }[name]
+
+        upload_id, part_etags = copy_from_archive.get_resumable_upload(
+            mock_s3_cli,
             dest_bucket_name,
-            multipart_chunksize_mb,
             dest_object_name,
+            plan,
+            now - timedelta(seconds=900),
+            600,
         )
 
-        mock_s3_cli.copy.assert_called_once_with(
-            {"Bucket": src_bucket_name, "Key": src_object_name},
+        self.assertEqual("matching", upload_id)
+        self.assertEqual({2: "etag2", 3: "etag3"}, part_etags)
+        mock_uploads_paginator.paginate.assert_called_once_with(
+            Bucket=dest_bucket_name, Prefix=dest_object_name
+        )
+        mock_s3_cli.abort_multipart_upload.assert_has_calls(
+            [
+                call(
+                    Bucket=dest_bucket_name,
+                    Key=dest_object_name,
+                    UploadId="mismatched",
+                ),
+                call(Bucket=dest_bucket_name, Key=dest_object_name, UploadId="oldest"),
+            ]
+        )
+        self.assertEqual(2, mock_s3_cli.abort_multipart_upload.call_count)
+
+    def test_get_resumable_upload_ignores_uploads_older_than_source(self):
+        """
+        Uploads initiated before the source was last modified hold parts
+        of an older source, so are not resumed even if their parts match the plan.
+        """
+        dest_bucket_name = uuid.uuid4().__str__()
+        dest_object_name = uuid.uuid4().__str__()
+        plan = shared_transfer.plan_transfer(20 * MB, 10, 250, chunksize_override_mb=8)
+        now = datetime.now(timezone.utc)
+        mock_uploads_paginator = Mock()
+        mock_uploads_paginator.paginate.return_value = [
+            {
+                "Uploads": [
+                    {
+                        "Key": dest_object_name,
+                        "UploadId": "stale",
+                        "Initiated": now - timedelta(seconds=700),
+                    },
+                    {
+                        "Key": dest_object_name,
+                        "UploadId": "in_progress",
+                        "Initiated": now - timedelta(seconds=120),
+                    },
+                ]
+            }
+        ]
+        mock_s3_cli = Mock()
+        mock_s3_cli.get_paginator.return_value = mock_uploads_paginator
+
+        result = copy_from_archive.get_resumable_upload(
+            mock_s3_cli,
             dest_bucket_name,
             dest_object_name,
-            ExtraArgs={},
-            Config=mock.ANY,
+            plan,
+            now - timedelta(seconds=60),
+            600,
         )
-        self.assertEqual(expected_result, result)
+
+        self.assertEqual((None, {}), result)
+        mock_s3_cli.get_paginator.assert_called_once_with("list_multipart_uploads")
+        mock_s3_cli.abort_multipart_upload.assert_called_once_with(
+            Bucket=dest_bucket_name, Key=dest_object_name, UploadId="stale"
+        )
+
+    def test_get_resumable_upload_none_found(self):
+        mock_paginator = Mock()
+        mock_paginator.paginate.return_value = [{}]
+        mock_s3_cli = Mock()
+        mock_s3_cli.get_paginator.return_value = mock_paginator
+        plan = shared_transfer.plan_transfer(20 * MB, 10, 250, chunksize_override_mb=8)
+
+        result = copy_from_archive.get_resumable_upload(
+            mock_s3_cli,
+            uuid.uuid4().__str__(),
+            uuid.uuid4().__str__(),
+            plan,
+            datetime.now(timezone.utc),
+        )
+
+        self.assertEqual((None, {}), result)
+        mock_s3_cli.abort_multipart_upload.assert_not_called()
 
 
 if __name__ == "__main__":
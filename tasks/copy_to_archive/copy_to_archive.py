@@ -6,18 +6,21 @@ and copies those files from their current storage location into a staging/archiv
 
 import json
 import os
-import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 # Third party libraries
 import boto3
 import fastjsonschema as fastjsonschema
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from boto3.s3.transfer import MB, TransferConfig
 from botocore.config import Config
 from fastjsonschema import JsonSchemaException
+from orca_shared.files import shared_files
+from orca_shared.transfer import shared_transfer
 
 import sqs_library
 
@@ -30,6 +33,14 @@ OS_ENVIRON_DEFAULT_MULTIPART_CHUNKSIZE_MB_KEY = "DEFAULT_MULTIPART_CHUNKSIZE_MB"
 OS_ENVIRON_METADATA_DB_QUEUE_URL_KEY = "METADATA_DB_QUEUE_URL"
 OS_ENVIRON_DEFAULT_MAX_POOL_CONNECTIONS_KEY = "DEFAULT_MAX_POOL_CONNECTIONS"
 OS_ENVIRON_DEFAULT_MAX_CONCURRENCY_KEY = "DEFAULT_MAX_CONCURRENCY"
+OS_ENVIRON_DEFAULT_MAX_FILES_IN_FLIGHT_KEY = "DEFAULT_MAX_FILES_IN_FLIGHT"
+
+DEFAULT_MAX_FILES_IN_FLIGHT = 10
+
+# Building clients and their connection pools takes time, so keep them for warm invocations.
+_S3_CLIENT_CACHE: Dict[Tuple[Optional[str], int], Any] = {}
+_S3_CLIENT_CACHE_STATS = {"hits": 0, "misses": 0}
+_S3_CLIENT_CACHE_LOCK = threading.Lock()
 
 EVENT_CONFIG_KEY = "config"
 EVENT_INPUT_KEY = "input"
@@ -76,31 +87,77 @@ def should_exclude_files_type(file_key: str, exclude_file_types: List[str]) -> b
     Returns:
         True if file should be excluded from copy, False otherwise.
     """
-    for file_type in exclude_file_types:
-        # Returns the first instance in the string that matches .ext or None if no match was found.
-        if re.search(f"^.*{file_type}$", file_key) is not None:
-            return True
-    return False
+    return shared_files.get_file_exclusion_matcher(exclude_file_types).should_exclude(
+        file_key
+    )
+
+
+def get_s3_client(max_pool_connections: int) -> Any:
+    """
+    Returns a cached s3 client for the current region and pool size,
+    creating it on first use. The client is retained between warm invocations.
+
+        Environment Variables:
+            AWS_REGION (string, optional):
+                The region the client connects to. Defaults to boto3's configuration.
+
+    Args:
+        max_pool_connections: The maximum number of connections to keep in the pool.
+
+    Returns:
+        An instance of boto3 s3 client.
+    """
+    region = os.environ.get("AWS_REGION", None)
+    cache_key = (region, max_pool_connections)
+    with _S3_CLIENT_CACHE_LOCK:
+        s3_client = _S3_CLIENT_CACHE.get(cache_key, None)
+        if s3_client is None:
+            _S3_CLIENT_CACHE_STATS["misses"] += 1
+            s3_client = boto3.client(
+                "s3",
+                region_name=region,
+                config=Config(max_pool_connections=max_pool_connections),
+            )
+            _S3_CLIENT_CACHE[cache_key] = s3_client
+        else:
+            _S3_CLIENT_CACHE_STATS["hits"] += 1
+        LOGGER.info(
+            f"S3 client cache hits: {_S3_CLIENT_CACHE_STATS['hits']}, "
+            f"misses: {_S3_CLIENT_CACHE_STATS['misses']}."
+        )
+    return s3_client
 
 
 def copy_granule_between_buckets(
+    s3_client: Any,
     source_bucket_name: str,
     source_key: str,
     destination_bucket: str,
     destination_key: str,
-    multipart_chunksize_mb: int,
+    multipart_chunksize_mb: Optional[int],
     storage_class: str,
+    max_concurrency: int,
+    default_multipart_chunksize_mb: int,
 ) -> Dict[str, str]:
     """
     Copies granule from source bucket to destination.
-    Also queries the destination_bucket to get additional metadata file info.
+    The copy is planned from the source object's size by shared_transfer.
+    Files the plan copies in one request use a single copy_object,
+    whose response provides the additional metadata file info.
+    Larger files use a multipart copy, see copy_parts,
+    followed by a head_object on the version it created to get that info.
     Args:
+        s3_client: An instance of boto3 s3 client. Safe to share between threads.
         source_bucket_name: The name of the bucket in which the granule is currently located.
         source_key: source Granule path excluding s3://[bucket]/
         destination_bucket: The name of the bucket the granule is to be copied to.
         destination_key: Destination granule path excluding s3://[bucket]/
-        multipart_chunksize_mb: The maximum size of chunks to use when copying.
+        multipart_chunksize_mb: The collection's chunk size for multipart copies.
+            If None, the chunk size is chosen from the file size.
         storage_class: The storage class to store in.
+        max_concurrency: The maximum number of concurrent S3 API transfer operations
+            used for this file.
+        default_multipart_chunksize_mb: The largest chunk size to choose automatically.
     Returns:
         A dictionary containing all the file metadata needed
         for reconciliation with Cumulus with the following keys:
@@ -120,47 +177,61 @@ def copy_granule_between_buckets(
                 "etag" (str):
                     etag of the file object in the archive bucket.
     """
-    default_max_pool_connections = int(
-        os.environ[OS_ENVIRON_DEFAULT_MAX_POOL_CONNECTIONS_KEY]
-    )
-    LOGGER.info(default_max_pool_connections)
-
-    default_max_concurrency = int(os.environ[OS_ENVIRON_DEFAULT_MAX_CONCURRENCY_KEY])
-    LOGGER.info(default_max_concurrency)
-
-    s3 = boto3.client(
-        "s3", config=Config(max_pool_connections=default_max_pool_connections)
-    )
+    source_metadata = s3_client.head_object(Bucket=source_bucket_name, Key=source_key)
     copy_source = {"Bucket": source_bucket_name, "Key": source_key}
-    s3.copy(
-        copy_source,
-        destination_bucket,
-        destination_key,
-        ExtraArgs={
-            "StorageClass": storage_class,
-            "MetadataDirective": "COPY",
-            "ContentType": s3.head_object(Bucket=source_bucket_name, Key=source_key)[
-                "ContentType"
-            ],
-            # Needed for cross-OU copies.
-        },
-        Config=TransferConfig(
-            multipart_chunksize=multipart_chunksize_mb * MB,
-            max_concurrency=default_max_concurrency,
-        ),
-    )
-    # get metadata info from latest file version
-    file_versions = s3.list_object_versions(
-        Bucket=destination_bucket, Prefix=destination_key
-    )
-    latest_version = next(  # Find the first item in file_versions["Versions"]
-        # that has "IsLatest" set to true.
-        filter(lambda file_version: file_version["IsLatest"], file_versions["Versions"])
+    extra_args = {
+        "StorageClass": storage_class,
+        "MetadataDirective": "COPY",
+        "ContentType": source_metadata["ContentType"],
+        # Needed for cross-OU copies.
+    }
+    plan = shared_transfer.plan_transfer(
+        source_metadata["ContentLength"],
+        max_concurrency,
+        default_multipart_chunksize_mb,
+        chunksize_override_mb=multipart_chunksize_mb,
     )
-    LOGGER.info("collecting metadata from file version")
-    etag = latest_version["ETag"]
-    size_in_bytes = latest_version["Size"]
-    version = latest_version["VersionId"]
+    LOGGER.info(f"Copying '{source_key}' with {plan}")
+    start_time = time.monotonic()
+    if not plan.multipart:
+        # A single copy_object returns the new version's metadata,
+        # so no further requests are needed.
+        copy_response = s3_client.copy_object(
+            CopySource=copy_source,
+            Bucket=destination_bucket,
+            Key=destination_key,
+            **extra_args,
+        )
+        elapsed_secs = time.monotonic() - start_time
+        LOGGER.info("collecting metadata from copy response")
+        etag = copy_response["CopyObjectResult"]["ETag"]
+        size_in_bytes = source_metadata["ContentLength"]
+        # Unversioned buckets do not return a VersionId.
+        version = copy_response.get("VersionId", "null")
+    else:
+        complete_response = copy_parts(
+            s3_client,
+            copy_source,
+            destination_bucket,
+            destination_key,
+            plan,
+            storage_class,
+            source_metadata["ContentType"],
+        )
+        elapsed_secs = time.monotonic() - start_time
+        # Get metadata info from the version this copy created,
+        # rather than the latest version, which a later write may have replaced.
+        # Unversioned buckets do not return a VersionId.
+        version = complete_response.get("VersionId", None)
+        head_object_args = {} if version is None else {"VersionId": version}
+        destination_metadata = s3_client.head_object(
+            Bucket=destination_bucket, Key=destination_key, **head_object_args
+        )
+        LOGGER.info("collecting metadata from file version")
+        etag = destination_metadata["ETag"]
+        size_in_bytes = destination_metadata["ContentLength"]
+        version = destination_metadata.get("VersionId", "null")
+    shared_transfer.log_transfer_throughput(source_key, plan, elapsed_secs)
     files_dictionary = {
         "cumulusArchiveLocation": source_bucket_name,
         "orcaArchiveLocation": destination_bucket,
@@ -174,6 +245,162 @@ def copy_granule_between_buckets(
     return files_dictionary
 
 
+def copy_parts(
+    s3_client: Any,
+    copy_source: Dict[str, str],
+    destination_bucket: str,
+    destination_key: str,
+    plan: shared_transfer.TransferPlan,
+    storage_class: str,
+    content_type: str,
+) -> Dict[str, Any]:
+    """
+    Copies an object in the parts of the plan with UploadPartCopy,
+    running up to plan.max_concurrency part copies at once.
+    If a part fails, the upload is aborted so its parts are not kept.
+    Args:
+        s3_client: An instance of boto3 s3 client. Safe to share between threads.
+        copy_source: The 'Bucket' and 'Key' of the object being copied.
+        destination_bucket: The name of the bucket the granule is to be copied to.
+        destination_key: Destination granule path excluding s3://[bucket]/
+        plan: A multipart plan for the copy.
+        storage_class: The storage class to store in.
+        content_type: The ContentType of the source object.
+    Returns:
+        The complete_multipart_upload response, with the 'ETag' and 'VersionId'
+        of the new object.
+    """
+    upload_id = s3_client.create_multipart_upload(
+        Bucket=destination_bucket,
+        Key=destination_key,
+        StorageClass=storage_class,
+        ContentType=content_type,
+    )["UploadId"]
+
+    def copy_part(part_range: Tuple[int, int, int]) -> Dict[str, Any]:
+        part_number, first_byte, last_byte = part_range
+        etag = s3_client.upload_part_copy(
+            Bucket=destination_bucket,
+            Key=destination_key,
+            CopySource=copy_source,
+            CopySourceRange=f"bytes={first_byte}-{last_byte}",
+            PartNumber=part_number,
+            UploadId=upload_id,
+        )["CopyPartResult"]["ETag"]
+        return {"ETag": etag, "PartNumber": part_number}
+
+    try:
+        with ThreadPoolExecutor(max_workers=plan.max_concurrency) as part_executor:
+            parts = list(
+                part_executor.map(copy_part, shared_transfer.get_part_ranges(plan))
+            )
+        return s3_client.complete_multipart_upload(
+            Bucket=destination_bucket,
+            Key=destination_key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+    except Exception:
+        LOGGER.error(f"Aborting upload '{upload_id}' of '{destination_key}'.")
+        s3_client.abort_multipart_upload(
+            Bucket=destination_bucket, Key=destination_key, UploadId=upload_id
+        )
+        raise
+
+
+def copy_granules_between_buckets(
+    granule_copy_requests: List[List[Dict[str, str]]],
+    destination_bucket: str,
+    multipart_chunksize_mb: Optional[int],
+    storage_class: str,
+    default_multipart_chunksize_mb: int,
+) -> List[List[Dict[str, str]]]:
+    """
+    Copies the files of all granules concurrently using a bounded thread pool
+    over a single shared s3 client, reused across warm invocations.
+
+        Environment Variables:
+            DEFAULT_MAX_POOL_CONNECTIONS (int, required):
+                The minimum number of connections to keep in the shared connection pool.
+            DEFAULT_MAX_CONCURRENCY (int, required):
+                The maximum number of concurrent S3 API transfer operations per file.
+            DEFAULT_MAX_FILES_IN_FLIGHT (int, optional):
+                The maximum number of files copied at the same time.
+                Defaults to DEFAULT_MAX_FILES_IN_FLIGHT.
+                Each file in flight can make DEFAULT_MAX_CONCURRENCY requests at once,
+                so the pool is raised to DEFAULT_MAX_FILES_IN_FLIGHT * DEFAULT_MAX_CONCURRENCY
+                connections if DEFAULT_MAX_POOL_CONNECTIONS is smaller.
+
+    Args:
+        granule_copy_requests: One list per granule, each containing dicts with the keys
+            "source_bucket_name", "source_key", and "destination_key".
+        destination_bucket: The name of the bucket the granules are to be copied to.
+        multipart_chunksize_mb: The collection's chunk size for multipart copies.
+            If None, each file's chunk size is chosen from its size.
+        storage_class: The storage class to store in.
+        default_multipart_chunksize_mb: The largest chunk size to choose automatically.
+
+    Returns:
+        One list per granule, in the same order as granule_copy_requests,
+        containing the results of copy_granule_between_buckets
+        in the same order as that granule's requests.
+
+    Raises:
+        Exception: The first error raised by a copy, in request order.
+            Copies that have not started yet are cancelled.
+    """
+    if not any(granule_copy_requests):
+        LOGGER.info("No files to copy.")
+        return [[] for _ in granule_copy_requests]
+
+    default_max_pool_connections = int(
+        os.environ[OS_ENVIRON_DEFAULT_MAX_POOL_CONNECTIONS_KEY]
+    )
+    default_max_concurrency = int(os.environ[OS_ENVIRON_DEFAULT_MAX_CONCURRENCY_KEY])
+    max_files_in_flight = int(
+        os.environ.get(
+            OS_ENVIRON_DEFAULT_MAX_FILES_IN_FLIGHT_KEY, DEFAULT_MAX_FILES_IN_FLIGHT
+        )
+    )
+    # Give every request that can be in flight at once its own pooled connection.
+    max_pool_connections = max(
+        default_max_pool_connections, max_files_in_flight * default_max_concurrency
+    )
+    LOGGER.info(
+        f"Copying with max_pool_connections {max_pool_connections}, "
+        f"max_concurrency {default_max_concurrency}, "
+        f"and max_files_in_flight {max_files_in_flight}."
+    )
+
+    s3 = get_s3_client(max_pool_connections)
+    executor = ThreadPoolExecutor(max_workers=max_files_in_flight)
+    try:
+        granule_futures: List[List[Future]] = [
+            [
+                executor.submit(
+                    copy_granule_between_buckets,
+                    s3_client=s3,
+                    source_bucket_name=copy_request["source_bucket_name"],
+                    source_key=copy_request["source_key"],
+                    destination_bucket=destination_bucket,
+                    destination_key=copy_request["destination_key"],
+                    multipart_chunksize_mb=multipart_chunksize_mb,
+                    storage_class=storage_class,
+                    max_concurrency=default_max_concurrency,
+                    default_multipart_chunksize_mb=default_multipart_chunksize_mb,
+                )
+                for copy_request in copy_requests
+            ]
+            for copy_requests in granule_copy_requests
+        ]
+        return [[future.result() for future in futures] for futures in granule_futures]
+    except Exception:
+        executor.shutdown(wait=True, cancel_futures=True)
+        raise
+    finally:
+        executor.shutdown(wait=True)
+
+
 # noinspection PyUnusedLocal
 def task(task_input: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -184,11 +411,13 @@ def task(task_input: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
             ORCA_DEFAULT_BUCKET (string, required):
                 Name of the default archive bucket.
                 Overridden by bucket specified in config.
-            DEFAULT_MULTIPART_CHUNKSIZE_MB (int, optional):
-                The default maximum size of chunks to use when copying.
+            DEFAULT_MULTIPART_CHUNKSIZE_MB (int, required):
+                The largest chunk size chosen automatically from a file's size.
                 Can be overridden by collection config.
             METADATA_DB_QUEUE_URL (string, required):
                 SQS URL of the metadata queue.
+            DEFAULT_MAX_FILES_IN_FLIGHT (int, optional):
+                The maximum number of files copied at the same time.
 
     Args:
         task_input: See schemas/input.json
@@ -197,23 +426,25 @@ def task(task_input: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         A dict representing input and copied files. See schemas/output.json for more information.
     """
-    exclude_file_types = config.get(CONFIG_EXCLUDED_FILE_EXTENSIONS_KEY, None)
-    if exclude_file_types is None:
-        exclude_file_types = []
+    exclusion_matcher = shared_files.get_file_exclusion_matcher(
+        config.get(CONFIG_EXCLUDED_FILE_EXTENSIONS_KEY, None)
+    )
 
     destination_bucket = get_destination_bucket_name(config)
     storage_class = get_storage_class(config)
 
+    default_multipart_chunksize_mb = int(
+        os.environ[OS_ENVIRON_DEFAULT_MULTIPART_CHUNKSIZE_MB_KEY]
+    )
     multipart_chunksize_mb_str = config.get(CONFIG_MULTIPART_CHUNKSIZE_MB_KEY, None)
     if multipart_chunksize_mb_str is None:
-        multipart_chunksize_mb = int(
-            os.environ[OS_ENVIRON_DEFAULT_MULTIPART_CHUNKSIZE_MB_KEY]
-        )
+        multipart_chunksize_mb = None
         LOGGER.debug(
             "{CONFIG_MULTIPART_CHUNKSIZE_MB_KEY} is not set for config."
-            "Using default value of {multipart_chunksize_mb}.",
+            "Choosing chunk sizes from file sizes, "
+            "up to {default_multipart_chunksize_mb}.",
             CONFIG_MULTIPART_CHUNKSIZE_MB_KEY=CONFIG_MULTIPART_CHUNKSIZE_MB_KEY,
-            multipart_chunksize_mb=multipart_chunksize_mb,
+            default_multipart_chunksize_mb=default_multipart_chunksize_mb,
         )
     else:
         multipart_chunksize_mb = int(multipart_chunksize_mb_str)
@@ -233,42 +464,19 @@ def task(task_input: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
         )
         raise
 
-    granule_data = {}
     copied_file_urls = []
 
-    # initiate empty SQS body dict
-    sqs_body = {"provider": {}, "collection": {}, "granule": {}}
-    sqs_body["provider"]["name"] = config.get(CONFIG_PROVIDER_NAME_KEY, None)
-    sqs_body["provider"]["providerId"] = config[CONFIG_PROVIDER_ID_KEY]
-    sqs_body["collection"]["shortname"] = config[CONFIG_COLLECTION_SHORT_NAME_KEY]
-    sqs_body["collection"]["version"] = config[CONFIG_COLLECTION_VERSION_KEY]
-    # Cumulus currently creates collectionId by concatenating
-    # shortname + ___ + version
-    # See https://github.com/nasa/cumulus-dashboard/blob/
-    # 18a278ee5a1ac5181ec035b3df0665ef5acadcb0/app/src/js/utils/format.js#L342
-    sqs_body["collection"]["collectionId"] = (
-        config[CONFIG_COLLECTION_SHORT_NAME_KEY]
-        + "___"
-        + config[CONFIG_COLLECTION_VERSION_KEY]
-    )
+    # Gather the files to copy for every granule so they can be copied concurrently.
+    granule_copy_requests = []
+    granule_file_properties = []
     # Iterate through the input granules (>= 0 granules expected)
     for granule in task_input["granules"]:
-        # noinspection PyPep8Naming
-        granuleId = granule["granuleId"]
-        if granuleId not in granule_data.keys():
-            granule_data[granuleId] = {"granuleId": granuleId, "files": []}
-        # populate the SQS body for granules
-        sqs_body["granule"]["cumulusGranuleId"] = granuleId
-        sqs_body["granule"]["cumulusCreateTime"] = datetime.fromtimestamp(
-            granule["createdAt"] / 1000, timezone.utc
-        ).isoformat()
-        sqs_body["granule"]["executionId"] = config[CONFIG_EXECUTION_ID_KEY]
-        sqs_body["granule"]["ingestTime"] = datetime.now(timezone.utc).isoformat()
-        sqs_body["granule"]["lastUpdate"] = datetime.now(timezone.utc).isoformat()
-        sqs_body["granule"]["files"] = []
-
-        # Iterate through the files in a granule object
-        for file in granule["files"]:
+        copy_requests = []
+        file_properties = []
+        # Iterate through the files in a granule object that are not excluded
+        for file in exclusion_matcher.filter(
+            granule["files"], lambda file: file[FILE_FILEPATH_KEY]
+        ):
             if file_destination_key is None:
                 destination_file_filepath = file[FILE_FILEPATH_KEY]
             else:
@@ -276,40 +484,79 @@ def task(task_input: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
             LOGGER.info(f"file destination key is {destination_file_filepath}")
             file_filepath = file[FILE_FILEPATH_KEY]
             file_bucket = file[FILE_BUCKET_KEY]
-            file_source_uri = f"s3://{file_bucket}/{file_filepath}"
-            file_hash = file.get(FILE_HASH_KEY, None)
-            file_hash_type = file.get(FILE_HASH_TYPE_KEY, None)
-            if should_exclude_files_type(file_filepath, exclude_file_types):
-                LOGGER.info(
-                    f"Excluding {file_filepath} from backup "
-                    f"because of collection configured {CONFIG_EXCLUDED_FILE_EXTENSIONS_KEY}."
-                )
-                continue
-            result = copy_granule_between_buckets(
-                source_bucket_name=file_bucket,
-                source_key=file_filepath,
-                destination_bucket=destination_bucket,
-                destination_key=destination_file_filepath,
-                multipart_chunksize_mb=multipart_chunksize_mb,
-                storage_class=storage_class,
+            copy_requests.append(
+                {
+                    "source_bucket_name": file_bucket,
+                    "source_key": file_filepath,
+                    "destination_key": destination_file_filepath,
+                }
+            )
+            file_properties.append(
+                {
+                    # since fileName is no longer available in event
+                    "name": file_filepath.split("/")[-1],
+                    "hash": file.get(FILE_HASH_KEY, None),
+                    "hashType": file.get(FILE_HASH_TYPE_KEY, None),
+                    "source_uri": f"s3://{file_bucket}/{file_filepath}",
+                }
             )
+        granule_copy_requests.append(copy_requests)
+        granule_file_properties.append(file_properties)
+
+    granule_copy_results = copy_granules_between_buckets(
+        granule_copy_requests=granule_copy_requests,
+        destination_bucket=destination_bucket,
+        multipart_chunksize_mb=multipart_chunksize_mb,
+        storage_class=storage_class,
+        default_multipart_chunksize_mb=default_multipart_chunksize_mb,
+    )
 
-            result["name"] = file_filepath.split("/")[
-                -1
-            ]  # since fileName is no longer available in event
-            result["hash"] = file_hash
-            result["hashType"] = file_hash_type
-            copied_file_urls.append(file_source_uri)
+    sqs_bodies = []
+    for granule, copy_results, file_properties in zip(
+        task_input["granules"], granule_copy_results, granule_file_properties
+    ):
+        # initiate empty SQS body dict
+        sqs_body = {"provider": {}, "collection": {}, "granule": {}}
+        sqs_body["provider"]["name"] = config.get(CONFIG_PROVIDER_NAME_KEY, None)
+        sqs_body["provider"]["providerId"] = config[CONFIG_PROVIDER_ID_KEY]
+        sqs_body["collection"]["shortname"] = config[CONFIG_COLLECTION_SHORT_NAME_KEY]
+        sqs_body["collection"]["version"] = config[CONFIG_COLLECTION_VERSION_KEY]
+        # Cumulus currently creates collectionId by concatenating
+        # shortname + ___ + version
+        # See https://github.com/nasa/cumulus-dashboard/blob/
+        # 18a278ee5a1ac5181ec035b3df0665ef5acadcb0/app/src/js/utils/format.js#L342
+        sqs_body["collection"]["collectionId"] = (
+            config[CONFIG_COLLECTION_SHORT_NAME_KEY]
+            + "___"
+            + config[CONFIG_COLLECTION_VERSION_KEY]
+        )
+        # populate the SQS body for granules
+        sqs_body["granule"]["cumulusGranuleId"] = granule["granuleId"]
+        sqs_body["granule"]["cumulusCreateTime"] = datetime.fromtimestamp(
+            granule["createdAt"] / 1000, timezone.utc
+        ).isoformat()
+        sqs_body["granule"]["executionId"] = config[CONFIG_EXECUTION_ID_KEY]
+        sqs_body["granule"]["ingestTime"] = datetime.now(timezone.utc).isoformat()
+        sqs_body["granule"]["lastUpdate"] = datetime.now(timezone.utc).isoformat()
+        sqs_body["granule"]["files"] = []
+
+        for result, properties in zip(copy_results, file_properties):
+            result["name"] = properties["name"]
+            result["hash"] = properties["hash"]
+            result["hashType"] = properties["hashType"]
+            copied_file_urls.append(properties["source_uri"])
             LOGGER.info(
-                f"Copied {file_filepath} into archive bucket {destination_bucket}."
+                f"Copied {properties['source_uri']} into archive bucket {destination_bucket}."
             )
             # Add file record to metadata SQS message
             LOGGER.debug(
                 "Adding the files dictionary to the SQS body. {result}.", result=result
             )
             sqs_body["granule"]["files"].append(result)
-        # post to metadata SQS for each granule
-        sqs_library.post_to_metadata_queue(sqs_body, metadata_queue_url)
+        sqs_bodies.append(sqs_body)
+
+    # post to metadata SQS, batching granules together
+    sqs_library.post_batch_to_metadata_queue(sqs_bodies, metadata_queue_url)
 
     # Using "copied_to_orca" instead of "copied_to_archive" until we decouple from Cumulus.
     return {"granules": task_input["granules"], "copied_to_orca": copied_file_urls}
@@ -467,7 +714,7 @@ def handler(event: Dict[str, Union[List[str], Dict]], context: LambdaContext) ->
 
     Environment Vars:
         DEFAULT_MULTIPART_CHUNKSIZE_MB (int):
-            The default maximum size of chunks to use when copying.
+            The largest chunk size chosen automatically from a file's size.
             Can be overridden by collection config.
         DEFAULT_STORAGE_CLASS (str):
             The class of storage to use when ingesting files.
@@ -479,10 +726,14 @@ def handler(event: Dict[str, Union[List[str], Dict]], context: LambdaContext) ->
         METADATA_DB_QUEUE_URL (string, required): SQS URL of the metadata queue.
         DEFAULT_MAX_POOL_CONNECTIONS (int):
             The maximum number of connections to keep in a connection pool.
+            Raised to DEFAULT_MAX_FILES_IN_FLIGHT * DEFAULT_MAX_CONCURRENCY if smaller.
             Defaults to 10.
         DEFAULT_MAX_CONCURRENCY (int):
             The maximum number of concurrent S3 API transfer operations.
             Defaults to 10.
+        DEFAULT_MAX_FILES_IN_FLIGHT (int):
+            The maximum number of files copied at the same time.
+            Defaults to 10.
 
     Args:
         event: Event passed into the step from the aws workflow.
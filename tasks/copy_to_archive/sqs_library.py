@@ -12,7 +12,7 @@ import os
 import random
 import time
 import uuid
-from typing import Any, Callable, Dict, TypeVar
+from typing import Any, Callable, Dict, List, TypeVar
 
 # Third party libraries
 import boto3
@@ -26,6 +26,8 @@ MAX_RETRIES = 3  # number of times to retry.
 BACKOFF_FACTOR = 2  # Value of the factor used to backoff
 INITIAL_BACKOFF_IN_SECONDS = 1  # Number of seconds to sleep the first time through.
 RT = TypeVar("RT")  # return type
+MAX_BATCH_ENTRIES = 10  # maximum number of messages in an SQS batch.
+MAX_BATCH_SIZE_IN_BYTES = 262144  # maximum total payload size of an SQS batch.
 
 try:
     with open("schemas/body.json", "r") as raw_schema:
@@ -159,3 +161,115 @@ def post_to_metadata_queue(
         raise Exception(
             f"Calculated MD5 of {md5_body} does not match SQS MD5 of {sqs_md5}"
         )
+
+
+def post_batch_to_metadata_queue(
+    sqs_bodies: List[Dict[str, Any]],
+    metadata_queue_url: str,
+) -> None:
+    """
+    Posts metadata information for multiple granules to the metadata SQS queue,
+    grouping bodies into batches that fit the SQS batch limits.
+    Args:
+        sqs_bodies: A list of dictionaries, each containing the metadata objects
+            for one granule that will be sent to SQS.
+        metadata_queue_url: The metadata SQS queue URL defined by AWS.
+    Raises:
+        Exception: If any message could not be sent after retries.
+    """
+    if len(sqs_bodies) == 0:
+        return
+
+    LOGGER.debug("Validating the SQS message bodies with the schema.")
+    for sqs_body in sqs_bodies:
+        _BODY_VALIDATE(sqs_body)
+    bodies = [json.dumps(sqs_body) for sqs_body in sqs_bodies]
+
+    LOGGER.debug(
+        f"Creating SQS resource for {metadata_queue_url}",
+    )
+    mysqs_resource = boto3.resource("sqs", region_name=get_aws_region())
+    mysqs = mysqs_resource.Queue(metadata_queue_url)
+
+    batch = []
+    batch_size_in_bytes = 0
+    for body in bodies:
+        body_size_in_bytes = len(body.encode("utf8"))
+        if len(batch) > 0 and (
+            len(batch) == MAX_BATCH_ENTRIES
+            or batch_size_in_bytes + body_size_in_bytes > MAX_BATCH_SIZE_IN_BYTES
+        ):
+            send_batch_to_metadata_queue(mysqs, batch)
+            batch = []
+            batch_size_in_bytes = 0
+        batch.append(body)
+        batch_size_in_bytes += body_size_in_bytes
+    send_batch_to_metadata_queue(mysqs, batch)
+
+
+def send_batch_to_metadata_queue(mysqs: Any, bodies: List[str]) -> None:
+    """
+    Sends a single batch of messages to the metadata SQS queue,
+    retrying only the entries that failed or whose MD5 did not match.
+    Args:
+        mysqs: The boto3 SQS Queue resource for the metadata queue.
+        bodies: The JSON message bodies to send. Must fit within the SQS batch limits.
+    Raises:
+        Exception: If any entry could not be sent after retries.
+    """
+    pending_entries = {}
+    for index, body in enumerate(bodies):
+        pending_entries[str(index)] = {
+            "Id": str(index),
+            "MessageDeduplicationId": hashlib.sha256(body.encode("utf8")).hexdigest(),
+            "MessageGroupId": f"metadata_message-{uuid.uuid4()}",
+            "MessageBody": body,
+        }
+    _send_pending_entries(mysqs, pending_entries)
+
+
+@retry_error()
+def _send_pending_entries(
+    mysqs: Any, pending_entries: Dict[str, Dict[str, str]]
+) -> None:
+    """
+    Sends the pending entries in one send_message_batch call.
+    Entries that are sent successfully are removed from pending_entries,
+    so retries only resend the remainder.
+    Args:
+        mysqs: The boto3 SQS Queue resource for the metadata queue.
+        pending_entries: The entries yet to be sent, keyed by entry Id. Modified in place.
+    Raises:
+        Exception: If any entry failed to send.
+    """
+    LOGGER.debug(
+        f"Sending {len(pending_entries)} messages to metadata queue in one batch."
+    )
+    response = mysqs.send_messages(Entries=list(pending_entries.values()))
+    LOGGER.debug(f"SQS Message Batch Response: {json.dumps(response)}")
+
+    for successful_entry in response.get("Successful", []):
+        entry_id = successful_entry["Id"]
+        md5_body = hashlib.md5(  # nosec
+            pending_entries[entry_id]["MessageBody"].encode("utf8")
+        ).hexdigest()
+        sqs_md5 = successful_entry.get("MD5OfMessageBody")
+        if md5_body != sqs_md5:
+            LOGGER.error(
+                f"Calculated MD5 of {md5_body} does not match SQS MD5 of {sqs_md5} "
+                f"for entry {entry_id}."
+            )
+            continue
+        del pending_entries[entry_id]
+
+    for failed_entry in response.get("Failed", []):
+        LOGGER.error(
+            f"Failed to send entry {failed_entry['Id']} to Queue. "
+            f"Code {failed_entry.get('Code')}: {failed_entry.get('Message')}"
+        )
+
+    if len(pending_entries) > 0:
+        raise Exception(
+            f"Failed to send {len(pending_entries)} messages to Queue: "
+            f"{list(pending_entries.keys())}"
+        )
@@ -7,10 +7,12 @@ class ConfigCheck:
     bad_config = None
 
     def check_multipart_chunksize(
-        self, copy_source, destination_bucket, destination_key, ExtraArgs, Config
+        self, Bucket, Key, CopySource, CopySourceRange, PartNumber, UploadId
     ):
         try:
-            if Config.multipart_chunksize != self.multipart_chunksize:
-                self.bad_config = Config
+            first_byte = int(CopySourceRange.split("=")[1].split("-")[0])
+            if first_byte != (PartNumber - 1) * self.multipart_chunksize:
+                self.bad_config = CopySourceRange
         except Exception as ex:
             self.bad_config = ex
+        return {"CopyPartResult": {"ETag": f"etag{PartNumber}"}}
@@ -1,8 +1,8 @@
 import copy
+import hashlib
 import json
 import os
 import random
-import unittest
 import uuid
 from test.unit_tests.ConfigCheck import ConfigCheck
 from unittest import TestCase
@@ -16,6 +16,7 @@ from boto3.s3.transfer import MB
 
 # noinspection PyPackageRequirements
 from moto import mock_sqs
+from orca_shared.transfer import shared_transfer
 
 import copy_to_archive
 import sqs_library
@@ -117,6 +118,8 @@ class TestCopyToArchive(TestCase):
         Perform teardown for the tests
         """
         self.mock_sqs.stop()
+        copy_to_archive._S3_CLIENT_CACHE.clear()
+        copy_to_archive._S3_CLIENT_CACHE_STATS.update({"hits": 0, "misses": 0})
 
     @patch("copy_to_archive.LOGGER.info")
     def test_set_optional_event_property(
@@ -236,7 +239,7 @@ class TestCopyToArchive(TestCase):
     # todo: Remove mock.ANY where possible. Currently used to ignore differences between files.
     @patch("copy_to_archive.get_storage_class")
     @patch("copy_to_archive.get_destination_bucket_name")
-    @patch("copy_to_archive.sqs_library.post_to_metadata_queue")
+    @patch("copy_to_archive.sqs_library.post_batch_to_metadata_queue")
     @patch.dict(
         os.environ,
         {
@@ -267,27 +270,32 @@ class TestCopyToArchive(TestCase):
             for file in self.event_granules["granules"][0]["files"]
         ]
 
-        config_check = ConfigCheck(4 * MB)
+        # Chosen from the 100MB file size, as the collection does not override it.
+        config_check = ConfigCheck(8 * MB)
 
         # todo: use 'side_effect' to verify args.
         # It is safer, as current method does not deep-copy args
         boto3.client = Mock()
         s3_cli = boto3.client("s3")
-        s3_cli.copy = Mock(return_value=None)
-        s3_cli.copy.side_effect = config_check.check_multipart_chunksize
-        s3_cli.head_object = Mock(return_value={"ContentType": content_type})
-        file_return_value = {
-            "Versions": [
-                {
-                    "ETag": '"8d1ff728a961869c715b458fa5f041f0"',
-                    "Size": 14191,
-                    "Key": "test/test.docx",
-                    "VersionId": "1",
-                    "IsLatest": True,
-                }
-            ]
-        }
-        s3_cli.list_object_versions = Mock(return_value=file_return_value)
+        s3_cli.create_multipart_upload = Mock(return_value={"UploadId": "upload1"})
+        s3_cli.upload_part_copy = Mock(
+            side_effect=config_check.check_multipart_chunksize
+        )
+        s3_cli.complete_multipart_upload = Mock(
+            return_value={
+                "ETag": '"8d1ff728a961869c715b458fa5f041f0-13"',
+                "VersionId": "1",
+            }
+        )
+        s3_cli.head_object = Mock(
+            return_value={
+                "ContentType": content_type,
+                # Large enough to use a multipart copy.
+                "ContentLength": 100 * MB,
+                "ETag": '"8d1ff728a961869c715b458fa5f041f0"',
+                "VersionId": "1",
+            }
+        )
         provider_id = uuid.uuid4().__str__()
         provider_name = uuid.uuid4().__str__()
         event_config = {
@@ -315,23 +323,24 @@ class TestCopyToArchive(TestCase):
             head_object_calls.append(
                 call(Bucket=source_bucket_names[i], Key=source_keys[i])
             )
+            head_object_calls.append(
+                call(
+                    Bucket=mock_get_destination_bucket_name.return_value,
+                    Key=source_keys[i],
+                    VersionId="1",
+                )
+            )
             copy_calls.append(
                 call(
-                    {"Bucket": source_bucket_names[i], "Key": source_keys[i]},
-                    mock_get_destination_bucket_name.return_value,
-                    source_keys[i],
-                    ExtraArgs={
-                        "StorageClass": mock_get_storage_class.return_value,
-                        "MetadataDirective": "COPY",
-                        "ContentType": content_type,
-                    },
-                    Config=unittest.mock.ANY,  # Checked by ConfigCheck.
-                    # Equality checkers do not work.
+                    Bucket=mock_get_destination_bucket_name.return_value,
+                    Key=source_keys[i],
+                    StorageClass=mock_get_storage_class.return_value,
+                    ContentType=content_type,
                 )
             )
 
-        s3_cli.head_object.assert_has_calls(head_object_calls)
-        s3_cli.copy.assert_has_calls(copy_calls)
+        s3_cli.head_object.assert_has_calls(head_object_calls, any_order=True)
+        s3_cli.create_multipart_upload.assert_has_calls(copy_calls, any_order=True)
         sqs_body = {
             "provider": {
                 "name": provider_name,
@@ -448,12 +457,12 @@ class TestCopyToArchive(TestCase):
         }
 
         mock_post_to_queue.assert_called_once_with(
-            sqs_body, os.environ["METADATA_DB_QUEUE_URL"]
+            [sqs_body], os.environ["METADATA_DB_QUEUE_URL"]
         )
 
-        self.assertEqual(s3_cli.head_object.call_count, 4)
-        self.assertEqual(s3_cli.copy.call_count, 4)
-        self.assertEqual(s3_cli.list_object_versions.call_count, 4)
+        self.assertEqual(s3_cli.head_object.call_count, 8)
+        self.assertEqual(s3_cli.create_multipart_upload.call_count, 4)
+        s3_cli.copy_object.assert_not_called()
 
         expected_copied_file_urls = [
             f"s3://{file[copy_to_archive.FILE_BUCKET_KEY]}/"
@@ -467,7 +476,7 @@ class TestCopyToArchive(TestCase):
 
     @patch("copy_to_archive.get_storage_class")
     @patch("copy_to_archive.get_destination_bucket_name")
-    @patch("copy_to_archive.sqs_library.post_to_metadata_queue")
+    @patch("copy_to_archive.sqs_library.post_batch_to_metadata_queue")
     @patch.dict(
         os.environ,
         {
@@ -542,26 +551,31 @@ class TestCopyToArchive(TestCase):
             for file in multiple_event_granules["granules"][0]["files"]
         ]
 
-        config_check = ConfigCheck(4 * MB)
+        # Chosen from the 100MB file size, as the collection does not override it.
+        config_check = ConfigCheck(8 * MB)
 
         boto3.client = Mock()
         s3_cli = boto3.client("s3")
-        s3_cli.copy = Mock(return_value=None)
-        s3_cli.copy.side_effect = config_check.check_multipart_chunksize
-        s3_cli.head_object = Mock(return_value={"ContentType": content_type})
-        file_return_value = {
-            "Versions": [
-                {
-                    "ETag": '"8d1ff728a961869c715b458fa5f041f0"',
-                    "Size": 14191,
-                    "Key": "test/test.docx",
-                    "VersionId": "1",
-                    "IsLatest": True,
-                }
-            ]
-        }
+        s3_cli.create_multipart_upload = Mock(return_value={"UploadId": "upload1"})
+        s3_cli.upload_part_copy = Mock(
+            side_effect=config_check.check_multipart_chunksize
+        )
+        s3_cli.complete_multipart_upload = Mock(
+            return_value={
+                "ETag": '"8d1ff728a961869c715b458fa5f041f0-13"',
+                "VersionId": "1",
+            }
+        )
+        s3_cli.head_object = Mock(
+            return_value={
+                "ContentType": content_type,
+                # Large enough to use a multipart copy.
+                "ContentLength": 100 * MB,
+                "ETag": '"8d1ff728a961869c715b458fa5f041f0"',
+                "VersionId": "1",
+            }
+        )
         provider_id = uuid.uuid4().__str__()
-        s3_cli.list_object_versions = Mock(return_value=file_return_value)
         event_config = {
             "providerId": provider_id,
             "executionId": "test-execution-id",
@@ -586,32 +600,40 @@ class TestCopyToArchive(TestCase):
             head_object_calls.append(
                 call(Bucket=source_bucket_names[i], Key=source_keys[i])
             )
+            head_object_calls.append(
+                call(
+                    Bucket=mock_get_destination_bucket_name.return_value,
+                    Key=source_keys[i],
+                    VersionId="1",
+                )
+            )
             copy_calls.append(
                 call(
-                    {"Bucket": source_bucket_names[i], "Key": source_keys[i]},
-                    mock_get_destination_bucket_name.return_value,
-                    source_keys[i],
-                    ExtraArgs={
-                        "StorageClass": mock_get_storage_class.return_value,
-                        "MetadataDirective": "COPY",
-                        "ContentType": content_type,
-                    },
-                    Config=unittest.mock.ANY,  # Checked by ConfigCheck.
-                    # Equality checkers do not work.
+                    Bucket=mock_get_destination_bucket_name.return_value,
+                    Key=source_keys[i],
+                    StorageClass=mock_get_storage_class.return_value,
+                    ContentType=content_type,
                 )
             )
 
-        s3_cli.head_object.assert_has_calls(head_object_calls)
-        s3_cli.copy.assert_has_calls(copy_calls)
-        self.assertEqual(mock_post_to_queue.call_count, 2)  # todo: Add proper checks.
-        self.assertEqual(s3_cli.head_object.call_count, 2)
-        self.assertEqual(s3_cli.copy.call_count, 2)
-        self.assertEqual(s3_cli.list_object_versions.call_count, 2)
+        s3_cli.head_object.assert_has_calls(head_object_calls, any_order=True)
+        s3_cli.create_multipart_upload.assert_has_calls(copy_calls, any_order=True)
+        mock_post_to_queue.assert_called_once_with(
+            ANY, os.environ["METADATA_DB_QUEUE_URL"]
+        )
+        posted_bodies = mock_post_to_queue.call_args.args[0]
+        self.assertEqual(
+            [granule["granuleId"] for granule in multiple_event_granules["granules"]],
+            [body["granule"]["cumulusGranuleId"] for body in posted_bodies],
+        )
+        self.assertEqual(s3_cli.head_object.call_count, 4)
+        self.assertEqual(s3_cli.create_multipart_upload.call_count, 2)
+        s3_cli.copy_object.assert_not_called()
         self.assertEqual(multiple_event_granules["granules"], result["granules"])
 
     @patch("copy_to_archive.get_storage_class")
     @patch("copy_to_archive.get_destination_bucket_name")
-    @patch("copy_to_archive.sqs_library.post_to_metadata_queue")
+    @patch("copy_to_archive.sqs_library.post_batch_to_metadata_queue")
     @patch.dict(
         os.environ,
         {
@@ -649,21 +671,25 @@ class TestCopyToArchive(TestCase):
         # It is safer, as current method does not deep-copy args
         boto3.client = Mock()
         s3_cli = boto3.client("s3")
-        s3_cli.copy = Mock(return_value=None)
-        s3_cli.copy.side_effect = config_check.check_multipart_chunksize
-        s3_cli.head_object = Mock(return_value={"ContentType": content_type})
-        file_return_value = {
-            "Versions": [
-                {
-                    "ETag": '"8d1ff728a961869c715b458fa5f041f0"',
-                    "Size": 14191,
-                    "Key": "test/test.docx",
-                    "VersionId": "1",
-                    "IsLatest": True,
-                }
-            ]
-        }
-        s3_cli.list_object_versions = Mock(return_value=file_return_value)
+        s3_cli.create_multipart_upload = Mock(return_value={"UploadId": "upload1"})
+        s3_cli.upload_part_copy = Mock(
+            side_effect=config_check.check_multipart_chunksize
+        )
+        s3_cli.complete_multipart_upload = Mock(
+            return_value={
+                "ETag": '"8d1ff728a961869c715b458fa5f041f0-13"',
+                "VersionId": "1",
+            }
+        )
+        s3_cli.head_object = Mock(
+            return_value={
+                "ContentType": content_type,
+                # Large enough to use a multipart copy.
+                "ContentLength": 100 * MB,
+                "ETag": '"8d1ff728a961869c715b458fa5f041f0"',
+                "VersionId": "1",
+            }
+        )
         provider_id = uuid.uuid4().__str__()
         event_config = {
             CONFIG_MULTIPART_CHUNKSIZE_MB_KEY: str(overridden_multipart_chunksize_mb),
@@ -690,27 +716,28 @@ class TestCopyToArchive(TestCase):
             head_object_calls.append(
                 call(Bucket=source_bucket_names[i], Key=source_keys[i])
             )
+            head_object_calls.append(
+                call(
+                    Bucket=mock_get_destination_bucket_name.return_value,
+                    Key=source_keys[i],
+                    VersionId="1",
+                )
+            )
             copy_calls.append(
                 call(
-                    {"Bucket": source_bucket_names[i], "Key": source_keys[i]},
-                    mock_get_destination_bucket_name.return_value,
-                    source_keys[i],
-                    ExtraArgs={
-                        "StorageClass": mock_get_storage_class.return_value,
-                        "MetadataDirective": "COPY",
-                        "ContentType": content_type,
-                    },
-                    Config=unittest.mock.ANY,  # Checked by ConfigCheck.
-                    # Equality checkers do not work.
+                    Bucket=mock_get_destination_bucket_name.return_value,
+                    Key=source_keys[i],
+                    StorageClass=mock_get_storage_class.return_value,
+                    ContentType=content_type,
                 )
             )
 
-        s3_cli.head_object.assert_has_calls(head_object_calls)
-        s3_cli.copy.assert_has_calls(copy_calls)
+        s3_cli.head_object.assert_has_calls(head_object_calls, any_order=True)
+        s3_cli.create_multipart_upload.assert_has_calls(copy_calls, any_order=True)
 
-        self.assertEqual(s3_cli.head_object.call_count, 4)
-        self.assertEqual(s3_cli.copy.call_count, 4)
-        self.assertEqual(s3_cli.list_object_versions.call_count, 4)
+        self.assertEqual(s3_cli.head_object.call_count, 8)
+        self.assertEqual(s3_cli.create_multipart_upload.call_count, 4)
+        s3_cli.copy_object.assert_not_called()
         expected_copied_file_urls = [
             f"s3://{file[copy_to_archive.FILE_BUCKET_KEY]}/"
             f"{file[copy_to_archive.FILE_FILEPATH_KEY]}"
@@ -740,7 +767,7 @@ class TestCopyToArchive(TestCase):
         # It is safer, as current method does not deep-copy args
         boto3.client = Mock()
         s3_cli = boto3.client("s3")
-        s3_cli.copy = Mock()
+        s3_cli.create_multipart_upload = Mock()
         s3_cli.head_object = Mock()
 
         provider_id = uuid.uuid4().__str__()
@@ -763,7 +790,424 @@ class TestCopyToArchive(TestCase):
         self.assertEqual(0, len(granules))
 
         s3_cli.head_object.assert_not_called()
-        s3_cli.copy.assert_not_called()
+        s3_cli.create_multipart_upload.assert_not_called()
+
+    def test_copy_granule_between_buckets_small_file_uses_copy_response(self):
+        """
+        Files the plan copies in one request should use one copy_object,
+        taking metadata from its response instead of querying the destination.
+        """
+        source_bucket_name = uuid.uuid4().__str__()
+        source_key = uuid.uuid4().__str__()
+        destination_bucket = uuid.uuid4().__str__()
+        destination_key = uuid.uuid4().__str__()
+        storage_class = uuid.uuid4().__str__()
+        content_type = uuid.uuid4().__str__()
+        etag = uuid.uuid4().__str__()
+        version_id = uuid.uuid4().__str__()
+        size = random.randint(0, 8 * MB - 1)  # nosec
+        mock_s3_client = Mock()
+        mock_s3_client.head_object.return_value = {
+            "ContentType": content_type,
+            "ContentLength": size,
+        }
+        mock_s3_client.copy_object.return_value = {
+            "CopyObjectResult": {"ETag": etag},
+            "VersionId": version_id,
+        }
+
+        result = copy_to_archive.copy_granule_between_buckets(
+            mock_s3_client,
+            source_bucket_name,
+            source_key,
+            destination_bucket,
+            destination_key,
+            None,
+            storage_class,
+            10,
+            250,
+        )
+
+        mock_s3_client.head_object.assert_called_once_with(
+            Bucket=source_bucket_name, Key=source_key
+        )
+        mock_s3_client.copy_object.assert_called_once_with(
+            CopySource={"Bucket": source_bucket_name, "Key": source_key},
+            Bucket=destination_bucket,
+            Key=destination_key,
+            StorageClass=storage_class,
+            MetadataDirective="COPY",
+            ContentType=content_type,
+        )
+        mock_s3_client.create_multipart_upload.assert_not_called()
+        mock_s3_client.list_object_versions.assert_not_called()
+        self.assertEqual(
+            {
+                "cumulusArchiveLocation": source_bucket_name,
+                "orcaArchiveLocation": destination_bucket,
+                "keyPath": destination_key,
+                "sizeInBytes": size,
+                "version": version_id,
+                "ingestTime": ANY,
+                "etag": etag,
+                "storageClass": storage_class,
+            },
+            result,
+        )
+
+    def test_copy_granule_between_buckets_large_file_uses_copied_version(self):
+        """
+        Files larger than one planned chunk should be copied in parts,
+        followed by a head_object on the version the completed copy created.
+        """
+        source_bucket_name = uuid.uuid4().__str__()
+        source_key = uuid.uuid4().__str__()
+        destination_bucket = uuid.uuid4().__str__()
+        destination_key = uuid.uuid4().__str__()
+        storage_class = uuid.uuid4().__str__()
+        content_type = uuid.uuid4().__str__()
+        upload_id = uuid.uuid4().__str__()
+        version_id = uuid.uuid4().__str__()
+        etag = uuid.uuid4().__str__()
+        size = 20 * MB
+        mock_s3_client = Mock()
+        mock_s3_client.head_object.side_effect = [
+            {"ContentType": content_type, "ContentLength": size},
+            {"ETag": etag, "ContentLength": size, "VersionId": version_id},
+        ]
+        mock_s3_client.create_multipart_upload.return_value = {"UploadId": upload_id}
+        mock_s3_client.upload_part_copy.side_effect = lambda **kwargs: {
+            "CopyPartResult": {"ETag": f"etag{kwargs['PartNumber']}"}
+        }
+        mock_s3_client.complete_multipart_upload.return_value = {
+            "ETag": etag,
+            "VersionId": version_id,
+        }
+
+        result = copy_to_archive.copy_granule_between_buckets(
+            mock_s3_client,
+            source_bucket_name,
+            source_key,
+            destination_bucket,
+            destination_key,
+            8,
+            storage_class,
+            10,
+            250,
+        )
+
+        copy_source = {"Bucket": source_bucket_name, "Key": source_key}
+        mock_s3_client.create_multipart_upload.assert_called_once_with(
+            Bucket=destination_bucket,
+            Key=destination_key,
+            StorageClass=storage_class,
+            ContentType=content_type,
+        )
+        mock_s3_client.upload_part_copy.assert_has_calls(
+            [
+                call(
+                    Bucket=destination_bucket,
+                    Key=destination_key,
+                    CopySource=copy_source,
+                    CopySourceRange=f"bytes={first_byte}-{last_byte}",
+                    PartNumber=part_number,
+                    UploadId=upload_id,
+                )
+                for part_number, first_byte, last_byte in [
+                    (1, 0, 8 * MB - 1),
+                    (2, 8 * MB, 16 * MB - 1),
+                    (3, 16 * MB, 20 * MB - 1),
+                ]
+            ],
+            any_order=True,
+        )
+        self.assertEqual(3, mock_s3_client.upload_part_copy.call_count)
+        mock_s3_client.complete_multipart_upload.assert_called_once_with(
+            Bucket=destination_bucket,
+            Key=destination_key,
+            UploadId=upload_id,
+            MultipartUpload={
+                "Parts": [
+                    {"ETag": "etag1", "PartNumber": 1},
+                    {"ETag": "etag2", "PartNumber": 2},
+                    {"ETag": "etag3", "PartNumber": 3},
+                ]
+            },
+        )
+        mock_s3_client.copy_object.assert_not_called()
+        mock_s3_client.abort_multipart_upload.assert_not_called()
+        mock_s3_client.head_object.assert_called_with(
+            Bucket=destination_bucket, Key=destination_key, VersionId=version_id
+        )
+        self.assertEqual(size, result["sizeInBytes"])
+        self.assertEqual(etag, result["etag"])
+        self.assertEqual(version_id, result["version"])
+
+    def test_copy_granule_between_buckets_large_file_unversioned(self):
+        """
+        Unversioned buckets return no VersionId, so the head_object should
+        not ask for one, and the version should be reported as 'null'.
+        """
+        destination_bucket = uuid.uuid4().__str__()
+        destination_key = uuid.uuid4().__str__()
+        etag = uuid.uuid4().__str__()
+        size = 100 * MB
+        mock_s3_client = Mock()
+        mock_s3_client.head_object.side_effect = [
+            {"ContentType": uuid.uuid4().__str__(), "ContentLength": size},
+            {"ETag": etag, "ContentLength": size},
+        ]
+        mock_s3_client.create_multipart_upload.return_value = {"UploadId": "upload1"}
+        mock_s3_client.upload_part_copy.return_value = {
+            "CopyPartResult": {"ETag": "etag"}
+        }
+        mock_s3_client.complete_multipart_upload.return_value = {"ETag": etag}
+
+        result = copy_to_archive.copy_granule_between_buckets(
+            mock_s3_client,
+            uuid.uuid4().__str__(),
+            uuid.uuid4().__str__(),
+            destination_bucket,
+            destination_key,
+            None,
+            uuid.uuid4().__str__(),
+            10,
+            4,
+        )
+
+        # 8MB parts, as the 4MB default is below the smallest chunk size chosen.
+        self.assertEqual(13, mock_s3_client.upload_part_copy.call_count)
+        mock_s3_client.head_object.assert_called_with(
+            Bucket=destination_bucket, Key=destination_key
+        )
+        self.assertEqual(size, result["sizeInBytes"])
+        self.assertEqual(etag, result["etag"])
+        self.assertEqual("null", result["version"])
+
+    def test_copy_parts_error_aborts_upload(self):
+        """
+        If a part fails to copy, the upload should be aborted and the error raised.
+        """
+        destination_bucket = uuid.uuid4().__str__()
+        destination_key = uuid.uuid4().__str__()
+        expected_exception = Exception(uuid.uuid4().__str__())
+        plan = shared_transfer.plan_transfer(20 * MB, 10, 250, chunksize_override_mb=8)
+        mock_s3_client = Mock()
+        mock_s3_client.create_multipart_upload.return_value = {"UploadId": "upload1"}
+        mock_s3_client.upload_part_copy.side_effect = expected_exception
+
+        with self.assertRaises(Exception) as cm:
+            copy_to_archive.copy_parts(
+                mock_s3_client,
+                {"Bucket": uuid.uuid4().__str__(), "Key": uuid.uuid4().__str__()},
+                destination_bucket,
+                destination_key,
+                plan,
+                uuid.uuid4().__str__(),
+                uuid.uuid4().__str__(),
+            )
+
+        self.assertEqual(expected_exception, cm.exception)
+        mock_s3_client.complete_multipart_upload.assert_not_called()
+        mock_s3_client.abort_multipart_upload.assert_called_once_with(
+            Bucket=destination_bucket, Key=destination_key, UploadId="upload1"
+        )
+
+    @patch("copy_to_archive.boto3.client")
+    @patch.dict(os.environ, {"AWS_REGION": "us-west-2"}, clear=True)
+    def test_get_s3_client_reuses_client(self, mock_client: MagicMock):
+        """
+        Clients should be built once per region and pool size, then reused.
+        """
+        mock_client.side_effect = lambda *args, **kwargs: Mock()
+
+        first_client = copy_to_archive.get_s3_client(10)
+        second_client = copy_to_archive.get_s3_client(10)
+        other_pool_client = copy_to_archive.get_s3_client(20)
+
+        self.assertIs(first_client, second_client)
+        self.assertIsNot(first_client, other_pool_client)
+        self.assertEqual(2, mock_client.call_count)
+        mock_client.assert_called_with("s3", region_name="us-west-2", config=ANY)
+        self.assertEqual(
+            20, mock_client.call_args.kwargs["config"].max_pool_connections
+        )
+        self.assertEqual(
+            {"hits": 1, "misses": 2}, copy_to_archive._S3_CLIENT_CACHE_STATS
+        )
+
+    @patch("copy_to_archive.copy_granule_between_buckets")
+    @patch("copy_to_archive.ThreadPoolExecutor")
+    @patch("copy_to_archive.boto3.client")
+    @patch.dict(
+        os.environ,
+        {
+            copy_to_archive.OS_ENVIRON_DEFAULT_MAX_POOL_CONNECTIONS_KEY: "15",
+            copy_to_archive.OS_ENVIRON_DEFAULT_MAX_CONCURRENCY_KEY: "5",
+            copy_to_archive.OS_ENVIRON_DEFAULT_MAX_FILES_IN_FLIGHT_KEY: "3",
+        },
+        clear=True,
+    )
+    def test_copy_granules_between_buckets_preserves_order(
+        self,
+        mock_client: MagicMock,
+        mock_executor_class: MagicMock,
+        mock_copy_granule_between_buckets: MagicMock,
+    ):
+        """
+        Results should be grouped per granule in request order,
+        with all copies sharing one client.
+        """
+        mock_executor = mock_executor_class.return_value
+        # Run submitted work inline to keep the test deterministic.
+        mock_executor.submit.side_effect = lambda func, **kwargs: Mock(
+            result=Mock(return_value=func(**kwargs))
+        )
+        mock_copy_granule_between_buckets.side_effect = lambda **kwargs: kwargs[
+            "source_key"
+        ]
+        destination_bucket = uuid.uuid4().__str__()
+        storage_class = uuid.uuid4().__str__()
+        granule_copy_requests = [
+            [
+                {
+                    "source_bucket_name": uuid.uuid4().__str__(),
+                    "source_key": uuid.uuid4().__str__(),
+                    "destination_key": uuid.uuid4().__str__(),
+                }
+                for _ in range(file_count)
+            ]
+            for file_count in [2, 0, 3]
+        ]
+
+        result = copy_to_archive.copy_granules_between_buckets(
+            granule_copy_requests, destination_bucket, None, storage_class, 4
+        )
+
+        self.assertEqual(
+            [
+                [copy_request["source_key"] for copy_request in copy_requests]
+                for copy_requests in granule_copy_requests
+            ],
+            result,
+        )
+        mock_client.assert_called_once_with("s3", region_name=None, config=ANY)
+        self.assertEqual(
+            15, mock_client.call_args.kwargs["config"].max_pool_connections
+        )
+        mock_executor_class.assert_called_once_with(max_workers=3)
+        mock_copy_granule_between_buckets.assert_has_calls(
+            [
+                call(
+                    s3_client=mock_client.return_value,
+                    source_bucket_name=copy_request["source_bucket_name"],
+                    source_key=copy_request["source_key"],
+                    destination_bucket=destination_bucket,
+                    destination_key=copy_request["destination_key"],
+                    multipart_chunksize_mb=None,
+                    storage_class=storage_class,
+                    max_concurrency=5,
+                    default_multipart_chunksize_mb=4,
+                )
+                for copy_requests in granule_copy_requests
+                for copy_request in copy_requests
+            ]
+        )
+        mock_executor.shutdown.assert_called_with(wait=True)
+
+    @patch("copy_to_archive.copy_granule_between_buckets")
+    @patch("copy_to_archive.boto3.client")
+    @patch.dict(
+        os.environ,
+        {
+            copy_to_archive.OS_ENVIRON_DEFAULT_MAX_POOL_CONNECTIONS_KEY: "10",
+            copy_to_archive.OS_ENVIRON_DEFAULT_MAX_CONCURRENCY_KEY: "8",
+            copy_to_archive.OS_ENVIRON_DEFAULT_MAX_FILES_IN_FLIGHT_KEY: "4",
+        },
+        clear=True,
+    )
+    def test_copy_granules_between_buckets_pool_fits_all_requests(
+        self,
+        mock_client: MagicMock,
+        mock_copy_granule_between_buckets: MagicMock,
+    ):
+        """
+        Every file in flight can use max_concurrency connections at once,
+        so the shared pool should be raised to hold all of them.
+        """
+        copy_to_archive.copy_granules_between_buckets(
+            [
+                [
+                    {
+                        "source_bucket_name": uuid.uuid4().__str__(),
+                        "source_key": uuid.uuid4().__str__(),
+                        "destination_key": uuid.uuid4().__str__(),
+                    }
+                ]
+            ],
+            uuid.uuid4().__str__(),
+            None,
+            uuid.uuid4().__str__(),
+            250,
+        )
+
+        mock_client.assert_called_once_with("s3", region_name=None, config=ANY)
+        self.assertEqual(
+            32, mock_client.call_args.kwargs["config"].max_pool_connections
+        )
+
+    @patch("copy_to_archive.copy_granule_between_buckets")
+    @patch("copy_to_archive.boto3.client")
+    @patch.dict(
+        os.environ,
+        {
+            copy_to_archive.OS_ENVIRON_DEFAULT_MAX_POOL_CONNECTIONS_KEY: "10",
+            copy_to_archive.OS_ENVIRON_DEFAULT_MAX_CONCURRENCY_KEY: "10",
+        },
+        clear=True,
+    )
+    def test_copy_granules_between_buckets_error_raised(
+        self,
+        mock_client: MagicMock,
+        mock_copy_granule_between_buckets: MagicMock,
+    ):
+        """
+        An error in any copy should be raised to the caller.
+        """
+        expected_exception = Exception(uuid.uuid4().__str__())
+
+        def copy_side_effect(**kwargs):
+            if kwargs["source_key"] == "bad_key":
+                raise expected_exception
+            return kwargs["source_key"]
+
+        mock_copy_granule_between_buckets.side_effect = copy_side_effect
+
+        with self.assertRaises(Exception) as cm:
+            copy_to_archive.copy_granules_between_buckets(
+                [
+                    [
+                        {
+                            "source_bucket_name": "bucket",
+                            "source_key": "good_key",
+                            "destination_key": "good_key",
+                        }
+                    ],
+                    [
+                        {
+                            "source_bucket_name": "bucket",
+                            "source_key": "bad_key",
+                            "destination_key": "bad_key",
+                        }
+                    ],
+                ],
+                uuid.uuid4().__str__(),
+                4,
+                uuid.uuid4().__str__(),
+                250,
+            )
+        self.assertEqual(expected_exception, cm.exception)
+        mock_client.assert_called_once_with("s3", region_name=None, config=ANY)
 
     @patch.dict(
         os.environ,
@@ -962,6 +1406,153 @@ class TestCopyToArchive(TestCase):
         )
         self.assertEqual(3, mock_sleep.call_count)
 
+    @staticmethod
+    def create_sqs_body(granule_id: str):
+        return {
+            "provider": {"providerId": "1234", "name": "LPCumulus"},
+            "collection": {
+                "collectionId": "MOD14A1__061",
+                "shortname": "MOD14A1",
+                "version": "061",
+            },
+            "granule": {
+                "cumulusGranuleId": granule_id,
+                "cumulusCreateTime": "2019-07-17T17:36:38.494918+00:00",
+                "executionId": "f2fgh-356-789",
+                "ingestTime": "2019-07-17T17:36:38.494918+00:00",
+                "lastUpdate": "2019-07-17T17:36:38.494918+00:00",
+                "files": [],
+            },
+        }
+
+    @patch("copy_to_archive.sqs_library.send_batch_to_metadata_queue")
+    @patch.dict(os.environ, {"AWS_REGION": "us-west-2"}, clear=True)
+    def test_post_batch_to_metadata_queue_splits_batches(
+        self, mock_send_batch: MagicMock
+    ):
+        """
+        Bodies should be grouped into batches of at most MAX_BATCH_ENTRIES
+        and MAX_BATCH_SIZE_IN_BYTES, preserving order.
+        """
+        max_entries = sqs_library.MAX_BATCH_ENTRIES
+        sqs_bodies = [
+            self.create_sqs_body(uuid.uuid4().__str__()) for _ in range(max_entries + 2)
+        ]
+        # Too large for both to fit in one batch.
+        for sqs_body in sqs_bodies[max_entries:]:
+            sqs_body["granule"]["cumulusGranuleId"] = "a" * (
+                sqs_library.MAX_BATCH_SIZE_IN_BYTES * 2 // 3
+            )
+
+        sqs_library.post_batch_to_metadata_queue(sqs_bodies, self.metadata_queue_url)
+
+        sent_batches = [
+            [json.loads(body) for body in batch_call.args[1]]
+            for batch_call in mock_send_batch.call_args_list
+        ]
+        self.assertEqual(
+            [
+                sqs_bodies[:max_entries],
+                [sqs_bodies[max_entries]],
+                [sqs_bodies[max_entries + 1]],
+            ],
+            sent_batches,
+        )
+
+    @patch("time.sleep")
+    @patch.dict(os.environ, {"AWS_REGION": "us-west-2"}, clear=True)
+    def test_post_batch_to_metadata_queue_happy_path(self, mock_sleep: MagicMock):
+        """
+        All bodies should arrive on the queue when sent in batches.
+        """
+        sqs_bodies = [
+            self.create_sqs_body(uuid.uuid4().__str__())
+            for _ in range(sqs_library.MAX_BATCH_ENTRIES + 1)
+        ]
+
+        sqs_library.post_batch_to_metadata_queue(sqs_bodies, self.metadata_queue_url)
+
+        received_bodies = []
+        while True:
+            messages = self.queue.receive_messages(MaxNumberOfMessages=10)
+            if len(messages) == 0:
+                break
+            for message in messages:
+                received_bodies.append(json.loads(message.body))
+                message.delete()
+        self.assertCountEqual(sqs_bodies, received_bodies)
+        mock_sleep.assert_not_called()
+
+    @patch("time.sleep")
+    @patch("sqs_library.boto3.resource")
+    @patch.dict(os.environ, {"AWS_REGION": "us-west-2"}, clear=True)
+    def test_post_batch_to_metadata_queue_retries_failed_entries_only(
+        self, mock_resource: MagicMock, mock_sleep: MagicMock
+    ):
+        """
+        Only failed entries and entries with mismatched MD5s should be resent.
+        """
+        sqs_bodies = [self.create_sqs_body(uuid.uuid4().__str__()) for _ in range(3)]
+        bodies = [json.dumps(sqs_body) for sqs_body in sqs_bodies]
+        md5s = [
+            hashlib.md5(body.encode("utf8")).hexdigest() for body in bodies
+        ]  # nosec
+        sent_entry_ids = []
+
+        def send_messages(Entries):
+            sent_entry_ids.append([entry["Id"] for entry in Entries])
+            if len(sent_entry_ids) == 1:
+                return {
+                    "Successful": [
+                        {"Id": "0", "MD5OfMessageBody": md5s[0]},
+                        {"Id": "1", "MD5OfMessageBody": "bad md5"},
+                    ],
+                    "Failed": [
+                        {"Id": "2", "Code": "InternalError", "SenderFault": False}
+                    ],
+                }
+            return {
+                "Successful": [
+                    {"Id": entry["Id"], "MD5OfMessageBody": md5s[int(entry["Id"])]}
+                    for entry in Entries
+                ]
+            }
+
+        mock_queue = mock_resource.return_value.Queue.return_value
+        mock_queue.send_messages.side_effect = send_messages
+
+        sqs_library.post_batch_to_metadata_queue(sqs_bodies, self.metadata_queue_url)
+
+        mock_resource.return_value.Queue.assert_called_once_with(
+            self.metadata_queue_url
+        )
+        self.assertEqual([["0", "1", "2"], ["1", "2"]], sent_entry_ids)
+        self.assertEqual(1, mock_sleep.call_count)
+
+    @patch("time.sleep")
+    @patch("sqs_library.boto3.resource")
+    @patch.dict(os.environ, {"AWS_REGION": "us-west-2"}, clear=True)
+    def test_post_batch_to_metadata_queue_retry_failures(
+        self, mock_resource: MagicMock, mock_sleep: MagicMock
+    ):
+        """
+        Entries that keep failing should raise an error once retries are exhausted.
+        """
+        mock_queue = mock_resource.return_value.Queue.return_value
+        mock_queue.send_messages.return_value = {
+            "Failed": [{"Id": "0", "Code": "InternalError", "SenderFault": False}]
+        }
+
+        with self.assertRaises(Exception) as cm:
+            sqs_library.post_batch_to_metadata_queue(
+                [self.create_sqs_body(uuid.uuid4().__str__())], self.metadata_queue_url
+            )
+        self.assertEqual("Failed to send 1 messages to Queue: ['0']", str(cm.exception))
+        self.assertEqual(
+            sqs_library.MAX_RETRIES + 1, mock_queue.send_messages.call_count
+        )
+        self.assertEqual(sqs_library.MAX_RETRIES, mock_sleep.call_count)
+
 
 # TODO: Write tests to validate file name regex exclusion
 
@@ -21,7 +21,7 @@ from migrations.migrate_db import perform_migration
 
 # Globals
 # Latest version of the ORCA schema.
-LATEST_ORCA_SCHEMA_VERSION = 7
+LATEST_ORCA_SCHEMA_VERSION = 8
 MAX_RETRIES = 3
 
 
@@ -183,6 +183,7 @@ def create_recovery_objects(connection: Connection) -> None:
     - recovery_status
     - recovery_job
     - recovery_table
+    - recovery_job_status_count
 
     Args:
         connection (sqlalchemy.future.Connection): Database connection.
@@ -210,6 +211,14 @@ def create_recovery_objects(connection: Connection) -> None:
     connection.execute(sql.recovery_file_table_sql())
     LOGGER.info("recovery_file table created.")
 
+    # Create the recovery_job_status_count table and the trigger that fills it
+    LOGGER.debug("Creating recovery_job_status_count table ...")
+    connection.execute(sql.recovery_job_status_count_table_sql())
+    LOGGER.info("recovery_job_status_count table created.")
+    LOGGER.debug("Creating recovery_file status count trigger ...")
+    connection.execute(sql.recovery_file_status_count_trigger_sql())
+    LOGGER.info("recovery_file status count trigger created.")
+
 
 def create_inventory_objects(connection: Connection) -> None:
     """
@@ -467,6 +467,159 @@ def recovery_file_table_sql() -> text:  # pragma: no cover
     )
 
 
+def recovery_job_status_count_table_sql() -> text:  # pragma: no cover
+    """
+    Full SQL for creating the recovery_job_status_count table.
+
+    Returns:
+        SQL for creating recovery_job_status_count table.
+    """
+    return text(
+        """
+        -- Create table
+        CREATE TABLE IF NOT EXISTS recovery_job_status_count
+        (
+          job_id              text NOT NULL
+        , collection_id       text NOT NULL
+        , granule_id          text NOT NULL
+        , pending_count       integer NOT NULL DEFAULT 0
+        , staged_count        integer NOT NULL DEFAULT 0
+        , failed_count        integer NOT NULL DEFAULT 0
+        , success_count       integer NOT NULL DEFAULT 0
+        , max_completion_time timestamp with time zone NULL
+        , CONSTRAINT PK_recovery_job_status_count
+            PRIMARY KEY (job_id, collection_id, granule_id)
+        , CONSTRAINT FK_recovery_job_status_count_recoverjob
+            FOREIGN KEY (job_id, collection_id, granule_id)
+            REFERENCES recovery_job (job_id, collection_id, granule_id)
+            ON DELETE CASCADE
+        );
+
+        -- Comments
+        COMMENT ON TABLE recovery_job_status_count
+            IS 'Number of files in each status for a recovery_job, kept up to date by trigger.';
+        COMMENT ON COLUMN recovery_job_status_count.pending_count
+            IS 'Number of files for the granule that are pending.';
+        COMMENT ON COLUMN recovery_job_status_count.staged_count
+            IS 'Number of files for the granule that are staged.';
+        COMMENT ON COLUMN recovery_job_status_count.failed_count
+            IS 'Number of files for the granule that failed.';
+        COMMENT ON COLUMN recovery_job_status_count.success_count
+            IS 'Number of files for the granule that were recovered.';
+        COMMENT ON COLUMN recovery_job_status_count.max_completion_time
+            IS 'Latest completion time of the files for the granule.';
+
+        -- Grants
+        GRANT SELECT, INSERT, UPDATE, DELETE ON recovery_job_status_count TO orca_app;
+    """
+    )
+
+
+def recovery_file_status_count_trigger_sql() -> text:  # pragma: no cover
+    """
+    Full SQL for creating the trigger that keeps recovery_job_status_count and the
+    status of each recovery_job up to date as recovery_file rows change.
+    Each changed file adjusts its granule's counts, and the job status is
+    derived from the counts instead of aggregating over all the granule's files.
+
+    Returns:
+        SQL for creating the recovery_file status count trigger.
+    """
+    return text(
+        """
+        -- Create function
+        CREATE OR REPLACE FUNCTION recovery_file_status_count()
+            RETURNS trigger
+            LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE recovery_job_status_count
+                SET
+                    pending_count = pending_count - CASE WHEN OLD.status_id = 1 THEN 1 ELSE 0 END,
+                    staged_count = staged_count - CASE WHEN OLD.status_id = 2 THEN 1 ELSE 0 END,
+                    failed_count = failed_count - CASE WHEN OLD.status_id = 3 THEN 1 ELSE 0 END,
+                    success_count = success_count - CASE WHEN OLD.status_id = 4 THEN 1 ELSE 0 END
+                WHERE
+                    job_id = OLD.job_id
+                AND
+                    collection_id = OLD.collection_id
+                AND
+                    granule_id = OLD.granule_id;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO recovery_job_status_count AS status_count
+                    (job_id, collection_id, granule_id, pending_count, staged_count,
+                    failed_count, success_count, max_completion_time)
+                VALUES
+                    (NEW.job_id, NEW.collection_id, NEW.granule_id,
+                    CASE WHEN NEW.status_id = 1 THEN 1 ELSE 0 END,
+                    CASE WHEN NEW.status_id = 2 THEN 1 ELSE 0 END,
+                    CASE WHEN NEW.status_id = 3 THEN 1 ELSE 0 END,
+                    CASE WHEN NEW.status_id = 4 THEN 1 ELSE 0 END,
+                    NEW.completion_time)
+                ON CONFLICT (job_id, collection_id, granule_id)
+                DO UPDATE SET
+                    pending_count = status_count.pending_count + EXCLUDED.pending_count,
+                    staged_count = status_count.staged_count + EXCLUDED.staged_count,
+                    failed_count = status_count.failed_count + EXCLUDED.failed_count,
+                    success_count = status_count.success_count + EXCLUDED.success_count,
+                    max_completion_time = GREATEST(
+                        status_count.max_completion_time, EXCLUDED.max_completion_time
+                    );
+            END IF;
+
+            -- Matches MIN(status_id) and MAX(completion_time) over the granule's files.
+            -- OLD is NULL on INSERT and NEW is NULL on DELETE.
+            UPDATE
+                recovery_job
+            SET
+                status_id = CASE
+                    WHEN status_count.pending_count > 0 THEN 1
+                    WHEN status_count.staged_count > 0 THEN 2
+                    WHEN status_count.failed_count > 0 THEN 3
+                    ELSE 4
+                END,
+                completion_time = CASE
+                    WHEN status_count.pending_count + status_count.staged_count > 0 THEN NULL
+                    ELSE status_count.max_completion_time
+                END
+            FROM
+                recovery_job_status_count AS status_count
+            WHERE
+                recovery_job.job_id = status_count.job_id
+            AND
+                recovery_job.collection_id = status_count.collection_id
+            AND
+                recovery_job.granule_id = status_count.granule_id
+            AND
+                (status_count.job_id, status_count.collection_id, status_count.granule_id)
+                    IN ((OLD.job_id, OLD.collection_id, OLD.granule_id),
+                        (NEW.job_id, NEW.collection_id, NEW.granule_id))
+            AND
+                status_count.pending_count + status_count.staged_count
+                    + status_count.failed_count + status_count.success_count > 0;
+
+            RETURN NULL;
+        END;
+        $$;
+
+        COMMENT ON FUNCTION recovery_file_status_count()
+            IS 'Updates the recovery_job_status_count and recovery_job status of a file.';
+
+        -- Create trigger
+        DROP TRIGGER IF EXISTS recovery_file_status_count ON recovery_file;
+        CREATE TRIGGER recovery_file_status_count
+            AFTER INSERT OR DELETE
+                OR UPDATE OF job_id, collection_id, granule_id, status_id, completion_time
+            ON recovery_file
+            FOR EACH ROW
+            EXECUTE FUNCTION recovery_file_status_count();
+    """
+    )
+
+
 # ----------------------------------------------------------------------------
 # ORCA SQL used for creating ORCA inventory metadata tables
 # ----------------------------------------------------------------------------
@@ -583,6 +736,16 @@ def granules_table_sql() -> text:  # pragma: no cover
             IS 'createdAt time from Cumulus';
         COMMENT ON COLUMN granules.last_update
             IS 'Last time the data for the granule was updated.';
+
+        -- Indexes - Matches the sort order of catalog reporting pages
+        CREATE INDEX IF NOT EXISTS idx_granules_cumulus_granule_id_provider_id
+            ON granules (cumulus_granule_id, provider_id, collection_id);
+        -- Indexes - Catalog reporting createdAt range filters
+        CREATE INDEX IF NOT EXISTS idx_granules_collection_id_cumulus_create_time
+            ON granules (collection_id, cumulus_create_time);
+        CREATE INDEX IF NOT EXISTS idx_granules_provider_id_cumulus_create_time
+            ON granules (provider_id, cumulus_create_time);
+
         -- Grants
         GRANT SELECT, INSERT, UPDATE, DELETE ON granules TO orca_app;
     """
@@ -707,6 +870,11 @@ def files_table_sql() -> text:  # pragma: no cover
             IS 'Hash type used to hash the object. Supplied by Cumulus.';
         COMMENT ON COLUMN files.storage_class_id
             IS 'Storage class of the file.';
+
+        -- Indexes - Files of a granule, for catalog reporting pages and granule lookups
+        CREATE INDEX IF NOT EXISTS idx_files_granule_id
+            ON files (granule_id);
+
         -- Grants
         GRANT SELECT, INSERT, UPDATE, DELETE ON files TO orca_app;
     """
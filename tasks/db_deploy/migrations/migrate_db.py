@@ -14,6 +14,7 @@ from migrations.migrate_versions_3_to_4.migrate import migrate_versions_3_to_4
 from migrations.migrate_versions_4_to_5.migrate import migrate_versions_4_to_5
 from migrations.migrate_versions_5_to_6.migrate import migrate_versions_5_to_6
 from migrations.migrate_versions_6_to_7.migrate import migrate_versions_6_to_7
+from migrations.migrate_versions_7_to_8.migrate import migrate_versions_7_to_8
 
 
 def perform_migration(
@@ -61,5 +62,10 @@ def perform_migration(
 
     if current_schema_version == 6:
         # Run migrations from version 6 to version 7
-        migrate_versions_6_to_7(config, True)
+        migrate_versions_6_to_7(config, False)
         current_schema_version = 7
+
+    if current_schema_version == 7:
+        # Run migrations from version 7 to version 8
+        migrate_versions_7_to_8(config, True)
+        current_schema_version = 8
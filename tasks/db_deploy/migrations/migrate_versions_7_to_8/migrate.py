@@ -0,0 +1,95 @@
+"""
+Name: migrate.py
+
+Description: Migrates the ORCA schema from version 7 to version 8.
+"""
+
+from orca_shared.database.entities import PostgresConnectionInfo
+from orca_shared.database.shared_db import LOGGER
+from orca_shared.database.use_cases import create_admin_uri
+from sqlalchemy import create_engine
+
+import migrations.migrate_versions_7_to_8.migrate_sql as sql
+
+
+def migrate_versions_7_to_8(
+    config: PostgresConnectionInfo, is_latest_version: bool
+) -> None:
+    """
+    Performs the migration of the ORCA schema from version 7 to version 8 of
+    the ORCA schema. This includes adding the recovery_job_status_count table and the
+    recovery_file trigger that keeps it and the recovery_job status up to date,
+    and the indexes used by catalog reporting, which are built concurrently.
+
+    Args:
+        config: Connection information for the database.
+        is_latest_version: Flag to determine if version 8 is the latest
+                                  schema version.
+    Returns:
+        None
+    """
+    # Get the admin engine to the app database
+    user_admin_engine = create_engine(
+        create_admin_uri(config, LOGGER, config.user_database_name), future=True
+    )
+
+    with user_admin_engine.begin() as connection:
+
+        # Change to DBO role and set search path
+        LOGGER.debug("Changing to the dbo role to create objects ...")
+        connection.execute(sql.text("SET ROLE orca_dbo;"))
+
+        # Set the search path
+        LOGGER.debug("Setting search path to the ORCA schema to create objects ...")
+        connection.execute(sql.text("SET search_path TO orca, public;"))
+
+        # Create recovery_job_status_count table
+        LOGGER.debug("Creating recovery_job_status_count table ...")
+        connection.execute(sql.recovery_job_status_count_table_sql())
+        LOGGER.info("recovery_job_status_count table created.")
+
+        # Create the trigger before counting, so no file changes are missed.
+        LOGGER.debug("Creating recovery_file status count trigger ...")
+        connection.execute(sql.recovery_file_status_count_trigger_sql())
+        LOGGER.info("recovery_file status count trigger created.")
+
+        LOGGER.debug("Populating the recovery_job_status_count table with data ...")
+        connection.execute(sql.recovery_job_status_count_data_sql())
+        LOGGER.info("Data added to the recovery_job_status_count table.")
+
+    # Build the catalog indexes without blocking catalog writes.
+    # CREATE INDEX CONCURRENTLY cannot run in a transaction, and waits for
+    # the transaction above to finish, so it runs on its own connection after it.
+    with user_admin_engine.execution_options(
+        isolation_level="AUTOCOMMIT"
+    ).connect() as connection:
+        connection.execute(sql.text("SET ROLE orca_dbo;"))
+        connection.execute(sql.text("SET search_path TO orca, public;"))
+
+        # Indexes left invalid by a failed run are built again.
+        invalid_index_names = (
+            connection.execute(
+                sql.invalid_catalog_indexes_sql(),
+                [{"index_names": list(sql.CATALOG_INDEXES)}],
+            )
+            .scalars()
+            .all()
+        )
+        for index_name in invalid_index_names:
+            LOGGER.debug(f"Dropping invalid index {index_name} ...")
+            connection.execute(sql.drop_catalog_index_sql(index_name))
+
+        for index_name in sql.CATALOG_INDEXES:
+            LOGGER.debug(f"Creating index {index_name} ...")
+            connection.execute(sql.catalog_index_sql(index_name))
+        LOGGER.info("Catalog indexes created.")
+
+    # If v8 is the latest version, update the schema_versions table.
+    # Done last, so the migration is run again if any index was not built.
+    if is_latest_version:
+        with user_admin_engine.begin() as connection:
+            connection.execute(sql.text("SET ROLE orca_dbo;"))
+            connection.execute(sql.text("SET search_path TO orca, public;"))
+            LOGGER.debug("Populating the schema_versions table with data ...")
+            connection.execute(sql.schema_versions_data_sql())
+            LOGGER.info("Data added to the schema_versions table.")
@@ -1,4 +1,5 @@
 \c orca
+\ir orca_schema_v8/remove.sql;
 \ir orca_schema_v7/remove.sql;
 \ir orca_schema_v6/remove.sql;
 \ir orca_schema_v5/remove.sql;
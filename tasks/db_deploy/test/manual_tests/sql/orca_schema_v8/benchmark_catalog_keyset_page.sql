@@ -0,0 +1,161 @@
+-- Compares reading a deep orca_catalog_reporting page by continuationToken,
+-- with the matching granule IDs listed by a DISTINCT subquery and joined back,
+-- against finding them with an EXISTS semi-join.
+-- Pages are filtered to 2 of the 10 providers.
+-- Requires the ORCA schema at version 8 or later.
+-- All data is created in a transaction that is rolled back at the end.
+\timing on
+BEGIN;
+SET search_path TO orca, public;
+
+-- Seed 10 providers, 100 collections and 2,000,000 granules.
+INSERT INTO providers (provider_id, name)
+SELECT
+    'benchmark_provider_' || provider_number
+   ,'Benchmark provider ' || provider_number
+FROM
+    generate_series(1, 10) AS provider_number
+;
+
+INSERT INTO collections (collection_id, shortname, version)
+SELECT
+    'BENCHMARK__' || lpad(collection_number::text, 3, '0')
+   ,'BENCHMARK'
+   ,lpad(collection_number::text, 3, '0')
+FROM
+    generate_series(1, 100) AS collection_number
+;
+
+INSERT INTO granules
+    (provider_id, collection_id, cumulus_granule_id, execution_id,
+    ingest_time, cumulus_create_time, last_update)
+SELECT
+    'benchmark_provider_' || (granule_number % 10 + 1)
+   ,'BENCHMARK__' || lpad((granule_number % 100 + 1)::text, 3, '0')
+   ,'benchmark_granule_' || granule_number
+   ,md5(granule_number::text)
+   ,NOW()
+   ,NOW()
+   ,NOW()
+FROM
+    generate_series(1, 2000000) AS granule_number
+;
+
+ANALYZE granules;
+
+-- The sort key of a granule 1,500,000 granules into the catalog,
+-- as held by the continuationToken of the page it ends.
+SELECT
+    cumulus_granule_id AS last_cumulus_granule_id
+   ,provider_id AS last_provider_id
+   ,collection_id AS last_collection_id
+FROM
+    granules
+ORDER BY cumulus_granule_id, provider_id, collection_id
+OFFSET 15000*100 - 1
+LIMIT 1
+\gset
+
+-- Before: the DISTINCT list of every matching granule ID is built and joined back
+-- before the keyset comparison is applied.
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT
+    granules.id,
+    granules.provider_id,
+    granules.collection_id,
+    granules.cumulus_granule_id
+FROM
+(SELECT DISTINCT
+    granules.cumulus_granule_id
+FROM granules
+WHERE
+    provider_id=ANY(ARRAY['benchmark_provider_1', 'benchmark_provider_2'])
+) as granule_ids
+JOIN
+    granules ON granule_ids.cumulus_granule_id = granules.cumulus_granule_id
+WHERE
+    (granules.cumulus_granule_id, granules.provider_id, granules.collection_id) >
+    (:'last_cumulus_granule_id', :'last_provider_id', :'last_collection_id')
+ORDER BY granules.cumulus_granule_id, granules.provider_id, granules.collection_id
+LIMIT 100+1
+;
+
+-- After: the keyset comparison is an index condition on the sort order index,
+-- and each granule is checked against the filters with a semi-join.
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT
+    granules.id,
+    granules.provider_id,
+    granules.collection_id,
+    granules.cumulus_granule_id
+FROM
+    granules
+WHERE
+    (granules.cumulus_granule_id, granules.provider_id, granules.collection_id) >
+    (:'last_cumulus_granule_id', :'last_provider_id', :'last_collection_id')
+    and
+    EXISTS (
+    SELECT
+        1
+    FROM granules AS matching_granules
+    WHERE
+        matching_granules.cumulus_granule_id = granules.cumulus_granule_id and
+        matching_granules.provider_id=ANY(ARRAY['benchmark_provider_1', 'benchmark_provider_2'])
+    )
+ORDER BY granules.cumulus_granule_id, granules.provider_id, granules.collection_id
+LIMIT 100+1
+;
+
+-- Both versions return the same page.
+SELECT
+    (
+    SELECT
+        array_agg(page.id ORDER BY page.cumulus_granule_id)
+    FROM (
+        SELECT
+            granules.id,
+            granules.cumulus_granule_id
+        FROM
+        (SELECT DISTINCT
+            granules.cumulus_granule_id
+        FROM granules
+        WHERE
+            provider_id=ANY(ARRAY['benchmark_provider_1', 'benchmark_provider_2'])
+        ) as granule_ids
+        JOIN
+            granules ON granule_ids.cumulus_granule_id = granules.cumulus_granule_id
+        WHERE
+            (granules.cumulus_granule_id, granules.provider_id, granules.collection_id) >
+            (:'last_cumulus_granule_id', :'last_provider_id', :'last_collection_id')
+        ORDER BY granules.cumulus_granule_id, granules.provider_id, granules.collection_id
+        LIMIT 100+1
+    ) AS page
+    ) = (
+    SELECT
+        array_agg(page.id ORDER BY page.cumulus_granule_id)
+    FROM (
+        SELECT
+            granules.id,
+            granules.cumulus_granule_id
+        FROM
+            granules
+        WHERE
+            (granules.cumulus_granule_id, granules.provider_id, granules.collection_id) >
+            (:'last_cumulus_granule_id', :'last_provider_id', :'last_collection_id')
+            and
+            EXISTS (
+            SELECT
+                1
+            FROM granules AS matching_granules
+            WHERE
+                matching_granules.cumulus_granule_id = granules.cumulus_granule_id and
+                matching_granules.provider_id=ANY(
+                    ARRAY['benchmark_provider_1', 'benchmark_provider_2'])
+            )
+        ORDER BY granules.cumulus_granule_id, granules.provider_id, granules.collection_id
+        LIMIT 100+1
+    ) AS page
+    ) AS same_page
+;
+
+ROLLBACK;
@@ -0,0 +1,190 @@
+-- Compares reading a page of orca_catalog_reporting granules with the files
+-- built into json by the database, against reading the granules and their files
+-- as plain rows in two queries.
+-- Requires the ORCA schema at version 8 or later.
+-- All data is created in a transaction that is rolled back at the end.
+\timing on
+BEGIN;
+SET search_path TO orca, public;
+
+-- Seed 10 providers, 100 collections, 500,000 granules and 2,000,000 files.
+INSERT INTO providers (provider_id, name)
+SELECT
+    'benchmark_provider_' || provider_number
+   ,'Benchmark provider ' || provider_number
+FROM
+    generate_series(1, 10) AS provider_number
+;
+
+INSERT INTO collections (collection_id, shortname, version)
+SELECT
+    'BENCHMARK__' || lpad(collection_number::text, 3, '0')
+   ,'BENCHMARK'
+   ,lpad(collection_number::text, 3, '0')
+FROM
+    generate_series(1, 100) AS collection_number
+;
+
+INSERT INTO granules
+    (provider_id, collection_id, cumulus_granule_id, execution_id,
+    ingest_time, cumulus_create_time, last_update)
+SELECT
+    'benchmark_provider_' || (granule_number % 10 + 1)
+   ,'BENCHMARK__' || lpad((granule_number % 100 + 1)::text, 3, '0')
+   ,'benchmark_granule_' || granule_number
+   ,md5(granule_number::text)
+   ,NOW()
+   ,NOW()
+   ,NOW()
+FROM
+    generate_series(1, 500000) AS granule_number
+;
+
+INSERT INTO files
+    (granule_id, name, orca_archive_location, cumulus_archive_location, key_path,
+    ingest_time, etag, version, size_in_bytes, hash, hash_type, storage_class_id)
+SELECT
+    granules.id
+   ,granules.cumulus_granule_id || '.' || file_number || '.h5'
+   ,'benchmark-orca-archive'
+   ,'benchmark-cumulus-archive'
+   ,granules.collection_id || '/' || granules.cumulus_granule_id || '.' || file_number || '.h5'
+   ,NOW()
+   ,md5(granules.id::text || file_number)
+   ,'v1'
+   ,granules.id * 10 + file_number
+   ,md5(granules.cumulus_granule_id || file_number)
+   ,'MD5'
+   ,file_number % 2 + 1
+FROM
+    granules
+CROSS JOIN
+    generate_series(1, 4) AS file_number
+WHERE
+    granules.cumulus_granule_id LIKE 'benchmark_granule_%'
+;
+
+ANALYZE granules;
+ANALYZE files;
+
+-- Page 10 of one collection, as returned by both versions.
+-- Before: files are aggregated to json in a LATERAL join for each granule.
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT
+    *
+    FROM
+    (
+    SELECT
+        granules.id,
+        granules.provider_id,
+        granules.collection_id,
+        granules.cumulus_granule_id,
+        (EXTRACT(EPOCH FROM date_trunc('milliseconds', granules.cumulus_create_time)
+         AT TIME ZONE 'UTC') * 1000)::bigint as cumulus_create_time,
+        granules.execution_id,
+        (EXTRACT(EPOCH FROM date_trunc('milliseconds', granules.ingest_time)
+         AT TIME ZONE 'UTC') * 1000)::bigint as ingest_time,
+        (EXTRACT(EPOCH FROM date_trunc('milliseconds', granules.last_update)
+         AT TIME ZONE 'UTC') * 1000)::bigint as last_update
+    FROM
+    (SELECT DISTINCT
+        granules.cumulus_granule_id
+    FROM granules
+    WHERE
+        collection_id=ANY(ARRAY['BENCHMARK__042'])
+    ) as granule_ids
+    JOIN
+        granules ON granule_ids.cumulus_granule_id = granules.cumulus_granule_id
+    ORDER BY cumulus_granule_id, provider_id, collection_id
+    OFFSET 10*100
+    LIMIT 100+1
+) as granules
+LEFT JOIN LATERAL
+    (SELECT COALESCE(json_agg(files), '[]'::json) as files
+    FROM (
+    SELECT json_build_object(
+        'name', files.name,
+        'cumulusArchiveLocation', files.cumulus_archive_location,
+        'orcaArchiveLocation', files.orca_archive_location,
+        'keyPath', files.key_path,
+        'sizeBytes', files.size_in_bytes,
+        'hash', files.hash,
+        'hashType', files.hash_type,
+        'storageClass', storage_class.value,
+        'version', files.version) AS files
+    FROM files
+    JOIN
+        storage_class ON storage_class_id=storage_class.id
+    WHERE granules.id = files.granule_id
+    ) as files
+) as grouped on TRUE
+;
+
+-- After: the granules of the page, then their files as plain rows.
+-- The granule ids are kept in page_granule_ids for the second query.
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT
+    granules.id,
+    granules.provider_id,
+    granules.collection_id,
+    granules.cumulus_granule_id,
+    (EXTRACT(EPOCH FROM date_trunc('milliseconds', granules.cumulus_create_time)
+     AT TIME ZONE 'UTC') * 1000)::bigint as cumulus_create_time,
+    granules.execution_id,
+    (EXTRACT(EPOCH FROM date_trunc('milliseconds', granules.ingest_time)
+     AT TIME ZONE 'UTC') * 1000)::bigint as ingest_time,
+    (EXTRACT(EPOCH FROM date_trunc('milliseconds', granules.last_update)
+     AT TIME ZONE 'UTC') * 1000)::bigint as last_update
+FROM
+(SELECT DISTINCT
+    granules.cumulus_granule_id
+FROM granules
+WHERE
+    collection_id=ANY(ARRAY['BENCHMARK__042'])
+) as granule_ids
+JOIN
+    granules ON granule_ids.cumulus_granule_id = granules.cumulus_granule_id
+ORDER BY granules.cumulus_granule_id, granules.provider_id, granules.collection_id
+OFFSET 10*100
+LIMIT 100+1
+;
+
+SELECT
+    array_agg(page.id)::text AS page_granule_ids
+FROM (
+    SELECT
+        granules.id
+    FROM
+    (SELECT DISTINCT
+        granules.cumulus_granule_id
+    FROM granules
+    WHERE
+        collection_id=ANY(ARRAY['BENCHMARK__042'])
+    ) as granule_ids
+    JOIN
+        granules ON granule_ids.cumulus_granule_id = granules.cumulus_granule_id
+    ORDER BY granules.cumulus_granule_id, granules.provider_id, granules.collection_id
+    OFFSET 10*100
+    LIMIT 100+1
+) AS page
+\gset
+
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT
+    granule_id,
+    name,
+    cumulus_archive_location,
+    orca_archive_location,
+    key_path,
+    size_in_bytes,
+    hash,
+    hash_type,
+    storage_class_id,
+    version
+FROM
+    files
+WHERE
+    granule_id = ANY(:'page_granule_ids'::bigint[])
+;
+
+ROLLBACK;
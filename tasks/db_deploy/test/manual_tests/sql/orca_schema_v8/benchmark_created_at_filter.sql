@@ -0,0 +1,163 @@
+-- Compares the plans of the orca_catalog_reporting createdAt filter before and
+-- after it was rewritten to compare cumulus_create_time directly.
+-- Requires the ORCA schema at version 8 or later.
+-- All data is created in a transaction that is rolled back at the end.
+\timing on
+BEGIN;
+SET search_path TO orca, public;
+
+-- Seed 10 providers, 100 collections and 2,000,000 granules
+-- created over 5 years.
+INSERT INTO providers (provider_id, name)
+SELECT
+    'benchmark_provider_' || provider_number
+   ,'Benchmark provider ' || provider_number
+FROM
+    generate_series(1, 10) AS provider_number
+;
+
+INSERT INTO collections (collection_id, shortname, version)
+SELECT
+    'BENCHMARK__' || lpad(collection_number::text, 3, '0')
+   ,'BENCHMARK'
+   ,lpad(collection_number::text, 3, '0')
+FROM
+    generate_series(1, 100) AS collection_number
+;
+
+INSERT INTO granules
+    (provider_id, collection_id, cumulus_granule_id, execution_id,
+    ingest_time, cumulus_create_time, last_update)
+SELECT
+    'benchmark_provider_' || (granule_number % 10 + 1)
+   ,'BENCHMARK__' || lpad((granule_number % 100 + 1)::text, 3, '0')
+   ,'benchmark_granule_' || granule_number
+   ,md5(granule_number::text)
+   ,create_time
+   ,create_time
+   ,create_time
+FROM (
+    SELECT
+        granule_number
+       ,TIMESTAMP WITH TIME ZONE '2018-01-01 00:00:00+00'
+            + random() * INTERVAL '1826 days' AS create_time
+    FROM
+        generate_series(1, 2000000) AS granule_number
+    ) AS seed
+;
+
+-- Granules at the edges of the day used below, including sub-millisecond times.
+INSERT INTO granules
+    (provider_id, collection_id, cumulus_granule_id, execution_id,
+    ingest_time, cumulus_create_time, last_update)
+SELECT
+    'benchmark_provider_3'
+   ,'BENCHMARK__042'
+   ,'benchmark_boundary_granule_' || create_time
+   ,md5(create_time::text)
+   ,create_time::timestamptz
+   ,create_time::timestamptz
+   ,create_time::timestamptz
+FROM
+    unnest(ARRAY[
+        '2019-12-31 23:59:59.9996+00',
+        '2020-01-01 00:00:00+00',
+        '2020-01-01 23:59:59.9996+00',
+        '2020-01-02 00:00:00+00'
+    ]) AS create_time
+;
+
+ANALYZE providers;
+ANALYZE collections;
+ANALYZE granules;
+
+-- One day of one collection, from 2020-01-01 to 2020-01-02.
+-- Before: the column is wrapped in a function, so the index only narrows down
+-- the collection and every granule in it is filtered by time.
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT DISTINCT
+    granules.cumulus_granule_id
+FROM granules
+WHERE
+    collection_id=ANY(ARRAY['BENCHMARK__042']) and
+    (EXTRACT(EPOCH
+    FROM date_trunc('milliseconds', cumulus_create_time)
+    AT TIME ZONE 'UTC') * 1000)::bigint>=1577836800000 and
+    (EXTRACT(EPOCH
+    FROM date_trunc('milliseconds', cumulus_create_time)
+    AT TIME ZONE 'UTC') * 1000)::bigint<1577923200000
+;
+
+-- After: both columns are in the Index Cond of
+-- idx_granules_collection_id_cumulus_create_time.
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT DISTINCT
+    granules.cumulus_granule_id
+FROM granules
+WHERE
+    collection_id=ANY(ARRAY['BENCHMARK__042']) and
+    cumulus_create_time>=
+    TIMESTAMP WITH TIME ZONE 'epoch'
+    + CAST(1577836800000 AS BIGINT) * INTERVAL '1 millisecond' and
+    cumulus_create_time<
+    TIMESTAMP WITH TIME ZONE 'epoch'
+    + CAST(1577923200000 AS BIGINT) * INTERVAL '1 millisecond'
+;
+
+-- One day of one provider.
+-- Before: the provider's granules are read and filtered by time.
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT DISTINCT
+    granules.cumulus_granule_id
+FROM granules
+WHERE
+    provider_id=ANY(ARRAY['benchmark_provider_3']) and
+    (EXTRACT(EPOCH
+    FROM date_trunc('milliseconds', cumulus_create_time)
+    AT TIME ZONE 'UTC') * 1000)::bigint>=1577836800000 and
+    (EXTRACT(EPOCH
+    FROM date_trunc('milliseconds', cumulus_create_time)
+    AT TIME ZONE 'UTC') * 1000)::bigint<1577923200000
+;
+
+-- After: both columns are in the Index Cond of
+-- idx_granules_provider_id_cumulus_create_time.
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT DISTINCT
+    granules.cumulus_granule_id
+FROM granules
+WHERE
+    provider_id=ANY(ARRAY['benchmark_provider_3']) and
+    cumulus_create_time>=
+    TIMESTAMP WITH TIME ZONE 'epoch'
+    + CAST(1577836800000 AS BIGINT) * INTERVAL '1 millisecond' and
+    cumulus_create_time<
+    TIMESTAMP WITH TIME ZONE 'epoch'
+    + CAST(1577923200000 AS BIGINT) * INTERVAL '1 millisecond'
+;
+
+-- Both filters must match the same granules, including at the boundaries.
+-- Expect before_count = after_count.
+SELECT
+    COUNT(*) FILTER (
+        WHERE
+            (EXTRACT(EPOCH
+            FROM date_trunc('milliseconds', cumulus_create_time)
+            AT TIME ZONE 'UTC') * 1000)::bigint>=1577836800000 and
+            (EXTRACT(EPOCH
+            FROM date_trunc('milliseconds', cumulus_create_time)
+            AT TIME ZONE 'UTC') * 1000)::bigint<1577923200000
+    ) AS before_count
+   ,COUNT(*) FILTER (
+        WHERE
+            cumulus_create_time>=
+            TIMESTAMP WITH TIME ZONE 'epoch'
+            + CAST(1577836800000 AS BIGINT) * INTERVAL '1 millisecond' and
+            cumulus_create_time<
+            TIMESTAMP WITH TIME ZONE 'epoch'
+            + CAST(1577923200000 AS BIGINT) * INTERVAL '1 millisecond'
+    ) AS after_count
+FROM granules
+;
+
+ROLLBACK;
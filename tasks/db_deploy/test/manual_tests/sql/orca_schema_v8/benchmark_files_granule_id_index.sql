@@ -0,0 +1,168 @@
+-- Compares catalog page latency with and without idx_files_granule_id,
+-- on 2,500,000 granules with 4 files each.
+-- Requires the ORCA schema at version 8 or later.
+-- All data is created in a transaction that is rolled back at the end.
+-- The transaction locks the files table, so only run it on a test database.
+\timing on
+BEGIN;
+SET search_path TO orca, public;
+
+-- Start from the version 7 schema, which has no index on files.granule_id.
+DROP INDEX IF EXISTS idx_files_granule_id;
+
+-- Seed 10 providers, 100 collections, 2,500,000 granules and 10,000,000 files.
+INSERT INTO providers (provider_id, name)
+SELECT
+    'benchmark_provider_' || provider_number
+   ,'Benchmark provider ' || provider_number
+FROM
+    generate_series(1, 10) AS provider_number
+;
+
+INSERT INTO collections (collection_id, shortname, version)
+SELECT
+    'BENCHMARK__' || lpad(collection_number::text, 3, '0')
+   ,'BENCHMARK'
+   ,lpad(collection_number::text, 3, '0')
+FROM
+    generate_series(1, 100) AS collection_number
+;
+
+INSERT INTO granules
+    (provider_id, collection_id, cumulus_granule_id, execution_id,
+    ingest_time, cumulus_create_time, last_update)
+SELECT
+    'benchmark_provider_' || (granule_number % 10 + 1)
+   ,'BENCHMARK__' || lpad((granule_number % 100 + 1)::text, 3, '0')
+   ,'benchmark_granule_' || granule_number
+   ,md5(granule_number::text)
+   ,NOW()
+   ,NOW()
+   ,NOW()
+FROM
+    generate_series(1, 2500000) AS granule_number
+;
+
+INSERT INTO files
+    (granule_id, name, orca_archive_location, cumulus_archive_location, key_path,
+    ingest_time, etag, version, size_in_bytes, hash, hash_type, storage_class_id)
+SELECT
+    granules.id
+   ,granules.cumulus_granule_id || '.' || file_number || '.h5'
+   ,'benchmark-orca-archive'
+   ,'benchmark-cumulus-archive'
+   ,granules.collection_id || '/' || granules.cumulus_granule_id || '.' || file_number || '.h5'
+   ,NOW()
+   ,md5(granules.id::text || file_number)
+   ,'v1'
+   ,granules.id * 10 + file_number
+   ,md5(granules.cumulus_granule_id || file_number)
+   ,'MD5'
+   ,file_number % 2 + 1
+FROM
+    granules
+CROSS JOIN
+    generate_series(1, 4) AS file_number
+WHERE
+    granules.cumulus_granule_id LIKE 'benchmark_granule_%'
+;
+
+ANALYZE granules;
+ANALYZE files;
+
+-- The granules of page 10 of one collection, kept in page_granule_ids
+-- for the files queries below. This query does not use files.
+SELECT
+    array_agg(page.id)::text AS page_granule_ids
+FROM (
+    SELECT
+        granules.id
+    FROM
+    (SELECT DISTINCT
+        granules.cumulus_granule_id
+    FROM granules
+    WHERE
+        collection_id=ANY(ARRAY['BENCHMARK__042'])
+    ) as granule_ids
+    JOIN
+        granules ON granule_ids.cumulus_granule_id = granules.cumulus_granule_id
+    ORDER BY granules.cumulus_granule_id, granules.provider_id, granules.collection_id
+    OFFSET 10*100
+    LIMIT 100+1
+) AS page
+\gset
+
+-- Before: the files of the page.
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT
+    granule_id,
+    name,
+    cumulus_archive_location,
+    orca_archive_location,
+    key_path,
+    size_in_bytes,
+    hash,
+    hash_type,
+    storage_class_id,
+    version
+FROM
+    files
+WHERE
+    granule_id = ANY(:'page_granule_ids'::bigint[])
+;
+
+-- Before: the files of one granule.
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT
+    files.name,
+    files.key_path
+FROM
+    granules
+JOIN
+    files ON files.granule_id = granules.id
+WHERE
+    granules.collection_id = 'BENCHMARK__042'
+AND
+    granules.cumulus_granule_id = 'benchmark_granule_1234541'
+;
+
+-- Built as in the version 8 migration, without CONCURRENTLY,
+-- which cannot be used in a transaction.
+CREATE INDEX idx_files_granule_id ON files (granule_id);
+ANALYZE files;
+
+-- After: the files of the page.
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT
+    granule_id,
+    name,
+    cumulus_archive_location,
+    orca_archive_location,
+    key_path,
+    size_in_bytes,
+    hash,
+    hash_type,
+    storage_class_id,
+    version
+FROM
+    files
+WHERE
+    granule_id = ANY(:'page_granule_ids'::bigint[])
+;
+
+-- After: the files of one granule.
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT
+    files.name,
+    files.key_path
+FROM
+    granules
+JOIN
+    files ON files.granule_id = granules.id
+WHERE
+    granules.collection_id = 'BENCHMARK__042'
+AND
+    granules.cumulus_granule_id = 'benchmark_granule_1234541'
+;
+
+ROLLBACK;
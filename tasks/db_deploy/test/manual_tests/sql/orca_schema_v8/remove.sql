@@ -0,0 +1,19 @@
+-- Remove Updates
+DROP INDEX IF EXISTS orca.idx_files_granule_id;
+DROP INDEX IF EXISTS orca.idx_granules_provider_id_cumulus_create_time;
+DROP INDEX IF EXISTS orca.idx_granules_collection_id_cumulus_create_time;
+DROP INDEX IF EXISTS orca.idx_granules_cumulus_granule_id_provider_id;
+
+DROP TRIGGER IF EXISTS recovery_file_status_count ON orca.recovery_file;
+DROP FUNCTION IF EXISTS orca.recovery_file_status_count();
+DROP TABLE IF EXISTS orca.recovery_job_status_count;
+
+-- Upsert the current version
+DELETE FROM orca.schema_versions WHERE version_id = 8;
+INSERT INTO orca.schema_versions
+  VALUES
+    (7, 'Added collection_id to recovery job tables.', NOW(), True)
+ON CONFLICT (version_id)
+  DO
+    UPDATE
+    SET is_latest = True;
@@ -233,6 +233,8 @@ class TestCreateDatabaseLibraries(unittest.TestCase):
 
         self.assertEqual(self.mock_connection.mock_calls, execution_order)
 
+    @patch("install.create_db.sql.recovery_file_status_count_trigger_sql")
+    @patch("install.create_db.sql.recovery_job_status_count_table_sql")
     @patch("install.create_db.sql.recovery_file_table_sql")
     @patch("install.create_db.sql.recovery_job_table_sql")
     @patch("install.create_db.sql.recovery_status_data_sql")
@@ -243,6 +245,8 @@ class TestCreateDatabaseLibraries(unittest.TestCase):
         mock_recovery_status_data: MagicMock,
         mock_recovery_job_table: MagicMock,
         mock_recovery_file_table: MagicMock,
+        mock_recovery_job_status_count_table: MagicMock,
+        mock_recovery_file_status_count_trigger: MagicMock,
     ):
         """
         Tests happy path of the create_recovery_objects function
@@ -254,6 +258,8 @@ class TestCreateDatabaseLibraries(unittest.TestCase):
         mock_recovery_status_data.assert_called_once()
         mock_recovery_job_table.assert_called_once()
         mock_recovery_file_table.assert_called_once()
+        mock_recovery_job_status_count_table.assert_called_once()
+        mock_recovery_file_status_count_trigger.assert_called_once()
 
         # Check that the operations were called in the proper order
         execution_order = [
@@ -261,6 +267,8 @@ class TestCreateDatabaseLibraries(unittest.TestCase):
             call.execute(mock_recovery_status_data()),
             call.execute(mock_recovery_job_table()),
             call.execute(mock_recovery_file_table()),
+            call.execute(mock_recovery_job_status_count_table()),
+            call.execute(mock_recovery_file_status_count_trigger()),
         ]
 
         self.assertEqual(self.mock_connection.mock_calls, execution_order)
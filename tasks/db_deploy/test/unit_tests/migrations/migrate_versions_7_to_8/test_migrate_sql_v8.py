@@ -0,0 +1,50 @@
+"""
+Name: test_migrate_sql_v8.py
+
+Description: Testing library for the migrations/migrate_versions_7_to_8/migrate_sql.py.
+"""
+
+import unittest
+from inspect import getmembers, isfunction
+
+from sqlalchemy.sql.elements import TextClause
+
+import migrations.migrate_versions_7_to_8.migrate_sql as sql
+
+
+class TestOrcaSqlLogic(unittest.TestCase):
+    """
+    Note that currently all the function calls in the migrate_sql.py
+    return a SQL text string. The tests below
+    validate the logic in the function.
+    """
+
+    def test_all_functions_return_text(self) -> None:
+        """
+        Validates that all functions return a type TextClause
+        """
+
+        for name, function in getmembers(sql, isfunction):
+            if name not in ["text"]:
+                with self.subTest(function=function):
+                    # These functions take in the name of a catalog index.
+                    if name in ["catalog_index_sql", "drop_catalog_index_sql"]:
+                        for index_name in sql.CATALOG_INDEXES:
+                            self.assertEqual(type(function(index_name)), TextClause)
+
+                    # All other functions have no parameters passed
+                    else:
+                        self.assertEqual(type(function()), TextClause)
+
+    def test_catalog_index_sql_builds_concurrently(self) -> None:
+        """
+        Catalog indexes must not block writes while they build.
+        """
+        for index_name, definition in sql.CATALOG_INDEXES.items():
+            with self.subTest(index_name=index_name):
+                index_sql = sql.catalog_index_sql(index_name).text
+
+                self.assertIn(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name}", index_sql
+                )
+                self.assertIn(f"ON {definition};", index_sql)
@@ -0,0 +1,183 @@
+"""
+Name: test_migrate.py
+
+Description: Runs unit tests for the migrations/migrate_versions_7_to_8/migrate.py
+"""
+
+import unittest
+from unittest.mock import MagicMock, call, patch
+
+from orca_shared.database.entities import PostgresConnectionInfo
+
+from migrations.migrate_versions_7_to_8 import migrate
+
+
+class TestMigrateDatabaseLibraries(unittest.TestCase):
+    """
+    Runs unit tests on the migrate_db functions.
+    """
+
+    def setUp(self):
+        """
+        Set up test.
+        """
+        # todo: Use randomized values on a per-test basis.
+        self.config = PostgresConnectionInfo(  # nosec
+            admin_database_name="admin_db",
+            admin_username="admin",
+            admin_password="admin123",
+            user_username="user56789012",
+            user_password="pass56789012",
+            user_database_name="user_db",
+            host="aws.postgresrds.host",
+            port="5432",
+        )
+
+    def tearDown(self):
+        """
+        Tear down test
+        """
+        self.config = None
+
+    @patch("migrations.migrate_versions_7_to_8.migrate.sql.schema_versions_data_sql")
+    @patch("migrations.migrate_versions_7_to_8.migrate.sql.catalog_index_sql")
+    @patch("migrations.migrate_versions_7_to_8.migrate.sql.drop_catalog_index_sql")
+    @patch("migrations.migrate_versions_7_to_8.migrate.sql.invalid_catalog_indexes_sql")
+    @patch(
+        "migrations.migrate_versions_7_to_8.migrate.sql.recovery_job_status_count_data_sql"
+    )
+    @patch(
+        "migrations.migrate_versions_7_to_8."
+        "migrate.sql.recovery_file_status_count_trigger_sql"
+    )
+    @patch(
+        "migrations.migrate_versions_7_to_8."
+        "migrate.sql.recovery_job_status_count_table_sql"
+    )
+    @patch("migrations.migrate_versions_7_to_8.migrate.create_engine")
+    @patch("migrations.migrate_versions_7_to_8.migrate.create_admin_uri")
+    @patch("migrations.migrate_versions_7_to_8.migrate.sql.text")
+    def test_migrate_versions_7_to_8_happy_path(
+        self,
+        mock_text: MagicMock,
+        mock_create_admin_uri: MagicMock,
+        mock_create_engine: MagicMock,
+        mock_recovery_job_status_count_table_sql: MagicMock,
+        mock_recovery_file_status_count_trigger_sql: MagicMock,
+        mock_recovery_job_status_count_data_sql: MagicMock,
+        mock_invalid_catalog_indexes_sql: MagicMock,
+        mock_drop_catalog_index_sql: MagicMock,
+        mock_catalog_index_sql: MagicMock,
+        mock_schema_versions_data_sql: MagicMock,
+    ):
+        """
+        Tests the migrate_versions_7_to_8 function happy path
+        """
+        index_names = list(migrate.sql.CATALOG_INDEXES)
+        for latest_version in [True, False]:
+            with self.subTest(latest_version=latest_version):
+                mock_engine = mock_create_engine.return_value
+                mock_transaction_connection = mock_engine.begin().__enter__()
+                mock_autocommit_engine = mock_engine.execution_options.return_value
+                mock_autocommit_connection = (
+                    mock_autocommit_engine.connect().__enter__()
+                )
+                mock_autocommit_connection.execute.return_value.scalars.return_value.all.return_value = [  # noqa: E501
+                    index_names[0]
+                ]
+                mock_engine.reset_mock()
+                mock_transaction_connection.reset_mock()
+                mock_autocommit_connection.reset_mock(return_value=False)
+
+                # Run the function
+                migrate.migrate_versions_7_to_8(self.config, latest_version)
+
+                # Check that all the functions were called the correct
+                # number of times with the proper values
+                mock_create_admin_uri.assert_called_once_with(
+                    self.config, migrate.LOGGER, self.config.user_database_name
+                )
+                mock_create_engine.assert_called_once_with(
+                    mock_create_admin_uri.return_value, future=True
+                )
+                mock_recovery_job_status_count_table_sql.assert_called_once_with()
+                mock_recovery_file_status_count_trigger_sql.assert_called_once_with()
+                mock_recovery_job_status_count_data_sql.assert_called_once_with()
+                mock_invalid_catalog_indexes_sql.assert_called_once_with()
+                mock_drop_catalog_index_sql.assert_called_once_with(index_names[0])
+                mock_catalog_index_sql.assert_has_calls(
+                    [call(index_name) for index_name in index_names]
+                )
+                self.assertEqual(len(index_names), mock_catalog_index_sql.call_count)
+
+                # Check the text calls occur and in the proper order
+                text_calls = [
+                    call("SET ROLE orca_dbo;"),
+                    call("SET search_path TO orca, public;"),
+                ] * (3 if latest_version else 2)
+                mock_text.assert_has_calls(text_calls, any_order=False)
+                self.assertEqual(len(text_calls), mock_text.call_count)
+
+                # The trigger must exist before existing files are counted.
+                transaction_order = [
+                    call.execute(mock_text("SET ROLE orca_dbo;")),
+                    call.execute(mock_text("SET search_path TO orca, public;")),
+                    call.execute(mock_recovery_job_status_count_table_sql()),
+                    call.execute(mock_recovery_file_status_count_trigger_sql()),
+                    call.execute(mock_recovery_job_status_count_data_sql()),
+                ]
+
+                # Indexes are built concurrently, outside of a transaction.
+                mock_engine.execution_options.assert_called_once_with(
+                    isolation_level="AUTOCOMMIT"
+                )
+                autocommit_order = [
+                    call.execute(mock_text("SET ROLE orca_dbo;")),
+                    call.execute(mock_text("SET search_path TO orca, public;")),
+                    call.execute(
+                        mock_invalid_catalog_indexes_sql(),
+                        [{"index_names": index_names}],
+                    ),
+                    call.execute().scalars(),
+                    call.execute().scalars().all(),
+                    call.execute(mock_drop_catalog_index_sql()),
+                ] + [call.execute(mock_catalog_index_sql())] * len(index_names)
+                mock_autocommit_connection.assert_has_calls(
+                    autocommit_order, any_order=False
+                )
+
+                # Validate logic switch and set the execution order
+                if latest_version:
+                    mock_schema_versions_data_sql.assert_called_once_with()
+                    transaction_order.extend(
+                        [
+                            call.execute(mock_text("SET ROLE orca_dbo;")),
+                            call.execute(mock_text("SET search_path TO orca, public;")),
+                            call.execute(mock_schema_versions_data_sql()),
+                        ]
+                    )
+                    self.assertEqual(2, mock_engine.begin.call_count)
+                else:
+                    mock_schema_versions_data_sql.assert_not_called()
+                    self.assertEqual(1, mock_engine.begin.call_count)
+
+                # Check that items were called in the proper order
+                mock_transaction_connection.assert_has_calls(
+                    transaction_order, any_order=False
+                )
+                self.assertEqual(
+                    len(transaction_order),
+                    len(mock_transaction_connection.method_calls),
+                )
+
+            # Reset the mocks for next loop
+            mock_create_admin_uri.reset_mock()
+            mock_create_engine.reset_mock()
+            mock_recovery_job_status_count_table_sql.reset_mock()
+            mock_recovery_file_status_count_trigger_sql.reset_mock()
+            mock_recovery_job_status_count_data_sql.reset_mock()
+            mock_invalid_catalog_indexes_sql.reset_mock()
+            mock_drop_catalog_index_sql.reset_mock()
+            mock_catalog_index_sql.reset_mock()
+            mock_schema_versions_data_sql.reset_mock()
+            mock_text.reset_mock()
@@ -45,8 +45,10 @@ class TestMigrateDatabaseLibraries(unittest.TestCase):
     @patch("migrations.migrate_db.migrate_versions_4_to_5")
     @patch("migrations.migrate_db.migrate_versions_5_to_6")
     @patch("migrations.migrate_db.migrate_versions_6_to_7")
+    @patch("migrations.migrate_db.migrate_versions_7_to_8")
     def test_perform_migration_happy_path(
         self,
+        mock_migrate_v7_to_v8: MagicMock,
         mock_migrate_v6_to_v7: MagicMock,
         mock_migrate_v5_to_v6: MagicMock,
         mock_migrate_v4_to_v5: MagicMock,
@@ -57,7 +59,7 @@ class TestMigrateDatabaseLibraries(unittest.TestCase):
         """
         Tests the perform_migration function happy paths
         """
-        for version in [1, 2, 3, 4, 5, 6, 7, 8]:
+        for version in [1, 2, 3, 4, 5, 6, 7, 8, 9]:
             with self.subTest(version=version):
                 migrate_db.perform_migration(version, self.config, self.orca_buckets)
 
@@ -92,10 +94,15 @@ class TestMigrateDatabaseLibraries(unittest.TestCase):
                     mock_migrate_v5_to_v6.assert_not_called()
 
                 if version < 7:
-                    mock_migrate_v6_to_v7.assert_called_once_with(self.config, True)
+                    mock_migrate_v6_to_v7.assert_called_once_with(self.config, False)
                 else:
                     mock_migrate_v6_to_v7.assert_not_called()
 
+                if version < 8:
+                    mock_migrate_v7_to_v8.assert_called_once_with(self.config, True)
+                else:
+                    mock_migrate_v7_to_v8.assert_not_called()
+
             # Reset for next loop
             mock_migrate_v1_to_v2.reset_mock()
             mock_migrate_v2_to_v3.reset_mock()
@@ -103,3 +110,4 @@ class TestMigrateDatabaseLibraries(unittest.TestCase):
             mock_migrate_v4_to_v5.reset_mock()
             mock_migrate_v5_to_v6.reset_mock()
             mock_migrate_v6_to_v7.reset_mock()
+            mock_migrate_v7_to_v8.reset_mock()
@@ -6,13 +6,14 @@ Description:  Extracts the keys (filepaths) for a granule's files from a Cumulus
 
 import json
 import re
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
 import fastjsonschema as fastjsonschema
 from fastjsonschema import JsonSchemaException
+from orca_shared.files import shared_files
 
 # Set AWS powertools logger
 LOGGER = Logger()
@@ -55,6 +56,87 @@ class ExtractFilePathsError(Exception):
     """Exception to be raised if any errors occur"""
 
 
+class RegexBucketRouter:
+    """
+    Finds the destination bucket for file names using the regexes from get_regex_buckets.
+    The first regex, in configured order, that matches anywhere in the file name wins.
+    """
+
+    def __init__(self, regex_buckets: Dict[str, str], combine_patterns: bool = True):
+        """
+        Args:
+            regex_buckets: dict containing regex and bucket. See get_regex_buckets.
+            combine_patterns: If True, attempts to combine all regexes into a single
+                pattern so each file name is matched in one pass.
+                Falls back to checking regexes one at a time if they cannot be combined.
+        """
+        self._routes = [
+            (re.compile(regex), bucket) for regex, bucket in regex_buckets.items()
+        ]
+        self._combined_pattern = None
+        if combine_patterns and len(self._routes) > 0:
+            self._combined_pattern = self._combine(list(regex_buckets.keys()))
+        self._destination_buckets: Dict[str, Optional[str]] = {}
+
+    def _combine(self, regexes: List[str]) -> Optional[re.Pattern]:
+        """
+        Combines the regexes into one pattern with a named group per regex.
+        Each alternative is anchored to the start with a lazy prefix,
+        so alternation order, rather than match position, decides the winner.
+        Args:
+            regexes: The regexes, in priority order.
+        Returns:
+            The combined pattern, or None if the regexes cannot be safely combined.
+        """
+        # Renumbering would break backreferences, so leave grouped regexes alone.
+        if any(pattern.groups > 0 for pattern, _ in self._routes):
+            LOGGER.debug("Regexes contain groups. Matching one regex at a time.")
+            return None
+        try:
+            return re.compile(
+                "|".join(
+                    f"(?P<route{index}>(?s:.*?)(?:{regex}))"
+                    for index, regex in enumerate(regexes)
+                )
+            )
+        except re.error as error:
+            # For example, global inline flags are only allowed at the start.
+            LOGGER.debug(
+                f"Could not combine regexes: {error}. Matching one regex at a time."
+            )
+            return None
+
+    def get_destination_bucket(self, file_name: str) -> Optional[str]:
+        """
+        Gets the bucket for the first regex that matches the file name.
+        Results are remembered per file name.
+        Args:
+            file_name: The name of the file.
+        Returns:
+            The name of the bucket, or None if no regex matches.
+        """
+        if file_name in self._destination_buckets:
+            return self._destination_buckets[file_name]
+
+        destination_bucket = None
+        if self._combined_pattern is not None:
+            match = self._combined_pattern.match(file_name)
+            if match is not None:
+                route_index = int(match.lastgroup.removeprefix("route"))
+                destination_bucket = self._routes[route_index][1]
+        else:
+            destination_bucket = next(
+                (
+                    bucket
+                    for pattern, bucket in self._routes
+                    if pattern.search(file_name) is not None
+                ),
+                None,
+            )
+        self._destination_buckets[file_name] = destination_bucket
+        return destination_bucket
+
+
 def task(task_input: Dict[str, Any], config: Dict[str, Any]):
     """
     Task called by the handler to perform the work.
@@ -88,49 +170,41 @@ def task(task_input: Dict[str, Any], config: Dict[str, Any]):
         message = f"Key {ke} is missing from the event configuration: {config}"
         LOGGER.error(message)
         raise KeyError(message)
-    regex_buckets = get_regex_buckets(config)
+    exclusion_matcher = shared_files.get_file_exclusion_matcher(exclude_file_types)
+    router = RegexBucketRouter(get_regex_buckets(config))
     result_granules = []
     for a_granule in task_input[INPUT_GRANULES_KEY]:
         recovery_bucket_override = a_granule.get(
             INPUT_GRANULE_RECOVERY_BUCKET_OVERRIDE_KEY, None
         )
         files = []
-        for a_file in a_granule[INPUT_GRANULE_FILES_KEY]:
+        # filtering excludedFileExtensions
+        for a_file in exclusion_matcher.filter(
+            a_granule[INPUT_GRANULE_FILES_KEY],
+            lambda file: file[INPUT_GRANULE_FILE_FILENAME_KEY],
+        ):
             file_name = a_file[INPUT_GRANULE_FILE_FILENAME_KEY]
-            LOGGER.debug(f"Validating file {file_name}")
-            # filtering excludedFileExtensions
-            if should_exclude_files_type(file_name, exclude_file_types):
-                LOGGER.info(f"Excluding file '{file_name}'")
+            LOGGER.debug(f"File {file_name} will be restored")
+            file_key = a_file[INPUT_GRANULE_FILE_KEY_KEY]
+            LOGGER.debug(f"Retrieving information for {file_key}")
+
+            if recovery_bucket_override is not None:
+                destination_bucket = recovery_bucket_override
             else:
-                LOGGER.debug(f"File {file_name} will be restored")
-                file_key = a_file[INPUT_GRANULE_FILE_KEY_KEY]
-                LOGGER.debug(f"Retrieving information for {file_key}")
-
-                if recovery_bucket_override is not None:
-                    destination_bucket = recovery_bucket_override
-                else:
-                    matching_regex = next(
-                        filter(
-                            lambda key: re.compile(key).search(file_name), regex_buckets
-                        ),
-                        None,
-                    )
-                    if matching_regex is None:
-                        raise ExtractFilePathsError(
-                            f"No matching regex for '{file_key}'"
-                        )
-                    destination_bucket = regex_buckets[matching_regex]
-
-                LOGGER.debug(
-                    f"Found retrieval destination {destination_bucket} for {file_name}"
-                )
+                destination_bucket = router.get_destination_bucket(file_name)
+                if destination_bucket is None:
+                    raise ExtractFilePathsError(f"No matching regex for '{file_key}'")
 
-                files.append(
-                    {
-                        OUTPUT_KEY_KEY: file_key,
-                        OUTPUT_DESTINATION_BUCKET_KEY: destination_bucket,
-                    }
-                )
+            LOGGER.debug(
+                f"Found retrieval destination {destination_bucket} for {file_name}"
+            )
+
+            files.append(
+                {
+                    OUTPUT_KEY_KEY: file_key,
+                    OUTPUT_DESTINATION_BUCKET_KEY: destination_bucket,
+                }
+            )
         if len(files) == 0:
             LOGGER.warning(
                 f"All files for collection '{a_granule[INPUT_COLLECTION_ID_KEY]} "
@@ -193,14 +267,15 @@ def should_exclude_files_type(file_key: str, exclude_file_types: List[str]) -> b
     Returns:
         True if file should be excluded from copy, False otherwise.
     """
-    for file_type in exclude_file_types:
-        # Returns the first instance in the string that matches .ext or None if no match was found.
-        if re.search(f"^.*{file_type}$", file_key) is not None:
-            LOGGER.warning(
-                f"The file {file_key} will not be restored "
-                f"because it matches the excluded file type {file_type}."
-            )
-            return True
+    matching_extension = shared_files.get_file_exclusion_matcher(
+        exclude_file_types
+    ).get_matching_extension(file_key)
+    if matching_extension is not None:
+        LOGGER.warning(
+            f"The file {file_key} will not be restored "
+            f"because it matches the excluded file type {matching_extension}."
+        )
+        return True
     return False
 
 
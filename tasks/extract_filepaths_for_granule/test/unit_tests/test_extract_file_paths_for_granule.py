@@ -467,6 +467,79 @@ class TestExtractFilePaths(unittest.TestCase):
             ],
         )
 
+    def test_regex_bucket_router_first_match_wins(self):
+        """
+        The first configured regex that matches should win,
+        even if a later regex matches earlier in the file name.
+        """
+        regex_buckets = {
+            r"\.h5$": "first-bucket",
+            r"^L0A": "second-bucket",
+            r".*": "default-bucket",
+        }
+        for combine_patterns in [True, False]:
+            router = extract_filepaths_for_granule.RegexBucketRouter(
+                regex_buckets, combine_patterns
+            )
+            self.assertEqual(
+                "first-bucket", router.get_destination_bucket("L0A_0420.h5")
+            )
+            self.assertEqual(
+                "second-bucket", router.get_destination_bucket("L0A_0420.iso.xml")
+            )
+            self.assertEqual(
+                "default-bucket", router.get_destination_bucket("other.cmr.json")
+            )
+
+    def test_regex_bucket_router_combines_patterns(self):
+        """
+        Regexes without groups should be combined into one pattern.
+        Regexes with groups or inline flags should be matched one at a time.
+        """
+        combined_router = extract_filepaths_for_granule.RegexBucketRouter(
+            {".*.h5$": "bucket", ".*.xml$": "bucket"}
+        )
+        grouped_router = extract_filepaths_for_granule.RegexBucketRouter(
+            {r"(a)\1\.h5$": "grouped-bucket", ".*": "default-bucket"}
+        )
+        flagged_router = extract_filepaths_for_granule.RegexBucketRouter(
+            {".*.xml$": "bucket", "(?i).*.H5$": "flagged-bucket"}
+        )
+
+        self.assertIsNotNone(combined_router._combined_pattern)
+        self.assertIsNone(grouped_router._combined_pattern)
+        self.assertEqual(
+            "grouped-bucket", grouped_router.get_destination_bucket("aa.h5")
+        )
+        self.assertEqual(
+            "default-bucket", grouped_router.get_destination_bucket("ab.h5")
+        )
+        self.assertIsNone(flagged_router._combined_pattern)
+        self.assertEqual(
+            "flagged-bucket", flagged_router.get_destination_bucket("file.h5")
+        )
+
+    def test_regex_bucket_router_no_match_is_remembered(self):
+        """
+        Unmatched file names should return None, and results should be remembered.
+        """
+        router = extract_filepaths_for_granule.RegexBucketRouter({".*.h5$": "bucket"})
+        router._combined_pattern = Mock(wraps=router._combined_pattern)
+
+        self.assertIsNone(router.get_destination_bucket("file.xml"))
+        self.assertIsNone(router.get_destination_bucket("file.xml"))
+        self.assertEqual("bucket", router.get_destination_bucket("file.h5"))
+        self.assertEqual("bucket", router.get_destination_bucket("file.h5"))
+        self.assertEqual(2, router._combined_pattern.match.call_count)
+
+    def test_regex_bucket_router_no_regexes(self):
+        """
+        With no regexes configured, nothing should match.
+        """
+        router = extract_filepaths_for_granule.RegexBucketRouter({})
+
+        self.assertIsNone(router.get_destination_bucket(uuid.uuid4().__str__()))
+
     def test_exclude_file_types(self):
         """
         Testing filtering of exclude file types.
@@ -387,6 +387,8 @@ def generate_temporary_s3_column_list(manifest_file_schema: str) -> str:
 def create_temporary_table_sql(temporary_s3_column_list: str) -> text:
     """
     Creates a temporary table to store inventory data.
+    The table is dropped when the transaction commits, as pooled connections
+    are reused by later invocations.
     Args:
         temporary_s3_column_list: The list of columns that need to be created to store csv data.
             Be very careful to avoid injection.
@@ -395,7 +397,7 @@ def create_temporary_table_sql(temporary_s3_column_list: str) -> text:
         f"""
         CREATE TEMPORARY TABLE s3_import(
             {temporary_s3_column_list}
-        )
+        ) ON COMMIT DROP
         """
     )
 
@@ -748,6 +748,20 @@ class TestGetCurrentArchiveList(
             result,
         )
 
+    def test_create_temporary_table_sql_drops_on_commit(self):
+        """
+        The table must not outlive its transaction,
+        or the next invocation on the same pooled connection could not create it.
+        """
+        result = get_current_archive_list.create_temporary_table_sql(
+            "key_path text, etag text"
+        )
+
+        self.assertEqual(
+            "CREATE TEMPORARY TABLE s3_import( key_path text, etag text ) ON COMMIT DROP",
+            " ".join(result.text.split()),
+        )
+
     @patch("boto3.client")
     def test_get_message_from_queue_happy_path(self, mock_client: MagicMock):
         """
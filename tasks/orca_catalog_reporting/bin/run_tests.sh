@@ -75,7 +75,7 @@ check_returncode $? "ERROR: Potential security or code issues found."
 echo "INFO: Running unit and coverage tests ..."
 
 # Currently just running unit tests until we fix/support large tests
-coverage run --source=orca_catalog_reporting -m pytest
+coverage run --source=orca_catalog_reporting,orca_catalog_export -m pytest
 check_returncode $? "ERROR: Unit tests encountered failures."
 
 # Unit tests expected to cover minimum of 80%.
@@ -0,0 +1,521 @@
+"""
+Name: orca_catalog_export.py
+
+Description: Exports every catalog granule matching the given filters to S3
+as gzipped newline delimited json, then writes a manifest describing the export.
+Large exports are split into chunks, one per invocation, and resumed by exportId.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Union
+
+# noinspection SpellCheckingInspection,PyPackageRequirements
+import boto3
+import fastjsonschema as fastjsonschema
+from aws_lambda_powertools import Logger
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+# noinspection PyPackageRequirements
+from botocore.exceptions import ClientError
+from orca_shared.database import shared_db
+from orca_shared.database.shared_db import retry_operational_error
+from sqlalchemy.future import Engine
+
+from orca_catalog_reporting import create_granule_dict, get_catalog_sql, get_files
+
+OS_ENVIRON_DB_CONNECT_INFO_SECRET_ARN_KEY = "DB_CONNECT_INFO_SECRET_ARN"  # nosec
+OS_ENVIRON_EXPORT_BUCKET_NAME_KEY = "EXPORT_BUCKET_NAME"
+
+EXPORT_KEY_PREFIX = "catalog_exports"
+# Holds the chunks written so far and where the next one starts.
+PROGRESS_FILE_NAME = "catalog_export_progress.json"
+# Objects in the reports bucket ending in 'manifest.json' are treated as
+# S3 inventory manifests, so the export manifest must not use that suffix.
+MANIFEST_FILE_NAME = "catalog_export.json"
+
+# Number of granules fetched from the server-side cursor at a time.
+# The files of each batch are read with one query.
+EXPORT_BATCH_SIZE = 1000
+# S3 requires every part but the last to be at least 5 MiB.
+UPLOAD_PART_SIZE_BYTES = 8 * 1024 * 1024
+# A chunk is completed once there is less than this much Lambda time left,
+# leaving time to upload its last part and record the progress.
+EXPORT_TIME_MARGIN_SECS = 60
+
+# Set AWS powertools logger
+LOGGER = Logger()
+
+# Generating schema validators can take time, so do it once and reuse.
+try:
+    with open("schemas/export_input.json", "r") as raw_schema:
+        _INPUT_VALIDATE = fastjsonschema.compile(json.loads(raw_schema.read()))
+    with open("schemas/export_output.json", "r") as raw_schema:
+        _OUTPUT_VALIDATE = fastjsonschema.compile(json.loads(raw_schema.read()))
+except Exception as ex:
+    LOGGER.error(f"Could not build schema validator: {ex}")
+    raise
+
+
+class MultipartUploadWriter:
+    """
+    File-like object that uploads everything written to it as a single S3 object,
+    one part at a time, so the whole object never has to be held in memory.
+    Keeps the size and sha256 of the uploaded bytes.
+    """
+
+    def __init__(
+        self,
+        s3_client,
+        bucket_name: str,
+        key: str,
+        part_size_bytes: int = UPLOAD_PART_SIZE_BYTES,
+    ):
+        """
+        Args:
+            s3_client: The client to upload with.
+            bucket_name: The bucket to upload to.
+            key: The key of the object to create.
+            part_size_bytes: Written bytes are buffered until there are this many,
+                then uploaded as a part.
+        """
+        self.s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.key = key
+        self.part_size_bytes = part_size_bytes
+        self.size_in_bytes = 0
+        self._sha256 = hashlib.sha256()
+        self._buffer = bytearray()
+        self._parts = []
+        self._upload_id = s3_client.create_multipart_upload(
+            Bucket=bucket_name, Key=key, ContentType="application/gzip"
+        )["UploadId"]
+
+    @property
+    def sha256(self) -> str:
+        """
+        The hex encoded sha256 of the bytes written so far.
+        """
+        return self._sha256.hexdigest()
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        self._sha256.update(data)
+        self.size_in_bytes += len(data)
+        if len(self._buffer) >= self.part_size_bytes:
+            self._upload_part()
+        return len(data)
+
+    def flush(self) -> None:
+        # Parts are only uploaded once full, or by complete.
+        pass
+
+    def _upload_part(self) -> None:
+        part_number = len(self._parts) + 1
+        response = self.s3_client.upload_part(
+            Bucket=self.bucket_name,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=bytes(self._buffer),
+        )
+        self._parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+        self._buffer.clear()
+
+    def complete(self) -> None:
+        """
+        Uploads any buffered bytes and creates the object from the uploaded parts.
+        """
+        if self._buffer or not self._parts:
+            self._upload_part()
+        self.s3_client.complete_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=self.key,
+            UploadId=self._upload_id,
+            MultipartUpload={"Parts": self._parts},
+        )
+
+    def abort(self) -> None:
+        """
+        Discards the uploaded parts. The object is not created.
+        """
+        self.s3_client.abort_multipart_upload(
+            Bucket=self.bucket_name, Key=self.key, UploadId=self._upload_id
+        )
+
+
+def task(
+    provider_id: Union[None, List[str]],
+    collection_id: Union[None, List[str]],
+    granule_id: Union[None, List[str]],
+    start_timestamp: Union[None, int],
+    end_timestamp: Union[None, int],
+    bucket_name: str,
+    export_id: str,
+    db_connect_info: Dict[str, str],
+    get_remaining_time_in_millis: Callable[[], int],
+) -> Dict[str, Any]:
+    """
+    Exports the next chunk of matching granules, resuming the export if it was started
+    by an earlier invocation. Once every granule is exported, writes the manifest.
+
+    Args:
+        provider_id: The unique ID of the provider(s) making the request.
+        collection_id: The unique ID of collection(s) to export.
+        granule_id: The unique ID of granule(s) to export.
+        start_timestamp: Cumulus createdAt start time for date range to export.
+        end_timestamp: Cumulus createdAt end-time for date range to export.
+            If None, the export must have been started by an earlier invocation.
+            The filters of a resumed export are read from its progress.
+        bucket_name: The bucket to write the export to.
+        export_id: Unique ID of the export. Used in the keys of the export's objects.
+        db_connect_info: See shared_db.py's get_configuration for further details.
+        get_remaining_time_in_millis: Returns the Lambda's remaining time.
+            The chunk is completed with EXPORT_TIME_MARGIN_SECS left.
+
+    Returns:
+        The progress of the export, with the manifest's key if it is complete.
+        See schemas/export_output.json
+    """
+    key_prefix = f"{EXPORT_KEY_PREFIX}/{export_id}"
+    progress_key = f"{key_prefix}/{PROGRESS_FILE_NAME}"
+    manifest_key = f"{key_prefix}/{MANIFEST_FILE_NAME}"
+
+    s3_client = boto3.client("s3")
+    progress = get_progress(s3_client, bucket_name, progress_key)
+    if progress is None:
+        if end_timestamp is None:
+            raise ValueError(f"No export '{export_id}' to resume.")
+        progress = {
+            "exportId": export_id,
+            "createdAt": int(datetime.now(timezone.utc).timestamp() * 1000),
+            "filters": {
+                "providerId": provider_id,
+                "collectionId": collection_id,
+                "granuleId": granule_id,
+                "startTimestamp": start_timestamp,
+                "endTimestamp": end_timestamp,
+            },
+            "bucket": bucket_name,
+            "format": "ndjson",
+            "compression": "gzip",
+            "files": [],
+            "granuleCount": 0,
+            "fileCount": 0,
+            "lastGranule": None,
+        }
+
+    # lastGranule is None before the first chunk, and once every granule is exported.
+    if progress["lastGranule"] is not None or len(progress["files"]) == 0:
+        export_next_chunk(
+            s3_client,
+            bucket_name,
+            progress,
+            f"{key_prefix}/catalog-{len(progress['files']):05d}.ndjson.gz",
+            db_connect_info,
+            get_remaining_time_in_millis,
+        )
+        put_json(s3_client, bucket_name, progress_key, progress)
+        if progress["lastGranule"] is not None:
+            LOGGER.info(
+                f"Exported {progress['granuleCount']} granules so far "
+                f"to s3://{bucket_name}/{key_prefix}. "
+                f"Invoke again with exportId '{export_id}' to continue."
+            )
+            return {"complete": False, "manifestKey": None, **get_manifest(progress)}
+
+    manifest = get_manifest(progress)
+    # Written last, so a manifest is only present for a complete export.
+    put_json(s3_client, bucket_name, manifest_key, manifest)
+    LOGGER.info(
+        f"Exported {progress['granuleCount']} granules "
+        f"to s3://{bucket_name}/{key_prefix}."
+    )
+    return {"complete": True, "manifestKey": manifest_key, **manifest}
+
+
+def export_next_chunk(
+    s3_client,
+    bucket_name: str,
+    progress: Dict[str, Any],
+    data_key: str,
+    db_connect_info: Dict[str, str],
+    get_remaining_time_in_millis: Callable[[], int],
+) -> None:
+    """
+    Exports the granules after progress['lastGranule'] to data_key,
+    then adds the chunk to progress.
+
+    Args:
+        s3_client: The client to upload with.
+        bucket_name: The bucket to write the chunk to.
+        progress: The progress of the export. Updated in place.
+        data_key: The key of the chunk.
+        db_connect_info: See shared_db.py's get_configuration for further details.
+        get_remaining_time_in_millis: Returns the Lambda's remaining time.
+    """
+    filters = progress["filters"]
+    summary = export_catalog(
+        shared_db.get_user_connection(db_connect_info),
+        s3_client,
+        bucket_name,
+        data_key,
+        filters["providerId"],
+        filters["collectionId"],
+        filters["granuleId"],
+        filters["startTimestamp"],
+        filters["endTimestamp"],
+        progress["lastGranule"],
+        get_remaining_time_in_millis,
+    )
+    progress["files"].append(
+        {
+            "key": data_key,
+            "granuleCount": summary["granuleCount"],
+            "fileCount": summary["fileCount"],
+            "sizeBytes": summary["sizeBytes"],
+            "sha256": summary["sha256"],
+        }
+    )
+    progress["granuleCount"] += summary["granuleCount"]
+    progress["fileCount"] += summary["fileCount"]
+    progress["lastGranule"] = None if summary["complete"] else summary["lastGranule"]
+
+
+def get_manifest(progress: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns the manifest of an export, which is its progress
+    without the sort key the next chunk starts after.
+    """
+    return {key: value for key, value in progress.items() if key != "lastGranule"}
+
+
+def get_progress(
+    s3_client, bucket_name: str, progress_key: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Reads the progress of an export.
+
+    Args:
+        s3_client: The client to read with.
+        bucket_name: The bucket the export is written to.
+        progress_key: The key of the export's progress.
+
+    Returns:
+        The progress written by task, or None if the export was not started.
+    """
+    try:
+        response = s3_client.get_object(Bucket=bucket_name, Key=progress_key)
+    except ClientError as ex:
+        if ex.response["Error"]["Code"] in ["NoSuchKey", "404"]:
+            return None
+        raise
+    return json.loads(response["Body"].read())
+
+
+def put_json(s3_client, bucket_name: str, key: str, body: Dict[str, Any]) -> None:
+    """
+    Writes body to the bucket as a json object.
+    """
+    s3_client.put_object(
+        Bucket=bucket_name,
+        Key=key,
+        Body=json.dumps(body).encode("utf8"),
+        ContentType="application/json",
+    )
+
+
+@retry_operational_error()
+def export_catalog(
+    engine: Engine,
+    s3_client,
+    bucket_name: str,
+    data_key: str,
+    provider_id: Union[None, List[str]],
+    collection_id: Union[None, List[str]],
+    granule_id: Union[None, List[str]],
+    start_timestamp: Union[None, int],
+    end_timestamp: int,
+    last_granule: Optional[Dict[str, str]],
+    get_remaining_time_in_millis: Callable[[], int],
+) -> Dict[str, Any]:
+    """
+    Streams the matching granules after last_granule from a server-side cursor
+    to a gzipped newline delimited json object, one granule per line, in the order of
+    catalog reporting pages. Stops early once there are less than
+    EXPORT_TIME_MARGIN_SECS left. On failure, nothing is left in S3.
+
+    Args:
+        engine: The sqlalchemy engine to use for contacting the database.
+        s3_client: The client to upload with.
+        bucket_name: The bucket to write the object to.
+        data_key: The key of the object to write.
+        provider_id: The unique ID of the provider(s) making the request.
+        collection_id: The unique ID of collection(s) to export.
+        granule_id: The unique ID of granule(s) to export.
+        start_timestamp: Cumulus createdAt start time for date range to export.
+        end_timestamp: Cumulus createdAt end-time for date range to export.
+        last_granule: The sort key of the last granule exported by an earlier chunk,
+            with the keys 'cumulusGranuleId', 'providerId' and 'collectionId'.
+            None to start from the first granule.
+        get_remaining_time_in_millis: Returns the Lambda's remaining time.
+
+    Returns:
+        A dict with the following keys:
+            'granuleCount' (int)
+            'fileCount' (int)
+            'sizeBytes' (int): The size of the gzipped object.
+            'sha256' (str): The hex encoded sha256 of the gzipped object.
+            'complete' (bool): False if stopped early.
+            'lastGranule' (dict): The sort key of the last granule written,
+                in the format of last_granule.
+    """
+    granule_count = 0
+    file_count = 0
+    complete = True
+    writer = MultipartUploadWriter(s3_client, bucket_name, data_key)
+    try:
+        with gzip.GzipFile(
+            fileobj=writer, mode="wb"
+        ) as gzip_file, engine.begin() as connection:
+            sql_results = connection.execution_options(
+                yield_per=EXPORT_BATCH_SIZE
+            ).execute(
+                get_catalog_sql(),
+                [
+                    {
+                        "provider_id": provider_id,
+                        "collection_id": collection_id,
+                        "granule_id": granule_id,
+                        "start_timestamp": start_timestamp,
+                        "end_timestamp": end_timestamp,
+                        "page_index": 0,
+                        "page_size": None,
+                        "last_cumulus_granule_id": (
+                            None
+                            if last_granule is None
+                            else last_granule["cumulusGranuleId"]
+                        ),
+                        "last_provider_id": (
+                            None if last_granule is None else last_granule["providerId"]
+                        ),
+                        "last_collection_id": (
+                            None
+                            if last_granule is None
+                            else last_granule["collectionId"]
+                        ),
+                    }
+                ],
+            )
+            for granule_rows in sql_results.partitions():
+                files = get_files(
+                    [granule_row.id for granule_row in granule_rows], connection
+                )
+                for granule_row in granule_rows:
+                    granule = create_granule_dict(
+                        granule_row, files.get(granule_row.id, [])
+                    )
+                    gzip_file.write(
+                        json.dumps(granule, separators=(",", ":")).encode("utf8")
+                        + b"\n"
+                    )
+                    granule_count += 1
+                    file_count += len(granule["files"])
+                    last_granule = {
+                        "cumulusGranuleId": granule_row.cumulus_granule_id,
+                        "providerId": granule_row.provider_id,
+                        "collectionId": granule_row.collection_id,
+                    }
+                if get_remaining_time_in_millis() < EXPORT_TIME_MARGIN_SECS * 1000:
+                    # The rest is exported by the next invocation.
+                    complete = False
+                    break
+        writer.complete()
+    except Exception:
+        writer.abort()
+        raise
+
+    return {
+        "granuleCount": granule_count,
+        "fileCount": file_count,
+        "sizeBytes": writer.size_in_bytes,
+        "sha256": writer.sha256,
+        "complete": complete,
+        "lastGranule": last_granule,
+    }
+
+
+def check_env_variable(env_name: str) -> str:
+    """
+    Checks for the lambda environment variable.
+
+    Args:
+        env_name (str): The environment variable name set in lambda configuration.
+
+    Raises: KeyError in case the environment variable is not found.
+    """
+    try:
+        env_value = os.environ[env_name]
+        if len(env_value) == 0:
+            raise KeyError(f"Empty value for {env_name}")
+    except KeyError:
+        LOGGER.error(f"{env_name} environment value not found.")
+        raise
+
+    return env_value
+
+
+@LOGGER.inject_lambda_context
+def handler(
+    event: Dict[str, Union[List[str], int]], context: LambdaContext
+) -> Dict[str, Any]:
+    """
+    Entry point for the orca_catalog_export Lambda.
+    Each invocation exports one chunk. If the output has 'complete' set to false,
+    invoke again with its exportId until it is true.
+    Args:
+        event: See schemas/export_input.json
+        context: This object provides information about the lambda invocation, function,
+            and execution env.
+    Environment Vars:
+        DB_CONNECT_INFO_SECRET_ARN (string):
+            Secret ARN of the AWS secretsmanager secret for connecting to the database.
+            See shared_db.py's get_configuration for further details.
+        EXPORT_BUCKET_NAME (string):
+            The bucket to write the export to.
+
+    Returns:
+        See schemas/export_output.json
+    """
+    _INPUT_VALIDATE(event)
+
+    db_connect_info = shared_db.get_configuration(
+        check_env_variable(OS_ENVIRON_DB_CONNECT_INFO_SECRET_ARN_KEY)
+    )
+    bucket_name = check_env_variable(OS_ENVIRON_EXPORT_BUCKET_NAME_KEY)
+
+    export_id = event.get("exportId", None)
+    if export_id is None:
+        # Retries of this invocation have the same request id, so resume the export.
+        export_id = context.aws_request_id
+        filters = event
+    else:
+        # The filters are read from the export's progress.
+        filters = {}
+
+    result = task(
+        filters.get("providerId", None),
+        filters.get("collectionId", None),
+        filters.get("granuleId", None),
+        filters.get("startTimestamp", None),
+        filters.get("endTimestamp", None),
+        bucket_name,
+        export_id,
+        db_connect_info,
+        context.get_remaining_time_in_millis,
+    )
+    _OUTPUT_VALIDATE(result)
+    return result
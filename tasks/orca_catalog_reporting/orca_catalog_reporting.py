@@ -1,5 +1,8 @@
+import binascii
 import json
 import os
+import threading
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from http import HTTPStatus
 from typing import Any, Dict, List, Union
 
@@ -9,13 +12,18 @@ from aws_lambda_powertools.utilities.typing import LambdaContext
 from fastjsonschema import JsonSchemaException
 from orca_shared.database import shared_db
 from orca_shared.database.shared_db import retry_operational_error
-from sqlalchemy import text
-from sqlalchemy.future import Engine
+from sqlalchemy import Row, text
+from sqlalchemy.future import Connection, Engine
 
 # Set AWS powertools logger
 LOGGER = Logger()
 
 PAGE_SIZE = 100
+
+# storage_class values by id, shared across invocations of a warm Lambda.
+_STORAGE_CLASS_VALUES: Dict[int, str] = {}
+_STORAGE_CLASS_VALUES_LOCK = threading.Lock()
+
 # Generating schema validators can take time, so do it once and reuse.
 try:
     with open("schemas/input.json", "r") as raw_schema:
@@ -39,6 +47,7 @@ def task(
     start_timestamp: Union[None, int],
     end_timestamp: int,
     page_index: int,
+    page_start: Union[None, Dict[str, str]],
     db_connect_info: Dict[str, str],
 ) -> Dict[str, Any]:
     """
@@ -49,6 +58,9 @@ def task(
         start_timestamp: Cumulus createdAt start time for date range to compare data.
         end_timestamp: Cumulus createdAt end-time for date range to compare data.
         page_index: The 0-based index of the results page to return.
+            Counted from page_start, if given.
+        page_start: The last granule of the previous page, from decode_continuation_token.
+            If given, only granules after it are returned.
         db_connect_info: See requests_db.py's get_configuration for further details.
     """
     engine = shared_db.get_user_connection(db_connect_info)
@@ -60,9 +72,72 @@ def task(
         start_timestamp,
         end_timestamp,
         page_index,
+        page_start,
     )
 
-    return {"anotherPage": len(granules) > PAGE_SIZE, "granules": granules[0:PAGE_SIZE]}
+    another_page = len(granules) > PAGE_SIZE
+    granules = granules[0:PAGE_SIZE]
+    return {
+        "anotherPage": another_page,
+        "continuationToken": (
+            encode_continuation_token(granules[-1]) if another_page else None
+        ),
+        "granules": granules,
+    }
+
+
+def encode_continuation_token(granule: Dict[str, Any]) -> str:
+    """
+    Creates the token used to request the page after the given granule.
+
+    Args:
+        granule: The last granule on the current page, as returned by query_db.
+
+    Returns:
+        Base 64 encoded json string holding the granule's sort key.
+    """
+    values = json.dumps(
+        {
+            "id": granule["id"],
+            "providerId": granule["providerId"],
+            "collectionId": granule["collectionId"],
+        }
+    )
+    return urlsafe_b64encode(values.encode("utf8")).decode("utf8")
+
+
+def decode_continuation_token(continuation_token: str) -> Dict[str, str]:
+    """
+    Reads the sort key of the last granule on the previous page from a token.
+
+    Args:
+        continuation_token: A token from encode_continuation_token.
+
+    Returns:
+        A dict with the following keys:
+            'cumulus_granule_id' (str)
+            'provider_id' (str)
+            'collection_id' (str)
+
+    Raises:
+        ValueError: If the token was not created by encode_continuation_token.
+    """
+    try:
+        values = json.loads(
+            urlsafe_b64decode(continuation_token.encode("utf8")).decode("utf8")
+        )
+        page_start = {
+            "cumulus_granule_id": values["id"],
+            "provider_id": values["providerId"],
+            "collection_id": values["collectionId"],
+        }
+    except (binascii.Error, ValueError, TypeError, KeyError) as decode_error:
+        raise ValueError(
+            f"Invalid continuationToken '{continuation_token}'."
+        ) from decode_error
+    if not all(isinstance(value, str) for value in page_start.values()):
+        raise ValueError(f"Invalid continuationToken '{continuation_token}'.")
+    return page_start
 
 
 @retry_operational_error()
@@ -74,8 +149,11 @@ def query_db(
     start_timestamp: Union[None, int],
     end_timestamp: int,
     page_index: int,
+    page_start: Union[None, Dict[str, str]],
 ) -> List[Dict[str, Any]]:
     """
+    Returns up to PAGE_SIZE + 1 granules, ordered by
+    cumulus_granule_id, provider_id and collection_id.
 
     Args:
         engine: The sqlalchemy engine to use for contacting the database.
@@ -85,9 +163,18 @@ def query_db(
         start_timestamp: Cumulus createdAt start time for date range to compare data.
         end_timestamp: Cumulus createdAt end-time for date range to compare data.
         page_index: The 0-based index of the results page to return.
+            Counted from page_start, if given.
+        page_start: The last granule of the previous page, from decode_continuation_token.
+            If given, only granules after it are returned.
     """
+    if page_start is None:
+        page_start = {
+            "cumulus_granule_id": None,
+            "provider_id": None,
+            "collection_id": None,
+        }
     with engine.begin() as connection:
-        sql_results = connection.execute(
+        granule_rows = connection.execute(
             get_catalog_sql(),
             [
                 {
@@ -98,92 +185,200 @@ def query_db(
                     "end_timestamp": end_timestamp,
                     "page_index": page_index,
                     "page_size": PAGE_SIZE,
+                    "last_cumulus_granule_id": page_start["cumulus_granule_id"],
+                    "last_provider_id": page_start["provider_id"],
+                    "last_collection_id": page_start["collection_id"],
                 }
             ],
+        ).all()
+        files = get_files([granule_row.id for granule_row in granule_rows], connection)
+        return [
+            create_granule_dict(granule_row, files.get(granule_row.id, []))
+            for granule_row in granule_rows
+        ]
+
+
+def get_files(
+    granule_ids: List[int], connection: Connection
+) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Reads the files of the given granules in one query.
+
+    Args:
+        granule_ids: The internal ORCA ids of the granules.
+        connection: The connection to read the files with.
+
+    Returns:
+        The files of each granule in the format of schemas/output.json,
+        keyed by the granule's internal ORCA id. Granules without files are left out.
+    """
+    files = {}
+    if len(granule_ids) == 0:
+        return files
+    file_rows = connection.execute(get_files_sql(), [{"granule_ids": granule_ids}])
+    for (
+        granule_id,
+        name,
+        cumulus_archive_location,
+        orca_archive_location,
+        key_path,
+        size_in_bytes,
+        file_hash,
+        hash_type,
+        storage_class_id,
+        version,
+    ) in file_rows:
+        files.setdefault(granule_id, []).append(
+            {
+                "name": name,
+                "cumulusArchiveLocation": cumulus_archive_location,
+                "orcaArchiveLocation": orca_archive_location,
+                "keyPath": key_path,
+                "sizeBytes": size_in_bytes,
+                "hash": file_hash,
+                "hashType": hash_type,
+                "storageClass": get_storage_class_value(storage_class_id, connection),
+                "version": version,
+            }
         )
+    return files
 
-        granules = []
-        for sql_result in sql_results.mappings():
-            granules.append(
-                {
-                    "providerId": sql_result["provider_id"],
-                    "collectionId": sql_result["collection_id"],
-                    "id": sql_result["cumulus_granule_id"],
-                    "createdAt": sql_result["cumulus_create_time"],
-                    "executionId": sql_result["execution_id"],
-                    "ingestDate": sql_result["ingest_time"],
-                    "lastUpdate": sql_result["last_update"],
-                    "files": sql_result["files"],
-                }
+
+def get_storage_class_value(storage_class_id: int, connection: Connection) -> str:
+    """
+    Looks up the value of a storage_class id.
+    Values are read from the database once, and again only if an id is not found.
+
+    Args:
+        storage_class_id: The id of the storage class.
+        connection: The connection to read the storage_class table with.
+
+    Returns:
+        The value of the storage class, such as 'GLACIER'.
+    """
+    with _STORAGE_CLASS_VALUES_LOCK:
+        if storage_class_id not in _STORAGE_CLASS_VALUES:
+            LOGGER.debug("Loading storage class values.")
+            results = connection.execute(get_storage_classes_sql())
+            _STORAGE_CLASS_VALUES.clear()
+            _STORAGE_CLASS_VALUES.update(
+                {row["id"]: row["value"] for row in results.mappings()}
             )
-        return granules
+        storage_class = _STORAGE_CLASS_VALUES.get(storage_class_id, None)
+    if storage_class is None:
+        raise ValueError(f"Storage class id '{storage_class_id}' not found.")
+    return storage_class
+
+
+def create_granule_dict(
+    granule_row: Row, files: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Converts a row from get_catalog_sql to a granule in the format of schemas/output.json.
+
+    Args:
+        granule_row: The row.
+        files: The granule's files, from get_files.
+    """
+    return {
+        "providerId": granule_row.provider_id,
+        "collectionId": granule_row.collection_id,
+        "id": granule_row.cumulus_granule_id,
+        "createdAt": granule_row.cumulus_create_time,
+        "executionId": granule_row.execution_id,
+        "ingestDate": granule_row.ingest_time,
+        "lastUpdate": granule_row.last_update,
+        "files": files,
+    }
 
 
 def get_catalog_sql() -> text:  # pragma: no cover
+    """
+    Returns page_size + 1 granules, or every granule if page_size is null.
+    Files are read separately with get_files_sql.
+    """
     return text(
-        # todo: Optimize for large data sets. https://bugs.earthdata.nasa.gov/browse/ORCA-286
         """
 SELECT
-    *
-    FROM
-    (
+    granules.id,
+    granules.provider_id,
+    granules.collection_id,
+    granules.cumulus_granule_id,
+    (EXTRACT(EPOCH FROM date_trunc('milliseconds', granules.cumulus_create_time)
+     AT TIME ZONE 'UTC') * 1000)::bigint as cumulus_create_time,
+    granules.execution_id,
+    (EXTRACT(EPOCH FROM date_trunc('milliseconds', granules.ingest_time)
+     AT TIME ZONE 'UTC') * 1000)::bigint as ingest_time,
+    (EXTRACT(EPOCH FROM date_trunc('milliseconds', granules.last_update)
+     AT TIME ZONE 'UTC') * 1000)::bigint as last_update
+FROM
+    granules
+WHERE
+    -- Keyset pagination, starting after the last granule of the previous page.
+    -- Compared on the outer granules, so the sort order index can seek to it.
+    (:last_cumulus_granule_id is null or
+    (granules.cumulus_granule_id, granules.provider_id, granules.collection_id) >
+    (:last_cumulus_granule_id, :last_provider_id, :last_collection_id))
+    and
+    -- Every granule sharing a cumulus_granule_id with a matching granule.
+    -- A semi-join instead of joining a DISTINCT list of matching IDs,
+    -- so a page stops reading once it has page_size + 1 granules.
+    EXISTS (
     SELECT
-        *
-        FROM
-        (
-            SELECT
-                granules.id,
-                granules.provider_id,
-                granules.collection_id,
-                granules.cumulus_granule_id,
-                (EXTRACT(EPOCH FROM date_trunc('milliseconds', granules.cumulus_create_time)
-                 AT TIME ZONE 'UTC') * 1000)::bigint as cumulus_create_time,
-                granules.execution_id,
-                (EXTRACT(EPOCH FROM date_trunc('milliseconds', granules.ingest_time)
-                 AT TIME ZONE 'UTC') * 1000)::bigint as ingest_time,
-                (EXTRACT(EPOCH FROM date_trunc('milliseconds', granules.last_update)
-                 AT TIME ZONE 'UTC') * 1000)::bigint as last_update
-            FROM
-            (SELECT DISTINCT
-                granules.cumulus_granule_id
-            FROM granules
-            WHERE
-                (:provider_id is null or provider_id=ANY(:provider_id)) and
-                (:collection_id is null or collection_id=ANY(:collection_id)) and
-                (:granule_id is null or cumulus_granule_id=ANY(:granule_id)) and
-                (:start_timestamp is null or (EXTRACT(EPOCH
-                FROM date_trunc('milliseconds', cumulus_create_time)
-                AT TIME ZONE 'UTC') * 1000)::bigint>=:start_timestamp) and
-                (:end_timestamp is null or (EXTRACT(EPOCH
-                FROM date_trunc('milliseconds', cumulus_create_time)
-                AT TIME ZONE 'UTC') * 1000)::bigint<:end_timestamp)
-            ) as granule_ids
-            JOIN
-                granules ON granule_ids.cumulus_granule_id = granules.cumulus_granule_id
-        ) as granules
-    ORDER BY cumulus_granule_id, provider_id
-    OFFSET :page_index*:page_size
-    LIMIT :page_size+1
-) as granules
-LEFT JOIN LATERAL
-    (SELECT COALESCE(json_agg(files), '[]'::json) as files
-    FROM (
-    SELECT json_build_object(
-        'name', files.name,
-        'cumulusArchiveLocation', files.cumulus_archive_location,
-        'orcaArchiveLocation', files.orca_archive_location,
-        'keyPath', files.key_path,
-        'sizeBytes', files.size_in_bytes,
-        'hash', files.hash,
-        'hashType', files.hash_type,
-        'storageClass', storage_class.value,
-        'version', files.version) AS files
-    FROM files
-    JOIN
-        storage_class ON storage_class_id=storage_class.id
-    WHERE granules.id = files.granule_id
-    ) as files
-) as grouped on TRUE"""
+        1
+    FROM granules AS matching_granules
+    WHERE
+        matching_granules.cumulus_granule_id = granules.cumulus_granule_id and
+        (:provider_id is null or matching_granules.provider_id=ANY(:provider_id)) and
+        (:collection_id is null or matching_granules.collection_id=ANY(:collection_id)) and
+        (:granule_id is null or matching_granules.cumulus_granule_id=ANY(:granule_id)) and
+        -- Timestamps are converted instead of the column, so indexes can be used.
+        -- Same result as truncating the column to milliseconds,
+        -- as the timestamps are whole milliseconds.
+        (:start_timestamp is null or matching_granules.cumulus_create_time>=
+        TIMESTAMP WITH TIME ZONE 'epoch'
+        + CAST(:start_timestamp AS BIGINT) * INTERVAL '1 millisecond')
+        and
+        (:end_timestamp is null or matching_granules.cumulus_create_time<
+        TIMESTAMP WITH TIME ZONE 'epoch'
+        + CAST(:end_timestamp AS BIGINT) * INTERVAL '1 millisecond')
+    )
+-- collection_id breaks ties, as cumulus_granule_id is only unique within a collection.
+ORDER BY granules.cumulus_granule_id, granules.provider_id, granules.collection_id
+-- A null page_size removes both the OFFSET and the LIMIT.
+OFFSET :page_index*:page_size
+LIMIT :page_size+1"""
+    )
+
+
+def get_files_sql() -> text:  # pragma: no cover
+    return text(
+        """
+SELECT
+    granule_id,
+    name,
+    cumulus_archive_location,
+    orca_archive_location,
+    key_path,
+    size_in_bytes,
+    hash,
+    hash_type,
+    storage_class_id,
+    version
+FROM
+    files
+WHERE
+    granule_id = ANY(:granule_ids)"""
+    )
+
+
+def get_storage_classes_sql() -> text:  # pragma: no cover
+    return text(
+        """
+SELECT
+    id, value
+FROM
+    storage_class"""
     )
 
 
@@ -232,7 +427,8 @@ def handler(
     Returns:
         See schemas/output.json
         Or, if an error occurs, see create_http_error_dict
-            400 if input does not match schemas/input.json.
+            400 if input does not match schemas/input.json,
+                or continuationToken is invalid.
             500 if an error occurs when querying the database.
     """
     try:
@@ -253,6 +449,25 @@ def handler(
             LOGGER.error("DB_CONNECT_INFO_SECRET_ARN environment value not found.")
             raise
 
+        page_start = None
+        if "continuationToken" in event:
+            if "pageIndex" in event:
+                return create_http_error_dict(
+                    "BadRequest",
+                    HTTPStatus.BAD_REQUEST,
+                    context.aws_request_id,
+                    "pageIndex and continuationToken cannot be used together.",
+                )
+            try:
+                page_start = decode_continuation_token(event["continuationToken"])
+            except ValueError as value_error:
+                return create_http_error_dict(
+                    "BadRequest",
+                    HTTPStatus.BAD_REQUEST,
+                    context.aws_request_id,
+                    value_error.__str__(),
+                )
+
         db_connect_info = shared_db.get_configuration(db_connect_info_secret_arn)
 
         result = task(
@@ -261,7 +476,8 @@ def handler(
             event.get("granuleId", None),
             event.get("startTimestamp", None),
             event["endTimestamp"],
-            event["pageIndex"],
+            event.get("pageIndex", 0),
+            page_start,
             db_connect_info,
         )
         _OUTPUT_VALIDATE(result)
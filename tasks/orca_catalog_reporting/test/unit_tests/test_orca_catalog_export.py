@@ -0,0 +1,857 @@
+"""
+Name: test_orca_catalog_export.py
+
+Description:  Unit tests for orca_catalog_export.py.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import random
+import unittest
+import uuid
+from collections import namedtuple
+from unittest.mock import MagicMock, Mock, call, patch
+
+from botocore.exceptions import ClientError
+from fastjsonschema import JsonSchemaException
+
+import orca_catalog_export
+
+GranuleRow = namedtuple(
+    "GranuleRow",
+    [
+        "id",
+        "provider_id",
+        "collection_id",
+        "cumulus_granule_id",
+        "cumulus_create_time",
+        "execution_id",
+        "ingest_time",
+        "last_update",
+    ],
+)
+
+
+class TestOrcaCatalogExportUnit(
+    unittest.TestCase
+):  # pylint: disable-msg=too-many-instance-attributes
+    @staticmethod
+    def create_granule_row(granule_id: int) -> GranuleRow:
+        return GranuleRow(
+            id=granule_id,
+            provider_id=uuid.uuid4().__str__(),
+            collection_id=uuid.uuid4().__str__(),
+            cumulus_granule_id=uuid.uuid4().__str__(),
+            cumulus_create_time=random.randint(0, 628021800000),  # nosec
+            execution_id=uuid.uuid4().__str__(),
+            ingest_time=random.randint(0, 628021800000),  # nosec
+            last_update=random.randint(0, 628021800000),  # nosec
+        )
+
+    @staticmethod
+    def create_file() -> dict:
+        return {
+            "name": uuid.uuid4().__str__(),
+            "cumulusArchiveLocation": uuid.uuid4().__str__(),
+            "orcaArchiveLocation": uuid.uuid4().__str__(),
+            "keyPath": uuid.uuid4().__str__(),
+            "sizeBytes": random.randint(0, 999),  # nosec
+            "hash": uuid.uuid4().__str__(),
+            "hashType": uuid.uuid4().__str__(),
+            "storageClass": uuid.uuid4().__str__(),
+            "version": uuid.uuid4().__str__(),
+        }
+
+    @staticmethod
+    def create_s3_client() -> MagicMock:
+        """
+        Returns a client that keeps the body of each uploaded part in upload_part_bodies.
+        """
+        mock_s3_client = Mock()
+        mock_s3_client.upload_part_bodies = []
+
+        def upload_part(**kwargs):
+            mock_s3_client.upload_part_bodies.append(kwargs["Body"])
+            return {"ETag": f"etag{kwargs['PartNumber']}"}
+
+        mock_s3_client.upload_part.side_effect = upload_part
+        return mock_s3_client
+
+    @patch("orca_catalog_export.task")
+    @patch("orca_shared.database.shared_db.get_configuration")
+    @patch.dict(
+        os.environ,
+        {"DB_CONNECT_INFO_SECRET_ARN": "test", "EXPORT_BUCKET_NAME": "reports"},
+        clear=True,
+    )
+    def test_handler_happy_path(
+        self,
+        mock_get_configuration: MagicMock,
+        mock_task: MagicMock,
+    ):
+        """
+        Basic path with all information present.
+        Should call task with the request id as the export id.
+        """
+        provider_id = [uuid.uuid4().__str__()]
+        collection_id = [uuid.uuid4().__str__()]
+        granule_id = [uuid.uuid4().__str__()]
+        start_timestamp = random.randint(0, 628021800000)  # nosec
+        end_timestamp = random.randint(0, 628021800000)  # nosec
+        event = {
+            "providerId": provider_id,
+            "collectionId": collection_id,
+            "granuleId": granule_id,
+            "startTimestamp": start_timestamp,
+            "endTimestamp": end_timestamp,
+        }
+        context = Mock()
+        mock_task.return_value = {
+            "complete": True,
+            "manifestKey": "catalog_exports/abc/catalog_export.json",
+            "exportId": "abc",
+            "createdAt": random.randint(0, 628021800000),  # nosec
+            "filters": {
+                "providerId": provider_id,
+                "collectionId": collection_id,
+                "granuleId": granule_id,
+                "startTimestamp": start_timestamp,
+                "endTimestamp": end_timestamp,
+            },
+            "bucket": "reports",
+            "format": "ndjson",
+            "compression": "gzip",
+            "files": [
+                {
+                    "key": "catalog_exports/abc/catalog-00000.ndjson.gz",
+                    "granuleCount": 0,
+                    "fileCount": 0,
+                    "sizeBytes": 20,
+                    "sha256": uuid.uuid4().__str__(),
+                }
+            ],
+            "granuleCount": 0,
+            "fileCount": 0,
+        }
+
+        result = orca_catalog_export.handler(event, context)
+
+        mock_get_configuration.assert_called_once_with("test")
+        mock_task.assert_called_once_with(
+            provider_id,
+            collection_id,
+            granule_id,
+            start_timestamp,
+            end_timestamp,
+            "reports",
+            context.aws_request_id,
+            mock_get_configuration.return_value,
+            context.get_remaining_time_in_millis,
+        )
+        self.assertEqual(mock_task.return_value, result)
+
+    @patch("orca_catalog_export.task")
+    @patch("orca_shared.database.shared_db.get_configuration")
+    @patch.dict(
+        os.environ,
+        {"DB_CONNECT_INFO_SECRET_ARN": "test", "EXPORT_BUCKET_NAME": "reports"},
+        clear=True,
+    )
+    def test_handler_resumes_export(
+        self,
+        mock_get_configuration: MagicMock,
+        mock_task: MagicMock,
+    ):
+        """
+        An exportId should resume that export, ignoring any filters given.
+        """
+        context = Mock()
+        mock_task.return_value = {
+            "complete": False,
+            "manifestKey": None,
+            "exportId": "abc",
+            "createdAt": random.randint(0, 628021800000),  # nosec
+            "filters": {
+                "providerId": None,
+                "collectionId": None,
+                "granuleId": None,
+                "startTimestamp": None,
+                "endTimestamp": 628021800000,
+            },
+            "bucket": "reports",
+            "format": "ndjson",
+            "compression": "gzip",
+            "files": [],
+            "granuleCount": 0,
+            "fileCount": 0,
+        }
+
+        result = orca_catalog_export.handler(
+            {"exportId": "abc", "providerId": ["lpdaac"]}, context
+        )
+
+        mock_task.assert_called_once_with(
+            None,
+            None,
+            None,
+            None,
+            None,
+            "reports",
+            "abc",
+            mock_get_configuration.return_value,
+            context.get_remaining_time_in_millis,
+        )
+        self.assertEqual(mock_task.return_value, result)
+
+    @patch("orca_catalog_export.task")
+    @patch("orca_shared.database.shared_db.get_configuration")
+    @patch.dict(
+        os.environ,
+        {"DB_CONNECT_INFO_SECRET_ARN": "test", "EXPORT_BUCKET_NAME": "reports"},
+        clear=True,
+    )
+    def test_handler_missing_end_timestamp_raises_error(
+        self,
+        mock_get_configuration: MagicMock,
+        mock_task: MagicMock,
+    ):
+        with self.assertRaises(JsonSchemaException):
+            orca_catalog_export.handler({"providerId": ["lpdaac"]}, Mock())
+
+        mock_task.assert_not_called()
+
+    @patch("orca_catalog_export.task")
+    @patch("orca_shared.database.shared_db.get_configuration")
+    @patch.dict(
+        os.environ,
+        {"DB_CONNECT_INFO_SECRET_ARN": "test"},
+        clear=True,
+    )
+    def test_handler_missing_bucket_raises_error(
+        self,
+        mock_get_configuration: MagicMock,
+        mock_task: MagicMock,
+    ):
+        with self.assertRaises(KeyError):
+            orca_catalog_export.handler({"endTimestamp": 628021800000}, Mock())
+
+        mock_task.assert_not_called()
+
+    @staticmethod
+    def create_progress_client(progress: dict = None) -> MagicMock:
+        """
+        Returns a client whose get_object returns the given progress,
+        or raises NoSuchKey if it is None.
+        """
+        mock_s3_client = Mock()
+        if progress is None:
+            mock_s3_client.get_object.side_effect = ClientError(
+                {"Error": {"Code": "NoSuchKey"}}, "GetObject"
+            )
+        else:
+            mock_s3_client.get_object.return_value = {
+                "Body": Mock(read=Mock(return_value=json.dumps(progress).encode()))
+            }
+        return mock_s3_client
+
+    @staticmethod
+    def get_put_objects(mock_s3_client: MagicMock) -> dict:
+        """
+        Returns the json body of each put_object call by key.
+        """
+        put_objects = {}
+        for put_call in mock_s3_client.put_object.call_args_list:
+            put_objects[put_call.kwargs["Key"]] = json.loads(put_call.kwargs["Body"])
+        return put_objects
+
+    @patch("orca_catalog_export.export_catalog")
+    @patch("orca_catalog_export.boto3.client")
+    @patch("orca_shared.database.shared_db.get_user_connection")
+    def test_task_writes_manifest(
+        self,
+        mock_get_user_connection: MagicMock,
+        mock_client: MagicMock,
+        mock_export_catalog: MagicMock,
+    ):
+        """
+        If every granule fits in the first chunk, the manifest should be written
+        after it, with a name the S3 inventory notification ignores.
+        """
+        provider_id = [uuid.uuid4().__str__()]
+        end_timestamp = random.randint(0, 628021800000)  # nosec
+        db_connect_info = Mock()
+        mock_get_remaining_time_in_millis = Mock()
+        mock_client.return_value = self.create_progress_client()
+        mock_export_catalog.return_value = {
+            "granuleCount": 3,
+            "fileCount": 5,
+            "sizeBytes": 100,
+            "sha256": "abc123",
+            "complete": True,
+            "lastGranule": {
+                "cumulusGranuleId": "g3",
+                "providerId": "p",
+                "collectionId": "c",
+            },
+        }
+
+        result = orca_catalog_export.task(
+            provider_id,
+            None,
+            None,
+            None,
+            end_timestamp,
+            "reports",
+            "export1",
+            db_connect_info,
+            mock_get_remaining_time_in_millis,
+        )
+
+        mock_get_user_connection.assert_called_once_with(db_connect_info)
+        mock_client.assert_called_once_with("s3")
+        mock_client.return_value.get_object.assert_called_once_with(
+            Bucket="reports", Key="catalog_exports/export1/catalog_export_progress.json"
+        )
+        mock_export_catalog.assert_called_once_with(
+            mock_get_user_connection.return_value,
+            mock_client.return_value,
+            "reports",
+            "catalog_exports/export1/catalog-00000.ndjson.gz",
+            provider_id,
+            None,
+            None,
+            None,
+            end_timestamp,
+            None,
+            mock_get_remaining_time_in_millis,
+        )
+        manifest_key = "catalog_exports/export1/catalog_export.json"
+        self.assertFalse(manifest_key.endswith("manifest.json"))
+        # The manifest is written last.
+        self.assertEqual(
+            manifest_key, mock_client.return_value.put_object.call_args.kwargs["Key"]
+        )
+        put_objects = self.get_put_objects(mock_client.return_value)
+        manifest = put_objects[manifest_key]
+        self.assertEqual(
+            {"complete": True, "manifestKey": manifest_key, **manifest}, result
+        )
+        self.assertEqual(
+            {
+                "exportId": "export1",
+                "filters": {
+                    "providerId": provider_id,
+                    "collectionId": None,
+                    "granuleId": None,
+                    "startTimestamp": None,
+                    "endTimestamp": end_timestamp,
+                },
+                "bucket": "reports",
+                "format": "ndjson",
+                "compression": "gzip",
+                "files": [
+                    {
+                        "key": "catalog_exports/export1/catalog-00000.ndjson.gz",
+                        "granuleCount": 3,
+                        "fileCount": 5,
+                        "sizeBytes": 100,
+                        "sha256": "abc123",
+                    }
+                ],
+                "granuleCount": 3,
+                "fileCount": 5,
+            },
+            {key: value for key, value in manifest.items() if key != "createdAt"},
+        )
+        self.assertIsInstance(manifest["createdAt"], int)
+        self.assertEqual(
+            {**manifest, "lastGranule": None},
+            put_objects["catalog_exports/export1/catalog_export_progress.json"],
+        )
+
+    @patch("orca_catalog_export.export_catalog")
+    @patch("orca_catalog_export.boto3.client")
+    @patch("orca_shared.database.shared_db.get_user_connection")
+    def test_task_out_of_time_saves_progress(
+        self,
+        mock_get_user_connection: MagicMock,
+        mock_client: MagicMock,
+        mock_export_catalog: MagicMock,
+    ):
+        """
+        If the chunk stops early, the progress should be saved for the next invocation,
+        and no manifest written.
+        """
+        last_granule = {
+            "cumulusGranuleId": uuid.uuid4().__str__(),
+            "providerId": uuid.uuid4().__str__(),
+            "collectionId": uuid.uuid4().__str__(),
+        }
+        mock_client.return_value = self.create_progress_client()
+        mock_export_catalog.return_value = {
+            "granuleCount": 1000,
+            "fileCount": 2000,
+            "sizeBytes": 100,
+            "sha256": "abc123",
+            "complete": False,
+            "lastGranule": last_granule,
+        }
+
+        result = orca_catalog_export.task(
+            None,
+            None,
+            None,
+            None,
+            628021800000,
+            "reports",
+            "export1",
+            Mock(),
+            Mock(),
+        )
+
+        progress_key = "catalog_exports/export1/catalog_export_progress.json"
+        put_objects = self.get_put_objects(mock_client.return_value)
+        self.assertEqual([progress_key], list(put_objects.keys()))
+        self.assertEqual(last_granule, put_objects[progress_key]["lastGranule"])
+        self.assertEqual(
+            {
+                "complete": False,
+                "manifestKey": None,
+                **{
+                    key: value
+                    for key, value in put_objects[progress_key].items()
+                    if key != "lastGranule"
+                },
+            },
+            result,
+        )
+        self.assertEqual(1000, result["granuleCount"])
+
+    @patch("orca_catalog_export.export_catalog")
+    @patch("orca_catalog_export.boto3.client")
+    @patch("orca_shared.database.shared_db.get_user_connection")
+    def test_task_resumes_from_progress(
+        self,
+        mock_get_user_connection: MagicMock,
+        mock_client: MagicMock,
+        mock_export_catalog: MagicMock,
+    ):
+        """
+        A started export should continue after its last granule,
+        with the filters it was started with, into its next chunk.
+        """
+        filters = {
+            "providerId": [uuid.uuid4().__str__()],
+            "collectionId": None,
+            "granuleId": None,
+            "startTimestamp": 1,
+            "endTimestamp": 628021800000,
+        }
+        first_file = {
+            "key": "catalog_exports/export1/catalog-00000.ndjson.gz",
+            "granuleCount": 1000,
+            "fileCount": 2000,
+            "sizeBytes": 100,
+            "sha256": "abc123",
+        }
+        last_granule = {
+            "cumulusGranuleId": uuid.uuid4().__str__(),
+            "providerId": uuid.uuid4().__str__(),
+            "collectionId": uuid.uuid4().__str__(),
+        }
+        progress = {
+            "exportId": "export1",
+            "createdAt": 5,
+            "filters": filters,
+            "bucket": "reports",
+            "format": "ndjson",
+            "compression": "gzip",
+            "files": [first_file],
+            "granuleCount": 1000,
+            "fileCount": 2000,
+            "lastGranule": last_granule,
+        }
+        mock_get_remaining_time_in_millis = Mock()
+        mock_client.return_value = self.create_progress_client(progress)
+        mock_export_catalog.return_value = {
+            "granuleCount": 2,
+            "fileCount": 3,
+            "sizeBytes": 50,
+            "sha256": "def456",
+            "complete": True,
+            "lastGranule": None,
+        }
+
+        result = orca_catalog_export.task(
+            None,
+            None,
+            None,
+            None,
+            None,
+            "reports",
+            "export1",
+            Mock(),
+            mock_get_remaining_time_in_millis,
+        )
+
+        mock_export_catalog.assert_called_once_with(
+            mock_get_user_connection.return_value,
+            mock_client.return_value,
+            "reports",
+            "catalog_exports/export1/catalog-00001.ndjson.gz",
+            filters["providerId"],
+            None,
+            None,
+            1,
+            628021800000,
+            last_granule,
+            mock_get_remaining_time_in_millis,
+        )
+        self.assertEqual(
+            {
+                "complete": True,
+                "manifestKey": "catalog_exports/export1/catalog_export.json",
+                "exportId": "export1",
+                "createdAt": 5,
+                "filters": filters,
+                "bucket": "reports",
+                "format": "ndjson",
+                "compression": "gzip",
+                "files": [
+                    first_file,
+                    {
+                        "key": "catalog_exports/export1/catalog-00001.ndjson.gz",
+                        "granuleCount": 2,
+                        "fileCount": 3,
+                        "sizeBytes": 50,
+                        "sha256": "def456",
+                    },
+                ],
+                "granuleCount": 1002,
+                "fileCount": 2003,
+            },
+            result,
+        )
+
+    @patch("orca_catalog_export.export_catalog")
+    @patch("orca_catalog_export.boto3.client")
+    def test_task_complete_export_not_exported_again(
+        self,
+        mock_client: MagicMock,
+        mock_export_catalog: MagicMock,
+    ):
+        """
+        Invoking a complete export again should only rewrite its manifest.
+        """
+        progress = {
+            "exportId": "export1",
+            "createdAt": 5,
+            "filters": {
+                "providerId": None,
+                "collectionId": None,
+                "granuleId": None,
+                "startTimestamp": None,
+                "endTimestamp": 628021800000,
+            },
+            "bucket": "reports",
+            "format": "ndjson",
+            "compression": "gzip",
+            "files": [
+                {
+                    "key": "catalog_exports/export1/catalog-00000.ndjson.gz",
+                    "granuleCount": 0,
+                    "fileCount": 0,
+                    "sizeBytes": 20,
+                    "sha256": "abc123",
+                }
+            ],
+            "granuleCount": 0,
+            "fileCount": 0,
+            "lastGranule": None,
+        }
+        mock_client.return_value = self.create_progress_client(progress)
+
+        result = orca_catalog_export.task(
+            None, None, None, None, None, "reports", "export1", Mock(), Mock()
+        )
+
+        mock_export_catalog.assert_not_called()
+        put_objects = self.get_put_objects(mock_client.return_value)
+        self.assertEqual(
+            ["catalog_exports/export1/catalog_export.json"], list(put_objects.keys())
+        )
+        self.assertTrue(result["complete"])
+
+    @patch("orca_catalog_export.export_catalog")
+    @patch("orca_catalog_export.boto3.client")
+    def test_task_unknown_export_raises_error(
+        self,
+        mock_client: MagicMock,
+        mock_export_catalog: MagicMock,
+    ):
+        mock_client.return_value = self.create_progress_client()
+
+        with self.assertRaises(ValueError) as cm:
+            orca_catalog_export.task(
+                None, None, None, None, None, "reports", "export1", Mock(), Mock()
+            )
+
+        self.assertEqual("No export 'export1' to resume.", str(cm.exception))
+        mock_export_catalog.assert_not_called()
+        mock_client.return_value.put_object.assert_not_called()
+
+    @patch("orca_catalog_export.get_files")
+    @patch("orca_catalog_export.get_catalog_sql")
+    def test_export_catalog_streams_granules(
+        self, mock_get_catalog_sql: MagicMock, mock_get_files: MagicMock
+    ):
+        """
+        Rows from the server-side cursor should be written as gzipped json lines,
+        with the files of each batch read in one query,
+        and with the checksum and size of the uploaded object.
+        """
+        partitions = [
+            [self.create_granule_row(1), self.create_granule_row(2)],
+            [self.create_granule_row(3)],
+        ]
+        files = {1: [self.create_file(), self.create_file()], 3: [self.create_file()]}
+        mock_get_files.side_effect = lambda granule_ids, connection: {
+            granule_id: files[granule_id]
+            for granule_id in granule_ids
+            if granule_id in files
+        }
+        provider_id = [uuid.uuid4().__str__()]
+        collection_id = [uuid.uuid4().__str__()]
+        granule_id = [uuid.uuid4().__str__()]
+        start_timestamp = random.randint(0, 628021800000)  # nosec
+        end_timestamp = random.randint(0, 628021800000)  # nosec
+        mock_s3_client = self.create_s3_client()
+        mock_s3_client.create_multipart_upload.return_value = {"UploadId": "upload1"}
+        mock_connection = Mock()
+        mock_execute = mock_connection.execution_options.return_value.execute
+        mock_execute.return_value.partitions.return_value = partitions
+        mock_engine = Mock()
+        mock_engine.begin.return_value = MagicMock()
+        mock_engine.begin.return_value.__enter__.return_value = mock_connection
+
+        result = orca_catalog_export.export_catalog(
+            mock_engine,
+            mock_s3_client,
+            "reports",
+            "some/key",
+            provider_id,
+            collection_id,
+            granule_id,
+            start_timestamp,
+            end_timestamp,
+            None,
+            Mock(return_value=900000),
+        )
+
+        mock_connection.execution_options.assert_called_once_with(
+            yield_per=orca_catalog_export.EXPORT_BATCH_SIZE
+        )
+        mock_execute.assert_called_once_with(
+            mock_get_catalog_sql.return_value,
+            [
+                {
+                    "provider_id": provider_id,
+                    "collection_id": collection_id,
+                    "granule_id": granule_id,
+                    "start_timestamp": start_timestamp,
+                    "end_timestamp": end_timestamp,
+                    "page_index": 0,
+                    "page_size": None,
+                    "last_cumulus_granule_id": None,
+                    "last_provider_id": None,
+                    "last_collection_id": None,
+                }
+            ],
+        )
+        mock_get_files.assert_has_calls(
+            [call([1, 2], mock_connection), call([3], mock_connection)]
+        )
+        uploaded = b"".join(mock_s3_client.upload_part_bodies)
+        lines = gzip.decompress(uploaded).decode("utf8").splitlines()
+        self.assertEqual(
+            [
+                orca_catalog_export.create_granule_dict(row, files.get(row.id, []))
+                for partition in partitions
+                for row in partition
+            ],
+            [json.loads(line) for line in lines],
+        )
+        self.assertEqual(
+            {
+                "granuleCount": 3,
+                "fileCount": 3,
+                "sizeBytes": len(uploaded),
+                "sha256": hashlib.sha256(uploaded).hexdigest(),
+                "complete": True,
+                "lastGranule": {
+                    "cumulusGranuleId": partitions[1][0].cumulus_granule_id,
+                    "providerId": partitions[1][0].provider_id,
+                    "collectionId": partitions[1][0].collection_id,
+                },
+            },
+            result,
+        )
+        mock_s3_client.complete_multipart_upload.assert_called_once_with(
+            Bucket="reports",
+            Key="some/key",
+            UploadId="upload1",
+            MultipartUpload={"Parts": [{"ETag": "etag1", "PartNumber": 1}]},
+        )
+        mock_s3_client.abort_multipart_upload.assert_not_called()
+
+    @patch("orca_catalog_export.get_files")
+    @patch("orca_catalog_export.get_catalog_sql")
+    def test_export_catalog_stops_when_out_of_time(
+        self, mock_get_catalog_sql: MagicMock, mock_get_files: MagicMock
+    ):
+        """
+        The chunk should continue after last_granule, and be completed once
+        there is not enough time left for another batch.
+        """
+        partitions = [
+            [self.create_granule_row(1), self.create_granule_row(2)],
+            [self.create_granule_row(3)],
+        ]
+        mock_get_files.return_value = {}
+        last_granule = {
+            "cumulusGranuleId": uuid.uuid4().__str__(),
+            "providerId": uuid.uuid4().__str__(),
+            "collectionId": uuid.uuid4().__str__(),
+        }
+        mock_s3_client = self.create_s3_client()
+        mock_s3_client.create_multipart_upload.return_value = {"UploadId": "upload1"}
+        mock_connection = Mock()
+        mock_execute = mock_connection.execution_options.return_value.execute
+        mock_execute.return_value.partitions.return_value = iter(partitions)
+        mock_engine = Mock()
+        mock_engine.begin.return_value = MagicMock()
+        mock_engine.begin.return_value.__enter__.return_value = mock_connection
+        mock_get_remaining_time_in_millis = Mock(
+            return_value=orca_catalog_export.EXPORT_TIME_MARGIN_SECS * 1000 - 1
+        )
+
+        result = orca_catalog_export.export_catalog(
+            mock_engine,
+            mock_s3_client,
+            "reports",
+            "some/key",
+            None,
+            None,
+            None,
+            None,
+            628021800000,
+            last_granule,
+            mock_get_remaining_time_in_millis,
+        )
+
+        parameters = mock_execute.call_args.args[1][0]
+        self.assertEqual(
+            last_granule["cumulusGranuleId"], parameters["last_cumulus_granule_id"]
+        )
+        self.assertEqual(last_granule["providerId"], parameters["last_provider_id"])
+        self.assertEqual(last_granule["collectionId"], parameters["last_collection_id"])
+        mock_get_files.assert_called_once_with([1, 2], mock_connection)
+        uploaded = b"".join(mock_s3_client.upload_part_bodies)
+        self.assertEqual(2, len(gzip.decompress(uploaded).decode("utf8").splitlines()))
+        self.assertFalse(result["complete"])
+        self.assertEqual(2, result["granuleCount"])
+        self.assertEqual(
+            {
+                "cumulusGranuleId": partitions[0][1].cumulus_granule_id,
+                "providerId": partitions[0][1].provider_id,
+                "collectionId": partitions[0][1].collection_id,
+            },
+            result["lastGranule"],
+        )
+        mock_s3_client.complete_multipart_upload.assert_called_once()
+        mock_s3_client.abort_multipart_upload.assert_not_called()
+
+    @patch("orca_catalog_export.get_catalog_sql")
+    def test_export_catalog_error_aborts_upload(self, mock_get_catalog_sql: MagicMock):
+        """
+        If the export fails, the uploaded parts should be discarded.
+        """
+        expected_exception = Exception(uuid.uuid4().__str__())
+        mock_s3_client = self.create_s3_client()
+        mock_s3_client.create_multipart_upload.return_value = {"UploadId": "upload1"}
+        mock_engine = Mock()
+        mock_engine.begin.side_effect = expected_exception
+
+        with self.assertRaises(Exception) as cm:
+            orca_catalog_export.export_catalog(
+                mock_engine,
+                mock_s3_client,
+                "reports",
+                "some/key",
+                None,
+                None,
+                None,
+                None,
+                628021800000,
+                None,
+                Mock(return_value=900000),
+            )
+
+        self.assertEqual(expected_exception, cm.exception)
+        mock_s3_client.abort_multipart_upload.assert_called_once_with(
+            Bucket="reports", Key="some/key", UploadId="upload1"
+        )
+        mock_s3_client.complete_multipart_upload.assert_not_called()
+
+    def test_multipart_upload_writer_uploads_full_parts(self):
+        """
+        Parts should be uploaded as soon as they are full, with the rest on complete.
+        """
+        mock_s3_client = self.create_s3_client()
+        mock_s3_client.create_multipart_upload.return_value = {"UploadId": "upload1"}
+
+        writer = orca_catalog_export.MultipartUploadWriter(
+            mock_s3_client, "reports", "some/key", part_size_bytes=4
+        )
+        writer.write(b"abc")
+        writer.write(b"defgh")
+        writer.write(b"ij")
+        writer.complete()
+
+        mock_s3_client.create_multipart_upload.assert_called_once_with(
+            Bucket="reports", Key="some/key", ContentType="application/gzip"
+        )
+        self.assertEqual([b"abcdefgh", b"ij"], mock_s3_client.upload_part_bodies)
+        mock_s3_client.upload_part.assert_has_calls(
+            [
+                call(
+                    Bucket="reports",
+                    Key="some/key",
+                    UploadId="upload1",
+                    PartNumber=1,
+                    Body=b"abcdefgh",
+                ),
+                call(
+                    Bucket="reports",
+                    Key="some/key",
+                    UploadId="upload1",
+                    PartNumber=2,
+                    Body=b"ij",
+                ),
+            ]
+        )
+        mock_s3_client.complete_multipart_upload.assert_called_once_with(
+            Bucket="reports",
+            Key="some/key",
+            UploadId="upload1",
+            MultipartUpload={
+                "Parts": [
+                    {"ETag": "etag1", "PartNumber": 1},
+                    {"ETag": "etag2", "PartNumber": 2},
+                ]
+            },
+        )
+        self.assertEqual(10, writer.size_in_bytes)
+        self.assertEqual(hashlib.sha256(b"abcdefghij").hexdigest(), writer.sha256)
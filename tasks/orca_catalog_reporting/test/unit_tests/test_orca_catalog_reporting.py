@@ -4,19 +4,41 @@ Name: test_orca_catalog_reporting.py
 Description:  Unit tests for orca_catalog_reporting.py.
 """
 
+import base64
 import os
 import random
 import unittest
 import uuid
+from collections import namedtuple
 from http import HTTPStatus
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import MagicMock, Mock, call, patch
 
 import orca_catalog_reporting
 
+GranuleRow = namedtuple(
+    "GranuleRow",
+    [
+        "id",
+        "provider_id",
+        "collection_id",
+        "cumulus_granule_id",
+        "cumulus_create_time",
+        "execution_id",
+        "ingest_time",
+        "last_update",
+    ],
+)
+
 
 class TestOrcaCatalogReportingUnit(
     unittest.TestCase
 ):  # pylint: disable-msg=too-many-instance-attributes
+    def setUp(self):
+        orca_catalog_reporting._STORAGE_CLASS_VALUES.clear()
+
+    def tearDown(self):
+        orca_catalog_reporting._STORAGE_CLASS_VALUES.clear()
+
     @patch("orca_catalog_reporting.task")
     @patch("orca_shared.database.shared_db.get_configuration")
     @patch.dict(
@@ -86,6 +108,7 @@ class TestOrcaCatalogReportingUnit(
             start_timestamp,
             end_timestamp,
             page_index,
+            None,
             mock_get_configuration.return_value,
         )
         self.assertEqual(mock_task.return_value, result)
@@ -121,10 +144,140 @@ class TestOrcaCatalogReportingUnit(
             None,
             end_timestamp,
             page_index,
+            None,
+            mock_get_configuration.return_value,
+        )
+        self.assertEqual(mock_task.return_value, result)
+
+    @patch("orca_catalog_reporting.task")
+    @patch("orca_shared.database.shared_db.get_configuration")
+    @patch.dict(
+        os.environ,
+        {"DB_CONNECT_INFO_SECRET_ARN": "test"},
+        clear=True,
+    )
+    def test_handler_missing_page_index_uses_first_page(
+        self,
+        mock_get_configuration: MagicMock,
+        mock_task: MagicMock,
+    ):
+        """
+        Without pageIndex or continuationToken, the first page should be returned.
+        """
+        end_timestamp = random.randint(0, 628021800000)  # nosec
+
+        event = {"endTimestamp": end_timestamp}
+        context = Mock()
+        mock_task.return_value = {
+            "anotherPage": False,
+            "continuationToken": None,
+            "granules": [],
+        }
+
+        result = orca_catalog_reporting.handler(event, context)
+
+        mock_task.assert_called_once_with(
+            None,
+            None,
+            None,
+            None,
+            end_timestamp,
+            0,
+            None,
             mock_get_configuration.return_value,
         )
         self.assertEqual(mock_task.return_value, result)
 
+    @patch("orca_catalog_reporting.decode_continuation_token")
+    @patch("orca_catalog_reporting.task")
+    @patch("orca_shared.database.shared_db.get_configuration")
+    @patch.dict(
+        os.environ,
+        {"DB_CONNECT_INFO_SECRET_ARN": "test"},
+        clear=True,
+    )
+    def test_handler_continuation_token_passes_page_start(
+        self,
+        mock_get_configuration: MagicMock,
+        mock_task: MagicMock,
+        mock_decode_continuation_token: MagicMock,
+    ):
+        """
+        A continuationToken should be decoded and passed to task as the page start.
+        """
+        continuation_token = uuid.uuid4().__str__()
+        end_timestamp = random.randint(0, 628021800000)  # nosec
+
+        event = {"continuationToken": continuation_token, "endTimestamp": end_timestamp}
+        context = Mock()
+        mock_task.return_value = {
+            "anotherPage": False,
+            "continuationToken": None,
+            "granules": [],
+        }
+
+        result = orca_catalog_reporting.handler(event, context)
+
+        mock_decode_continuation_token.assert_called_once_with(continuation_token)
+        mock_task.assert_called_once_with(
+            None,
+            None,
+            None,
+            None,
+            end_timestamp,
+            0,
+            mock_decode_continuation_token.return_value,
+            mock_get_configuration.return_value,
+        )
+        self.assertEqual(mock_task.return_value, result)
+
+    @patch("orca_catalog_reporting.create_http_error_dict")
+    @patch("orca_catalog_reporting.task")
+    @patch("orca_shared.database.shared_db.get_configuration")
+    @patch.dict(
+        os.environ,
+        {"DB_CONNECT_INFO_SECRET_ARN": "test"},
+        clear=True,
+    )
+    def test_handler_bad_continuation_token_returns_error(
+        self,
+        mock_get_configuration: MagicMock,
+        mock_task: MagicMock,
+        mock_create_http_error_dict: MagicMock,
+    ):
+        """
+        Tokens that were not returned by a previous page,
+        or that are used with pageIndex, should be rejected.
+        """
+        valid_token = orca_catalog_reporting.encode_continuation_token(
+            {"id": "a", "providerId": "b", "collectionId": "c"}
+        )
+        for event, message in [
+            (
+                {"continuationToken": "not a token", "endTimestamp": 1},
+                "Invalid continuationToken 'not a token'.",
+            ),
+            (
+                {"continuationToken": valid_token, "pageIndex": 0, "endTimestamp": 1},
+                "pageIndex and continuationToken cannot be used together.",
+            ),
+        ]:
+            with self.subTest(event=event):
+                context = Mock()
+
+                result = orca_catalog_reporting.handler(event, context)
+
+                mock_create_http_error_dict.assert_called_once_with(
+                    "BadRequest",
+                    HTTPStatus.BAD_REQUEST,
+                    context.aws_request_id,
+                    message,
+                )
+                self.assertEqual(mock_create_http_error_dict.return_value, result)
+                mock_task.assert_not_called()
+                mock_get_configuration.assert_not_called()
+            mock_create_http_error_dict.reset_mock()
+
     @patch("orca_catalog_reporting.create_http_error_dict")
     @patch("orca_shared.database.shared_db.get_configuration")
     @patch.dict(
@@ -195,7 +348,7 @@ class TestOrcaCatalogReportingUnit(
             "BadRequest",
             HTTPStatus.BAD_REQUEST,
             context.aws_request_id,
-            "data must contain ['pageIndex', 'endTimestamp'] properties",
+            "data must contain ['endTimestamp'] properties",
         )
         self.assertEqual(mock_create_http_error_dict.return_value, result)
 
@@ -276,6 +429,7 @@ class TestOrcaCatalogReportingUnit(
         start_timestamp = Mock()
         end_timestamp = Mock()
         page_index = Mock()
+        page_start = Mock()
         db_connect_info = Mock()
 
         granules = []
@@ -290,6 +444,7 @@ class TestOrcaCatalogReportingUnit(
             start_timestamp,
             end_timestamp,
             page_index,
+            page_start,
             db_connect_info,
         )
 
@@ -302,8 +457,12 @@ class TestOrcaCatalogReportingUnit(
             start_timestamp,
             end_timestamp,
             page_index,
+            page_start,
+        )
+        self.assertEqual(
+            {"anotherPage": False, "continuationToken": None, "granules": granules},
+            result,
         )
-        self.assertEqual({"anotherPage": False, "granules": granules}, result)
 
     @patch("orca_catalog_reporting.query_db")
     @patch("orca_shared.database.shared_db.get_user_connection")
@@ -320,11 +479,18 @@ class TestOrcaCatalogReportingUnit(
         start_timestamp = Mock()
         end_timestamp = Mock()
         page_index = Mock()
+        page_start = Mock()
         db_connect_info = Mock()
 
         granules = []
         for i in range(orca_catalog_reporting.PAGE_SIZE + 1):
-            granules.append(Mock)
+            granules.append(
+                {
+                    "id": uuid.uuid4().__str__(),
+                    "providerId": uuid.uuid4().__str__(),
+                    "collectionId": uuid.uuid4().__str__(),
+                }
+            )
         mock_query_db.return_value = granules
 
         result = orca_catalog_reporting.task(
@@ -334,6 +500,7 @@ class TestOrcaCatalogReportingUnit(
             start_timestamp,
             end_timestamp,
             page_index,
+            page_start,
             db_connect_info,
         )
 
@@ -346,19 +513,73 @@ class TestOrcaCatalogReportingUnit(
             start_timestamp,
             end_timestamp,
             page_index,
+            page_start,
         )
         self.assertEqual(
             {
                 "anotherPage": True,
+                "continuationToken": orca_catalog_reporting.encode_continuation_token(
+                    granules[orca_catalog_reporting.PAGE_SIZE - 1]
+                ),
                 "granules": granules[0 : orca_catalog_reporting.PAGE_SIZE],  # noqa: 203
             },
             result,
         )
 
+    def test_continuation_token_round_trip(self):
+        """
+        A token should decode to the sort key of the granule it was created from.
+        """
+        granule = {
+            "providerId": uuid.uuid4().__str__(),
+            "collectionId": uuid.uuid4().__str__(),
+            "id": "granule/with+characters?that=need&escaping~~~",
+            "createdAt": random.randint(0, 628021800000),  # nosec
+        }
+
+        token = orca_catalog_reporting.encode_continuation_token(granule)
+        result = orca_catalog_reporting.decode_continuation_token(token)
+
+        self.assertEqual(
+            {
+                "cumulus_granule_id": granule["id"],
+                "provider_id": granule["providerId"],
+                "collection_id": granule["collectionId"],
+            },
+            result,
+        )
+        self.assertNotIn("/", token)
+        self.assertNotIn("+", token)
+
+    def test_decode_continuation_token_invalid_raises_error(self):
+        """
+        Anything not created by encode_continuation_token should raise a ValueError.
+        """
+        for token in [
+            "",
+            "not a token",
+            base64.urlsafe_b64encode(b"not json").decode("utf8"),
+            base64.urlsafe_b64encode(b"[1, 2]").decode("utf8"),
+            base64.urlsafe_b64encode(b'{"id": "a", "providerId": "b"}').decode("utf8"),
+            base64.urlsafe_b64encode(
+                b'{"id": 1, "providerId": "b", "collectionId": "c"}'
+            ).decode("utf8"),
+            base64.urlsafe_b64encode(b"\xff").decode("utf8"),
+        ]:
+            with self.subTest(token=token):
+                with self.assertRaises(ValueError) as context:
+                    orca_catalog_reporting.decode_continuation_token(token)
+                self.assertEqual(
+                    f"Invalid continuationToken '{token}'.", str(context.exception)
+                )
+
+    @patch("orca_catalog_reporting.get_files")
     @patch("orca_catalog_reporting.get_catalog_sql")
-    def test_query_db_happy_path(self, mock_get_catalog_sql: MagicMock):
+    def test_query_db_happy_path(
+        self, mock_get_catalog_sql: MagicMock, mock_get_files: MagicMock
+    ):
         """
-        Should query the db, then format the returned data.
+        Should query the db for granules, then their files, then format the returned data.
         """
         provider_id = Mock()
         collection_id = Mock()
@@ -366,32 +587,39 @@ class TestOrcaCatalogReportingUnit(
         start_timestamp = Mock()
         end_timestamp = Mock()
         page_index = Mock()
-
-        returned_provider_id = Mock()
-        returned_collection_id = Mock()
-        returned_granule_id = Mock()
-        returned_created_at = random.randint(0, 628021800000)  # nosec
-        returned_execution_id = Mock()
-        returned_ingest_time = random.randint(0, 628021800000)  # nosec
-        returned_last_update = random.randint(0, 628021800000)  # nosec
-        returned_files = Mock()
-
-        returned_row0 = {
-            "provider_id": returned_provider_id,
-            "collection_id": returned_collection_id,
-            "cumulus_granule_id": returned_granule_id,
-            "cumulus_create_time": returned_created_at,
-            "execution_id": returned_execution_id,
-            "ingest_time": returned_ingest_time,
-            "last_update": returned_last_update,
-            "files": returned_files,
+        page_start = {
+            "cumulus_granule_id": uuid.uuid4().__str__(),
+            "provider_id": uuid.uuid4().__str__(),
+            "collection_id": uuid.uuid4().__str__(),
         }
+
+        returned_row0 = GranuleRow(
+            id=random.randint(0, 999),  # nosec
+            provider_id=Mock(),
+            collection_id=Mock(),
+            cumulus_granule_id=Mock(),
+            cumulus_create_time=random.randint(0, 628021800000),  # nosec
+            execution_id=Mock(),
+            ingest_time=random.randint(0, 628021800000),  # nosec
+            last_update=random.randint(0, 628021800000),  # nosec
+        )
+        returned_row1 = GranuleRow(
+            id=returned_row0.id + 1,
+            provider_id=Mock(),
+            collection_id=Mock(),
+            cumulus_granule_id=Mock(),
+            cumulus_create_time=random.randint(0, 628021800000),  # nosec
+            execution_id=Mock(),
+            ingest_time=random.randint(0, 628021800000),  # nosec
+            last_update=random.randint(0, 628021800000),  # nosec
+        )
+        returned_files = [Mock()]
+        mock_get_files.return_value = {returned_row0.id: returned_files}
         mock_execute_result = Mock()
-        mock_execute_result.mappings = Mock(return_value=[returned_row0])
+        mock_execute_result.all = Mock(return_value=[returned_row0, returned_row1])
         mock_execute = Mock()
         mock_execute.return_value = mock_execute_result
         mock_connection = Mock()
-        mock_connection = Mock()
         mock_connection.execute = mock_execute
         mock_exit = Mock(return_value=False)
         mock_enter = Mock()
@@ -408,6 +636,7 @@ class TestOrcaCatalogReportingUnit(
             start_timestamp,
             end_timestamp,
             page_index,
+            page_start,
         )
 
         mock_enter.__enter__.assert_called_once_with()
@@ -422,28 +651,212 @@ class TestOrcaCatalogReportingUnit(
                     "end_timestamp": end_timestamp,
                     "page_index": page_index,
                     "page_size": orca_catalog_reporting.PAGE_SIZE,
+                    "last_cumulus_granule_id": page_start["cumulus_granule_id"],
+                    "last_provider_id": page_start["provider_id"],
+                    "last_collection_id": page_start["collection_id"],
                 }
             ],
         )
-        mock_execute_result.mappings.assert_called_once_with()
+        mock_execute_result.all.assert_called_once_with()
+        mock_get_files.assert_called_once_with(
+            [returned_row0.id, returned_row1.id], mock_connection
+        )
         mock_exit.assert_called_once_with(None, None, None)
         mock_get_catalog_sql.assert_called_once_with()
         self.assertEqual(
             [
                 {
-                    "providerId": returned_provider_id,
-                    "collectionId": returned_collection_id,
-                    "id": returned_granule_id,
-                    "createdAt": returned_created_at,
-                    "executionId": returned_execution_id,
-                    "ingestDate": returned_ingest_time,
-                    "lastUpdate": returned_last_update,
+                    "providerId": returned_row0.provider_id,
+                    "collectionId": returned_row0.collection_id,
+                    "id": returned_row0.cumulus_granule_id,
+                    "createdAt": returned_row0.cumulus_create_time,
+                    "executionId": returned_row0.execution_id,
+                    "ingestDate": returned_row0.ingest_time,
+                    "lastUpdate": returned_row0.last_update,
                     "files": returned_files,
+                },
+                {
+                    "providerId": returned_row1.provider_id,
+                    "collectionId": returned_row1.collection_id,
+                    "id": returned_row1.cumulus_granule_id,
+                    "createdAt": returned_row1.cumulus_create_time,
+                    "executionId": returned_row1.execution_id,
+                    "ingestDate": returned_row1.ingest_time,
+                    "lastUpdate": returned_row1.last_update,
+                    "files": [],
+                },
+            ],
+            result,
+        )
+
+    @patch("orca_catalog_reporting.get_catalog_sql")
+    def test_query_db_no_page_start(self, mock_get_catalog_sql: MagicMock):
+        """
+        Without a page start, the keyset parameters should be null.
+        With no granules, files should not be queried.
+        """
+        page_index = random.randint(0, 999)  # nosec
+        mock_engine = Mock()
+        mock_connection = Mock()
+        mock_connection.execute.return_value.all.return_value = []
+        mock_engine.begin.return_value.__enter__ = Mock(return_value=mock_connection)
+        mock_engine.begin.return_value.__exit__ = Mock(return_value=False)
+
+        result = orca_catalog_reporting.query_db(
+            mock_engine, None, None, None, None, 1, page_index, None
+        )
+
+        mock_connection.execute.assert_called_once_with(
+            mock_get_catalog_sql.return_value,
+            [
+                {
+                    "provider_id": None,
+                    "collection_id": None,
+                    "granule_id": None,
+                    "start_timestamp": None,
+                    "end_timestamp": 1,
+                    "page_index": page_index,
+                    "page_size": orca_catalog_reporting.PAGE_SIZE,
+                    "last_cumulus_granule_id": None,
+                    "last_provider_id": None,
+                    "last_collection_id": None,
                 }
             ],
+        )
+        self.assertEqual([], result)
+
+    @patch("orca_catalog_reporting.get_storage_classes_sql")
+    @patch("orca_catalog_reporting.get_files_sql")
+    def test_get_files_groups_files_by_granule(
+        self, mock_get_files_sql: MagicMock, mock_get_storage_classes_sql: MagicMock
+    ):
+        """
+        Files should be read in one query, and grouped under their granule's id.
+        """
+        file_rows = [
+            (1, "a.h5", "cumulus", "orca", "k/a.h5", 10, "h1", "md5", 1, "v1"),
+            (2, "b.h5", "cumulus", "orca", "k/b.h5", 20, None, None, 2, "v2"),
+            (1, "c.h5", "cumulus", "orca", "k/c.h5", 30, "h3", "md5", 1, "v3"),
+        ]
+        storage_class_rows = [
+            {"id": 1, "value": "GLACIER"},
+            {"id": 2, "value": "DEEP_ARCHIVE"},
+        ]
+        mock_connection = Mock()
+
+        def execute(sql, parameters=None):
+            if sql == mock_get_files_sql.return_value:
+                return file_rows
+            mock_result = Mock()
+            mock_result.mappings.return_value = storage_class_rows
+            return mock_result
+
+        mock_connection.execute.side_effect = execute
+
+        result = orca_catalog_reporting.get_files([1, 2, 3], mock_connection)
+
+        mock_connection.execute.assert_has_calls(
+            [
+                call(mock_get_files_sql.return_value, [{"granule_ids": [1, 2, 3]}]),
+                call(mock_get_storage_classes_sql.return_value),
+            ]
+        )
+        self.assertEqual(2, mock_connection.execute.call_count)
+        self.assertEqual(
+            {
+                1: [
+                    {
+                        "name": "a.h5",
+                        "cumulusArchiveLocation": "cumulus",
+                        "orcaArchiveLocation": "orca",
+                        "keyPath": "k/a.h5",
+                        "sizeBytes": 10,
+                        "hash": "h1",
+                        "hashType": "md5",
+                        "storageClass": "GLACIER",
+                        "version": "v1",
+                    },
+                    {
+                        "name": "c.h5",
+                        "cumulusArchiveLocation": "cumulus",
+                        "orcaArchiveLocation": "orca",
+                        "keyPath": "k/c.h5",
+                        "sizeBytes": 30,
+                        "hash": "h3",
+                        "hashType": "md5",
+                        "storageClass": "GLACIER",
+                        "version": "v3",
+                    },
+                ],
+                2: [
+                    {
+                        "name": "b.h5",
+                        "cumulusArchiveLocation": "cumulus",
+                        "orcaArchiveLocation": "orca",
+                        "keyPath": "k/b.h5",
+                        "sizeBytes": 20,
+                        "hash": None,
+                        "hashType": None,
+                        "storageClass": "DEEP_ARCHIVE",
+                        "version": "v2",
+                    }
+                ],
+            },
             result,
         )
 
+    def test_get_files_no_granules(self):
+        mock_connection = Mock()
+
+        result = orca_catalog_reporting.get_files([], mock_connection)
+
+        self.assertEqual({}, result)
+        mock_connection.execute.assert_not_called()
+
+    @patch("orca_catalog_reporting.get_storage_classes_sql")
+    def test_get_storage_class_value_cached(
+        self, mock_get_storage_classes_sql: MagicMock
+    ):
+        """
+        Storage class values should only be read from the database once.
+        """
+        mock_connection = Mock()
+        mock_connection.execute.return_value.mappings.return_value = [
+            {"id": 1, "value": "GLACIER"},
+            {"id": 2, "value": "DEEP_ARCHIVE"},
+        ]
+
+        result0 = orca_catalog_reporting.get_storage_class_value(1, mock_connection)
+        result1 = orca_catalog_reporting.get_storage_class_value(2, mock_connection)
+        result2 = orca_catalog_reporting.get_storage_class_value(1, mock_connection)
+
+        self.assertEqual(
+            ["GLACIER", "DEEP_ARCHIVE", "GLACIER"], [result0, result1, result2]
+        )
+        mock_connection.execute.assert_called_once_with(
+            mock_get_storage_classes_sql.return_value
+        )
+
+    @patch("orca_catalog_reporting.get_storage_classes_sql")
+    def test_get_storage_class_value_unknown_id_raises_error(
+        self, mock_get_storage_classes_sql: MagicMock
+    ):
+        """
+        An id missing from the cache should be looked up again before failing.
+        """
+        orca_catalog_reporting._STORAGE_CLASS_VALUES[1] = "GLACIER"
+        mock_connection = Mock()
+        mock_connection.execute.return_value.mappings.return_value = [
+            {"id": 1, "value": "GLACIER"},
+        ]
+
+        with self.assertRaises(ValueError):
+            orca_catalog_reporting.get_storage_class_value(2, mock_connection)
+
+        mock_connection.execute.assert_called_once_with(
+            mock_get_storage_classes_sql.return_value
+        )
+
     @patch("orca_catalog_reporting.LOGGER.error")
     def test_create_http_error_dict_happy_path(self, mock_error: MagicMock):
         error_type = uuid.uuid4().__str__()
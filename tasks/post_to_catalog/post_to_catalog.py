@@ -6,7 +6,9 @@ Description:  Pulls entries from a queue and posts them to a DB.
 
 import json
 import os
-from typing import Any, Dict, List, Union
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple, Union
 
 # noinspection SpellCheckingInspection
 import fastjsonschema as fastjsonschema
@@ -15,7 +17,7 @@ from aws_lambda_powertools.utilities.typing import LambdaContext
 from orca_shared.database import shared_db
 from orca_shared.database.shared_db import retry_operational_error
 from sqlalchemy import text
-from sqlalchemy.future import Engine
+from sqlalchemy.future import Connection, Engine
 
 # Set AWS powertools logger
 LOGGER = Logger()
@@ -28,135 +30,201 @@ except Exception as ex:
     LOGGER.error("Could not build schema validator: {ex}", ex=ex)
     raise
 
+# Columns of the VALUES list used to insert granules in bulk.
+GRANULE_COLUMNS = [
+    "provider_id",
+    "collection_id",
+    "cumulus_granule_id",
+    "execution_id",
+    "ingest_time",
+    "cumulus_create_time",
+    "last_update",
+]
+
+# storage_class values mapped to their ids. Rarely changes, so kept between invocations.
+_STORAGE_CLASS_IDS: Dict[str, int] = {}
+_STORAGE_CLASS_IDS_LOCK = threading.Lock()
+
+
+@dataclass
+class CatalogBatch:
+    """
+    The catalog entries from a batch of records,
+    deduplicated so that they can be written in a single transaction.
+    Attributes:
+        providers: The providers to upsert, keyed by provider_id.
+        collections: The collections to upsert, keyed by collection_id.
+        granules: The granules to upsert, keyed by collection_id and cumulus_granule_id.
+            If a granule is received more than once, its provider_id, execution_id
+            and last_update come from the last record, as they would if upserted in turn.
+        files: The files to upsert, keyed by cumulus_archive_location and key_path.
+            Each file refers to its granule by the granule's key.
+            Only the last record received for a file is kept.
+    """
+
+    providers: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    collections: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    granules: Dict[Tuple[str, str], Dict[str, Any]] = field(default_factory=dict)
+    files: Dict[Tuple[str, str], Tuple[Tuple[str, str], Dict[str, Any]]] = field(
+        default_factory=dict
+    )
+
 
 def task(records: List[Dict[str, Any]], db_connect_info: Dict) -> None:
     """
-    Sends each individual record to send_record_to_database.
+    Adds each record to a CatalogBatch, then writes the batch to the database.
 
     Args:
-        records: A list of Dicts. See send_record_to_database for schema info.
+        records: A list of Dicts. See add_record_to_batch for schema info.
         db_connect_info: See shared_db.py's get_configuration for further details.
     """
     engine = shared_db.get_user_connection(db_connect_info)
+    batch = CatalogBatch()
     for record in records:
-        send_record_to_database(record, engine)
-        # Not deleting from active queue due to FIFO not requiring it.
+        add_record_to_batch(record, batch)
+    write_batch_to_database(batch, engine)
+    # Not deleting from active queue due to FIFO not requiring it.
 
 
-def send_record_to_database(record: Dict[str, Any], engine: Engine) -> None:
+def add_record_to_batch(record: Dict[str, Any], batch: CatalogBatch) -> None:
     """
-    Deconstructs a record to its components and calls create_catalog_records with the result.
+    Deconstructs a record to its components and calls add_catalog_records_to_batch
+    with the result.
 
     Args:
         record: Contains the following keys:
             'body' (str): A json string representing a dict.
                 Contains key/value pairs of column names and values for those columns.
                 Must match catalog_record_input.json.
-        engine: The sqlalchemy engine to use for contacting the database.
+        batch: The batch to add the catalog entries to.
     """
     values = json.loads(record["body"])
     _CATALOG_RECORD_VALIDATE(values)
-    create_catalog_records(
+    add_catalog_records_to_batch(
         values["provider"],
         values["collection"],
         values["granule"],
-        engine,
+        batch,
     )
 
 
-@retry_operational_error()
-def create_catalog_records(
+def add_catalog_records_to_batch(
     provider: Dict[str, str],
     collection: Dict[str, str],
     granule: Dict[str, Union[str, List[Dict[str, Union[str, int]]]]],
-    engine: Engine,
+    batch: CatalogBatch,
 ) -> None:
     """
-    Posts the information to the catalog database.
+    Adds the provider, collection, granule and files of a record to the batch.
 
     Args:
         provider: See schemas/catalog_record_input.json.
         collection: See schemas/catalog_record_input.json.
         granule: See schemas/catalog_record_input.json.
+        batch: The batch to add the catalog entries to.
+    """
+    batch.providers.setdefault(
+        provider["providerId"],
+        {
+            "provider_id": provider["providerId"],
+            "name": provider["name"],
+        },
+    )
+    batch.collections.setdefault(
+        collection["collectionId"],
+        {
+            "collection_id": collection["collectionId"],
+            "shortname": collection["shortname"],
+            "version": collection["version"],
+        },
+    )
+
+    granule_key = (collection["collectionId"], granule["cumulusGranuleId"])
+    granule_parameters = batch.granules.setdefault(
+        granule_key,
+        {
+            "provider_id": provider["providerId"],
+            "collection_id": collection["collectionId"],
+            "cumulus_granule_id": granule["cumulusGranuleId"],
+            "execution_id": granule["executionId"],
+            "ingest_time": granule["ingestTime"],
+            "cumulus_create_time": granule["cumulusCreateTime"],
+            "last_update": granule["lastUpdate"],
+        },
+    )
+    # Matches the columns set by create_granules_sql on conflict.
+    granule_parameters["provider_id"] = provider["providerId"]
+    granule_parameters["execution_id"] = granule["executionId"]
+    granule_parameters["last_update"] = granule["lastUpdate"]
+
+    for file in granule["files"]:
+        LOGGER.debug(
+            "Queueing file record '{cumulus_archive_location}'",
+            cumulus_archive_location=file["cumulusArchiveLocation"],
+        )
+        batch.files[(file["cumulusArchiveLocation"], file["keyPath"])] = (
+            granule_key,
+            {
+                "name": file["name"],
+                "cumulus_archive_location": file["cumulusArchiveLocation"],
+                "orca_archive_location": file["orcaArchiveLocation"],
+                "key_path": file["keyPath"],
+                "size_in_bytes": file["sizeInBytes"],
+                "hash": file.get("hash", None),
+                "hash_type": file.get("hashType", None),
+                "storage_class": file.get("storageClass"),
+                "version": file["version"],
+                "ingest_time": file["ingestTime"],
+                "etag": file["etag"],
+            },
+        )
+
+
+@retry_operational_error()
+def write_batch_to_database(batch: CatalogBatch, engine: Engine) -> None:
+    """
+    Posts all catalog entries in the batch to the catalog database in one transaction.
+    Providers and collections are upserted once each, granules with a single
+    multi-row INSERT, and files with one executemany.
+
+    Args:
+        batch: The catalog entries to write.
         engine: The sqlalchemy engine to use for contacting the database.
     """
+    if len(batch.granules) == 0:
+        return
+    granules = list(batch.granules.values())
     try:
-        LOGGER.debug("Creating catalog records.")
-        # Could theoretically use same connection for multiple records.
-        # Would extend connection time. Serverless may throw a fit under specific circumstances.
+        LOGGER.debug(
+            f"Creating {len(batch.providers)} provider(s), "
+            f"{len(batch.collections)} collection(s), {len(granules)} granule(s) "
+            f"and {len(batch.files)} file(s)."
+        )
         with engine.begin() as connection:
-            LOGGER.debug(
-                "Creating provider record '{providerId}'",
-                providerId=provider["providerId"],
-            )
-            connection.execute(
-                create_provider_sql(),
-                [
-                    {
-                        "provider_id": provider["providerId"],
-                        "name": provider["name"],
-                    }
-                ],
-            )
-            LOGGER.debug(
-                "Creating collection record '{collectionId}'",
-                collectionId=collection["collectionId"],
-            )
+            connection.execute(create_provider_sql(), list(batch.providers.values()))
             connection.execute(
-                create_collection_sql(),
-                [
-                    {
-                        "collection_id": collection["collectionId"],
-                        "shortname": collection["shortname"],
-                        "version": collection["version"],
-                    }
-                ],
-            )
-            LOGGER.debug(
-                "Creating granule record '{cumulusGranuleId}'",
-                cumulusGranuleId=granule["cumulusGranuleId"],
+                create_collection_sql(), list(batch.collections.values())
             )
             results = connection.execute(
-                create_granule_sql(),
-                [
-                    {
-                        "provider_id": provider["providerId"],
-                        "collection_id": collection["collectionId"],
-                        "cumulus_granule_id": granule["cumulusGranuleId"],
-                        "execution_id": granule["executionId"],
-                        "ingest_time": granule["ingestTime"],
-                        "cumulus_create_time": granule["cumulusCreateTime"],
-                        "last_update": granule["lastUpdate"],
-                    }
-                ],
+                create_granules_sql(len(granules)), get_values_parameters(granules)
             )
-
-            sql_result = results.mappings().fetchone()
-            if sql_result:
-                granule_id = sql_result["id"]
-            else:
-                raise ValueError("No job ID found.")
+            granule_ids = {
+                (row["collection_id"], row["cumulus_granule_id"]): row["id"]
+                for row in results.mappings()
+            }
+            missing_granules = batch.granules.keys() - granule_ids.keys()
+            if len(missing_granules) > 0:
+                raise ValueError(f"No granule ID found for {missing_granules}.")
 
             file_parameters = []
-            for file in granule["files"]:
-                LOGGER.debug(
-                    "Queueing file record '{cumulus_archive_location}'",
-                    cumulus_archive_location=file["cumulusArchiveLocation"],
-                )
+            for granule_key, file in batch.files.values():
                 file_parameters.append(
                     {
-                        "granule_id": granule_id,
-                        "name": file["name"],
-                        "cumulus_archive_location": file["cumulusArchiveLocation"],
-                        "orca_archive_location": file["orcaArchiveLocation"],
-                        "key_path": file["keyPath"],
-                        "size_in_bytes": file["sizeInBytes"],
-                        "hash": file.get("hash", None),
-                        "hash_type": file.get("hashType", None),
-                        "storage_class": file.get("storageClass"),
-                        "version": file["version"],
-                        "ingest_time": file["ingestTime"],
-                        "etag": file["etag"],
+                        **file,
+                        "granule_id": granule_ids[granule_key],
+                        "storage_class_id": get_storage_class_id(
+                            file["storage_class"], connection
+                        ),
                     }
                 )
             if any(file_parameters):
@@ -165,16 +233,73 @@ def create_catalog_records(
     except Exception as sql_ex:
         # Can't use f"" because of '{}' bug in CumulusLogger.
         LOGGER.error(
-            "Error while posting provider '{provider_id}', collection '{collection_id}', "
-            "granule '{cumulus_granule_id}' to inventory: {sql_ex}",
-            provider_id=provider["providerId"],
-            collection_id=collection["collectionId"],
-            cumulus_granule_id=granule["cumulusGranuleId"],
+            "Error while posting granules {cumulus_granule_ids} to inventory: {sql_ex}",
+            cumulus_granule_ids=[granule["cumulus_granule_id"] for granule in granules],
             sql_ex=sql_ex,
         )
         raise
 
 
+def get_storage_class_id(storage_class: str, connection: Connection) -> int:
+    """
+    Looks up the id of a storage_class value.
+    Ids are read from the database once, and again only if a value is not found.
+
+    Args:
+        storage_class: The value of the storage class, such as 'GLACIER'.
+        connection: The connection to read the storage_class table with.
+
+    Returns:
+        The id of the storage class.
+    """
+    with _STORAGE_CLASS_IDS_LOCK:
+        if storage_class not in _STORAGE_CLASS_IDS:
+            LOGGER.debug("Loading storage class ids.")
+            results = connection.execute(get_storage_classes_sql())
+            _STORAGE_CLASS_IDS.clear()
+            _STORAGE_CLASS_IDS.update(
+                {row["value"]: row["id"] for row in results.mappings()}
+            )
+        storage_class_id = _STORAGE_CLASS_IDS.get(storage_class, None)
+    if storage_class_id is None:
+        raise ValueError(f"Storage class '{storage_class}' not found.")
+    return storage_class_id
+
+
+def get_values_parameters(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Flattens rows into the parameters of a VALUES list built by get_values_sql.
+
+    Args:
+        rows: The rows to flatten. Each must have the same keys.
+
+    Returns:
+        The value of each column in each row, keyed by column name and row index.
+    """
+    return {
+        f"{column}_{index}": value
+        for index, row in enumerate(rows)
+        for column, value in row.items()
+    }
+
+
+def get_values_sql(columns: List[str], row_count: int) -> str:
+    """
+    Builds the rows of a VALUES list, with one parameter per column per row.
+
+    Args:
+        columns: The names of the columns in each row.
+        row_count: The number of rows.
+
+    Returns:
+        The rows, with parameters named as in get_values_parameters.
+    """
+    return ",\n        ".join(
+        "(" + ", ".join(f":{column}_{index}" for column in columns) + ")"
+        for index in range(row_count)
+    )
+
+
 def create_provider_sql() -> text:  # pragma: no cover
     return text(
         """
@@ -199,21 +324,32 @@ def create_collection_sql() -> text:  # pragma: no cover
     )
 
 
-def create_granule_sql() -> text:  # pragma: no cover
+def create_granules_sql(granule_count: int) -> text:  # pragma: no cover
     return text(
-        """
+        f"""
     INSERT INTO granules
-        (provider_id, collection_id, cumulus_granule_id,
-        execution_id, ingest_time, cumulus_create_time, last_update)
+        ({", ".join(GRANULE_COLUMNS)})
     VALUES
-        (:provider_id, :collection_id, :cumulus_granule_id,
-        :execution_id, :ingest_time, :cumulus_create_time, :last_update)
+        {get_values_sql(GRANULE_COLUMNS, granule_count)}
     ON CONFLICT (collection_id, cumulus_granule_id) DO UPDATE
         SET
-            provider_id=:provider_id, execution_id=:execution_id, last_update=:last_update
-    RETURNING id"""
+            provider_id=EXCLUDED.provider_id,
+            execution_id=EXCLUDED.execution_id,
+            last_update=EXCLUDED.last_update
+    RETURNING id, collection_id, cumulus_granule_id"""
     )
     # ON CONFLICT will only trigger if both collection_id and cumulus_granule_id match.
+    # Granules must be unique within the VALUES list, or the update will fail.
+
+
+def get_storage_classes_sql() -> text:  # pragma: no cover
+    return text(
+        """
+    SELECT
+        id, value
+    FROM
+        storage_class"""
+    )
 
 
 def create_file_sql() -> text:  # pragma: no cover
@@ -223,12 +359,10 @@ def create_file_sql() -> text:  # pragma: no cover
         (granule_id, name, orca_archive_location,
         cumulus_archive_location, key_path, ingest_time, etag,
         version, size_in_bytes, hash, hash_type, storage_class_id)
-    SELECT
-        :granule_id, :name, :orca_archive_location,
+    VALUES
+        (:granule_id, :name, :orca_archive_location,
         :cumulus_archive_location, :key_path, :ingest_time, :etag,
-        :version, :size_in_bytes, :hash, :hash_type, storage_class.id
-    FROM
-        storage_class WHERE storage_class.value=:storage_class
+        :version, :size_in_bytes, :hash, :hash_type, :storage_class_id)
     ON CONFLICT (cumulus_archive_location, key_path) DO UPDATE
         SET
         name=EXCLUDED.name,
@@ -11,6 +11,7 @@ import random
 import unittest
 import uuid
 from datetime import datetime, timezone
+from typing import Any, Dict, List
 from unittest.mock import MagicMock, Mock, call, patch
 
 import fastjsonschema
@@ -25,6 +26,12 @@ class TestPostToDatabase(
     TestPostToDatabase.
     """
 
+    def setUp(self):
+        post_to_catalog._STORAGE_CLASS_IDS.clear()
+
+    def tearDown(self):
+        post_to_catalog._STORAGE_CLASS_IDS.clear()
+
     @patch("post_to_catalog.task")
     @patch("orca_shared.database.shared_db.get_configuration")
     @patch.dict(
@@ -46,15 +53,17 @@ class TestPostToDatabase(
         post_to_catalog.handler(event, context)
         mock_task.assert_called_once_with(records, mock_get_configuration.return_value)
 
+    @patch("post_to_catalog.write_batch_to_database")
     @patch("orca_shared.database.shared_db.get_user_connection")
-    @patch("post_to_catalog.send_record_to_database")
+    @patch("post_to_catalog.add_record_to_batch")
     def test_task_happy_path(
         self,
-        mock_send_record_to_database: MagicMock,
+        mock_add_record_to_batch: MagicMock,
         mock_get_user_connection: MagicMock,
+        mock_write_batch_to_database: MagicMock,
     ):
         """
-        Should split records and call underlying function with each record.
+        Should add each record to one batch, then write the batch.
         """
         record0 = Mock()
         record1 = Mock()
@@ -65,14 +74,17 @@ class TestPostToDatabase(
 
         post_to_catalog.task(records, db_connect_info)
 
-        mock_send_record_to_database.assert_has_calls(
-            [call(record0, mock_engine), call(record1, mock_engine)]
+        batch = mock_write_batch_to_database.call_args.args[0]
+        self.assertIsInstance(batch, post_to_catalog.CatalogBatch)
+        mock_add_record_to_batch.assert_has_calls(
+            [call(record0, batch), call(record1, batch)]
         )
-        self.assertEqual(2, mock_send_record_to_database.call_count)
+        self.assertEqual(2, mock_add_record_to_batch.call_count)
+        mock_write_batch_to_database.assert_called_once_with(batch, mock_engine)
 
-    @patch("post_to_catalog.create_catalog_records")
-    def test_send_record_to_database_happy_path(
-        self, mock_create_catalog_records: MagicMock
+    @patch("post_to_catalog.add_catalog_records_to_batch")
+    def test_add_record_to_batch_happy_path(
+        self, mock_add_catalog_records_to_batch: MagicMock
     ):
         """
         Should accept a valid record and call underlying function with record's contained data.
@@ -81,48 +93,14 @@ class TestPostToDatabase(
             "providerId": uuid.uuid4().__str__(),
             "name": None,
         }
-        collection = {
-            "collectionId": uuid.uuid4().__str__(),
-            "shortname": uuid.uuid4().__str__(),
-            "version": uuid.uuid4().__str__(),
-        }
-        granule = {
-            "cumulusGranuleId": uuid.uuid4().__str__(),
-            "cumulusCreateTime": datetime.now(timezone.utc).isoformat(),
-            "executionId": uuid.uuid4().__str__(),
-            "ingestTime": datetime.now(timezone.utc).isoformat(),
-            "lastUpdate": datetime.now(timezone.utc).isoformat(),
-            "files": [
-                {
-                    "name": uuid.uuid4().__str__(),
-                    "cumulusArchiveLocation": uuid.uuid4().__str__(),
-                    "orcaArchiveLocation": uuid.uuid4().__str__(),
-                    "keyPath": uuid.uuid4().__str__(),
-                    "sizeInBytes": random.randint(0, 10000),  # nosec
-                    "hash": uuid.uuid4().__str__(),
-                    "hashType": uuid.uuid4().__str__(),
-                    "storageClass": "GLACIER",
-                    "version": uuid.uuid4().__str__(),
-                    "ingestTime": datetime.now(timezone.utc).isoformat(),
-                    "etag": uuid.uuid4().__str__(),
-                },
-                {
-                    "name": uuid.uuid4().__str__(),
-                    "cumulusArchiveLocation": uuid.uuid4().__str__(),
-                    "orcaArchiveLocation": uuid.uuid4().__str__(),
-                    "keyPath": uuid.uuid4().__str__(),
-                    "sizeInBytes": random.randint(0, 10000),  # nosec
-                    "hash": None,
-                    "hashType": None,
-                    "storageClass": "DEEP_ARCHIVE",
-                    "version": uuid.uuid4().__str__(),
-                    "ingestTime": datetime.now(timezone.utc).isoformat(),
-                    "etag": "etag1",
-                },
-            ],
-        }
+        collection = self.create_collection()
+        granule = self.create_granule(
+            [self.create_file("GLACIER"), self.create_file("DEEP_ARCHIVE")]
+        )
+        granule["files"][1]["hash"] = None
+        granule["files"][1]["hashType"] = None
 
-        mock_engine = Mock()
+        batch = post_to_catalog.CatalogBatch()
         record = {
             "body": json.dumps(
                 {"provider": provider, "collection": collection, "granule": granule},
@@ -130,15 +108,15 @@ class TestPostToDatabase(
             )
         }
 
-        post_to_catalog.send_record_to_database(record, mock_engine)
+        post_to_catalog.add_record_to_batch(record, batch)
 
-        mock_create_catalog_records.assert_called_once_with(
-            provider, collection, granule, mock_engine
+        mock_add_catalog_records_to_batch.assert_called_once_with(
+            provider, collection, granule, batch
         )
 
-    @patch("post_to_catalog.create_catalog_records")
-    def test_send_record_to_database_rejects_bad_record(
-        self, mock_create_catalog_records: MagicMock
+    @patch("post_to_catalog.add_catalog_records_to_batch")
+    def test_add_record_to_batch_rejects_bad_record(
+        self, mock_add_catalog_records_to_batch: MagicMock
     ):
         """
         Anything that doesn't match the schema should be rejected with an error.
@@ -147,21 +125,9 @@ class TestPostToDatabase(
             #  "providerId": uuid.uuid4().__str__(),
             "name": uuid.uuid4().__str__()
         }
-        collection = {
-            "collectionId": uuid.uuid4().__str__(),
-            "shortname": uuid.uuid4().__str__(),
-            "version": uuid.uuid4().__str__(),
-        }
-        granule = {
-            "cumulusGranuleId": uuid.uuid4().__str__(),
-            "cumulusCreateTime": datetime.now(timezone.utc).isoformat(),
-            "executionId": uuid.uuid4().__str__(),
-            "ingestTime": datetime.now(timezone.utc).isoformat(),
-            "lastUpdate": datetime.now(timezone.utc).isoformat(),
-            "files": [],
-        }
+        collection = self.create_collection()
+        granule = self.create_granule([])
 
-        mock_engine = Mock()
         record = {
             "body": json.dumps(
                 {"provider": provider, "collection": collection, "granule": granule},
@@ -170,90 +136,142 @@ class TestPostToDatabase(
         }
 
         with self.assertRaises(fastjsonschema.exceptions.JsonSchemaValueException):
-            post_to_catalog.send_record_to_database(record, mock_engine)
+            post_to_catalog.add_record_to_batch(record, post_to_catalog.CatalogBatch())
+
+        mock_add_catalog_records_to_batch.assert_not_called()
+
+    def test_add_catalog_records_to_batch_dedupes(self):
+        """
+        Providers, collections, granules and files received more than once
+        should only be written once, keeping the values an upsert in turn would.
+        """
+        provider0 = self.create_provider()
+        provider1 = self.create_provider()
+        collection = self.create_collection()
+        file0 = self.create_file("GLACIER")
+        file1 = self.create_file("GLACIER")
+        granule0 = self.create_granule([file0])
+        granule1 = self.create_granule([file1])
+        granule0_again = copy.deepcopy(granule0)
+        granule0_again["executionId"] = uuid.uuid4().__str__()
+        granule0_again["ingestTime"] = datetime.now(timezone.utc).isoformat()
+        granule0_again["lastUpdate"] = datetime.now(timezone.utc).isoformat()
+        file0_again = copy.deepcopy(file0)
+        file0_again["etag"] = uuid.uuid4().__str__()
+        granule0_again["files"] = [file0_again]
+
+        batch = post_to_catalog.CatalogBatch()
+        post_to_catalog.add_catalog_records_to_batch(
+            provider0, collection, granule0, batch
+        )
+        post_to_catalog.add_catalog_records_to_batch(
+            provider0, collection, granule1, batch
+        )
+        post_to_catalog.add_catalog_records_to_batch(
+            provider1, collection, granule0_again, batch
+        )
 
-        mock_create_catalog_records.assert_not_called()
+        self.assertEqual(
+            [provider0["providerId"], provider1["providerId"]],
+            list(batch.providers.keys()),
+        )
+        self.assertEqual([collection["collectionId"]], list(batch.collections.keys()))
+        granule0_key = (collection["collectionId"], granule0["cumulusGranuleId"])
+        granule1_key = (collection["collectionId"], granule1["cumulusGranuleId"])
+        self.assertEqual([granule0_key, granule1_key], list(batch.granules.keys()))
+        self.assertEqual(
+            {
+                "provider_id": provider1["providerId"],
+                "collection_id": collection["collectionId"],
+                "cumulus_granule_id": granule0["cumulusGranuleId"],
+                "execution_id": granule0_again["executionId"],
+                "ingest_time": granule0["ingestTime"],
+                "cumulus_create_time": granule0["cumulusCreateTime"],
+                "last_update": granule0_again["lastUpdate"],
+            },
+            batch.granules[granule0_key],
+        )
+        self.assertEqual(2, len(batch.files))
+        self.assertEqual(
+            (granule0_key, self.get_file_parameters(file0_again)),
+            batch.files[(file0["cumulusArchiveLocation"], file0["keyPath"])],
+        )
+        self.assertEqual(
+            (granule1_key, self.get_file_parameters(file1)),
+            batch.files[(file1["cumulusArchiveLocation"], file1["keyPath"])],
+        )
 
+    @patch("post_to_catalog.get_storage_class_id")
     @patch("post_to_catalog.create_file_sql")
-    @patch("post_to_catalog.create_granule_sql")
+    @patch("post_to_catalog.create_granules_sql")
     @patch("post_to_catalog.create_collection_sql")
     @patch("post_to_catalog.create_provider_sql")
-    def test_create_catalog_records_happy_path(
+    def test_write_batch_to_database_happy_path(
         self,
         mock_create_provider_sql: MagicMock,
         mock_create_collection_sql: MagicMock,
-        mock_create_granule_sql: MagicMock,
+        mock_create_granules_sql: MagicMock,
         mock_create_file_sql: MagicMock,
+        mock_get_storage_class_id: MagicMock,
     ):
         """
-        Should perform several SQL operations with separated files.
+        Should write the whole batch in one transaction,
+        with one statement per table.
         """
-        provider = {
-            "providerId": uuid.uuid4().__str__(),
-            "name": uuid.uuid4().__str__(),
-        }
-        collection = {
-            "collectionId": uuid.uuid4().__str__(),
-            "shortname": uuid.uuid4().__str__(),
-            "version": uuid.uuid4().__str__(),
-        }
-        file0 = {
-            "name": uuid.uuid4().__str__(),
-            "cumulusArchiveLocation": uuid.uuid4().__str__(),
-            "orcaArchiveLocation": uuid.uuid4().__str__(),
-            "keyPath": uuid.uuid4().__str__(),
-            "sizeInBytes": random.randint(0, 10000),  # nosec
-            "hash": uuid.uuid4().__str__(),
-            "hashType": uuid.uuid4().__str__(),
-            "storageClass": uuid.uuid4().__str__(),
-            "version": uuid.uuid4().__str__(),
-            "ingestTime": datetime.now(timezone.utc).isoformat(),
-            "etag": uuid.uuid4().__str__(),
-        }
-        file1 = {
-            "name": uuid.uuid4().__str__(),
-            "cumulusArchiveLocation": uuid.uuid4().__str__(),
-            "orcaArchiveLocation": uuid.uuid4().__str__(),
-            "keyPath": uuid.uuid4().__str__(),
-            "sizeInBytes": random.randint(0, 10000),  # nosec
-            "hash": None,
-            "hashType": None,
-            "storageClass": uuid.uuid4().__str__(),
-            "version": uuid.uuid4().__str__(),
-            "ingestTime": datetime.now(timezone.utc).isoformat(),
-            "etag": uuid.uuid4().__str__(),
-        }
-        granule = {
-            "cumulusGranuleId": uuid.uuid4().__str__(),
-            "cumulusCreateTime": datetime.now(timezone.utc).isoformat(),
-            "executionId": uuid.uuid4().__str__(),
-            "ingestTime": datetime.now(timezone.utc).isoformat(),
-            "lastUpdate": datetime.now(timezone.utc).isoformat(),
-            "files": [file0, file1],
-        }
+        provider = self.create_provider()
+        collection = self.create_collection()
+        file0 = self.create_file("GLACIER")
+        file1 = self.create_file("DEEP_ARCHIVE")
+        file1["hash"] = None
+        file1["hashType"] = None
+        granule0 = self.create_granule([file0])
+        granule1 = self.create_granule([file1])
+        batch = post_to_catalog.CatalogBatch()
+        for granule in [granule0, granule1]:
+            post_to_catalog.add_catalog_records_to_batch(
+                provider, collection, granule, batch
+            )
+        granule_ids = [random.randint(0, 10000) for _ in range(2)]  # nosec
+        storage_class_ids = {"GLACIER": 1, "DEEP_ARCHIVE": 2}
+        mock_get_storage_class_id.side_effect = (
+            lambda storage_class, connection: storage_class_ids[storage_class]
+        )
 
-        internal_id = random.randint(0, 10000)  # nosec
         mock_engine = Mock()
         mock_execute_result = Mock()
-        mock_execute_result.mappings.return_value.fetchone.return_value = {
-            "id": internal_id
-        }
-        mock_execute = Mock()
-        mock_execute.return_value = mock_execute_result
-        mock_engine.begin.return_value = Mock()
-        mock_connection = Mock()
-        mock_connection.execute = mock_execute
-        mock_engine.begin.return_value.__enter__ = Mock()
-        mock_engine.begin.return_value.__enter__.return_value = mock_connection
-        mock_engine.begin.return_value.__exit__ = Mock(return_value=False)
+        # RETURNING does not guarantee order.
+        mock_execute_result.mappings.return_value = [
+            {
+                "id": granule_ids[1],
+                "collection_id": collection["collectionId"],
+                "cumulus_granule_id": granule1["cumulusGranuleId"],
+            },
+            {
+                "id": granule_ids[0],
+                "collection_id": collection["collectionId"],
+                "cumulus_granule_id": granule0["cumulusGranuleId"],
+            },
+        ]
+        mock_connection = self.create_mock_connection(mock_engine)
+        mock_connection.execute.return_value = mock_execute_result
 
-        post_to_catalog.create_catalog_records(
-            copy.deepcopy(provider),
-            copy.deepcopy(collection),
-            copy.deepcopy(granule),
-            mock_engine,
-        )
+        post_to_catalog.write_batch_to_database(batch, mock_engine)
 
+        mock_engine.begin.assert_called_once_with()
+        mock_create_granules_sql.assert_called_once_with(2)
+        granule_parameters = {}
+        for index, granule in enumerate([granule0, granule1]):
+            granule_parameters.update(
+                {
+                    f"provider_id_{index}": provider["providerId"],
+                    f"collection_id_{index}": collection["collectionId"],
+                    f"cumulus_granule_id_{index}": granule["cumulusGranuleId"],
+                    f"execution_id_{index}": granule["executionId"],
+                    f"ingest_time_{index}": granule["ingestTime"],
+                    f"cumulus_create_time_{index}": granule["cumulusCreateTime"],
+                    f"last_update_{index}": granule["lastUpdate"],
+                }
+            )
         mock_connection.execute.assert_has_calls(
             [
                 call(
@@ -270,55 +288,170 @@ class TestPostToDatabase(
                         }
                     ],
                 ),
-                call(
-                    mock_create_granule_sql.return_value,
-                    [
-                        {
-                            "provider_id": provider["providerId"],
-                            "collection_id": collection["collectionId"],
-                            "cumulus_granule_id": granule["cumulusGranuleId"],
-                            "execution_id": granule["executionId"],
-                            "ingest_time": granule["ingestTime"],
-                            "cumulus_create_time": granule["cumulusCreateTime"],
-                            "last_update": granule["lastUpdate"],
-                        }
-                    ],
-                ),
+                call(mock_create_granules_sql.return_value, granule_parameters),
                 call().mappings(),
-                call().mappings().fetchone(),
                 call(
                     mock_create_file_sql.return_value,
                     [
                         {
-                            "granule_id": internal_id,
-                            "name": file0["name"],
-                            "cumulus_archive_location": file0["cumulusArchiveLocation"],
-                            "orca_archive_location": file0["orcaArchiveLocation"],
-                            "key_path": file0["keyPath"],
-                            "size_in_bytes": file0["sizeInBytes"],
-                            "hash": file0["hash"],
-                            "hash_type": file0["hashType"],
-                            "storage_class": file0["storageClass"],
-                            "version": file0["version"],
-                            "ingest_time": file0["ingestTime"],
-                            "etag": file0["etag"],
+                            **self.get_file_parameters(file0),
+                            "granule_id": granule_ids[0],
+                            "storage_class_id": 1,
                         },
                         {
-                            "granule_id": internal_id,
-                            "name": file1["name"],
-                            "cumulus_archive_location": file1["cumulusArchiveLocation"],
-                            "orca_archive_location": file1["orcaArchiveLocation"],
-                            "key_path": file1["keyPath"],
-                            "size_in_bytes": file1["sizeInBytes"],
-                            "hash": None,  # None is a valid value.
-                            "hash_type": None,
-                            "storage_class": file1["storageClass"],
-                            "version": file1["version"],
-                            "ingest_time": file1["ingestTime"],
-                            "etag": file1["etag"],
+                            **self.get_file_parameters(file1),
+                            "granule_id": granule_ids[1],
+                            "storage_class_id": 2,
                         },
                     ],
                 ),
             ]
         )
-        mock_execute_result.mappings.assert_called_once_with()
+        self.assertEqual(4, mock_connection.execute.call_count)
+        mock_get_storage_class_id.assert_has_calls(
+            [call("GLACIER", mock_connection), call("DEEP_ARCHIVE", mock_connection)]
+        )
+
+    @patch("post_to_catalog.create_file_sql")
+    @patch("post_to_catalog.create_granules_sql")
+    def test_write_batch_to_database_granule_id_missing_raises_error(
+        self,
+        mock_create_granules_sql: MagicMock,
+        mock_create_file_sql: MagicMock,
+    ):
+        """
+        If a granule's id is not returned, nothing should be committed.
+        """
+        batch = post_to_catalog.CatalogBatch()
+        post_to_catalog.add_catalog_records_to_batch(
+            self.create_provider(),
+            self.create_collection(),
+            self.create_granule([self.create_file("GLACIER")]),
+            batch,
+        )
+        mock_engine = Mock()
+        mock_connection = self.create_mock_connection(mock_engine)
+        mock_connection.execute.return_value.mappings.return_value = []
+
+        with self.assertRaises(ValueError):
+            post_to_catalog.write_batch_to_database.__wrapped__(batch, mock_engine)
+
+        mock_create_file_sql.assert_not_called()
+
+    def test_write_batch_to_database_empty_batch(self):
+        """
+        An empty batch should not contact the database.
+        """
+        mock_engine = Mock()
+
+        post_to_catalog.write_batch_to_database(
+            post_to_catalog.CatalogBatch(), mock_engine
+        )
+
+        mock_engine.begin.assert_not_called()
+
+    @patch("post_to_catalog.get_storage_classes_sql")
+    def test_get_storage_class_id_cached(self, mock_get_storage_classes_sql: MagicMock):
+        """
+        Storage class ids should only be read from the database once.
+        """
+        mock_connection = Mock()
+        mock_connection.execute.return_value.mappings.return_value = [
+            {"id": 1, "value": "GLACIER"},
+            {"id": 2, "value": "DEEP_ARCHIVE"},
+        ]
+
+        result0 = post_to_catalog.get_storage_class_id("GLACIER", mock_connection)
+        result1 = post_to_catalog.get_storage_class_id("DEEP_ARCHIVE", mock_connection)
+        result2 = post_to_catalog.get_storage_class_id("GLACIER", mock_connection)
+
+        self.assertEqual([1, 2, 1], [result0, result1, result2])
+        mock_connection.execute.assert_called_once_with(
+            mock_get_storage_classes_sql.return_value
+        )
+
+    @patch("post_to_catalog.get_storage_classes_sql")
+    def test_get_storage_class_id_unknown_value_raises_error(
+        self, mock_get_storage_classes_sql: MagicMock
+    ):
+        """
+        A value missing from the cache should be looked up again before failing.
+        """
+        post_to_catalog._STORAGE_CLASS_IDS["GLACIER"] = 1
+        mock_connection = Mock()
+        mock_connection.execute.return_value.mappings.return_value = [
+            {"id": 1, "value": "GLACIER"},
+        ]
+
+        with self.assertRaises(ValueError):
+            post_to_catalog.get_storage_class_id("DEEP_ARCHIVE", mock_connection)
+
+        mock_connection.execute.assert_called_once_with(
+            mock_get_storage_classes_sql.return_value
+        )
+
+    @staticmethod
+    def create_mock_connection(mock_engine: Mock) -> Mock:
+        mock_connection = Mock()
+        mock_engine.begin.return_value = Mock()
+        mock_engine.begin.return_value.__enter__ = Mock(return_value=mock_connection)
+        mock_engine.begin.return_value.__exit__ = Mock(return_value=False)
+        return mock_connection
+
+    @staticmethod
+    def create_provider() -> Dict[str, str]:
+        return {
+            "providerId": uuid.uuid4().__str__(),
+            "name": uuid.uuid4().__str__(),
+        }
+
+    @staticmethod
+    def create_collection() -> Dict[str, str]:
+        return {
+            "collectionId": uuid.uuid4().__str__(),
+            "shortname": uuid.uuid4().__str__(),
+            "version": uuid.uuid4().__str__(),
+        }
+
+    @staticmethod
+    def create_granule(files: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "cumulusGranuleId": uuid.uuid4().__str__(),
+            "cumulusCreateTime": datetime.now(timezone.utc).isoformat(),
+            "executionId": uuid.uuid4().__str__(),
+            "ingestTime": datetime.now(timezone.utc).isoformat(),
+            "lastUpdate": datetime.now(timezone.utc).isoformat(),
+            "files": files,
+        }
+
+    @staticmethod
+    def create_file(storage_class: str) -> Dict[str, Any]:
+        return {
+            "name": uuid.uuid4().__str__(),
+            "cumulusArchiveLocation": uuid.uuid4().__str__(),
+            "orcaArchiveLocation": uuid.uuid4().__str__(),
+            "keyPath": uuid.uuid4().__str__(),
+            "sizeInBytes": random.randint(0, 10000),  # nosec
+            "hash": uuid.uuid4().__str__(),
+            "hashType": uuid.uuid4().__str__(),
+            "storageClass": storage_class,
+            "version": uuid.uuid4().__str__(),
+            "ingestTime": datetime.now(timezone.utc).isoformat(),
+            "etag": uuid.uuid4().__str__(),
+        }
+
+    @staticmethod
+    def get_file_parameters(file: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "name": file["name"],
+            "cumulus_archive_location": file["cumulusArchiveLocation"],
+            "orca_archive_location": file["orcaArchiveLocation"],
+            "key_path": file["keyPath"],
+            "size_in_bytes": file["sizeInBytes"],
+            "hash": file["hash"],
+            "hash_type": file["hashType"],
+            "storage_class": file["storageClass"],
+            "version": file["version"],
+            "ingest_time": file["ingestTime"],
+            "etag": file["etag"],
+        }
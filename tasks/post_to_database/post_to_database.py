@@ -7,7 +7,8 @@ Description:  Pulls entries from a queue and posts them to a DB.
 import datetime
 import json
 import os
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
 
 # noinspection SpellCheckingInspection
 import fastjsonschema as fastjsonschema
@@ -31,23 +32,56 @@ except Exception as ex:
     LOGGER.error(f"Could not build schema validator: {ex}")
     raise
 
+# Columns of the VALUES list used to update files in bulk.
+FILE_UPDATE_COLUMNS = [
+    "job_id",
+    "collection_id",
+    "granule_id",
+    "filename",
+    "status_id",
+    "last_update",
+    "completion_time",
+    "error_message",
+]
+
+
+@dataclass
+class StatusBatch:
+    """
+    The recovery statuses from a batch of records,
+    grouped so that they can be written in a single transaction.
+    Attributes:
+        job_parameters: The recovery_job rows to insert.
+        file_parameters: The recovery_file rows to insert.
+        file_updates: The recovery_file updates, keyed by job, collection, granule and file.
+            Only the last update received for a file is kept.
+    """
+
+    job_parameters: List[Dict[str, Any]] = field(default_factory=list)
+    file_parameters: List[Dict[str, Any]] = field(default_factory=list)
+    file_updates: Dict[Tuple[str, str, str, str], Dict[str, Any]] = field(
+        default_factory=dict
+    )
+
 
 def task(records: List[Dict[str, Any]], db_connect_info: Dict) -> None:
     """
-    Sends each individual record to send_record_to_database.
+    Adds each record to a StatusBatch, then writes the batch to the database.
 
     Args:
-        records: A list of Dicts. See send_record_to_database for schema info.
+        records: A list of Dicts. See add_record_to_batch for schema info.
         db_connect_info: See shared_db.py's get_configuration for further details.
     """
     engine = shared_db.get_user_connection(db_connect_info)
+    batch = StatusBatch()
     for record in records:
-        send_record_to_database(record, engine)
+        add_record_to_batch(record, batch)
+    write_batch_to_database(batch, engine)
 
 
-def send_record_to_database(record: Dict[str, Any], engine: Engine) -> None:
+def add_record_to_batch(record: Dict[str, Any], batch: StatusBatch) -> None:
     """
-    Deconstructs a record to its components and calls send_values_to_database with the result.
+    Deconstructs a record to its components and adds them to the batch.
 
     Args:
         record: Contains the following keys:
@@ -57,7 +91,7 @@ def send_record_to_database(record: Dict[str, Any], engine: Engine) -> None:
             'messageAttributes' (dict): Contains the following keys:
                 'RequestMethod' (str): 'post' or 'put',
                     depending on if row should be created or updated respectively.
-        engine: The sqlalchemy engine to use for contacting the database.
+        batch: The batch to add the statuses to.
     """
     values = json.loads(record["body"])
     request_method = RequestMethod(
@@ -66,18 +100,18 @@ def send_record_to_database(record: Dict[str, Any], engine: Engine) -> None:
     LOGGER.debug(f"Processing request method {request_method} with record {values}")
     if request_method == RequestMethod.NEW_JOB:
         _NEW_JOB_VALIDATE(values)
-        create_status_for_job_and_files(
+        add_job_and_files_to_batch(
             values[shared_recovery.JOB_ID_KEY],
             values[shared_recovery.COLLECTION_ID_KEY],
             values[shared_recovery.GRANULE_ID_KEY],
             values[shared_recovery.REQUEST_TIME_KEY],
             values[shared_recovery.ARCHIVE_DESTINATION_KEY],
             values[shared_recovery.FILES_KEY],
-            engine,
+            batch,
         )
     elif request_method == RequestMethod.UPDATE_FILE:
         _UPDATE_FILE_VALIDATE(values)
-        update_status_for_file(
+        add_file_update_to_batch(
             values[shared_recovery.JOB_ID_KEY],
             values[shared_recovery.COLLECTION_ID_KEY],
             values[shared_recovery.GRANULE_ID_KEY],
@@ -86,7 +120,7 @@ def send_record_to_database(record: Dict[str, Any], engine: Engine) -> None:
             values.get(shared_recovery.COMPLETION_TIME_KEY, None),
             values[shared_recovery.STATUS_ID_KEY],
             values.get(shared_recovery.ERROR_MESSAGE_KEY, None),
-            engine,
+            batch,
         )
     else:
         error = ValueError(f"RequestMethod '{request_method.value}' not found.")
@@ -94,20 +128,17 @@ def send_record_to_database(record: Dict[str, Any], engine: Engine) -> None:
         raise error
 
 
-@shared_db.retry_operational_error(
-    # Retry all files due to transactional behavior of engine.begin
-)
-def create_status_for_job_and_files(
+def add_job_and_files_to_batch(
     job_id: str,
     collection_id: str,
     granule_id: str,
     request_time: str,
     archive_destination: str,
     files: List[Dict[str, Any]],
-    engine: Engine,
+    batch: StatusBatch,
 ) -> None:
     """
-    Posts the entry for the job, followed by individual entries for each file.
+    Adds the entry for the job, followed by individual entries for each file.
 
     Args:
         job_id: The unique identifier used for tracking requests.
@@ -116,7 +147,7 @@ def create_status_for_job_and_files(
         archive_destination: The S3 bucket destination of where the data is archived.
         request_time: The time the restore was requested in utc and iso-format.
         files: A List of Dicts. See schemas/new_job_input.json's `files` array for properties.
-        engine: The sqlalchemy engine to use for contacting the database.
+        batch: The batch to add the statuses to.
     """
     found_pending = False
     job_completion_time = None
@@ -175,35 +206,21 @@ def create_status_for_job_and_files(
         job_status = OrcaStatus.FAILED
         job_completion_time = job_completion_time.isoformat().__str__()
 
-    try:
-        LOGGER.debug(f"Creating recovery records for job_id {job_id}.")
-        with engine.begin() as connection:
-            connection.execute(
-                create_job_sql(),
-                [
-                    {
-                        "job_id": job_id,
-                        "collection_id": collection_id,
-                        "granule_id": granule_id,
-                        "status_id": job_status.value,
-                        "request_time": request_time,
-                        "completion_time": job_completion_time,
-                        "archive_destination": archive_destination,
-                    }
-                ],
-            )
-            if len(file_parameters) > 0:
-                connection.execute(create_file_sql(), file_parameters)
-    except Exception as sql_ex:
-        # Can't use f"" because of '{}' bug in CumulusLogger.
-        LOGGER.error(f"Error while creating statuses for job '{job_id}': {sql_ex}")
-        raise
+    batch.job_parameters.append(
+        {
+            "job_id": job_id,
+            "collection_id": collection_id,
+            "granule_id": granule_id,
+            "status_id": job_status.value,
+            "request_time": request_time,
+            "completion_time": job_completion_time,
+            "archive_destination": archive_destination,
+        }
+    )
+    batch.file_parameters.extend(file_parameters)
 
 
-@shared_db.retry_operational_error(
-    # Retry all files due to transactional behavior of engine.begin
-)
-def update_status_for_file(
+def add_file_update_to_batch(
     job_id: str,
     collection_id: str,
     granule_id: str,
@@ -212,11 +229,11 @@ def update_status_for_file(
     completion_time: Optional[str],
     status_id: int,
     error_message: Optional[str],
-    engine: Engine,
+    batch: StatusBatch,
 ) -> None:
     """
-    Updates a given file's status entry, modifying the job if all files
-    for that job have advanced in status.
+    Adds an update of a given file's status entry.
+    Replaces any earlier update for the same file in the batch.
 
     Args:
         job_id: The unique identifier used for tracking requests.
@@ -228,38 +245,91 @@ def update_status_for_file(
         status_id: Defines the status id used in the ORCA Recovery database.
         error_message: message displayed on error.
 
-        engine: The sqlalchemy engine to use for contacting the database.
+        batch: The batch to add the update to.
     """
-    file_parameters = {
-        "status_id": status_id,
-        "last_update": last_update,
-        "completion_time": completion_time,
-        "error_message": error_message,
+    batch.file_updates[(job_id, collection_id, granule_id, filename)] = {
         "job_id": job_id,
         "collection_id": collection_id,
         "granule_id": granule_id,
         "filename": filename,
+        "status_id": status_id,
+        "last_update": last_update,
+        "completion_time": completion_time,
+        "error_message": error_message,
     }
-    job_parameters = {
-        "job_id": job_id,
-        "collection_id": collection_id,
-        "granule_id": granule_id,
-    }
+
+
+@shared_db.retry_operational_error(
+    # Retry all statuses due to transactional behavior of engine.begin
+)
+def write_batch_to_database(batch: StatusBatch, engine: Engine) -> None:
+    """
+    Writes all statuses in the batch in one transaction.
+    New jobs and files are inserted first, so that updates in the same batch apply to them.
+    Job statuses are kept up to date by the recovery_file_status_count trigger,
+    which adjusts per-granule status counts as each file changes.
+
+    Args:
+        batch: The statuses to write.
+        engine: The sqlalchemy engine to use for contacting the database.
+    """
+    file_updates = list(batch.file_updates.values())
     try:
         LOGGER.debug(
-            f"Updating status for recovery record job_id '{job_id}' "
-            f"collection_id '{collection_id}' "
-            f"granule_id '{granule_id}' and file '{filename}'."
+            f"Writing {len(batch.job_parameters)} new job(s), "
+            f"{len(batch.file_parameters)} new file(s) "
+            f"and {len(file_updates)} file update(s)."
         )
         with engine.begin() as connection:
-            connection.execute(update_file_sql(), file_parameters)
-            connection.execute(update_job_sql(), job_parameters)
+            if len(batch.job_parameters) > 0:
+                connection.execute(create_job_sql(), batch.job_parameters)
+            if len(batch.file_parameters) > 0:
+                connection.execute(create_file_sql(), batch.file_parameters)
+            if len(file_updates) > 0:
+                connection.execute(
+                    update_files_sql(len(file_updates)),
+                    get_values_parameters(file_updates),
+                )
     except Exception as sql_ex:
         # Can't use f"" because of '{}' bug in CumulusLogger.
-        LOGGER.error(f"Error while creating statuses for job '{job_id}': {sql_ex}")
+        LOGGER.error(f"Error while writing statuses: {sql_ex}")
         raise
 
 
+def get_values_parameters(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Flattens rows into the parameters of a VALUES list built by get_values_sql.
+
+    Args:
+        rows: The rows to flatten. Each must have the same keys.
+
+    Returns:
+        The value of each column in each row, keyed by column name and row index.
+    """
+    return {
+        f"{column}_{index}": value
+        for index, row in enumerate(rows)
+        for column, value in row.items()
+    }
+
+
+def get_values_sql(columns: List[str], row_count: int) -> str:
+    """
+    Builds the rows of a VALUES list, with one parameter per column per row.
+
+    Args:
+        columns: The names of the columns in each row.
+        row_count: The number of rows.
+
+    Returns:
+        The rows, with parameters named as in get_values_parameters.
+    """
+    return ",\n            ".join(
+        "(" + ", ".join(f":{column}_{index}" for column in columns) + ")"
+        for index in range(row_count)
+    )
+
+
 def create_job_sql() -> text:  # pragma: no cover
     return text(
         """
@@ -287,55 +357,21 @@ def create_file_sql() -> text:  # pragma: no cover
     )
 
 
-def update_file_sql() -> text:  # pragma: no cover
+def update_files_sql(update_count: int) -> text:  # pragma: no cover
     return text(
-        """
+        f"""
         UPDATE recovery_file
-        SET status_id = :status_id, last_update = :last_update, completion_time = :completion_time,
-            error_message = :error_message
-        WHERE job_id = :job_id
-            AND collection_id = :collection_id
-            AND granule_id = :granule_id
-            AND filename = :filename"""
-    )
-
-
-def update_job_sql() -> text:  # pragma: no cover
-    return text(
-        """
-        with granule_status as (
-            SELECT
-                job_id,
-                collection_id,
-                granule_id,
-                MIN(status_id) AS status_id,
-                CASE
-                    WHEN MIN(status_id) IN (3, 4) THEN MAX(completion_time)
-                    ELSE NULL
-                END AS completion_time
-            FROM
-                recovery_file
-            WHERE
-                job_id = :job_id
-            AND
-                collection_id = :collection_id
-            AND
-                granule_id = :granule_id
-            GROUP BY job_id, collection_id, granule_id
-        )
-        UPDATE
-            recovery_job
-        SET
-            status_id = granule_status.status_id,
-            completion_time = granule_status.completion_time
-        FROM
-            granule_status
-        WHERE
-            recovery_job.job_id = granule_status.job_id
-        AND
-            recovery_job.collection_id = granule_status.collection_id
-        AND
-            recovery_job.granule_id = granule_status.granule_id"""
+        SET status_id = CAST(file_update.status_id AS INT2),
+            last_update = CAST(file_update.last_update AS TIMESTAMPTZ),
+            completion_time = CAST(file_update.completion_time AS TIMESTAMPTZ),
+            error_message = CAST(file_update.error_message AS TEXT)
+        FROM (VALUES
+            {get_values_sql(FILE_UPDATE_COLUMNS, update_count)}
+        ) AS file_update({", ".join(FILE_UPDATE_COLUMNS)})
+        WHERE recovery_file.job_id = file_update.job_id
+            AND recovery_file.collection_id = file_update.collection_id
+            AND recovery_file.granule_id = file_update.granule_id
+            AND recovery_file.filename = file_update.filename"""
     )
 
 
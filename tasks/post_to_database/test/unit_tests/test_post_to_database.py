@@ -45,12 +45,17 @@ class TestPostToDatabase(
         mock_task.assert_called_once_with(records, mock_get_configuration.return_value)
 
     @patch("orca_shared.database.shared_db.get_user_connection")
-    @patch("post_to_database.send_record_to_database")
+    @patch("post_to_database.write_batch_to_database")
+    @patch("post_to_database.add_record_to_batch")
     def test_task_happy_path(
         self,
-        mock_send_record_to_database: MagicMock,
+        mock_add_record_to_batch: MagicMock,
+        mock_write_batch_to_database: MagicMock,
         mock_get_user_connection: MagicMock,
     ):
+        """
+        All records should be added to one batch, which is written once.
+        """
         record0 = Mock()
         record1 = Mock()
         records = [record0, record1]
@@ -60,14 +65,17 @@ class TestPostToDatabase(
 
         post_to_database.task(records, db_connect_info)
 
-        mock_send_record_to_database.assert_has_calls(
-            [call(record0, mock_engine), call(record1, mock_engine)]
+        batch = mock_write_batch_to_database.call_args.args[0]
+        self.assertIsInstance(batch, post_to_database.StatusBatch)
+        mock_add_record_to_batch.assert_has_calls(
+            [call(record0, batch), call(record1, batch)]
         )
-        self.assertEqual(2, mock_send_record_to_database.call_count)
+        self.assertEqual(2, mock_add_record_to_batch.call_count)
+        mock_write_batch_to_database.assert_called_once_with(batch, mock_engine)
 
-    @patch("post_to_database.create_status_for_job_and_files")
-    def test_send_record_to_database_create_status_for_job_and_files(
-        self, mock_create_status_for_job_and_files: MagicMock
+    @patch("post_to_database.add_job_and_files_to_batch")
+    def test_add_record_to_batch_add_job_and_files_to_batch(
+        self, mock_add_job_and_files_to_batch: MagicMock
     ):
         job_id = uuid.uuid4().__str__()
         collection_id = uuid.uuid4().__str__()
@@ -101,7 +109,7 @@ class TestPostToDatabase(
             shared_recovery.FILES_KEY: files,
         }
         request_method = post_to_database.RequestMethod.NEW_JOB
-        mock_engine = Mock()
+        mock_batch = Mock()
         record = {
             "body": json.dumps(values, indent=4),
             "messageAttributes": {
@@ -109,19 +117,19 @@ class TestPostToDatabase(
             },
         }
 
-        post_to_database.send_record_to_database(record, mock_engine)
+        post_to_database.add_record_to_batch(record, mock_batch)
 
-        mock_create_status_for_job_and_files.assert_called_once_with(
+        mock_add_job_and_files_to_batch.assert_called_once_with(
             job_id,
             collection_id,
             granule_id,
             request_time,
             archive_destination,
             files,
-            mock_engine,
+            mock_batch,
         )
 
-    def test_send_record_to_database_create_status_for_job_and_files_errors_for_missing_properties(
+    def test_add_record_to_batch_add_job_and_files_to_batch_errors_for_missing_properties(
         self,
     ):
         """
@@ -152,7 +160,7 @@ class TestPostToDatabase(
             shared_recovery.FILES_KEY: files,
         }
         request_method = post_to_database.RequestMethod.NEW_JOB
-        mock_engine = Mock()
+        mock_batch = Mock()
 
         for key in values.keys():
             input_values = values.copy()
@@ -165,7 +173,7 @@ class TestPostToDatabase(
             }
             schema_error_raised = False
             try:
-                post_to_database.send_record_to_database(record, mock_engine)
+                post_to_database.add_record_to_batch(record, mock_batch)
             except JsonSchemaValueException:
                 schema_error_raised = True
 
@@ -174,9 +182,9 @@ class TestPostToDatabase(
                     f"Key '{key}' schema_error_raised was '{schema_error_raised}'."
                 )
 
-    @patch("post_to_database.update_status_for_file")
-    def test_send_record_to_database_update_status_for_file(
-        self, mock_update_status_for_file: MagicMock
+    @patch("post_to_database.add_file_update_to_batch")
+    def test_add_record_to_batch_add_file_update_to_batch(
+        self, mock_add_file_update_to_batch: MagicMock
     ):
         job_id = uuid.uuid4().__str__()
         collection_id = uuid.uuid4().__str__()
@@ -197,7 +205,7 @@ class TestPostToDatabase(
             shared_recovery.ERROR_MESSAGE_KEY: error_message,
         }
         request_method = post_to_database.RequestMethod.UPDATE_FILE
-        mock_engine = Mock()
+        mock_batch = Mock()
         record = {
             "body": json.dumps(values, indent=4),
             "messageAttributes": {
@@ -205,9 +213,9 @@ class TestPostToDatabase(
             },
         }
 
-        post_to_database.send_record_to_database(record, mock_engine)
+        post_to_database.add_record_to_batch(record, mock_batch)
 
-        mock_update_status_for_file.assert_called_once_with(
+        mock_add_file_update_to_batch.assert_called_once_with(
             job_id,
             collection_id,
             granule_id,
@@ -216,12 +224,12 @@ class TestPostToDatabase(
             completion_time,
             status_id,
             error_message,
-            mock_engine,
+            mock_batch,
         )
 
-    @patch("post_to_database.update_status_for_file")
-    def test_send_record_to_database_update_status_for_file_defaults_for_missing_properties(
-        self, mock_update_status_for_file: MagicMock
+    @patch("post_to_database.add_file_update_to_batch")
+    def test_add_record_to_batch_add_file_update_to_batch_defaults_for_missing_properties(
+        self, mock_add_file_update_to_batch: MagicMock
     ):
         """
         Missing completion time and error_message are fine.
@@ -250,7 +258,7 @@ class TestPostToDatabase(
             shared_recovery.ERROR_MESSAGE_KEY: error_message,
         }
         request_method = post_to_database.RequestMethod.UPDATE_FILE
-        mock_engine = Mock()
+        mock_batch = Mock()
 
         for key in values.keys():
             input_values = values.copy()
@@ -263,7 +271,7 @@ class TestPostToDatabase(
             }
             schema_error_raised = False
             try:
-                post_to_database.send_record_to_database(record, mock_engine)
+                post_to_database.add_record_to_batch(record, mock_batch)
             except JsonSchemaValueException:
                 schema_error_raised = True
 
@@ -275,8 +283,8 @@ class TestPostToDatabase(
                 expected_values = values.copy()
                 # noinspection PyTypeChecker
                 expected_values[key] = expected_defaults[key]
-                expected_values["engine"] = mock_engine
-                mock_update_status_for_file.assert_has_calls(
+                expected_values["batch"] = mock_batch
+                mock_add_file_update_to_batch.assert_has_calls(
                     [
                         call(
                             expected_values[shared_recovery.JOB_ID_KEY],
@@ -287,16 +295,12 @@ class TestPostToDatabase(
                             expected_values[shared_recovery.COMPLETION_TIME_KEY],
                             expected_values[shared_recovery.STATUS_ID_KEY],
                             expected_values[shared_recovery.ERROR_MESSAGE_KEY],
-                            mock_engine,
+                            mock_batch,
                         )
                     ]
                 )
 
-    @patch("post_to_database.create_file_sql")
-    @patch("post_to_database.create_job_sql")
-    def test_create_status_for_job_and_files_happy_path(
-        self, mock_create_job_sql: MagicMock, mock_create_file_sql: MagicMock
-    ):
+    def test_add_job_and_files_to_batch_happy_path(self):
         job_id = uuid.uuid4().__str__()
         collection_id = uuid.uuid4().__str__()
         granule_id = uuid.uuid4().__str__()
@@ -340,81 +344,69 @@ class TestPostToDatabase(
             },
         ]
 
-        mock_engine = Mock()
-        mock_engine.begin.return_value = Mock()
-        mock_connection = Mock()
-        mock_engine.begin.return_value.__enter__ = Mock()
-        mock_engine.begin.return_value.__enter__.return_value = mock_connection
-        mock_engine.begin.return_value.__exit__ = Mock(return_value=False)
+        batch = post_to_database.StatusBatch()
 
-        post_to_database.create_status_for_job_and_files(
+        post_to_database.add_job_and_files_to_batch(
             job_id,
             collection_id,
             granule_id,
             request_time,
             archive_destination,
             files,
-            mock_engine,
+            batch,
         )
 
-        mock_connection.execute.assert_has_calls(
+        self.assertEqual(
             [
-                call(
-                    mock_create_job_sql.return_value,
-                    [
-                        {
-                            "job_id": job_id,
-                            "collection_id": collection_id,
-                            "granule_id": granule_id,
-                            "status_id": OrcaStatus.PENDING.value,
-                            "request_time": request_time,
-                            "completion_time": None,
-                            "archive_destination": archive_destination,
-                        }
-                    ],
-                ),
-                call(
-                    mock_create_file_sql.return_value,
-                    [
-                        {
-                            "job_id": job_id,
-                            "collection_id": collection_id,
-                            "granule_id": granule_id,
-                            "filename": filename0,
-                            "key_path": key_path0,
-                            "restore_destination": restore_destination0,
-                            "multipart_chunksize_mb": multipart_chunksize_mb0,
-                            "status_id": OrcaStatus.PENDING.value,
-                            "error_message": None,
-                            "request_time": request_time0,
-                            "last_update": last_update0,
-                            "completion_time": None,
-                        },
-                        {
-                            "job_id": job_id,
-                            "collection_id": collection_id,
-                            "granule_id": granule_id,
-                            "filename": filename1,
-                            "key_path": key_path1,
-                            "restore_destination": restore_destination1,
-                            "multipart_chunksize_mb": multipart_chunksize_mb1,
-                            "status_id": OrcaStatus.FAILED.value,
-                            "error_message": error_message1,
-                            "request_time": request_time1,
-                            "last_update": last_update1,
-                            "completion_time": completion_time1,
-                        },
-                    ],
-                ),
-            ]
+                {
+                    "job_id": job_id,
+                    "collection_id": collection_id,
+                    "granule_id": granule_id,
+                    "status_id": OrcaStatus.PENDING.value,
+                    "request_time": request_time,
+                    "completion_time": None,
+                    "archive_destination": archive_destination,
+                }
+            ],
+            batch.job_parameters,
+        )
+        self.assertEqual(
+            [
+                {
+                    "job_id": job_id,
+                    "collection_id": collection_id,
+                    "granule_id": granule_id,
+                    "filename": filename0,
+                    "key_path": key_path0,
+                    "restore_destination": restore_destination0,
+                    "multipart_chunksize_mb": multipart_chunksize_mb0,
+                    "status_id": OrcaStatus.PENDING.value,
+                    "error_message": None,
+                    "request_time": request_time0,
+                    "last_update": last_update0,
+                    "completion_time": None,
+                },
+                {
+                    "job_id": job_id,
+                    "collection_id": collection_id,
+                    "granule_id": granule_id,
+                    "filename": filename1,
+                    "key_path": key_path1,
+                    "restore_destination": restore_destination1,
+                    "multipart_chunksize_mb": multipart_chunksize_mb1,
+                    "status_id": OrcaStatus.FAILED.value,
+                    "error_message": error_message1,
+                    "request_time": request_time1,
+                    "last_update": last_update1,
+                    "completion_time": completion_time1,
+                },
+            ],
+            batch.file_parameters,
         )
-        self.assertEqual(2, mock_connection.execute.call_count)
 
     @patch("post_to_database.datetime.datetime")
-    @patch("post_to_database.create_job_sql")
-    def test_create_status_for_job_and_files_no_files_failed(
+    def test_add_job_and_files_to_batch_no_files_failed(
         self,
-        mock_create_job_sql: MagicMock,
         mock_datetime: MagicMock,
     ):
         """
@@ -427,50 +419,37 @@ class TestPostToDatabase(
         archive_destination = uuid.uuid4().__str__()
         files = []
 
-        mock_engine = Mock()
-        mock_engine.begin.return_value = Mock()
-        mock_connection = Mock()
-        mock_engine.begin.return_value.__enter__ = Mock()
-        mock_engine.begin.return_value.__enter__.return_value = mock_connection
-        mock_engine.begin.return_value.__exit__ = Mock(return_value=False)
+        batch = post_to_database.StatusBatch()
 
-        post_to_database.create_status_for_job_and_files(
+        post_to_database.add_job_and_files_to_batch(
             job_id,
             collection_id,
             granule_id,
             request_time,
             archive_destination,
             files,
-            mock_engine,
+            batch,
         )
 
-        mock_connection.execute.assert_has_calls(
+        self.assertEqual(
             [
-                call(
-                    mock_create_job_sql.return_value,
-                    [
-                        {
-                            "job_id": job_id,
-                            "collection_id": collection_id,
-                            "granule_id": granule_id,
-                            "status_id": OrcaStatus.FAILED.value,
-                            "request_time": request_time,
-                            "completion_time": mock_datetime.now(datetime.timezone.utc)
-                            .isoformat()
-                            .__str__(),
-                            "archive_destination": archive_destination,
-                        }
-                    ],
-                ),
-            ]
+                {
+                    "job_id": job_id,
+                    "collection_id": collection_id,
+                    "granule_id": granule_id,
+                    "status_id": OrcaStatus.FAILED.value,
+                    "request_time": request_time,
+                    "completion_time": mock_datetime.now(datetime.timezone.utc)
+                    .isoformat()
+                    .__str__(),
+                    "archive_destination": archive_destination,
+                }
+            ],
+            batch.job_parameters,
         )
-        self.assertEqual(1, mock_connection.execute.call_count)
+        self.assertEqual([], batch.file_parameters)
 
-    @patch("post_to_database.create_file_sql")
-    @patch("post_to_database.create_job_sql")
-    def test_create_status_for_job_and_files_all_files_failed(
-        self, mock_create_job_sql: MagicMock, mock_create_file_sql: MagicMock
-    ):
+    def test_add_job_and_files_to_batch_all_files_failed(self):
         """
         If all files failed, job should be marked as such.
         """
@@ -541,91 +520,81 @@ class TestPostToDatabase(
             },
         ]
 
-        mock_engine = Mock()
-        mock_engine.begin.return_value = Mock()
-        mock_connection = Mock()
-        mock_engine.begin.return_value.__enter__ = Mock()
-        mock_engine.begin.return_value.__enter__.return_value = mock_connection
-        mock_engine.begin.return_value.__exit__ = Mock(return_value=False)
+        batch = post_to_database.StatusBatch()
 
-        post_to_database.create_status_for_job_and_files(
+        post_to_database.add_job_and_files_to_batch(
             job_id,
             collection_id,
             granule_id,
             request_time,
             archive_destination,
             files,
-            mock_engine,
+            batch,
         )
 
-        mock_connection.execute.assert_has_calls(
+        self.assertEqual(
             [
-                call(
-                    mock_create_job_sql.return_value,
-                    [
-                        {
-                            "job_id": job_id,
-                            "collection_id": collection_id,
-                            "granule_id": granule_id,
-                            "status_id": OrcaStatus.FAILED.value,
-                            "request_time": request_time,
-                            "completion_time": completion_time2.__str__(),
-                            "archive_destination": archive_destination,
-                        }
-                    ],
-                ),
-                call(
-                    mock_create_file_sql.return_value,
-                    [
-                        {
-                            "job_id": job_id,
-                            "collection_id": collection_id,
-                            "granule_id": granule_id,
-                            "filename": filename0,
-                            "key_path": key_path0,
-                            "restore_destination": restore_destination0,
-                            "multipart_chunksize_mb": multipart_chunksize_mb0,
-                            "status_id": OrcaStatus.FAILED.value,
-                            "error_message": error_message0,
-                            "request_time": request_time0,
-                            "last_update": last_update0,
-                            "completion_time": completion_time0,
-                        },
-                        {
-                            "job_id": job_id,
-                            "collection_id": collection_id,
-                            "granule_id": granule_id,
-                            "filename": filename1,
-                            "key_path": key_path1,
-                            "restore_destination": restore_destination1,
-                            "multipart_chunksize_mb": multipart_chunksize_mb1,
-                            "status_id": OrcaStatus.FAILED.value,
-                            "error_message": error_message1,
-                            "request_time": request_time1,
-                            "last_update": last_update1,
-                            "completion_time": completion_time1,
-                        },
-                        {
-                            "job_id": job_id,
-                            "collection_id": collection_id,
-                            "granule_id": granule_id,
-                            "filename": filename2,
-                            "key_path": key_path2,
-                            "restore_destination": restore_destination2,
-                            "multipart_chunksize_mb": multipart_chunksize_mb2,
-                            "status_id": OrcaStatus.FAILED.value,
-                            "error_message": error_message2,
-                            "request_time": request_time2,
-                            "last_update": last_update2,
-                            "completion_time": completion_time2,
-                        },
-                    ],
-                ),
-            ]
+                {
+                    "job_id": job_id,
+                    "collection_id": collection_id,
+                    "granule_id": granule_id,
+                    "status_id": OrcaStatus.FAILED.value,
+                    "request_time": request_time,
+                    "completion_time": completion_time2.__str__(),
+                    "archive_destination": archive_destination,
+                }
+            ],
+            batch.job_parameters,
+        )
+        self.assertEqual(
+            [
+                {
+                    "job_id": job_id,
+                    "collection_id": collection_id,
+                    "granule_id": granule_id,
+                    "filename": filename0,
+                    "key_path": key_path0,
+                    "restore_destination": restore_destination0,
+                    "multipart_chunksize_mb": multipart_chunksize_mb0,
+                    "status_id": OrcaStatus.FAILED.value,
+                    "error_message": error_message0,
+                    "request_time": request_time0,
+                    "last_update": last_update0,
+                    "completion_time": completion_time0,
+                },
+                {
+                    "job_id": job_id,
+                    "collection_id": collection_id,
+                    "granule_id": granule_id,
+                    "filename": filename1,
+                    "key_path": key_path1,
+                    "restore_destination": restore_destination1,
+                    "multipart_chunksize_mb": multipart_chunksize_mb1,
+                    "status_id": OrcaStatus.FAILED.value,
+                    "error_message": error_message1,
+                    "request_time": request_time1,
+                    "last_update": last_update1,
+                    "completion_time": completion_time1,
+                },
+                {
+                    "job_id": job_id,
+                    "collection_id": collection_id,
+                    "granule_id": granule_id,
+                    "filename": filename2,
+                    "key_path": key_path2,
+                    "restore_destination": restore_destination2,
+                    "multipart_chunksize_mb": multipart_chunksize_mb2,
+                    "status_id": OrcaStatus.FAILED.value,
+                    "error_message": error_message2,
+                    "request_time": request_time2,
+                    "last_update": last_update2,
+                    "completion_time": completion_time2,
+                },
+            ],
+            batch.file_parameters,
         )
-        self.assertEqual(2, mock_connection.execute.call_count)
 
-    def test_create_status_for_job_and_files_bad_status_id(self):
+    def test_add_job_and_files_to_batch_bad_status_id(self):
         """
         Only 'PENDING' and 'FAILED' should be allowed on initial creation.
         """
@@ -663,34 +632,120 @@ class TestPostToDatabase(
             ]
 
             with self.assertRaises(ValueError) as cm:
-                post_to_database.create_status_for_job_and_files(
+                post_to_database.add_job_and_files_to_batch(
                     job_id,
                     collection_id,
                     granule_id,
                     request_time,
                     archive_destination,
                     files,
-                    Mock(),
+                    post_to_database.StatusBatch(),
                 )
             self.assertEqual(
                 f"Status ID '{status.value}' not allowed for new status.",
                 str(cm.exception),
             )
 
-    @patch("post_to_database.update_file_sql")
-    @patch("post_to_database.update_job_sql")
-    def test_update_status_for_file_happy_path(
-        self, mock_update_job_sql: MagicMock, mock_update_file_sql: MagicMock
-    ):
+    def test_add_file_update_to_batch_keeps_last_update(self):
+        """
+        A later update for the same file should replace the earlier one.
+        """
         job_id = uuid.uuid4().__str__()
         collection_id = uuid.uuid4().__str__()
         granule_id = uuid.uuid4().__str__()
         filename = uuid.uuid4().__str__()
+        other_filename = uuid.uuid4().__str__()
         last_update = uuid.uuid4().__str__()
         completion_time = uuid.uuid4().__str__()
-        status_id = 4
         error_message = uuid.uuid4().__str__()
 
+        batch = post_to_database.StatusBatch()
+
+        for update_filename, status_id in [
+            (filename, OrcaStatus.STAGED.value),
+            (other_filename, OrcaStatus.STAGED.value),
+            (filename, OrcaStatus.SUCCESS.value),
+        ]:
+            post_to_database.add_file_update_to_batch(
+                job_id,
+                collection_id,
+                granule_id,
+                update_filename,
+                last_update,
+                completion_time,
+                status_id,
+                error_message,
+                batch,
+            )
+
+        self.assertEqual(
+            [
+                {
+                    "job_id": job_id,
+                    "collection_id": collection_id,
+                    "granule_id": granule_id,
+                    "filename": filename,
+                    "status_id": OrcaStatus.SUCCESS.value,
+                    "last_update": last_update,
+                    "completion_time": completion_time,
+                    "error_message": error_message,
+                },
+                {
+                    "job_id": job_id,
+                    "collection_id": collection_id,
+                    "granule_id": granule_id,
+                    "filename": other_filename,
+                    "status_id": OrcaStatus.STAGED.value,
+                    "last_update": last_update,
+                    "completion_time": completion_time,
+                    "error_message": error_message,
+                },
+            ],
+            list(batch.file_updates.values()),
+        )
+
+    @patch("post_to_database.update_files_sql")
+    @patch("post_to_database.create_file_sql")
+    @patch("post_to_database.create_job_sql")
+    def test_write_batch_to_database_happy_path(
+        self,
+        mock_create_job_sql: MagicMock,
+        mock_create_file_sql: MagicMock,
+        mock_update_files_sql: MagicMock,
+    ):
+        """
+        Inserts and updates should run in one transaction.
+        """
+        job_parameters = [Mock(), Mock()]
+        file_parameters = [Mock(), Mock(), Mock()]
+        file_updates = [
+            {
+                "job_id": "job0",
+                "collection_id": "collection0",
+                "granule_id": granule_id,
+                "filename": filename,
+                "status_id": OrcaStatus.SUCCESS.value,
+                "last_update": "last_update",
+                "completion_time": None,
+                "error_message": None,
+            }
+            for granule_id, filename in [
+                ("granule0", "file0"),
+                ("granule0", "file1"),
+                ("granule1", "file0"),
+            ]
+        ]
+        batch = post_to_database.StatusBatch(
+            job_parameters=job_parameters,
+            file_parameters=file_parameters,
+            file_updates={
+                tuple(
+                    update[key] for key in post_to_database.FILE_UPDATE_COLUMNS[:4]
+                ): update
+                for update in file_updates
+            },
+        )
+
         mock_engine = Mock()
         mock_engine.begin.return_value = Mock()
         mock_connection = Mock()
@@ -698,40 +753,79 @@ class TestPostToDatabase(
         mock_engine.begin.return_value.__enter__.return_value = mock_connection
         mock_engine.begin.return_value.__exit__ = Mock(return_value=False)
 
-        post_to_database.update_status_for_file(
-            job_id,
-            collection_id,
-            granule_id,
-            filename,
-            last_update,
-            completion_time,
-            status_id,
-            error_message,
-            mock_engine,
-        )
+        post_to_database.write_batch_to_database(batch, mock_engine)
+
+        mock_engine.begin.assert_called_once_with()
+        mock_update_files_sql.assert_called_once_with(3)
         mock_connection.execute.assert_has_calls(
             [
+                call(mock_create_job_sql.return_value, job_parameters),
+                call(mock_create_file_sql.return_value, file_parameters),
                 call(
-                    mock_update_file_sql.return_value,
-                    {
-                        "status_id": status_id,
-                        "last_update": last_update,
-                        "completion_time": completion_time,
-                        "error_message": error_message,
-                        "job_id": job_id,
-                        "collection_id": collection_id,
-                        "granule_id": granule_id,
-                        "filename": filename,
-                    },
-                ),
-                call(
-                    mock_update_job_sql.return_value,
-                    {
-                        "job_id": job_id,
-                        "collection_id": collection_id,
-                        "granule_id": granule_id,
-                    },
+                    mock_update_files_sql.return_value,
+                    post_to_database.get_values_parameters(file_updates),
                 ),
             ]
         )
-        self.assertEqual(2, mock_connection.execute.call_count)
+        self.assertEqual(3, mock_connection.execute.call_count)
+
+    @patch("post_to_database.update_files_sql")
+    @patch("post_to_database.create_file_sql")
+    @patch("post_to_database.create_job_sql")
+    def test_write_batch_to_database_skips_empty_statements(
+        self,
+        mock_create_job_sql: MagicMock,
+        mock_create_file_sql: MagicMock,
+        mock_update_files_sql: MagicMock,
+    ):
+        """
+        A batch without new jobs or without updates should only run the statements it needs.
+        """
+        file_update = {
+            "job_id": "job0",
+            "collection_id": "collection0",
+            "granule_id": "granule0",
+            "filename": "file0",
+        }
+        for batch, expected_sql in [
+            (
+                post_to_database.StatusBatch(job_parameters=[Mock()]),
+                [mock_create_job_sql],
+            ),
+            (
+                post_to_database.StatusBatch(
+                    file_updates={
+                        ("job0", "collection0", "granule0", "file0"): file_update
+                    }
+                ),
+                [mock_update_files_sql],
+            ),
+        ]:
+            with self.subTest(expected_sql=expected_sql):
+                mock_engine = Mock()
+                mock_engine.begin.return_value = Mock()
+                mock_connection = Mock()
+                mock_engine.begin.return_value.__enter__ = Mock()
+                mock_engine.begin.return_value.__enter__.return_value = mock_connection
+                mock_engine.begin.return_value.__exit__ = Mock(return_value=False)
+
+                post_to_database.write_batch_to_database(batch, mock_engine)
+
+                self.assertEqual(
+                    [sql.return_value for sql in expected_sql],
+                    [
+                        execute_call.args[0]
+                        for execute_call in mock_connection.execute.call_args_list
+                    ],
+                )
+
+    def test_get_values_sql_matches_get_values_parameters(self):
+        rows = [{"a": 1, "b": None}, {"a": 2, "b": "x"}]
+
+        result_sql = post_to_database.get_values_sql(["a", "b"], 2)
+        result_parameters = post_to_database.get_values_parameters(rows)
+
+        self.assertEqual("(:a_0, :b_0),\n            (:a_1, :b_1)", result_sql)
+        self.assertEqual(
+            {"a_0": 1, "b_0": None, "a_1": 2, "b_1": "x"}, result_parameters
+        )
@@ -5,10 +5,11 @@ Description:  Lambda function that makes a restore request from archive bucket f
 
 import json
 import os
-import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
 # noinspection PyPackageRequirements
 import boto3
@@ -24,10 +25,12 @@ from botocore.config import Config
 from botocore.exceptions import ClientError
 from fastjsonschema import JsonSchemaException
 from orca_shared.recovery import shared_recovery
+from orca_shared.retry import shared_retry
 
 DEFAULT_RESTORE_EXPIRE_DAYS = 5
 DEFAULT_MAX_REQUEST_RETRIES = 2
 DEFAULT_RESTORE_RETRY_SLEEP_SECS = 0
+DEFAULT_MAX_RESTORE_WORKERS = 10
 
 VALID_RESTORE_TYPES = ["Bulk", "Expedited", "Standard"]
 
@@ -46,6 +49,7 @@ EVENT_OPTIONAL_VALUES_KEY = "optionalValues"
 
 CONFIG_DEFAULT_BUCKET_OVERRIDE_KEY = "defaultBucketOverride"
 CONFIG_DEFAULT_RECOVERY_TYPE_OVERRIDE_KEY = "defaultRecoveryTypeOverride"
+CONFIG_BATCH_MODE_KEY = "batchMode"
 
 INPUT_GRANULES_KEY = "granules"
 
@@ -57,6 +61,7 @@ GRANULE_COLLECTION_ID_KEY = "collectionId"
 GRANULE_GRANULE_ID_KEY = "granuleId"
 GRANULE_KEYS_KEY = "keys"
 GRANULE_RECOVER_FILES_KEY = "recoverFiles"
+GRANULE_ERROR_MESSAGE_KEY = "errorMessage"
 
 # noinspection SpellCheckingInspection
 FILE_DEST_BUCKET_KEY = "destBucket"
@@ -100,6 +105,7 @@ class RestoreRequestError(Exception):
 # noinspection PyUnusedLocal
 def task(
     event: Dict,
+    get_remaining_time_in_millis: Optional[Callable[[], int]] = None,
 ) -> Dict[str, Any]:
     """
     Pulls information from os.environ, utilizing defaults if needed,
@@ -110,6 +116,8 @@ def task(
             event: A dict with the following keys:
                 'config' (dict): See schemas/config.json for details.
                 'input' (dict): See schemas/input.json for details.
+            get_remaining_time_in_millis: Returns the Lambda's remaining time.
+                Retries are not started if they would run past it.
         Environment Vars:
             See docs in handler for details.
         Returns:
@@ -177,6 +185,7 @@ def task(
         exp_days,
         status_update_queue_url,
         archive_recovery_queue_url,
+        get_remaining_time_in_millis=get_remaining_time_in_millis,
     )
 
 
@@ -234,12 +243,13 @@ def inner_task(
     restore_expire_days: int,
     status_update_queue_url: str,
     archive_recovery_queue_url: str,
+    get_remaining_time_in_millis: Optional[Callable[[], int]] = None,
 ) -> Dict[str, Any]:  # pylint: disable-msg=unused-argument
     """
     Task called by the handler to perform the work.
     This task will call the restore_request for each file. Restored files will be kept
-    for {exp_days} days before they expire. A restore request will be tried up to {retries} times
-    if it fails, waiting {retry_sleep_secs} between each attempt.
+    for {exp_days} days before they expire. A restore request will be retried up to {retries}
+    times if it fails, with exponential backoff and full jitter starting at {retry_sleep_secs}.
         Args:
             Note that because we are using CumulusMessageAdapter,
             this may not directly correspond to Lambda input.
@@ -248,6 +258,8 @@ def inner_task(
                     'defaultBucketOverride' (str): The name of the archive bucket
                         from which the files will be restored.
                     'asyncOperationId' (str): The unique identifier used for tracking requests.
+                    'batchMode' (bool): If true, granules are processed together by
+                        process_granules_batch, and failures are reported per granule.
                 'input' (dict): A dict with the following keys:
                     'granules' (list(dict)): A list of dicts with the following keys:
                         'granuleId' (str): The id of the granule being restored.
@@ -256,7 +268,7 @@ def inner_task(
                             'destBucket' (str): The bucket the restored file will be moved
                                 to after the restore completes.
             max_retries: The maximum number of retries for network operations.
-            retry_sleep_secs: The number of time to sleep between retries.
+            retry_sleep_secs: The backoff ceiling for the first retry.
             recovery_type: The Tier for the restore request.
                 Valid values are 'Standard'|'Bulk'|'Expedited'.
             restore_expire_days: The number of days the restored file will be accessible
@@ -264,10 +276,13 @@ def inner_task(
             status_update_queue_url: The URL of the SQS queue to post status to.
             archive_recovery_queue_url: The URL of the SQS queue that request_from_archive posts to
                 in case of files already recovered from archive.
+            get_remaining_time_in_millis: Returns the Lambda's remaining time.
+                Retries are not started if they would run past it.
         Returns:
             See schemas/output.json
         Raises:
             RestoreRequestError: Thrown if there are errors with the input request.
+                Not raised for per-granule failures in batch mode.
     """
     # Get the archive bucket from the event
     try:
@@ -300,62 +315,45 @@ def inner_task(
         "s3", config=Config(max_pool_connections=default_max_pool_connections)
     )  # pylint: disable-msg=invalid-name
 
+    job_id = event[EVENT_CONFIG_KEY][CONFIG_JOB_ID_KEY]
+    if event[EVENT_CONFIG_KEY].get(CONFIG_BATCH_MODE_KEY, None):
+        process_granules_batch(
+            s3,
+            granules,
+            archive_bucket,
+            collection_multipart_chunksize_mb,
+            restore_expire_days,
+            max_retries,
+            retry_sleep_secs,
+            recovery_type,
+            job_id,
+            status_update_queue_url,
+            archive_recovery_queue_url,
+            default_max_pool_connections,
+            get_remaining_time_in_millis=get_remaining_time_in_millis,
+        )
+        return {
+            "granules": granules,
+            "asyncOperationId": job_id,
+        }
+
     # Setup additional information and formatting for the event granule files
     # Setup initial array for the granules processed
     for granule in granules:
-        # Initialize the granule copy, file array, and timestamp variables
-        files = []
-        time_stamp = datetime.now(timezone.utc).isoformat()
-        if len(granule[GRANULE_KEYS_KEY]) == 0:
-            LOGGER.warning(
-                f"No files given for granule '{granule[GRANULE_GRANULE_ID_KEY]}'"
-            )
-        # Loop through the granule files and find the ones to restore
-        for keys in granule[GRANULE_KEYS_KEY]:
-            # Get the file key (path/filename)
-            file_key = keys[FILE_KEY_KEY]
-            # get the destination bucket for the file
-            destination_bucket_name = keys[FILE_DEST_BUCKET_KEY]
-
-            # Set the initial pending state for the file.
-            a_file = {
-                FILE_PROCESSED_KEY: False,
-                FILE_FILENAME_KEY: os.path.basename(file_key),
-                FILE_KEY_PATH_KEY: file_key,
-                FILE_RESTORE_DESTINATION_KEY: destination_bucket_name,
-                FILE_MULTIPART_CHUNKSIZE_MB_KEY: collection_multipart_chunksize_mb,
-                FILE_STATUS_ID_KEY: shared_recovery.OrcaStatus.PENDING.value,
-                FILE_REQUEST_TIME_KEY: time_stamp,
-                FILE_LAST_UPDATE_KEY: time_stamp,
-            }
-            file_info = get_s3_object_information(s3, archive_bucket, file_key)
-            if file_info is not None:
-                if (
-                    file_info["StorageClass"] == "DEEP_ARCHIVE"
-                    and recovery_type == "Expedited"
-                ):
-                    message = (
-                        f"File '{file_key}' from bucket '{archive_bucket}' "
-                        f"is in storage class '{file_info['StorageClass']}' "
-                        f"which is incompatible with recovery type '{recovery_type}'"
-                    )
-                    LOGGER.error(message)
-                    a_file[FILE_PROCESSED_KEY] = True
-                    a_file[FILE_STATUS_ID_KEY] = shared_recovery.OrcaStatus.FAILED.value
-                    a_file[FILE_ERROR_MESSAGE_KEY] = message
-                    a_file[FILE_COMPLETION_TIME_KEY] = time_stamp
-                else:
-                    LOGGER.info(
-                        f"Added {file_key} to the list of files we'll attempt to recover."
-                    )
-            else:
-                message = f"'{file_key}' does not exist in '{archive_bucket}' bucket"
-                LOGGER.error(message)
-                a_file[FILE_PROCESSED_KEY] = True
-                a_file[FILE_STATUS_ID_KEY] = shared_recovery.OrcaStatus.FAILED.value
-                a_file[FILE_ERROR_MESSAGE_KEY] = message
-                a_file[FILE_COMPLETION_TIME_KEY] = time_stamp
-            files.append(a_file)
+        # HEAD every file in the granule concurrently before deciding what to restore.
+        files_info = get_s3_objects_information(
+            s3,
+            archive_bucket,
+            [keys[FILE_KEY_KEY] for keys in granule[GRANULE_KEYS_KEY]],
+            default_max_pool_connections,
+        )
+        files = get_recover_files(
+            granule,
+            files_info,
+            archive_bucket,
+            recovery_type,
+            collection_multipart_chunksize_mb,
+        )
 
         # Add file information in the proper format
         granule[GRANULE_RECOVER_FILES_KEY] = files
@@ -363,29 +361,25 @@ def inner_task(
         # Send initial job and status information to the database queues
         # post to DB-queue. Retry using exponential delay if it fails
         LOGGER.debug("Sending initial job status information to DB QUEUE.")
-        job_id = event[EVENT_CONFIG_KEY][CONFIG_JOB_ID_KEY]
         collection_id = granule[GRANULE_COLLECTION_ID_KEY]
         granule_id = granule[GRANULE_GRANULE_ID_KEY]
 
-        for retry in range(max_retries + 1):
-            try:
-                shared_recovery.create_status_for_job(
-                    job_id,
-                    collection_id,
-                    granule_id,
-                    archive_bucket,
-                    files,
-                    status_update_queue_url,
-                )
-                break
-            except Exception as ex:
-                LOGGER.error(
-                    f"Ran into error posting to SQS {retry + 1} time(s) with exception '{ex}'"
-                )
-                # todo: Use backoff code. ORCA-201
-                time.sleep(retry_sleep_secs)
-                continue
-        else:
+        if not call_with_retries(
+            lambda: shared_recovery.create_status_for_job(
+                job_id,
+                collection_id,
+                granule_id,
+                archive_bucket,
+                files,
+                status_update_queue_url,
+            ),
+            shared_retry.RetryEngine(
+                f"Create status for granule '{granule_id}'",
+                max_retries,
+                retry_sleep_secs,
+                get_remaining_time_in_millis=get_remaining_time_in_millis,
+            ),
+        ):
             message = f"Unable to send message to QUEUE '{status_update_queue_url}'"
             LOGGER.critical(message)
             raise Exception(message)
@@ -403,6 +397,8 @@ def inner_task(
             job_id,
             status_update_queue_url,
             archive_recovery_queue_url,
+            max_workers=default_max_pool_connections,
+            get_remaining_time_in_millis=get_remaining_time_in_millis,
         )
 
     # Cumulus expects response (payload.granules) to be a list of granule objects.
@@ -410,10 +406,307 @@ def inner_task(
     # information.
     return {
         "granules": granules,
-        "asyncOperationId": event[EVENT_CONFIG_KEY][CONFIG_JOB_ID_KEY],
+        "asyncOperationId": job_id,
     }
 
 
+def call_with_retries(
+    operation: Callable[[], Any], retry_engine: shared_retry.RetryEngine
+) -> bool:
+    """
+    Calls operation until it does not raise an exception, backing off between attempts.
+    Args:
+        operation: The operation to call, such as posting a message to SQS.
+        retry_engine: Determines how many times, and how long to wait before, retrying.
+    Returns:
+        True if operation eventually succeeded, False otherwise.
+    """
+
+    # noinspection PyUnusedLocal
+    def attempt_operation(item: Any, attempt: int) -> bool:
+        try:
+            operation()
+            return True
+        except Exception as ex:
+            LOGGER.error(
+                f"Ran into error posting to SQS {attempt} time(s) with exception '{ex}'"
+            )
+            return False
+
+    return len(retry_engine.run([operation], attempt_operation)) == 0
+
+
+def get_recover_files(
+    granule: Dict[str, Any],
+    files_info: List[Optional[Dict[str, Any]]],
+    archive_bucket_name: str,
+    recovery_type: str,
+    collection_multipart_chunksize_mb: Optional[int],
+) -> List[Dict[str, Any]]:
+    """
+    Builds the initial recovery status for each file in the granule.
+    Files that do not exist, or that are in DEEP_ARCHIVE when Expedited recovery
+    is requested, are marked as processed and failed.
+    Args:
+        granule: A dict with the following keys:
+            'granuleId' (str): The id of the granule being restored.
+            'keys' (list(dict)): A list of dicts with the following keys:
+                'key' (str): Key to the file within the granule.
+                'destBucket' (str): The bucket the restored file will be moved
+                    to after the restore completes.
+        files_info: The result of get_s3_object_information for each entry in 'keys'.
+        archive_bucket_name: The S3 archive bucket name.
+        recovery_type: The Tier for the restore request.
+            Valid values are 'Standard'|'Bulk'|'Expedited'.
+        collection_multipart_chunksize_mb: The collection's multipart chunksize, if any.
+    Returns:
+        A list of file status dicts. See 'recoverFiles' in schemas/output.json.
+    """
+    # Initialize the file array and timestamp variables
+    files = []
+    time_stamp = datetime.now(timezone.utc).isoformat()
+    if len(granule[GRANULE_KEYS_KEY]) == 0:
+        LOGGER.warning(
+            f"No files given for granule '{granule[GRANULE_GRANULE_ID_KEY]}'"
+        )
+    # Loop through the granule files and find the ones to restore
+    for keys, file_info in zip(granule[GRANULE_KEYS_KEY], files_info):
+        # Get the file key (path/filename)
+        file_key = keys[FILE_KEY_KEY]
+        # get the destination bucket for the file
+        destination_bucket_name = keys[FILE_DEST_BUCKET_KEY]
+
+        # Set the initial pending state for the file.
+        a_file = {
+            FILE_PROCESSED_KEY: False,
+            FILE_FILENAME_KEY: os.path.basename(file_key),
+            FILE_KEY_PATH_KEY: file_key,
+            FILE_RESTORE_DESTINATION_KEY: destination_bucket_name,
+            FILE_MULTIPART_CHUNKSIZE_MB_KEY: collection_multipart_chunksize_mb,
+            FILE_STATUS_ID_KEY: shared_recovery.OrcaStatus.PENDING.value,
+            FILE_REQUEST_TIME_KEY: time_stamp,
+            FILE_LAST_UPDATE_KEY: time_stamp,
+        }
+        if file_info is not None:
+            if (
+                file_info["StorageClass"] == "DEEP_ARCHIVE"
+                and recovery_type == "Expedited"
+            ):
+                message = (
+                    f"File '{file_key}' from bucket '{archive_bucket_name}' "
+                    f"is in storage class '{file_info['StorageClass']}' "
+                    f"which is incompatible with recovery type '{recovery_type}'"
+                )
+                LOGGER.error(message)
+                a_file[FILE_PROCESSED_KEY] = True
+                a_file[FILE_STATUS_ID_KEY] = shared_recovery.OrcaStatus.FAILED.value
+                a_file[FILE_ERROR_MESSAGE_KEY] = message
+                a_file[FILE_COMPLETION_TIME_KEY] = time_stamp
+            else:
+                LOGGER.info(
+                    f"Added {file_key} to the list of files we'll attempt to recover."
+                )
+        else:
+            message = f"'{file_key}' does not exist in '{archive_bucket_name}' bucket"
+            LOGGER.error(message)
+            a_file[FILE_PROCESSED_KEY] = True
+            a_file[FILE_STATUS_ID_KEY] = shared_recovery.OrcaStatus.FAILED.value
+            a_file[FILE_ERROR_MESSAGE_KEY] = message
+            a_file[FILE_COMPLETION_TIME_KEY] = time_stamp
+        files.append(a_file)
+    return files
+
+
+def process_granules_batch(
+    s3: BaseClient,
+    granules: List[Dict[str, Any]],
+    archive_bucket_name: str,
+    collection_multipart_chunksize_mb: Optional[int],
+    restore_expire_days: int,
+    max_retries: int,
+    retry_sleep_secs: float,
+    recovery_type: str,
+    job_id: str,
+    status_update_queue_url: str,
+    archive_recovery_queue_url: str,
+    max_workers: int,
+    get_remaining_time_in_millis: Optional[Callable[[], int]] = None,
+) -> None:
+    """
+    Requests restoration of many granules in a single pass. Modifies granules for output.
+    Files are checked with concurrent head requests across all granules, the initial
+    job status for every granule is posted in SQS batches, and granules are restored
+    concurrently over a shared pool of at most max_workers restore requests.
+    Rather than raising, a failure is recorded in the failing granule's 'errorMessage'.
+    This includes head requests that fail for any reason other than a missing file,
+    which leave the granule with no 'recoverFiles' and no job status.
+    Args:
+        s3: An instance of boto3 s3 client
+        granules: A list of dicts with the following keys:
+            'collectionId' (str): The id of the collection containing the granule.
+            'granuleId' (str): The id of the granule being restored.
+            'keys' (list(dict)): A list of dicts with the following keys:
+                'key' (str): Key to the file within the granule.
+                'destBucket' (str): The bucket the restored file will be moved
+                    to after the restore completes.
+        archive_bucket_name: The S3 archive bucket name.
+        collection_multipart_chunksize_mb: The collection's multipart chunksize, if any.
+        restore_expire_days:
+            The number of days the restored file will be accessible in the S3 bucket
+            before it expires.
+        max_retries: The number of attempts to retry a network operation that failed.
+        retry_sleep_secs: The backoff ceiling for the first retry.
+        recovery_type: The Tier for the restore request. Valid values are
+            'Standard'|'Bulk'|'Expedited'.
+        job_id: The unique identifier used for tracking requests.
+        status_update_queue_url: The URL of the SQS queue to post status to.
+        archive_recovery_queue_url: The URL of the SQS queue that request_from_archive posts to
+            in case of files already recovered from archive.
+        max_workers: The maximum number of S3 requests to have in flight at once.
+        get_remaining_time_in_millis: Returns the Lambda's remaining time.
+            Retries are not started if they would run past it.
+    """
+    if len(granules) == 0:
+        return
+
+    # HEAD the files of every granule in one concurrent pass.
+    files_info = iter(
+        get_s3_objects_information(
+            s3,
+            archive_bucket_name,
+            [
+                keys[FILE_KEY_KEY]
+                for granule in granules
+                for keys in granule[GRANULE_KEYS_KEY]
+            ],
+            max_workers,
+            return_errors=True,
+        )
+    )
+    # Indices of the granules whose files were all checked.
+    checked_indices = []
+    for index, granule in enumerate(granules):
+        granule_files_info = [next(files_info) for _ in granule[GRANULE_KEYS_KEY]]
+        errors = [
+            file_info
+            for file_info in granule_files_info
+            if isinstance(file_info, ClientError)
+        ]
+        if len(errors) > 0:
+            LOGGER.error(
+                f"Failed to check the files of granule '{granule[GRANULE_GRANULE_ID_KEY]}' "
+                f"in '{archive_bucket_name}'. Encountered error '{errors[0]}'."
+            )
+            granule[GRANULE_RECOVER_FILES_KEY] = []
+            granule[GRANULE_ERROR_MESSAGE_KEY] = str(errors[0])
+            continue
+        granule[GRANULE_RECOVER_FILES_KEY] = get_recover_files(
+            granule,
+            granule_files_info,
+            archive_bucket_name,
+            recovery_type,
+            collection_multipart_chunksize_mb,
+        )
+        checked_indices.append(index)
+
+    # Send initial job and status information to the database queue in batches.
+    # Only granules whose messages were rejected are retried.
+    LOGGER.debug(
+        f"Sending initial job status information for {len(checked_indices)} granules "
+        f"to DB QUEUE."
+    )
+
+    def post_statuses(indices: List[int]) -> List[bool]:
+        failed_indices = set(
+            shared_recovery.create_status_for_jobs(
+                job_id,
+                archive_bucket_name,
+                [
+                    {
+                        shared_recovery.COLLECTION_ID_KEY: granules[index][
+                            GRANULE_COLLECTION_ID_KEY
+                        ],
+                        shared_recovery.GRANULE_ID_KEY: granules[index][
+                            GRANULE_GRANULE_ID_KEY
+                        ],
+                        shared_recovery.FILES_KEY: granules[index][
+                            GRANULE_RECOVER_FILES_KEY
+                        ],
+                    }
+                    for index in indices
+                ],
+                status_update_queue_url,
+            )
+        )
+        if len(failed_indices) > 0:
+            LOGGER.error(
+                f"Ran into error posting {len(failed_indices)} job status messages to SQS."
+            )
+        return [position not in failed_indices for position in range(len(indices))]
+
+    unposted_indices = shared_retry.RetryEngine(
+        "Create job statuses",
+        max_retries,
+        retry_sleep_secs,
+        get_remaining_time_in_millis=get_remaining_time_in_millis,
+    ).run_batch(checked_indices, post_statuses)
+
+    message = f"Unable to send message to QUEUE '{status_update_queue_url}'"
+    for index in unposted_indices:
+        granule = granules[index]
+        LOGGER.critical(f"{message} for granule '{granule[GRANULE_GRANULE_ID_KEY]}'")
+        completion_time = datetime.now(timezone.utc).isoformat()
+        for a_file in granule[GRANULE_RECOVER_FILES_KEY]:
+            if not a_file[FILE_PROCESSED_KEY]:
+                a_file[FILE_STATUS_ID_KEY] = shared_recovery.OrcaStatus.FAILED.value
+                a_file[FILE_ERROR_MESSAGE_KEY] = message
+                a_file[FILE_COMPLETION_TIME_KEY] = completion_time
+        granule[GRANULE_ERROR_MESSAGE_KEY] = message
+
+    # Restore the granules with a job status concurrently.
+    # Restore requests from all granules share one bounded pool.
+    posted_granules = [
+        granules[index]
+        for index in checked_indices
+        if index not in set(unposted_indices)
+    ]
+    if len(posted_granules) == 0:
+        return
+    with ThreadPoolExecutor(
+        max_workers=max(1, max_workers)
+    ) as restore_executor, ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(posted_granules)))
+    ) as granule_executor:
+        futures = [
+            granule_executor.submit(
+                process_granule,
+                s3,
+                granule,
+                archive_bucket_name,
+                restore_expire_days,
+                max_retries,
+                retry_sleep_secs,
+                recovery_type,
+                job_id,
+                status_update_queue_url,
+                archive_recovery_queue_url,
+                max_workers=max_workers,
+                executor=restore_executor,
+                get_remaining_time_in_millis=get_remaining_time_in_millis,
+            )
+            for granule in posted_granules
+        ]
+        for granule, future in zip(posted_granules, futures):
+            try:
+                future.result()
+            except Exception as ex:
+                LOGGER.error(
+                    f"Failed to request granule '{granule[GRANULE_GRANULE_ID_KEY]}' "
+                    f"from '{archive_bucket_name}'. Encountered error '{ex}'."
+                )
+                granule[GRANULE_ERROR_MESSAGE_KEY] = str(ex)
+
+
 def process_granule(
     s3: BaseClient,
     granule: Dict[str, Union[str, List[Dict]]],
@@ -425,8 +718,13 @@ def process_granule(
     job_id: str,
     status_update_queue_url: str,
     archive_recovery_queue_url: str,
+    max_workers: int = DEFAULT_MAX_RESTORE_WORKERS,
+    executor: Optional[ThreadPoolExecutor] = None,
+    get_remaining_time_in_millis: Optional[Callable[[], int]] = None,
 ) -> None:  # pylint: disable-msg=unused-argument
     """Call restore_object for the files in the granule_list. Modifies granule for output.
+    Restore requests are submitted concurrently, with at most max_workers requests in flight.
+    Only files whose request failed are retried, each after its own jittered backoff.
     Args:
         s3: An instance of boto3 s3 client
         granule: A dict with the following keys:
@@ -443,66 +741,72 @@ def process_granule(
             The number of days the restored file will be accessible in the S3 bucket
             before it expires.
         max_retries: The number of attempts to retry a restore_request that failed to submit.
-        retry_sleep_secs: The number of seconds to sleep between retry attempts.
+        retry_sleep_secs: The backoff ceiling for the first retry.
         recovery_type: The Tier for the restore request. Valid values are
             'Standard'|'Bulk'|'Expedited'.
         job_id: The unique identifier used for tracking requests.
         status_update_queue_url: The URL of the SQS queue to post status to.
         archive_recovery_queue_url: The URL of the SQS queue that request_from_archive posts to
             in case of files already recovered from archive.
+        max_workers: The maximum number of restore requests to submit at once.
+        executor: If given, restore requests are submitted to this shared pool
+            instead of a new one, and max_workers is ignored.
+        get_remaining_time_in_millis: Returns the Lambda's remaining time.
+            Retries are not started if they would run past it.
 
     Raises: RestoreRequestError if any file restore could not be initiated.
     """
-    attempt = 1
     collection_id = granule[GRANULE_COLLECTION_ID_KEY]
     granule_id = granule[GRANULE_GRANULE_ID_KEY]
 
-    # Try to restore objects in S3
-    while attempt <= max_retries + 1:
-        for a_file in granule[GRANULE_RECOVER_FILES_KEY]:
-            # Only restore files we have not restored or have not successfully been restored
-            if not a_file[FILE_PROCESSED_KEY]:
-                LOGGER.debug(
-                    f"Attempting to restore object at key "
-                    f"'{a_file[FILE_KEY_PATH_KEY]}'..."
-                )
-                try:
-                    restore_object(
-                        s3,
-                        a_file[FILE_KEY_PATH_KEY],
-                        restore_expire_days,
-                        archive_bucket_name,
-                        attempt,
-                        job_id,
-                        recovery_type,
-                        archive_recovery_queue_url,
-                    )
-
-                    # Successful restore
-                    a_file[FILE_PROCESSED_KEY] = True
-
-                except ClientError as err:
-                    # Set the message for logging and populate file's error message info.
-                    LOGGER.error(
-                        f"Failed to restore '{a_file[FILE_KEY_PATH_KEY]}' "
-                        f"from '{archive_bucket_name}'. "
-                        f"Encountered error '{err}'."
-                    )
-                    a_file[FILE_ERROR_MESSAGE_KEY] = str(err)
-
-        attempt = attempt + 1
-
-        # Only sleep if not on last attempt.
-        # todo: Use backoff code. ORCA-201
-        if attempt <= max_retries + 1:
-            # Check for early completion.
-            if all(
-                a_file[FILE_PROCESSED_KEY]
-                for a_file in granule[GRANULE_RECOVER_FILES_KEY]
-            ):
-                break
-            # No early completion sleep and try again
-            time.sleep(retry_sleep_secs)
+    def restore_file(a_file: Dict[str, Any], attempt: int) -> bool:
+        LOGGER.debug(
+            f"Attempting to restore object at key '{a_file[FILE_KEY_PATH_KEY]}'..."
+        )
+        try:
+            restore_object(
+                s3,
+                a_file[FILE_KEY_PATH_KEY],
+                restore_expire_days,
+                archive_bucket_name,
+                attempt,
+                job_id,
+                recovery_type,
+                archive_recovery_queue_url,
+            )
+        except ClientError as err:
+            # Set the message for logging and populate file's error message info.
+            LOGGER.error(
+                f"Failed to restore '{a_file[FILE_KEY_PATH_KEY]}' "
+                f"from '{archive_bucket_name}'. "
+                f"Encountered error '{err}'."
+            )
+            a_file[FILE_ERROR_MESSAGE_KEY] = str(err)
+            return False
+
+        # Successful restore
+        a_file[FILE_PROCESSED_KEY] = True
+        return True
+
+    # Only restore files we have not restored or have not successfully been restored.
+    # Each file is only modified by the worker currently restoring it.
+    pending_files = [
+        a_file
+        for a_file in granule[GRANULE_RECOVER_FILES_KEY]
+        if not a_file[FILE_PROCESSED_KEY]
+    ]
+    if len(pending_files) > 0:
+        with (
+            ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending_files))))
+            if executor is None
+            else nullcontext(executor)
+        ) as restore_executor:
+            shared_retry.RetryEngine(
+                f"Restore granule '{granule_id}'",
+                max_retries,
+                retry_sleep_secs,
+                get_remaining_time_in_millis=get_remaining_time_in_millis,
+            ).run(pending_files, restore_file, executor=restore_executor)
 
     # update the status of failed files. Initialize the variables needed
     # for the loop.
@@ -523,27 +827,23 @@ def process_granule(
             LOGGER.debug(
                 f"Sending status update information for {a_file[FILE_FILENAME_KEY]} to the QUEUE",
             )
-            for attempt in range(max_retries + 1):
-                try:
-                    shared_recovery.update_status_for_file(
-                        job_id,
-                        collection_id,
-                        granule_id,
-                        a_file[FILE_FILENAME_KEY],
-                        shared_recovery.OrcaStatus.FAILED,
-                        a_file[FILE_ERROR_MESSAGE_KEY],
-                        status_update_queue_url,
-                    )
-                    break
-                except Exception as ex:
-                    LOGGER.error(
-                        f"Ran into error posting to SQS {attempt + 1} "
-                        f"time(s) with exception '{ex}'"
-                    )
-                    # todo: Use backoff code. ORCA-201
-                    time.sleep(retry_sleep_secs)
-                    continue
-            else:
+            if not call_with_retries(
+                lambda: shared_recovery.update_status_for_file(
+                    job_id,
+                    collection_id,
+                    granule_id,
+                    a_file[FILE_FILENAME_KEY],
+                    shared_recovery.OrcaStatus.FAILED,
+                    a_file[FILE_ERROR_MESSAGE_KEY],
+                    status_update_queue_url,
+                ),
+                shared_retry.RetryEngine(
+                    f"Update status for '{a_file[FILE_FILENAME_KEY]}'",
+                    max_retries,
+                    retry_sleep_secs,
+                    get_remaining_time_in_millis=get_remaining_time_in_millis,
+                ),
+            ):
                 message = f"Unable to send message to QUEUE '{status_update_queue_url}'"
                 LOGGER.critical(message)
                 raise Exception(message)
@@ -597,6 +897,42 @@ def get_s3_object_information(
         # 'S3.Client.exceptions.NoSuchKey instead of deconstructing ClientError
 
 
+def get_s3_objects_information(
+    s3_cli: BaseClient,
+    archive_bucket_name: str,
+    file_keys: List[str],
+    max_workers: int,
+    return_errors: bool = False,
+) -> List[Union[Optional[Dict[str, Any]], ClientError]]:
+    """Perform head requests for several files in S3 concurrently.
+    Args:
+        s3_cli: An instance of boto3 s3 client
+        archive_bucket_name: The S3 bucket name
+        file_keys: The keys of the archived objects
+        max_workers: The maximum number of head requests to have in flight at once.
+        return_errors: If True, a ClientError raised for a key is returned
+            in that key's entry rather than raised, so other keys are not lost.
+    Returns:
+        A list with one entry per key, in the same order as file_keys.
+        See get_s3_object_information for the format of each entry.
+    """
+
+    def get_information(file_key: str) -> Union[Optional[Dict[str, Any]], ClientError]:
+        try:
+            return get_s3_object_information(s3_cli, archive_bucket_name, file_key)
+        except ClientError as err:
+            if not return_errors:
+                raise
+            return err
+
+    if len(file_keys) == 0:
+        return []
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(file_keys)))
+    ) as executor:
+        return list(executor.map(get_information, file_keys))
+
+
 def restore_object(
     s3_cli: BaseClient,
     key: str,
@@ -710,14 +1046,16 @@ def set_optional_event_property(
 
 @LOGGER.inject_lambda_context
 def handler(
-    event: Dict[str, Any], _: LambdaContext
+    event: Dict[str, Any], context: LambdaContext
 ):  # pylint: disable-msg=unused-argument
     """Lambda handler. Initiates a restore_object request from archive for each file of a granule.
     Note that this function is set up to accept a list of granules, (because Cumulus sends a list),
-    but at this time, only 1 granule will be accepted.
+    but by default only 1 granule is effectively supported.
     This is due to the error handling. If the restore request for any file for a
     granule fails to submit, the entire granule (workflow) fails. If more than one granule were
-    accepted, and a failure occurred, at present, it would fail all of them.
+    accepted, and a failure occurred, it would fail all of them.
+    Setting config['batchMode'] to true accepts many granules at once. Failures are then
+    reported in each granule's 'errorMessage' instead of failing the whole request.
     Environment variables can be set to override how many days to keep the restored files, how
     many times to retry a restore_request, and how long to wait between retries.
         Environment Vars:
@@ -725,8 +1063,9 @@ def handler(
                 the restored file will be accessible in the S3 bucket before it expires.
             RESTORE_REQUEST_RETRIES (int, optional, default = 3): The number of
                 attempts to retry a restore_request that failed to submit.
-            RESTORE_RETRY_SLEEP_SECS (int, optional, default = 0): The number of seconds
-                to sleep between retry attempts.
+            RESTORE_RETRY_SLEEP_SECS (int, optional, default = 0): The backoff ceiling,
+                in seconds, for the first retry. Retries wait a random time up to this
+                ceiling, which doubles with each retry.
             RESTORE_RECOVERY_TYPE (str, optional, default = 'Standard'): the Tier
                 for the restore request. Valid values are 'Standard'|'Bulk'|'Expedited'.
             STATUS_UPDATE_QUEUE_URL
@@ -736,8 +1075,8 @@ def handler(
         Args:
             event: Event passed into the step from the aws workflow.
                 See schemas/input.json and schemas/config.json for more information.
-            _: This object provides information about the lambda invocation, function,
-                and execution env.
+            context: This object provides information about the lambda invocation, function,
+                and execution env. Retries are not started if they would outlast it.
         Returns:
             A dict matching schemas/output.json
         Raises:
@@ -765,7 +1104,7 @@ def handler(
         LOGGER.error(json_schema_exception)
         raise
 
-    result = task(event)
+    result = task(event, context.get_remaining_time_in_millis)
 
     try:
         _VALIDATE_OUTPUT(result)
@@ -21,6 +21,7 @@ import fastjsonschema as fastjsonschema
 from botocore.exceptions import ClientError
 from orca_shared.recovery import shared_recovery
 from orca_shared.recovery.shared_recovery import OrcaStatus
+from orca_shared.retry import shared_retry
 
 import request_from_archive
 
@@ -117,6 +118,7 @@ class TestRequestFromArchive(unittest.TestCase):
             exp_days,
             db_queue_url,
             archive_recovery_queue_url,
+            get_remaining_time_in_millis=None,
         )
 
     @patch("request_from_archive.get_default_archive_bucket_name")
@@ -177,6 +179,7 @@ class TestRequestFromArchive(unittest.TestCase):
             exp_days,
             db_queue_url,
             archive_recovery_queue_url,
+            get_remaining_time_in_millis=None,
         )
 
     @patch("request_from_archive.get_default_archive_bucket_name")
@@ -238,6 +241,7 @@ class TestRequestFromArchive(unittest.TestCase):
             exp_days,
             db_queue_url,
             archive_recovery_queue_url,
+            get_remaining_time_in_millis=None,
         )
 
     @patch("request_from_archive.get_default_archive_bucket_name")
@@ -299,6 +303,7 @@ class TestRequestFromArchive(unittest.TestCase):
             request_from_archive.DEFAULT_RESTORE_EXPIRE_DAYS,
             db_queue_url,
             archive_recovery_queue_url,
+            get_remaining_time_in_millis=None,
         )
 
     @patch("request_from_archive.get_default_archive_bucket_name")
@@ -364,8 +369,13 @@ class TestRequestFromArchive(unittest.TestCase):
             exp_days,
             db_queue_url,
             archive_recovery_queue_url,
+            get_remaining_time_in_millis=None,
         )
 
+    @patch.dict(
+        os.environ,
+        {request_from_archive.OS_ENVIRON_DEFAULT_MAX_POOL_CONNECTIONS_KEY: "7"},
+    )
     # noinspection PyUnusedLocal
     @patch("request_from_archive.shared_recovery.create_status_for_job")
     @patch("time.sleep")
@@ -542,6 +552,8 @@ class TestRequestFromArchive(unittest.TestCase):
                     job_id,
                     db_queue_url,
                     archive_recovery_queue_url,
+                    max_workers=7,
+                    get_remaining_time_in_millis=None,
                 ),
                 call(
                     mock_s3_cli,
@@ -554,6 +566,8 @@ class TestRequestFromArchive(unittest.TestCase):
                     job_id,
                     db_queue_url,
                     archive_recovery_queue_url,
+                    max_workers=7,
+                    get_remaining_time_in_millis=None,
                 ),
             ]
         )
@@ -566,6 +580,10 @@ class TestRequestFromArchive(unittest.TestCase):
             result,
         )
 
+    @patch.dict(
+        os.environ,
+        {request_from_archive.OS_ENVIRON_DEFAULT_MAX_POOL_CONNECTIONS_KEY: "7"},
+    )
     # noinspection PyUnusedLocal
     @patch("request_from_archive.shared_recovery.create_status_for_job")
     @patch("time.sleep")
@@ -755,6 +773,8 @@ class TestRequestFromArchive(unittest.TestCase):
                     job_id,
                     db_queue_url,
                     archive_recovery_queue_url,
+                    max_workers=7,
+                    get_remaining_time_in_millis=None,
                 ),
                 call(
                     mock_s3_cli,
@@ -767,6 +787,8 @@ class TestRequestFromArchive(unittest.TestCase):
                     job_id,
                     db_queue_url,
                     archive_recovery_queue_url,
+                    max_workers=7,
+                    get_remaining_time_in_millis=None,
                 ),
             ]
         )
@@ -779,6 +801,10 @@ class TestRequestFromArchive(unittest.TestCase):
             result,
         )
 
+    @patch.dict(
+        os.environ,
+        {request_from_archive.OS_ENVIRON_DEFAULT_MAX_POOL_CONNECTIONS_KEY: "7"},
+    )
     # noinspection PyUnusedLocal
     @patch("request_from_archive.shared_recovery.create_status_for_job")
     @patch("time.sleep")
@@ -945,6 +971,10 @@ class TestRequestFromArchive(unittest.TestCase):
         except request_from_archive.RestoreRequestError:
             pass
 
+    @patch.dict(
+        os.environ,
+        {request_from_archive.OS_ENVIRON_DEFAULT_MAX_POOL_CONNECTIONS_KEY: "7"},
+    )
     # noinspection PyUnusedLocal
     @patch("request_from_archive.shared_recovery.create_status_for_job")
     @patch("time.sleep")
@@ -1138,6 +1168,8 @@ class TestRequestFromArchive(unittest.TestCase):
             job_id,
             db_queue_url,
             archive_recovery_queue_url,
+            max_workers=7,
+            get_remaining_time_in_millis=None,
         )
         self.assertEqual(
             {
@@ -1417,15 +1449,119 @@ class TestRequestFromArchive(unittest.TestCase):
                     recovery_type,
                     archive_recovery_queue_url,
                 ),
-            ]
+            ],
+            any_order=True,
         )
         self.assertEqual(2, mock_restore_object.call_count)
         mock_sleep.assert_not_called()
 
+    @patch("orca_shared.retry.shared_retry.get_full_jitter_delay", return_value=1)
+    @patch("time.sleep")
+    @patch("request_from_archive.restore_object")
+    def test_process_granule_concurrent_only_retries_failed_files(
+        self,
+        mock_restore_object: MagicMock,
+        mock_sleep: MagicMock,
+        mock_get_full_jitter_delay: MagicMock,
+    ):
+        """
+        Files submitted concurrently should only be resubmitted if their own request failed.
+        """
+        mock_s3 = Mock()
+        max_retries = 3
+        archive_bucket_name = uuid.uuid4().__str__()
+        retry_sleep_secs = randint(0, 99)  # nosec
+        recovery_type = uuid.uuid4().__str__()
+        restore_expire_days = randint(0, 99)  # nosec
+        job_id = uuid.uuid4().__str__()
+        db_queue_url = "http://" + uuid.uuid4().__str__() + ".blah"
+        archive_recovery_queue_url = "http://" + uuid.uuid4().__str__() + ".blah"
+        file_names = [uuid.uuid4().__str__() for _ in range(5)]
+        failing_file_name = file_names[2]
+
+        granule = {
+            request_from_archive.GRANULE_COLLECTION_ID_KEY: uuid.uuid4().__str__(),
+            request_from_archive.GRANULE_GRANULE_ID_KEY: uuid.uuid4().__str__(),
+            request_from_archive.GRANULE_RECOVER_FILES_KEY: [
+                {
+                    request_from_archive.FILE_PROCESSED_KEY: False,
+                    request_from_archive.FILE_FILENAME_KEY: file_name,
+                    request_from_archive.FILE_KEY_PATH_KEY: file_name,
+                    request_from_archive.FILE_RESTORE_DESTINATION_KEY: uuid.uuid4().__str__(),
+                    request_from_archive.FILE_STATUS_ID_KEY: 1,
+                }
+                for file_name in file_names
+            ],
+        }
+
+        # noinspection PyUnusedLocal
+        def restore_object_side_effect(
+            s3_cli, key, days, db_archive_bucket_key, attempt, *args
+        ):
+            if key == failing_file_name and attempt == 1:
+                raise ClientError({}, "")
+
+        mock_restore_object.side_effect = restore_object_side_effect
+
+        request_from_archive.process_granule(
+            mock_s3,
+            granule,
+            archive_bucket_name,
+            restore_expire_days,
+            max_retries,
+            retry_sleep_secs,
+            recovery_type,
+            job_id,
+            db_queue_url,
+            archive_recovery_queue_url,
+            max_workers=3,
+        )
+
+        for a_file in granule[request_from_archive.GRANULE_RECOVER_FILES_KEY]:
+            self.assertTrue(a_file[request_from_archive.FILE_PROCESSED_KEY])
+        mock_restore_object.assert_has_calls(
+            [
+                call(
+                    mock_s3,
+                    file_name,
+                    restore_expire_days,
+                    archive_bucket_name,
+                    1,
+                    job_id,
+                    recovery_type,
+                    archive_recovery_queue_url,
+                )
+                for file_name in file_names
+            ],
+            any_order=True,
+        )
+        mock_restore_object.assert_any_call(
+            mock_s3,
+            failing_file_name,
+            restore_expire_days,
+            archive_bucket_name,
+            2,
+            job_id,
+            recovery_type,
+            archive_recovery_queue_url,
+        )
+        self.assertEqual(len(file_names) + 1, mock_restore_object.call_count)
+        mock_get_full_jitter_delay.assert_called_once_with(
+            1, retry_sleep_secs, shared_retry.DEFAULT_MAX_DELAY_SECS
+        )
+        mock_sleep.assert_called_once()
+        self.assertAlmostEqual(
+            mock_get_full_jitter_delay.return_value, mock_sleep.call_args.args[0]
+        )
+
+    @patch("orca_shared.retry.shared_retry.get_full_jitter_delay", return_value=1)
     @patch("time.sleep")
     @patch("request_from_archive.restore_object")
     def test_process_granule_one_client_or_key_error_retries(
-        self, mock_restore_object: MagicMock, mock_sleep: MagicMock
+        self,
+        mock_restore_object: MagicMock,
+        mock_sleep: MagicMock,
+        mock_get_full_jitter_delay: MagicMock,
     ):
         mock_s3 = Mock()
         max_retries = 5
@@ -1506,9 +1642,12 @@ class TestRequestFromArchive(unittest.TestCase):
             ]
         )
         self.assertEqual(2, mock_restore_object.call_count)
-        mock_sleep.assert_has_calls([call(retry_sleep_secs)])
+        mock_get_full_jitter_delay.assert_called_once_with(
+            1, retry_sleep_secs, shared_retry.DEFAULT_MAX_DELAY_SECS
+        )
         self.assertEqual(1, mock_sleep.call_count)
 
+    @patch("orca_shared.retry.shared_retry.get_full_jitter_delay", return_value=1)
     @patch("orca_shared.recovery.shared_recovery.update_status_for_file")
     @patch("time.sleep")
     @patch("request_from_archive.restore_object")
@@ -1519,6 +1658,7 @@ class TestRequestFromArchive(unittest.TestCase):
         mock_restore_object: MagicMock,
         mock_sleep: MagicMock,
         mock_update_status_for_file: MagicMock,
+        mock_get_full_jitter_delay: MagicMock,
     ):
         mock_s3 = Mock()
         max_retries = randint(3, 20)  # nosec
@@ -1621,7 +1761,13 @@ class TestRequestFromArchive(unittest.TestCase):
             ]
         )
         self.assertEqual(max_retries + 1, mock_restore_object.call_count)
-        mock_sleep.assert_has_calls([call(retry_sleep_secs)] * max_retries)
+        mock_get_full_jitter_delay.assert_has_calls(
+            [
+                call(retry, retry_sleep_secs, shared_retry.DEFAULT_MAX_DELAY_SECS)
+                for retry in range(1, max_retries + 1)
+            ]
+        )
+        self.assertEqual(max_retries, mock_sleep.call_count)
         mock_update_status_for_file.assert_called_once_with(
             job_id,
             collection_id,
@@ -1644,6 +1790,7 @@ class TestRequestFromArchive(unittest.TestCase):
             ]
         )
 
+    @patch("orca_shared.retry.shared_retry.get_full_jitter_delay", return_value=1)
     @patch("orca_shared.recovery.shared_recovery.update_status_for_file")
     @patch("time.sleep")
     @patch("request_from_archive.restore_object")
@@ -1654,6 +1801,7 @@ class TestRequestFromArchive(unittest.TestCase):
         mock_restore_object: MagicMock,
         mock_sleep: MagicMock,
         mock_update_status_for_file: MagicMock,
+        mock_get_full_jitter_delay: MagicMock,
     ):
         """
         If a file expended all attempts for recovery, and posting to
@@ -1775,7 +1923,9 @@ class TestRequestFromArchive(unittest.TestCase):
         )
         self.assertEqual(max_retries + 1, mock_restore_object.call_count)
         self.assertEqual(max_retries + 1, mock_update_status_for_file.call_count)
-        mock_sleep.assert_has_calls([call(retry_sleep_secs)] * max_retries * 2)
+        # Both the restore request and the status update back off between attempts.
+        self.assertEqual(max_retries * 2, mock_get_full_jitter_delay.call_count)
+        self.assertEqual(max_retries * 2, mock_sleep.call_count)
         # The following does not check all error messages. Do not implement a call count check.
         mock_logger_error.assert_has_calls(
             [
@@ -1833,6 +1983,386 @@ class TestRequestFromArchive(unittest.TestCase):
         )
         self.assertIsNone(result)
 
+    @patch.dict(
+        os.environ,
+        {request_from_archive.OS_ENVIRON_DEFAULT_MAX_POOL_CONNECTIONS_KEY: "7"},
+    )
+    @patch("request_from_archive.shared_recovery.create_status_for_job")
+    @patch("request_from_archive.process_granule")
+    @patch("request_from_archive.process_granules_batch")
+    @patch("boto3.client")
+    def test_inner_task_batch_mode_calls_process_granules_batch(
+        self,
+        mock_boto3_client: MagicMock,
+        mock_process_granules_batch: MagicMock,
+        mock_process_granule: MagicMock,
+        mock_create_status_for_job: MagicMock,
+    ):
+        """
+        In batch mode, granules should be handed to process_granules_batch together.
+        """
+        archive_bucket_name = uuid.uuid4().__str__()
+        job_id = uuid.uuid4().__str__()
+        granules = [
+            {
+                request_from_archive.GRANULE_COLLECTION_ID_KEY: uuid.uuid4().__str__(),
+                request_from_archive.GRANULE_GRANULE_ID_KEY: uuid.uuid4().__str__(),
+                request_from_archive.GRANULE_KEYS_KEY: [],
+            }
+            for _ in range(3)
+        ]
+        event = {
+            request_from_archive.EVENT_CONFIG_KEY: {
+                request_from_archive.CONFIG_DEFAULT_BUCKET_OVERRIDE_KEY: archive_bucket_name,
+                request_from_archive.CONFIG_JOB_ID_KEY: job_id,
+                request_from_archive.CONFIG_BATCH_MODE_KEY: True,
+            },
+            request_from_archive.EVENT_INPUT_KEY: {
+                request_from_archive.INPUT_GRANULES_KEY: granules
+            },
+        }
+        max_retries = randint(0, 99)  # nosec
+        retry_sleep_secs = randint(0, 99)  # nosec
+        recovery_type = uuid.uuid4().__str__()
+        restore_expire_days = randint(0, 99)  # nosec
+        db_queue_url = "http://" + uuid.uuid4().__str__() + ".blah"
+        archive_recovery_queue_url = "http://" + uuid.uuid4().__str__() + ".blah"
+
+        result = request_from_archive.inner_task(
+            event,
+            max_retries,
+            retry_sleep_secs,
+            recovery_type,
+            restore_expire_days,
+            db_queue_url,
+            archive_recovery_queue_url,
+        )
+
+        mock_process_granules_batch.assert_called_once_with(
+            mock_boto3_client.return_value,
+            granules,
+            archive_bucket_name,
+            None,
+            restore_expire_days,
+            max_retries,
+            retry_sleep_secs,
+            recovery_type,
+            job_id,
+            db_queue_url,
+            archive_recovery_queue_url,
+            7,
+            get_remaining_time_in_millis=None,
+        )
+        mock_process_granule.assert_not_called()
+        mock_create_status_for_job.assert_not_called()
+        self.assertEqual({"granules": granules, "asyncOperationId": job_id}, result)
+
+    @patch("time.sleep")
+    @patch("request_from_archive.shared_recovery.update_status_for_file")
+    @patch("request_from_archive.shared_recovery.create_status_for_jobs")
+    @patch("request_from_archive.restore_object")
+    @patch("request_from_archive.get_s3_object_information")
+    def test_process_granules_batch_reports_failures_per_granule(
+        self,
+        mock_get_s3_object_information: MagicMock,
+        mock_restore_object: MagicMock,
+        mock_create_status_for_jobs: MagicMock,
+        mock_update_status_for_file: MagicMock,
+        mock_sleep: MagicMock,
+    ):
+        """
+        Granules whose status cannot be posted, or whose restore fails, should be
+        reported individually while the remaining granules are still requested.
+        """
+        mock_s3 = Mock()
+        max_retries = 1
+        archive_bucket_name = uuid.uuid4().__str__()
+        retry_sleep_secs = randint(0, 99)  # nosec
+        recovery_type = "Standard"
+        restore_expire_days = randint(0, 99)  # nosec
+        job_id = uuid.uuid4().__str__()
+        db_queue_url = "http://" + uuid.uuid4().__str__() + ".blah"
+        archive_recovery_queue_url = "http://" + uuid.uuid4().__str__() + ".blah"
+        granules = [
+            {
+                request_from_archive.GRANULE_COLLECTION_ID_KEY: uuid.uuid4().__str__(),
+                request_from_archive.GRANULE_GRANULE_ID_KEY: uuid.uuid4().__str__(),
+                request_from_archive.GRANULE_KEYS_KEY: [
+                    {
+                        request_from_archive.FILE_KEY_KEY: uuid.uuid4().__str__(),
+                        request_from_archive.FILE_DEST_BUCKET_KEY: uuid.uuid4().__str__(),
+                    }
+                    for _ in range(2)
+                ],
+            }
+            for _ in range(3)
+        ]
+        unposted_granule = granules[1]
+        failing_key = granules[2][request_from_archive.GRANULE_KEYS_KEY][0][
+            request_from_archive.FILE_KEY_KEY
+        ]
+
+        mock_get_s3_object_information.return_value = {"StorageClass": "GLACIER"}
+        # The second granule's status is rejected on every attempt.
+        mock_create_status_for_jobs.side_effect = [[1], [0]]
+
+        # noinspection PyUnusedLocal
+        def restore_object_side_effect(s3_cli, key, *args):
+            if key == failing_key:
+                raise ClientError({}, "")
+
+        mock_restore_object.side_effect = restore_object_side_effect
+
+        request_from_archive.process_granules_batch(
+            mock_s3,
+            granules,
+            archive_bucket_name,
+            None,
+            restore_expire_days,
+            max_retries,
+            retry_sleep_secs,
+            recovery_type,
+            job_id,
+            db_queue_url,
+            archive_recovery_queue_url,
+            4,
+        )
+
+        self.assertEqual(6, mock_get_s3_object_information.call_count)
+        self.assertEqual(2, mock_create_status_for_jobs.call_count)
+        first_call_granules = mock_create_status_for_jobs.call_args_list[0].args[2]
+        self.assertEqual(
+            [
+                granule[request_from_archive.GRANULE_GRANULE_ID_KEY]
+                for granule in granules
+            ],
+            [
+                granule[shared_recovery.GRANULE_ID_KEY]
+                for granule in first_call_granules
+            ],
+        )
+        second_call_granules = mock_create_status_for_jobs.call_args_list[1].args[2]
+        self.assertEqual(
+            [unposted_granule[request_from_archive.GRANULE_GRANULE_ID_KEY]],
+            [
+                granule[shared_recovery.GRANULE_ID_KEY]
+                for granule in second_call_granules
+            ],
+        )
+
+        # First granule succeeds.
+        self.assertNotIn(request_from_archive.GRANULE_ERROR_MESSAGE_KEY, granules[0])
+        for a_file in granules[0][request_from_archive.GRANULE_RECOVER_FILES_KEY]:
+            self.assertTrue(a_file[request_from_archive.FILE_PROCESSED_KEY])
+        # Second granule is never restored.
+        self.assertEqual(
+            f"Unable to send message to QUEUE '{db_queue_url}'",
+            unposted_granule[request_from_archive.GRANULE_ERROR_MESSAGE_KEY],
+        )
+        for a_file in unposted_granule[request_from_archive.GRANULE_RECOVER_FILES_KEY]:
+            self.assertEqual(
+                OrcaStatus.FAILED.value, a_file[request_from_archive.FILE_STATUS_ID_KEY]
+            )
+        for keys in unposted_granule[request_from_archive.GRANULE_KEYS_KEY]:
+            for call_args in mock_restore_object.call_args_list:
+                self.assertNotEqual(
+                    keys[request_from_archive.FILE_KEY_KEY], call_args.args[1]
+                )
+        # Third granule fails its restore.
+        self.assertEqual(
+            f"One or more files failed to be requested from '{archive_bucket_name}'.",
+            granules[2][request_from_archive.GRANULE_ERROR_MESSAGE_KEY],
+        )
+        mock_update_status_for_file.assert_called_once_with(
+            job_id,
+            granules[2][request_from_archive.GRANULE_COLLECTION_ID_KEY],
+            granules[2][request_from_archive.GRANULE_GRANULE_ID_KEY],
+            failing_key,
+            OrcaStatus.FAILED,
+            mock.ANY,
+            db_queue_url,
+        )
+        # Three files succeed on the first attempt, the failing file is tried twice.
+        self.assertEqual(5, mock_restore_object.call_count)
+
+    @patch("request_from_archive.shared_recovery.create_status_for_jobs")
+    @patch("request_from_archive.restore_object")
+    def test_process_granules_batch_head_error_fails_only_its_granule(
+        self,
+        mock_restore_object: MagicMock,
+        mock_create_status_for_jobs: MagicMock,
+    ):
+        """
+        A head request denied for one file should fail only that file's granule.
+        The other granules are still posted and restored.
+        """
+        archive_bucket_name = uuid.uuid4().__str__()
+        job_id = uuid.uuid4().__str__()
+        db_queue_url = "http://" + uuid.uuid4().__str__() + ".blah"
+        granules = [
+            {
+                request_from_archive.GRANULE_COLLECTION_ID_KEY: uuid.uuid4().__str__(),
+                request_from_archive.GRANULE_GRANULE_ID_KEY: uuid.uuid4().__str__(),
+                request_from_archive.GRANULE_KEYS_KEY: [
+                    {
+                        request_from_archive.FILE_KEY_KEY: uuid.uuid4().__str__(),
+                        request_from_archive.FILE_DEST_BUCKET_KEY: uuid.uuid4().__str__(),
+                    }
+                    for _ in range(2)
+                ],
+            }
+            for _ in range(3)
+        ]
+        denied_granule = granules[1]
+        denied_key = denied_granule[request_from_archive.GRANULE_KEYS_KEY][1][
+            request_from_archive.FILE_KEY_KEY
+        ]
+        error = ClientError(
+            {"Error": {"Code": "403", "Message": "Forbidden"}}, "HeadObject"
+        )
+
+        # noinspection PyPep8Naming
+        def head_object_side_effect(Bucket, Key):
+            if Key == denied_key:
+                raise error
+            return {"StorageClass": "GLACIER"}
+
+        mock_s3 = Mock()
+        mock_s3.head_object.side_effect = head_object_side_effect
+        mock_create_status_for_jobs.return_value = []
+
+        request_from_archive.process_granules_batch(
+            mock_s3,
+            granules,
+            archive_bucket_name,
+            None,
+            randint(0, 99),  # nosec
+            1,
+            0,
+            "Standard",
+            job_id,
+            db_queue_url,
+            "http://" + uuid.uuid4().__str__() + ".blah",
+            4,
+        )
+
+        self.assertEqual(6, mock_s3.head_object.call_count)
+        self.assertEqual(
+            str(error), denied_granule[request_from_archive.GRANULE_ERROR_MESSAGE_KEY]
+        )
+        self.assertEqual(
+            [], denied_granule[request_from_archive.GRANULE_RECOVER_FILES_KEY]
+        )
+        mock_create_status_for_jobs.assert_called_once_with(
+            job_id, archive_bucket_name, mock.ANY, db_queue_url
+        )
+        self.assertEqual(
+            [
+                granules[0][request_from_archive.GRANULE_GRANULE_ID_KEY],
+                granules[2][request_from_archive.GRANULE_GRANULE_ID_KEY],
+            ],
+            [
+                granule[shared_recovery.GRANULE_ID_KEY]
+                for granule in mock_create_status_for_jobs.call_args.args[2]
+            ],
+        )
+        for granule in [granules[0], granules[2]]:
+            self.assertNotIn(request_from_archive.GRANULE_ERROR_MESSAGE_KEY, granule)
+            for a_file in granule[request_from_archive.GRANULE_RECOVER_FILES_KEY]:
+                self.assertTrue(a_file[request_from_archive.FILE_PROCESSED_KEY])
+        self.assertEqual(
+            sorted(
+                keys[request_from_archive.FILE_KEY_KEY]
+                for granule in [granules[0], granules[2]]
+                for keys in granule[request_from_archive.GRANULE_KEYS_KEY]
+            ),
+            sorted(
+                call_args.args[1] for call_args in mock_restore_object.call_args_list
+            ),
+        )
+
+    @patch("request_from_archive.get_s3_object_information")
+    def test_get_s3_objects_information_preserves_order(
+        self, mock_get_s3_object_information: MagicMock
+    ):
+        """
+        Results from concurrent head requests should line up with the requested keys.
+        """
+        mock_s3_cli = Mock()
+        archive_bucket_name = uuid.uuid4().__str__()
+        file_keys = [uuid.uuid4().__str__() for _ in range(10)]
+
+        # noinspection PyUnusedLocal
+        def get_s3_object_information_side_effect(
+            s3_cli, input_archive_bucket_name, file_key
+        ):
+            if file_key == file_keys[3]:
+                return None
+            return {"Key": file_key}
+
+        mock_get_s3_object_information.side_effect = (
+            get_s3_object_information_side_effect
+        )
+
+        result = request_from_archive.get_s3_objects_information(
+            mock_s3_cli, archive_bucket_name, file_keys, 4
+        )
+
+        self.assertEqual(
+            [
+                None if file_key == file_keys[3] else {"Key": file_key}
+                for file_key in file_keys
+            ],
+            result,
+        )
+        mock_get_s3_object_information.assert_has_calls(
+            [
+                call(mock_s3_cli, archive_bucket_name, file_key)
+                for file_key in file_keys
+            ],
+            any_order=True,
+        )
+        self.assertEqual(len(file_keys), mock_get_s3_object_information.call_count)
+
+    def test_get_s3_objects_information_client_error_raised(self):
+        expected_error = ClientError(
+            {"Error": {"Code": "Teapot", "Message": "test"}}, ""
+        )
+        mock_s3_cli = Mock()
+        mock_s3_cli.head_object.side_effect = expected_error
+
+        with self.assertRaises(ClientError) as context:
+            request_from_archive.get_s3_objects_information(
+                mock_s3_cli, uuid.uuid4().__str__(), [uuid.uuid4().__str__()], 2
+            )
+        self.assertEqual(expected_error, context.exception)
+
+    def test_get_s3_objects_information_return_errors(self):
+        """
+        With return_errors, a failed head request is returned in its key's entry.
+        """
+        file_keys = [uuid.uuid4().__str__() for _ in range(3)]
+        expected_error = ClientError(
+            {"Error": {"Code": "SlowDown", "Message": "Slow Down"}}, ""
+        )
+
+        # noinspection PyPep8Naming
+        def head_object_side_effect(Bucket, Key):
+            if Key == file_keys[1]:
+                raise expected_error
+            return {"Key": Key}
+
+        mock_s3_cli = Mock()
+        mock_s3_cli.head_object.side_effect = head_object_side_effect
+
+        result = request_from_archive.get_s3_objects_information(
+            mock_s3_cli, uuid.uuid4().__str__(), file_keys, 2, return_errors=True
+        )
+
+        self.assertEqual(
+            [{"Key": file_keys[0]}, expected_error, {"Key": file_keys[2]}], result
+        )
+
     def test_restore_object_happy_path(self):
         archive_bucket_name = uuid.uuid4().__str__()
         key = uuid.uuid4().__str__()
@@ -1954,7 +2484,9 @@ class TestRequestFromArchive(unittest.TestCase):
         context = Mock()
         result = request_from_archive.handler(input_event, context)
 
-        mock_task.assert_called_once_with(input_event)
+        mock_task.assert_called_once_with(
+            input_event, context.get_remaining_time_in_millis
+        )
         mock_optional_property.assert_called_once_with(
             input_event, input_event[request_from_archive.EVENT_OPTIONAL_VALUES_KEY], []
         )
@@ -2164,7 +2696,7 @@ class TestRequestFromArchive(unittest.TestCase):
             Key=file2,
             RestoreRequest=restore_req_exp,
         )
-        mock_s3_cli.restore_object.assert_called_with(
+        mock_s3_cli.restore_object.assert_any_call(
             Bucket="my-dr-fake-archive-bucket",
             Key=file3,
             RestoreRequest=restore_req_exp,